@@ -0,0 +1,626 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""
+Backup archive creation
+
+A backup is made of independent components (etc, postgres, home, ...).
+The directories of the backup are scanned once, in parallel, to estimate
+the size of the backup and the resulting inventories are archived without
+walking the directories again.
+Each component is archived concurrently into its own gzip member, then the
+members are concatenated into a regular tgz file.  The archive starts with
+a manifest member which records the offset, size, checksum and duration of
+every component.  Since a sequence of gzip members is a valid gzip stream,
+the result is read by tarfile and GNU tar like any other tgz and archives
+created by older releases are restored unchanged.
+
+For a restore the archive is read once to index its members.  The state of
+the decompressor is saved at regular intervals during that pass, so the
+members restored afterwards are extracted from the closest checkpoint
+rather than by decompressing the archive again from its start.
+"""
+
+import bisect
+import errno
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import stat
+import tarfile
+import time
+import zlib
+from multiprocessing.pool import ThreadPool
+
+from controllerconfig.common import log
+from controllerconfig.common.exceptions import BackupFail
+from controllerconfig.common.exceptions import RestoreFail
+
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+LOG = log.get_logger(__name__)
+
+MANIFEST_NAME = 'backup.manifest'
+MANIFEST_VERSION = 1
+
+# The archive content is mostly text (database dumps, configuration) which
+# level 6 compresses nearly as well as level 9, in a fraction of the time.
+COMPRESS_LEVEL = 6
+
+READ_SIZE = 1024 * 1024
+
+# Uncompressed distance between the decompressor checkpoints of a restore,
+# each checkpoint holds the 32KB deflate window but none of the compressed
+# input, which is read again from the file.
+CHECKPOINT_SPACING = 16 * 1024 * 1024
+
+
+def get_workers():
+    """ Number of components archived concurrently """
+    # Leave half of the cores to the services of the active controller
+    return max(1, multiprocessing.cpu_count() // 2)
+
+
+class Inventory(object):
+    """ Files of a directory tree, in archive order
+
+    entries are the paths relative to the directory, along with whether
+    they are regular files.  size is the total size of the regular files.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.entries = []
+        self.size = 0
+
+
+def _list_directory(path):
+    """ List a directory, returns (name, mode, size) sorted by name """
+    entries = []
+    if scandir is not None:
+        for entry in scandir(path):
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    entries.append((entry.name, stat.S_IFDIR, 0))
+                elif entry.is_file(follow_symlinks=False):
+                    st = entry.stat(follow_symlinks=False)
+                    entries.append((entry.name, stat.S_IFREG, st.st_size))
+                else:
+                    entries.append((entry.name, 0, 0))
+            except OSError as e:
+                if e.errno != errno.ENOENT:
+                    raise
+    else:
+        for name in os.listdir(path):
+            try:
+                st = os.lstat(os.path.join(path, name))
+            except OSError as e:
+                if e.errno != errno.ENOENT:
+                    raise
+                continue
+            entries.append((name, stat.S_IFMT(st.st_mode), st.st_size))
+    entries.sort()
+    return entries
+
+
+def scan_directory(directory):
+    """ Build the inventory of a directory tree
+
+    Returns None if the directory does not exist.
+    """
+    if not os.path.isdir(directory):
+        return None
+
+    inventory = Inventory(directory)
+    inventory.entries.append(('', False))
+    pending = ['']
+    while pending:
+        relpath = pending.pop()
+        try:
+            entries = _list_directory(os.path.join(directory, relpath))
+        except OSError as e:
+            # Removed while scanning
+            if e.errno != errno.ENOENT:
+                raise
+            continue
+        subdirs = []
+        for name, mode, size in entries:
+            path = os.path.join(relpath, name)
+            inventory.entries.append((path, mode == stat.S_IFREG))
+            if mode == stat.S_IFREG:
+                inventory.size += size
+            elif mode == stat.S_IFDIR:
+                subdirs.append(path)
+        # Directories are listed before their content
+        pending.extend(reversed(subdirs))
+    return inventory
+
+
+def scan_directories(directories, workers=None):
+    """ Build the inventories of directory trees in parallel
+
+    Returns the inventories by directory, directories which do not exist
+    are omitted.
+    """
+    pool = ThreadPool(workers or get_workers())
+    try:
+        inventories = pool.map(scan_directory, directories)
+    finally:
+        pool.close()
+        pool.join()
+    return dict((inventory.directory, inventory)
+                for inventory in inventories if inventory is not None)
+
+
+def add_directory(archive, directory, arcname, inventories=None):
+    """ Add a directory tree to an archive
+
+    Uses the inventory of the directory when it was scanned, otherwise the
+    directory is walked.
+    """
+    inventory = (inventories or {}).get(directory)
+    if inventory is None:
+        archive.add(directory, arcname=arcname)
+        return
+
+    for relpath, regular in inventory.entries:
+        path = os.path.join(directory, relpath)
+        name = os.path.join(arcname, relpath) if relpath else arcname
+        try:
+            if regular:
+                with open(path, 'rb') as f:
+                    archive.addfile(archive.gettarinfo(arcname=name,
+                                                       fileobj=f), f)
+            else:
+                tarinfo = archive.gettarinfo(path, arcname=name)
+                # Sockets are not archived
+                if tarinfo is not None:
+                    archive.addfile(tarinfo)
+        except (IOError, OSError) as e:
+            # Removed since the scan
+            if e.errno != errno.ENOENT:
+                raise
+
+
+class Component(object):
+    """ A backup step which adds files to an archive
+
+    func is called with the component tar file as first argument, followed
+    by args.
+    """
+
+    def __init__(self, name, description, archive, func, *args):
+        self.name = name
+        self.description = description
+        self.archive = archive
+        self.func = func
+        self.args = args
+        self.path = None
+        self.size = 0
+        self.tar_size = 0
+        self.checksum = None
+        self.duration = 0.0
+        self.members = 0
+        self.roots = []
+        self.chunks = None
+
+
+class _ComponentTarFile(tarfile.TarFile):
+    """ Tar file without end of archive marker
+
+    The component tar files are concatenated, only the complete archive is
+    terminated.
+    """
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if not self._extfileobj:
+            self.fileobj.close()
+
+
+def _checksum(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(READ_SIZE), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def _archive_component(component, store=None):
+    start = time.time()
+    if store is None:
+        archive = _ComponentTarFile.open(component.path, 'w:gz',
+                                         compresslevel=COMPRESS_LEVEL)
+    else:
+        writer = store.writer()
+        archive = _ComponentTarFile.open(fileobj=writer, mode='w')
+    try:
+        component.func(archive, *component.args)
+        component.tar_size = archive.offset
+        roots = set()
+        for member in archive.getmembers():
+            roots.add(member.name.split('/')[0])
+        component.members = len(archive.getmembers())
+        component.roots = sorted(roots)
+    finally:
+        archive.close()
+    if store is None:
+        component.size = os.path.getsize(component.path)
+        component.checksum = _checksum(component.path)
+    else:
+        component.chunks = writer.close()
+        component.size = writer.size
+        component.checksum = writer.sha.hexdigest()
+    component.duration = time.time() - start
+    LOG.info("Backup of %s took %.1fs (%d bytes)" %
+             (component.name, component.duration, component.size))
+    return component
+
+
+def _gzip_member(data):
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED,
+                                  16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _manifest_member(manifest):
+    data = json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8')
+    info = tarfile.TarInfo(MANIFEST_NAME)
+    info.size = len(data)
+    info.mtime = int(manifest['created_at'])
+    info.mode = 0o644
+    header = info.tobuf(tarfile.GNU_FORMAT)
+    padding = (tarfile.BLOCKSIZE -
+               len(data) % tarfile.BLOCKSIZE) % tarfile.BLOCKSIZE
+    return header + data + tarfile.NUL * padding
+
+
+def _end_member(tar_size):
+    # Two empty blocks, padded to a full record like tarfile does
+    tar_size += 2 * tarfile.BLOCKSIZE
+    padding = (tarfile.RECORDSIZE -
+               tar_size % tarfile.RECORDSIZE) % tarfile.RECORDSIZE
+    return tarfile.NUL * (2 * tarfile.BLOCKSIZE + padding)
+
+
+def _get_manifest(components, compression):
+    offset = 0
+    manifest = {'version': MANIFEST_VERSION,
+                'created_at': time.time(),
+                'compression': compression,
+                'components': []}
+    for component in components:
+        manifest['components'].append({'name': component.name,
+                                       'offset': offset,
+                                       'size': component.size,
+                                       'sha256': component.checksum,
+                                       'duration': component.duration,
+                                       'members': component.members,
+                                       'roots': component.roots})
+        offset += component.size
+    return manifest
+
+
+def _assemble(path, components):
+    manifest = _get_manifest(components, 'gzip')
+    header = _manifest_member(manifest)
+    tar_size = len(header) + sum(c.tar_size for c in components)
+    with open(path, 'wb') as archive:
+        archive.write(_gzip_member(header))
+        for component in components:
+            with open(component.path, 'rb') as f:
+                shutil.copyfileobj(f, archive, READ_SIZE)
+            # Release the staging space as the archive grows
+            os.remove(component.path)
+        archive.write(_gzip_member(_end_member(tar_size)))
+    return manifest
+
+
+def _store_backup(path, components, store):
+    manifest = _get_manifest(components, 'zlib')
+    for component, entry in zip(components, manifest['components']):
+        entry['chunks'] = component.chunks
+    end = _end_member(sum(c.tar_size for c in components))
+    return store.write_manifest(path, manifest, end)
+
+
+def create_archives(components, staging_dir, workers=None, callback=None,
+                    store=None):
+    """ Archive the components concurrently
+
+    The components are written to their archive in the order of the list.
+    callback is called with each component as it completes, along with the
+    number of completed components.  With a chunk store, the archives are
+    incremental backup manifests and their content is added to the store.
+    Returns the manifest of each archive, by archive path.
+    """
+    if store is None:
+        component_dir = os.path.join(staging_dir, 'components')
+        os.mkdir(component_dir, 0o700)
+        for component in components:
+            component.path = os.path.join(component_dir,
+                                          component.name + '.tgz')
+
+    pool = ThreadPool(workers or get_workers())
+    try:
+        results = pool.imap_unordered(
+            lambda component: _archive_component(component, store),
+            components)
+        for completed, component in enumerate(results, 1):
+            if callback:
+                callback(component, completed)
+        pool.close()
+    except Exception:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+    manifests = {}
+    paths = []
+    for component in components:
+        if component.archive not in paths:
+            paths.append(component.archive)
+    for path in paths:
+        archive_components = [c for c in components if c.archive == path]
+        try:
+            if store is None:
+                manifests[path] = _assemble(path, archive_components)
+            else:
+                manifests[path] = _store_backup(path, archive_components,
+                                                store)
+        except (IOError, OSError) as e:
+            LOG.error("Failed to create archive %s: %s" % (path, e))
+            raise BackupFail("Failed to create archive %s" % path)
+    return manifests
+
+
+def _read_first_member(f):
+    """ Decompress the first gzip member of a file
+
+    Returns the data of the member and its compressed size, or None if the
+    member does not start with the manifest.
+    """
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    data = b''
+    consumed = 0
+    checked = False
+    while True:
+        block = f.read(io.DEFAULT_BUFFER_SIZE)
+        if not block:
+            break
+        consumed += len(block)
+        data += decompressor.decompress(block)
+        if not checked and len(data) >= tarfile.BLOCKSIZE:
+            name = data[:100].split(tarfile.NUL, 1)[0]
+            if name != MANIFEST_NAME.encode('utf-8'):
+                return None
+            checked = True
+        if decompressor.unused_data:
+            consumed -= len(decompressor.unused_data)
+            return data, consumed
+    return None
+
+
+def read_manifest(path):
+    """ Read the manifest of a backup archive
+
+    Returns None for archives created without a manifest.
+    """
+    try:
+        with open(path, 'rb') as f:
+            member = _read_first_member(f)
+    except (IOError, zlib.error) as e:
+        LOG.info("Unable to read manifest of %s: %s" % (path, e))
+        return None
+    if member is None:
+        return None
+
+    data, consumed = member
+    size = int(data[124:136].strip(tarfile.NUL + b' ') or b'0', 8)
+    try:
+        manifest = json.loads(data[tarfile.BLOCKSIZE:
+                                   tarfile.BLOCKSIZE + size].decode('utf-8'))
+    except ValueError:
+        LOG.error("Invalid manifest in %s" % path)
+        return None
+    # Component offsets are relative to the end of the manifest member
+    manifest['data_offset'] = consumed
+    return manifest
+
+
+def verify_archive(path, manifest=None):
+    """ Verify the component checksums of a backup archive
+
+    Archives without a manifest are not verified.  Returns the manifest.
+    """
+    if manifest is None:
+        manifest = read_manifest(path)
+    if manifest is None:
+        return None
+
+    with open(path, 'rb') as f:
+        for component in manifest['components']:
+            f.seek(manifest['data_offset'] + component['offset'])
+            sha = hashlib.sha256()
+            remaining = component['size']
+            while remaining:
+                block = f.read(min(READ_SIZE, remaining))
+                if not block:
+                    break
+                sha.update(block)
+                remaining -= len(block)
+            if remaining or sha.hexdigest() != component['sha256']:
+                LOG.error("Checksum mismatch for %s in %s" %
+                          (component['name'], path))
+                raise RestoreFail("Backup file is corrupted (%s)" %
+                                  component['name'])
+    return manifest
+
+
+class GzipReader(object):
+    """ Seekable read only file over a gzip file
+
+    The file may hold several gzip members, as backup archives do.  A
+    backward seek resumes the decompression from the closest checkpoint
+    saved while reading.  A checkpoint records the file offset of the input
+    not yet consumed by the decompressor, rather than the input itself.
+    """
+
+    def __init__(self, path, spacing=CHECKPOINT_SPACING):
+        self.name = path
+        self.position = 0
+        self._file = open(path, 'rb')
+        self._spacing = spacing
+        # (uncompressed offset, file offset of the unconsumed input,
+        #  decompressor)
+        self._checkpoints = [(0, 0, zlib.decompressobj(16 + zlib.MAX_WBITS))]
+        self._offsets = [0]
+        self._restore(0)
+
+    def _restore(self, index):
+        offset, file_offset, decompressor = self._checkpoints[index]
+        self._file.seek(file_offset)
+        self._decompressor = decompressor.copy()
+        self._input = b''
+        self._buffer = b''
+        self._buffer_offset = offset
+        self._eof = False
+
+    def _decompress(self):
+        """ Decompress the next block, returns False at the end of file """
+        if self._eof:
+            return False
+        offset = self._buffer_offset + len(self._buffer)
+        if offset >= self._offsets[-1] + self._spacing:
+            # The unconsumed input is always the end of the last read
+            self._checkpoints.append(
+                (offset, self._file.tell() - len(self._input),
+                 self._decompressor.copy()))
+            self._offsets.append(offset)
+
+        if not self._input:
+            self._input = self._file.read(READ_SIZE)
+            if not self._input:
+                self._eof = True
+                return False
+        data = self._decompressor.decompress(self._input, READ_SIZE)
+        self._input = self._decompressor.unconsumed_tail
+        if self._decompressor.unused_data:
+            # Start of the next gzip member, or the zero padding of the file
+            self._input = self._decompressor.unused_data
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            if self._input.startswith(b'\0'):
+                self._eof = True
+        self._buffer_offset = offset
+        self._buffer = data
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            # The uncompressed size is only known once the file is read
+            while self._decompress():
+                pass
+            offset += self._buffer_offset + len(self._buffer)
+        self.position = max(0, offset)
+
+    def read(self, size=-1):
+        data = []
+        while size != 0:
+            if self.position < self._buffer_offset:
+                self._restore(bisect.bisect_right(self._offsets,
+                                                  self.position) - 1)
+            start = self.position - self._buffer_offset
+            if start >= len(self._buffer):
+                if not self._decompress():
+                    break
+                continue
+            if size < 0:
+                block = self._buffer[start:]
+            else:
+                block = self._buffer[start:start + size]
+                size -= len(block)
+            data.append(block)
+            self.position += len(block)
+        return b''.join(data)
+
+    def close(self):
+        self._file.close()
+        self._checkpoints = []
+
+
+class IndexedTarFile(tarfile.TarFile):
+    """ Tar file looking up its members in an index
+
+    The members are read in a single pass when the index is built and
+    the file object is closed along with the archive.
+    """
+
+    index = None
+
+    def build_index(self):
+        # Members added again by tar --update replace the previous ones
+        self.index = dict((member.name, member)
+                          for member in self.getmembers())
+
+    def getmember(self, name):
+        if self.index is None:
+            self.build_index()
+        member = self.index.get(name) or self.index.get(name.rstrip('/'))
+        if member is None:
+            raise KeyError("filename %r not found" % name)
+        return member
+
+    def close(self):
+        super(IndexedTarFile, self).close()
+        self.fileobj.close()
+
+
+def open_archive(path, fileobj=None):
+    """ Open a backup archive for a restore
+
+    fileobj is a seekable file object over the uncompressed tar stream,
+    by default the gzip file at path is read with a GzipReader.
+    """
+    start = time.time()
+    if fileobj is None:
+        with open(path, 'rb') as f:
+            if f.read(2) == b'\x1f\x8b':
+                fileobj = GzipReader(path)
+    archive = None
+    try:
+        if fileobj is None:
+            archive = IndexedTarFile.open(path)
+        else:
+            archive = IndexedTarFile.open(fileobj=fileobj, mode='r:')
+        archive.build_index()
+    except Exception as e:
+        if archive is not None:
+            archive.close()
+        elif fileobj is not None:
+            fileobj.close()
+        if isinstance(e, zlib.error):
+            raise tarfile.ReadError("invalid compressed data: %s" % e)
+        raise
+    LOG.info("Indexed %d members of %s in %.1fs" %
+             (len(archive.index), path, time.time() - start))
+    return archive
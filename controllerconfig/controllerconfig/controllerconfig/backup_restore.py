@@ -21,6 +21,7 @@ import tarfile
 import tempfile
 import textwrap
 import time
+import zlib
 
 from fm_api import constants as fm_constants
 from fm_api import fm_api
@@ -33,6 +34,9 @@ from controllerconfig.common.exceptions import RestoreFail
 from controllerconfig.common.exceptions import KeystoneFail
 from controllerconfig.common.exceptions import SysInvFail
 from controllerconfig import openstack
+from controllerconfig import backup_archive
+from controllerconfig import backup_store
+from controllerconfig import pgdump
 import tsconfig.tsconfig as tsconfig
 from controllerconfig import utils
 from controllerconfig import sysinv_api as sysinv
@@ -201,20 +205,10 @@ def filter_directory(archive, directory):
             yield tarinfo
 
 
-def backup_etc_size():
-    """ Backup etc size estimate """
-    try:
-        total_size = utils.directory_get_size('/etc')
-        return total_size
-    except OSError:
-        LOG.error("Failed to estimate backup etc size.")
-        raise BackupFail("Failed to estimate backup etc size")
-
-
-def backup_etc(archive):
+def backup_etc(archive, inventories=None):
     """ Backup etc """
     try:
-        archive.add('/etc', arcname='etc')
+        backup_archive.add_directory(archive, '/etc', 'etc', inventories)
 
     except tarfile.TarError:
         LOG.error("Failed to backup etc.")
@@ -271,22 +265,13 @@ def restore_ceph_external_config_files(archive, staging_dir):
         subprocess.call(cp_command, shell=True)
 
 
-def backup_config_size(config_permdir):
-    """ Backup configuration size estimate """
-    try:
-        return(utils.directory_get_size(config_permdir))
-
-    except OSError:
-        LOG.error("Failed to estimate backup configuration size.")
-        raise BackupFail("Failed to estimate backup configuration size")
-
-
-def backup_config(archive, config_permdir):
+def backup_config(archive, config_permdir, inventories=None):
     """ Backup configuration """
     try:
         # The config dir is versioned, but we're only grabbing the current
         # release
-        archive.add(config_permdir, arcname='config')
+        backup_archive.add_directory(archive, config_permdir, 'config',
+                                     inventories)
 
     except tarfile.TarError:
         LOG.error("Failed to backup config.")
@@ -427,22 +412,13 @@ def restore_dnsmasq(archive, config_permdir):
         raise RestoreFail("Failed to restore dnsmasq files")
 
 
-def backup_puppet_data_size(puppet_permdir):
-    """ Backup puppet data size estimate """
-    try:
-        return(utils.directory_get_size(puppet_permdir))
-
-    except OSError:
-        LOG.error("Failed to estimate backup puppet data size.")
-        raise BackupFail("Failed to estimate backup puppet data size")
-
-
-def backup_puppet_data(archive, puppet_permdir):
+def backup_puppet_data(archive, puppet_permdir, inventories=None):
     """ Backup puppet data """
     try:
         # The puppet dir is versioned, but we're only grabbing the current
         # release
-        archive.add(puppet_permdir, arcname='hieradata')
+        backup_archive.add_directory(archive, puppet_permdir, 'hieradata',
+                                     inventories)
 
     except tarfile.TarError:
         LOG.error("Failed to backup puppet data.")
@@ -539,20 +515,11 @@ def backup_cinder_size(cinder_permdir):
         raise BackupFail("Failed to estimate backup cinder size")
 
 
-def backup_keyring_size(keyring_permdir):
-    """ Backup keyring size estimate """
-    try:
-        return(utils.directory_get_size(keyring_permdir))
-
-    except OSError:
-        LOG.error("Failed to estimate backup keyring size.")
-        raise BackupFail("Failed to estimate backup keyring size")
-
-
-def backup_keyring(archive, keyring_permdir):
+def backup_keyring(archive, keyring_permdir, inventories=None):
     """ Backup keyring configuration """
     try:
-        archive.add(keyring_permdir, arcname='.keyring')
+        backup_archive.add_directory(archive, keyring_permdir, '.keyring',
+                                     inventories)
 
     except tarfile.TarError:
         LOG.error("Failed to backup keyring.")
@@ -681,46 +648,21 @@ def restore_ldap(archive, ldap_permdir, staging_dir):
 def backup_postgres_size(cinder_config=False):
     """ Backup postgres size estimate """
     try:
-        total_size = 0
-
-        # Backup roles, table spaces and schemas for databases.
-        proc = subprocess.Popen([('sudo -u postgres pg_dumpall --clean ' +
-                                  '--schema-only | wc -c')], shell=True,
-                                stdout=subprocess.PIPE, stderr=DEVNULL)
-
-        for line in proc.stdout:
-            total_size = int(line)
-            break
-
-        proc.communicate()
-
         # get backup database
-        backup_databases, backup_db_skip_tables = get_backup_databases(
-            cinder_config)
-
-        # Backup data for databases.
-        for _, db_elem in enumerate(backup_databases):
-
-            db_cmd = 'sudo -u postgres pg_dump --format=plain --inserts '
-            db_cmd += '--disable-triggers --data-only %s ' % db_elem
-
-            for _, table_elem in enumerate(backup_db_skip_tables[db_elem]):
-                db_cmd += '--exclude-table=%s ' % table_elem
-
-            db_cmd += '| wc -c'
+        backup_databases, _ = get_backup_databases(cinder_config)
 
-            proc = subprocess.Popen([db_cmd], shell=True,
-                                    stdout=subprocess.PIPE, stderr=DEVNULL)
+        # The size of the databases on disk, indexes included, bounds the
+        # size of their data dump.
+        query = ("SELECT sum(pg_database_size(datname)) FROM pg_database "
+                 "WHERE datname IN (%s)" %
+                 ', '.join("'%s'" % db_elem for db_elem in backup_databases))
+        output = subprocess.check_output(
+            ['sudo', '-u', 'postgres', 'psql', '-t', '-A', '-c', query,
+             'postgres'], stderr=DEVNULL)
 
-            for line in proc.stdout:
-                total_size += int(line)
-                break
+        return int(output.strip() or 0)
 
-            proc.communicate()
-
-        return total_size
-
-    except subprocess.CalledProcessError:
+    except (subprocess.CalledProcessError, ValueError):
         LOG.error("Failed to estimate backup database size.")
         raise BackupFail("Failed to estimate backup database size")
 
@@ -730,30 +672,16 @@ def backup_postgres(archive, staging_dir, cinder_config=False):
     try:
         postgres_staging_dir = staging_dir + '/postgres'
         os.mkdir(postgres_staging_dir, 0o655)
-
-        # Backup roles, table spaces and schemas for databases.
-        subprocess.check_call([('sudo -u postgres pg_dumpall --clean ' +
-                                '--schema-only' +
-                                '> %s/%s' % (postgres_staging_dir,
-                                             'postgres.sql.config'))],
-                              shell=True, stderr=DEVNULL)
+        # Permission change required for pg_dump to write the data
+        subprocess.call(['chmod', 'a+rx', staging_dir], stdout=DEVNULL)
 
         # get backup database
         backup_databases, backup_db_skip_tables = get_backup_databases(
             cinder_config)
 
-        # Backup data for databases.
-        for _, db_elem in enumerate(backup_databases):
-
-            db_cmd = 'sudo -u postgres pg_dump --format=plain --inserts '
-            db_cmd += '--disable-triggers --data-only %s ' % db_elem
-
-            for _, table_elem in enumerate(backup_db_skip_tables[db_elem]):
-                db_cmd += '--exclude-table=%s ' % table_elem
-
-            db_cmd += '> %s/%s.sql.data' % (postgres_staging_dir, db_elem)
-
-            subprocess.check_call([db_cmd], shell=True, stderr=DEVNULL)
+        # Backup schemas and data for databases.
+        pgdump.dump_databases(postgres_staging_dir, backup_databases,
+                              backup_db_skip_tables)
 
         archive.add(postgres_staging_dir, arcname='postgres')
 
@@ -771,18 +699,9 @@ def restore_postgres(archive, staging_dir):
 
         utils.start_service("postgresql")
 
-        # Restore roles, table spaces and schemas for databases.
-        subprocess.check_call(["sudo", "-u", "postgres", "psql", "-f",
-                               postgres_staging_dir +
-                               '/postgres.sql.config', "postgres"],
-                              stdout=DEVNULL, stderr=DEVNULL)
-
-        # Restore data for databases.
-        for data in glob.glob(postgres_staging_dir + '/*.sql.data'):
-            db_elem = data.split('/')[-1].split('.')[0]
-            subprocess.check_call(["sudo", "-u", "postgres", "psql", "-f",
-                                   data, db_elem],
-                                  stdout=DEVNULL)
+        # Restore schemas and data for databases, from the pg_dump
+        # directories or the plain SQL files of older backups.
+        pgdump.restore_databases(postgres_staging_dir)
 
     except (OSError, subprocess.CalledProcessError, tarfile.TarError) as e:
         LOG.error("Failed to restore postgres databases. Error: %s", e)
@@ -852,20 +771,11 @@ def restore_config_dir(archive, staging_dir, config_dir, dest_dir):
         LOG.info("No custom %s config was found during restore." % config_dir)
 
 
-def backup_std_dir_size(directory):
-    """ Backup standard directory size estimate """
-    try:
-        return utils.directory_get_size(directory)
-
-    except OSError:
-        LOG.error("Failed to estimate backup size for %s" % directory)
-        raise BackupFail("Failed to estimate backup size for %s" % directory)
-
-
-def backup_std_dir(archive, directory):
+def backup_std_dir(archive, directory, inventories=None):
     """ Backup standard directory """
     try:
-        archive.add(directory, arcname=os.path.basename(directory))
+        backup_archive.add_directory(archive, directory,
+                                     os.path.basename(directory), inventories)
 
     except tarfile.TarError:
         LOG.error("Failed to backup %s" % directory)
@@ -940,43 +850,68 @@ def restore_ceph_crush_map(archive):
         raise RestoreFail('Failed to restore crush map file')
 
 
-def check_size(archive_dir, cinder_config):
-    """Check if there is enough space to create backup."""
-    backup_overhead_bytes = 1024 ** 3  # extra GB for staging directory
+def scan_backup_dirs(extra_dirs=()):
+    """ Scan the directories archived by a backup, in parallel """
+    directories = ['/etc',
+                   tsconfig.CONFIG_PATH,
+                   constants.HIERADATA_PERMDIR,
+                   keyring_permdir,
+                   glance_permdir,
+                   home_permdir,
+                   patching_permdir,
+                   patching_repo_permdir,
+                   extension_permdir,
+                   patch_vault_permdir]
+    try:
+        return backup_archive.scan_directories(directories + list(extra_dirs))
+
+    except OSError as e:
+        LOG.error("Failed to scan backup directories: %s" % e)
+        raise BackupFail("Failed to estimate backup size")
 
+
+def backup_size(cinder_config, inventories):
+    """ Backup size estimate, from the inventories of the directories """
     # backup_cinder_size() will return 0 if cinder/lvm is not configured,
     # So no need to add extra check here.
-    backup_size = (backup_overhead_bytes +
-                   backup_etc_size() +
-                   backup_config_size(tsconfig.CONFIG_PATH) +
-                   backup_puppet_data_size(constants.HIERADATA_PERMDIR) +
-                   backup_keyring_size(keyring_permdir) +
-                   backup_ldap_size() +
-                   backup_postgres_size(cinder_config) +
-                   backup_ceilometer_size(ceilometer_permdir) +
-                   backup_std_dir_size(glance_permdir) +
-                   backup_std_dir_size(home_permdir) +
-                   backup_std_dir_size(patching_permdir) +
-                   backup_std_dir_size(patching_repo_permdir) +
-                   backup_std_dir_size(extension_permdir) +
-                   backup_std_dir_size(patch_vault_permdir) +
-                   backup_cinder_size(cinder_permdir)
-                   )
+    return (sum(inventory.size for inventory in inventories.values()) +
+            backup_ldap_size() +
+            backup_postgres_size(cinder_config) +
+            backup_ceilometer_size(ceilometer_permdir) +
+            backup_cinder_size(cinder_permdir))
+
+
+def check_size(archive_dir, cinder_config):
+    """Check if there is enough space to create backup.
+
+    Returns the inventories of the backup directories.
+    """
+    backup_overhead_bytes = 1024 ** 3  # extra GB for staging directory
+
+    inventories = scan_backup_dirs()
+    backup_size_bytes = (backup_overhead_bytes +
+                         backup_size(cinder_config, inventories))
 
     archive_dir_free_space = \
         utils.filesystem_get_free_space(archive_dir)
 
-    if backup_size > archive_dir_free_space:
+    if backup_size_bytes > archive_dir_free_space:
         print("Archive directory (%s) does not have enough free "
               "space (%s), estimated backup size is %s." %
               (archive_dir, utils.print_bytes(archive_dir_free_space),
-               utils.print_bytes(backup_size)))
+               utils.print_bytes(backup_size_bytes)))
 
         raise BackupFail("Not enough free space for backup.")
 
+    return inventories
+
 
-def backup(backup_name, archive_dir, clone=False):
-    """Backup configuration."""
+def backup(backup_name, archive_dir, clone=False, incremental=False):
+    """Backup configuration.
+
+    An incremental backup only stores the content which is not already in
+    the chunk store of the archive directory.
+    """
 
     if not os.path.isdir(archive_dir):
         raise BackupFail("Archive directory (%s) not found." % archive_dir)
@@ -1023,119 +958,97 @@ def backup(backup_name, archive_dir, clone=False):
     try:
         os.chdir('/')
 
+        # The directories scanned to check the size are archived from their
+        # inventory
+        inventories = None
         if not clone:
-            check_size(archive_dir, cinder_config)
+            inventories = check_size(archive_dir, cinder_config)
 
         print ("\nPerforming backup (this might take several minutes):")
         staging_dir = tempfile.mkdtemp(dir=archive_dir)
 
+        store = None
+        suffix = '.tgz'
+        if incremental:
+            store = backup_store.ChunkStore(
+                backup_store.get_store_dir(archive_dir), create=True)
+            suffix = backup_store.MANIFEST_SUFFIX
+
         system_tar_path = os.path.join(archive_dir,
-                                       backup_name + '_system.tgz')
-        system_archive = tarfile.open(system_tar_path, "w:gz")
+                                       backup_name + '_system' + suffix)
         images_tar_path = os.path.join(archive_dir,
-                                       backup_name + '_images.tgz')
-
-        step = 1
-        total_steps = 15
-
-        if sysinv_constants.SB_TYPE_CEPH in backend_services.keys():
-            total_steps += 1
-
-        if tsconfig.region_config == "yes":
-            # We don't run the glance backup step
-            total_steps -= 1
-
-        # Step 1: Backup etc
-        backup_etc(system_archive)
-        utils.progress(total_steps, step, 'backup etc', 'DONE')
-        step += 1
-
-        # Step 2: Backup configuration
-        backup_config(system_archive, tsconfig.CONFIG_PATH)
-        utils.progress(total_steps, step, 'backup configuration', 'DONE')
-        step += 1
-
-        # Step 3: Backup puppet data
-        backup_puppet_data(system_archive, constants.HIERADATA_PERMDIR)
-        utils.progress(total_steps, step, 'backup puppet data', 'DONE')
-        step += 1
-
-        # Step 4: Backup keyring
-        backup_keyring(system_archive, keyring_permdir)
-        utils.progress(total_steps, step, 'backup keyring', 'DONE')
-        step += 1
-
-        # Step 5: Backup ldap
-        backup_ldap(system_archive, staging_dir)
-        utils.progress(total_steps, step, 'backup ldap', 'DONE')
-        step += 1
-
-        # Step 6: Backup postgres
-        backup_postgres(system_archive, staging_dir, cinder_config)
-        utils.progress(total_steps, step, 'backup postgres', 'DONE')
-        step += 1
-
-        # Step 7: Backup ceilometer
-        backup_ceilometer(system_archive, ceilometer_permdir)
-        utils.progress(total_steps, step, 'backup ceilometer', 'DONE')
-        step += 1
+                                       backup_name + '_images' + suffix)
+
+        # The steps are independent, they are archived concurrently and
+        # written to the archive in this order.
+        component = backup_archive.Component
+        components = [
+            component('etc', 'backup etc', system_tar_path, backup_etc,
+                      inventories),
+            component('config', 'backup configuration', system_tar_path,
+                      backup_config, tsconfig.CONFIG_PATH, inventories),
+            component('hieradata', 'backup puppet data', system_tar_path,
+                      backup_puppet_data, constants.HIERADATA_PERMDIR,
+                      inventories),
+            component('keyring', 'backup keyring', system_tar_path,
+                      backup_keyring, keyring_permdir, inventories),
+            component('ldap', 'backup ldap', system_tar_path,
+                      backup_ldap, staging_dir),
+            component('postgres', 'backup postgres', system_tar_path,
+                      backup_postgres, staging_dir, cinder_config),
+            component('ceilometer', 'backup ceilometer', system_tar_path,
+                      backup_ceilometer, ceilometer_permdir)]
 
         if tsconfig.region_config != "yes":
-            # Step 8: Backup glance
-            images_archive = tarfile.open(images_tar_path, "w:gz")
-            backup_std_dir(images_archive, glance_permdir)
-            images_archive.close()
-            utils.progress(total_steps, step, 'backup glance', 'DONE')
-            step += 1
+            components.append(
+                component('glance', 'backup glance', images_tar_path,
+                          backup_std_dir, glance_permdir, inventories))
 
-        # Step 9: Backup home
-        backup_std_dir(system_archive, home_permdir)
-        utils.progress(total_steps, step, 'backup home directory', 'DONE')
-        step += 1
-
-        # Step 10: Backup patching
-        if not clone:
-            backup_std_dir(system_archive, patching_permdir)
-            utils.progress(total_steps, step, 'backup patching', 'DONE')
-        step += 1
+        components.append(
+            component('home', 'backup home directory', system_tar_path,
+                      backup_std_dir, home_permdir, inventories))
 
-        # Step 11: Backup patching repo
         if not clone:
-            backup_std_dir(system_archive, patching_repo_permdir)
-            utils.progress(total_steps, step, 'backup patching repo', 'DONE')
-        step += 1
-
-        # Step 12: Backup extension filesystem
-        backup_std_dir(system_archive, extension_permdir)
-        utils.progress(total_steps, step, 'backup extension filesystem '
-                                          'directory', 'DONE')
-        step += 1
+            components.extend([
+                component('patching', 'backup patching', system_tar_path,
+                          backup_std_dir, patching_permdir, inventories),
+                component('patching-repo', 'backup patching repo',
+                          system_tar_path, backup_std_dir,
+                          patching_repo_permdir, inventories)])
+
+        components.append(
+            component('extension', 'backup extension filesystem directory',
+                      system_tar_path, backup_std_dir, extension_permdir,
+                      inventories))
 
-        # Step 13: Backup patch-vault filesystem
         if os.path.exists(patch_vault_permdir):
-            backup_std_dir(system_archive, patch_vault_permdir)
-            utils.progress(total_steps, step, 'backup patch-vault filesystem '
-                                              'directory', 'DONE')
-        step += 1
+            components.append(
+                component('patch-vault',
+                          'backup patch-vault filesystem directory',
+                          system_tar_path, backup_std_dir,
+                          patch_vault_permdir, inventories))
 
-        # Step 14: Backup cinder config/LVM config
         # No need to add extra check here as if cinder/LVM is not configured,
         # ../iscsi-target/saveconfig.json will be absent, so this function will
         # do nothing.
-        backup_cinder_config(system_archive)
-        utils.progress(total_steps, step, 'backup cinder/LVM config', 'DONE')
-        step += 1
+        components.append(
+            component('cinder', 'backup cinder/LVM config', system_tar_path,
+                      backup_cinder_config))
 
-        # Step 15: Backup ceph crush map
         if sysinv_constants.SB_TYPE_CEPH in backend_services.keys():
-            backup_ceph_crush_map(system_archive, staging_dir)
-            utils.progress(total_steps, step, 'backup ceph crush map', 'DONE')
-            step += 1
+            components.append(
+                component('ceph', 'backup ceph crush map', system_tar_path,
+                          backup_ceph_crush_map, staging_dir))
 
-        # Step 16: Create archive
-        system_archive.close()
-        utils.progress(total_steps, step, 'create archive', 'DONE')
-        step += 1
+        # One more step to create the archives
+        total_steps = len(components) + 1
+
+        def step_done(component, step):
+            utils.progress(total_steps, step, component.description, 'DONE')
+
+        backup_archive.create_archives(components, staging_dir,
+                                       callback=step_done, store=store)
+        utils.progress(total_steps, total_steps, 'create archive', 'DONE')
 
     except Exception:
         if system_tar_path and os.path.isfile(system_tar_path):
@@ -1165,6 +1078,40 @@ def backup(backup_name, archive_dir, clone=False):
         print(textwrap.fill(warnings, 80))
 
 
+def open_backup_file(backup_file):
+    """ Open and verify a backup archive or incremental backup """
+    try:
+        if backup_store.is_backup_manifest(backup_file):
+            backup_store.verify_backup(backup_file)
+            return backup_store.open_backup(backup_file)
+        archive = backup_archive.open_archive(backup_file)
+    except tarfile.TarError as e:
+        LOG.exception(e)
+        raise RestoreFail("Error opening backup file. Invalid backup "
+                          "file.")
+    backup_archive.verify_archive(backup_file)
+    return archive
+
+
+def verify_backup(backup_file):
+    """ Verify the checksums of a backup file """
+    if not os.path.isfile(backup_file):
+        raise RestoreFail("Backup file (%s) not found." % backup_file)
+
+    if backup_store.is_backup_manifest(backup_file):
+        backup_store.verify_backup(backup_file)
+    elif backup_archive.verify_archive(backup_file) is None:
+        print("Backup file %s has no manifest, only its format is "
+              "verified" % backup_file)
+        try:
+            with tarfile.open(backup_file) as archive:
+                for _ in archive:
+                    pass
+        except (tarfile.TarError, IOError, EOFError, zlib.error) as e:
+            LOG.exception(e)
+            raise RestoreFail("Invalid backup file.")
+
+
 def create_restore_runtime_config(filename):
     """ Create any runtime parameters needed for Restore."""
     config = {}
@@ -1302,12 +1249,7 @@ def restore_system(backup_file, include_storage_reinstall=False, clone=False):
         total_steps = 24
 
         # Step 1: Open archive and verify installed load matches backup
-        try:
-            archive = tarfile.open(backup_file)
-        except tarfile.TarError as e:
-            LOG.exception(e)
-            raise RestoreFail("Error opening backup file. Invalid backup "
-                              "file.")
+        archive = open_backup_file(backup_file)
         check_load_versions(archive, staging_dir)
         check_load_subfunctions(archive, staging_dir)
         utils.progress(total_steps, step, 'open archive', 'DONE', newline)
@@ -1734,12 +1676,7 @@ def restore_images(backup_file, clone=False):
         total_steps = 2
 
         # Step 1: Open archive
-        try:
-            archive = tarfile.open(backup_file)
-        except tarfile.TarError as e:
-            LOG.exception(e)
-            raise RestoreFail("Error opening backup file. Invalid backup "
-                              "file.")
+        archive = open_backup_file(backup_file)
         utils.progress(total_steps, step, 'open archive', 'DONE', newline)
         step += 1
 
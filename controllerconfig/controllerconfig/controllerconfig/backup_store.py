@@ -0,0 +1,310 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""
+Incremental backup chunk store
+
+An incremental backup stores the tar stream of each component as content
+defined chunks in a chunk store shared by all the incremental backups of
+the archive directory.  Chunks are named by their sha256 and only the
+chunks not already in the store are written, so the content which did not
+change since a previous backup (patches, images, home directories) is
+stored once.  Each backup is described by a small manifest listing its
+chunks, from which the archive is read back for a restore.
+
+Chunk boundaries are placed after a newline byte whose preceding bytes
+hash to a given value, between a minimum and a maximum chunk size.  Since
+the boundaries depend on the content only, an insertion or removal in the
+stream only changes the chunks around it.
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+
+from controllerconfig.common import log
+from controllerconfig.common.exceptions import RestoreFail
+from controllerconfig import backup_archive
+
+LOG = log.get_logger(__name__)
+
+STORE_DIR = 'store'
+INDEX_FILE = 'index'
+MANIFEST_SUFFIX = '.manifest'
+MANIFEST_VERSION = 1
+
+MIN_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+# On average one newline in 4096 is a boundary, chunks are about 1MB
+BOUNDARY_MASK = 0xfff
+BOUNDARY_WINDOW = 32
+
+COMPRESS_LEVEL = 6
+
+
+def get_store_dir(archive_dir):
+    """ Chunk store of the incremental backups of an archive directory """
+    return os.path.join(archive_dir, STORE_DIR)
+
+
+def is_backup_manifest(path):
+    """ Whether a backup file is the manifest of an incremental backup """
+    return path.endswith(MANIFEST_SUFFIX)
+
+
+def find_boundary(data, start=0):
+    """ Returns the end of the chunk of data beginning at start
+
+    Returns None if data is too short for the boundary to be known.
+    """
+    limit = min(len(data), start + MAX_CHUNK_SIZE)
+    pos = start + MIN_CHUNK_SIZE
+    while pos < limit:
+        pos = data.find(b'\n', pos, limit)
+        if pos < 0:
+            break
+        pos += 1
+        window = data[pos - BOUNDARY_WINDOW:pos]
+        if zlib.crc32(window) & BOUNDARY_MASK == 0:
+            return pos
+    if len(data) - start >= MAX_CHUNK_SIZE:
+        return start + MAX_CHUNK_SIZE
+    return None
+
+
+class ChunkStore(object):
+    """ Content addressed store of compressed chunks
+
+    The index lists the chunks of the store along with their size, it is
+    loaded once rather than checking for each chunk file.
+    """
+
+    def __init__(self, path, create=False):
+        self.path = path
+        self.chunks = {}
+        self._lock = threading.Lock()
+        if create and not os.path.isdir(path):
+            os.makedirs(path, 0o700)
+        index = os.path.join(path, INDEX_FILE)
+        if os.path.exists(index):
+            with open(index) as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) == 2:
+                        self.chunks[fields[0]] = int(fields[1])
+
+    def get_chunk_path(self, digest):
+        return os.path.join(self.path, digest[:2], digest)
+
+    def put(self, data):
+        """ Store a chunk, returns its digest """
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if digest in self.chunks:
+                return digest
+
+        path = self.get_chunk_path(digest)
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            try:
+                os.mkdir(directory, 0o700)
+            except OSError:
+                # Created by another component
+                if not os.path.isdir(directory):
+                    raise
+        tmp_path = '%s.%d.tmp' % (path, threading.current_thread().ident)
+        with open(tmp_path, 'wb') as f:
+            f.write(zlib.compress(data, COMPRESS_LEVEL))
+        os.rename(tmp_path, path)
+
+        with self._lock:
+            if digest not in self.chunks:
+                self.chunks[digest] = len(data)
+                with open(os.path.join(self.path, INDEX_FILE), 'a') as f:
+                    f.write('%s %d\n' % (digest, len(data)))
+        return digest
+
+    def get(self, digest):
+        """ Read a chunk, verifying its content """
+        try:
+            with open(self.get_chunk_path(digest), 'rb') as f:
+                data = zlib.decompress(f.read())
+        except (IOError, zlib.error) as e:
+            LOG.error("Failed to read chunk %s: %s" % (digest, e))
+            raise RestoreFail("Backup chunk %s is missing or corrupted" %
+                              digest)
+        if hashlib.sha256(data).hexdigest() != digest:
+            LOG.error("Checksum mismatch for chunk %s" % digest)
+            raise RestoreFail("Backup chunk %s is corrupted" % digest)
+        return data
+
+    def writer(self):
+        return ChunkWriter(self)
+
+    def write_manifest(self, path, manifest, end):
+        """ Write the manifest of an incremental backup
+
+        end is the end of archive marker of the tar stream.
+        """
+        writer = self.writer()
+        writer.write(end)
+        manifest = dict(manifest,
+                        store=os.path.relpath(self.path,
+                                              os.path.dirname(path)),
+                        end=writer.close())
+        with open(path + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.rename(path + '.tmp', path)
+        return manifest
+
+
+class ChunkWriter(object):
+    """ Write only file splitting its content into chunks of a store """
+
+    def __init__(self, store):
+        self.store = store
+        self.chunks = []
+        self.size = 0
+        self.sha = hashlib.sha256()
+        self._pending = []
+        self._pending_size = 0
+
+    def tell(self):
+        return self.size
+
+    def write(self, data):
+        self.size += len(data)
+        self.sha.update(data)
+        self._pending.append(data)
+        self._pending_size += len(data)
+        # The boundary of a chunk is known once the maximum size is reached
+        if self._pending_size >= 2 * MAX_CHUNK_SIZE:
+            self._flush(final=False)
+
+    def _flush(self, final):
+        data = b''.join(self._pending)
+        start = 0
+        while start < len(data):
+            end = find_boundary(data, start)
+            if end is None:
+                if not final:
+                    break
+                end = len(data)
+            self.chunks.append([self.store.put(data[start:end]),
+                                end - start])
+            start = end
+        data = data[start:]
+        self._pending = [data] if data else []
+        self._pending_size = len(data)
+
+    def close(self):
+        """ Store the remaining data, returns the list of chunks """
+        self._flush(final=True)
+        return self.chunks
+
+
+class ChunkReader(object):
+    """ Read only file over a list of chunks of a store """
+
+    def __init__(self, store, chunks):
+        self.store = store
+        self.digests = [digest for digest, _ in chunks]
+        self.offsets = []
+        self.size = 0
+        for _, size in chunks:
+            self.offsets.append(self.size)
+            self.size += size
+        self.position = 0
+        self._index = None
+        self._data = None
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += self.size
+        self.position = max(0, offset)
+
+    def read(self, size=-1):
+        if size < 0:
+            size = self.size - self.position
+        data = []
+        while size > 0 and self.position < self.size:
+            index = bisect.bisect_right(self.offsets, self.position) - 1
+            if index != self._index:
+                self._data = self.store.get(self.digests[index])
+                self._index = index
+            start = self.position - self.offsets[index]
+            block = self._data[start:start + size]
+            data.append(block)
+            self.position += len(block)
+            size -= len(block)
+        return b''.join(data)
+
+    def close(self):
+        self._data = None
+
+
+def read_manifest(path):
+    """ Read the manifest of an incremental backup """
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (IOError, ValueError) as e:
+        LOG.error("Failed to read backup manifest %s: %s" % (path, e))
+        raise RestoreFail("Invalid backup manifest %s" % path)
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise RestoreFail("Unsupported backup manifest version %s" %
+                          manifest.get('version'))
+    return manifest
+
+
+def _get_store(path, manifest):
+    return ChunkStore(os.path.join(os.path.dirname(os.path.abspath(path)),
+                                   manifest['store']))
+
+
+def _get_chunks(manifest):
+    chunks = []
+    for component in manifest['components']:
+        chunks.extend(component['chunks'])
+    return chunks + manifest['end']
+
+
+def open_backup(path):
+    """ Open the tar stream of an incremental backup """
+    manifest = read_manifest(path)
+    reader = ChunkReader(_get_store(path, manifest), _get_chunks(manifest))
+    return backup_archive.open_archive(path, fileobj=reader)
+
+
+def verify_backup(path):
+    """ Verify the chunks and the component checksums of a backup """
+    start = time.time()
+    manifest = read_manifest(path)
+    store = _get_store(path, manifest)
+    for component in manifest['components']:
+        sha = hashlib.sha256()
+        for digest, size in component['chunks']:
+            data = store.get(digest)
+            if len(data) != size:
+                raise RestoreFail("Backup chunk %s is corrupted" % digest)
+            sha.update(data)
+        if sha.hexdigest() != component['sha256']:
+            LOG.error("Checksum mismatch for %s in %s" %
+                      (component['name'], path))
+            raise RestoreFail("Backup is corrupted (%s)" % component['name'])
+    for digest, _ in manifest['end']:
+        store.get(digest)
+    LOG.info("Verified backup %s in %.1fs" % (path, time.time() - start))
+    return manifest
@@ -15,12 +15,11 @@ import re
 import glob
 import time
 import shutil
+import stat
 import netaddr
 import tempfile
-import fileinput
 import subprocess
 
-from controllerconfig.common import constants
 from sysinv.common import constants as si_const
 from controllerconfig import sysinv_api
 import tsconfig.tsconfig as tsconfig
@@ -28,6 +27,7 @@ from controllerconfig.common import log
 from controllerconfig.common.exceptions import CloneFail
 from controllerconfig.common.exceptions import BackupFail
 from controllerconfig import utils
+from controllerconfig import backup_archive
 from controllerconfig import backup_restore
 
 DEBUG = False
@@ -41,6 +41,9 @@ RESULT = "result"
 IN_PROGRESS = "in-progress"
 FAIL = "failed"
 OK = "ok"
+# Files with a NUL byte in their first block are not text
+BINARY_CHECK_SIZE = 8192
+REPLACE_BLOCK_SIZE = 1024 * 1024
 
 
 def clone_status():
@@ -85,7 +88,6 @@ def check_size(archive_dir):
     # workspace (updating system archive etc) needed to create the iso.
     feed_dir = os.path.join('/www', 'pages', 'feed',
                             'rel-' + tsconfig.SW_VERSION)
-    overhead_bytes += backup_restore.backup_std_dir_size(feed_dir)
 
     cinder_config = False
     backend_services = sysinv_api.get_storage_backend_services()
@@ -94,25 +96,10 @@ def check_size(archive_dir):
             cinder_config = True
             break
 
-    clone_size = (
-        overhead_bytes +
-        backup_restore.backup_etc_size() +
-        backup_restore.backup_config_size(tsconfig.CONFIG_PATH) +
-        backup_restore.backup_puppet_data_size(constants.HIERADATA_PERMDIR) +
-        backup_restore.backup_keyring_size(backup_restore.keyring_permdir) +
-        backup_restore.backup_ldap_size() +
-        backup_restore.backup_postgres_size(cinder_config) +
-        backup_restore.backup_ceilometer_size(
-            backup_restore.ceilometer_permdir) +
-        backup_restore.backup_std_dir_size(backup_restore.glance_permdir) +
-        backup_restore.backup_std_dir_size(backup_restore.home_permdir) +
-        backup_restore.backup_std_dir_size(backup_restore.patching_permdir) +
-        backup_restore.backup_std_dir_size(
-            backup_restore.patching_repo_permdir) +
-        backup_restore.backup_std_dir_size(backup_restore.extension_permdir) +
-        backup_restore.backup_std_dir_size(
-            backup_restore.patch_vault_permdir) +
-        backup_restore.backup_cinder_size(backup_restore.cinder_permdir))
+    # The feed directory is scanned along with the backup directories
+    inventories = backup_restore.scan_backup_dirs([feed_dir])
+    clone_size = (overhead_bytes +
+                  backup_restore.backup_size(cinder_config, inventories))
 
     archive_dir_free_space = \
         utils.filesystem_get_free_space(archive_dir)
@@ -467,53 +454,118 @@ def create_iso(iso_name, archive_dir):
             shutil.rmtree(tmpdir, ignore_errors=True)
 
 
-def find_and_replace_in_file(target, find, replace):
-    """ Find and replace a string in a file. """
-    found = None
-    try:
-        for line in fileinput.FileInput(target, inplace=1):
-            if find in line:
-                # look for "find" string within word boundaries
-                fpat = r'\b' + find + r'\b'
-                line = re.sub(fpat, replace, line)
-                found = True
-            print(line, end='')
-
-    except Exception as e:
-        LOG.error("Failed to replace [{}] with [{}] in [{}]: {}"
-                  .format(find, replace, target, str(e)))
-        found = None
-    finally:
-        fileinput.close()
-    return found
+def _to_bytes(value):
+    if isinstance(value, bytes):
+        return value
+    return value.encode('utf-8')
 
 
-def find_and_replace(target_list, find, replace):
-    """ Find and replace a string in all files in a directory. """
-    found = False
-    file_list = []
+def _walk_files(target_list):
+    """ Regular files of a list of files and directories """
     for target in target_list:
         if os.path.isfile(target):
-            if find_and_replace_in_file(target, find, replace):
-                found = True
-                file_list.append(target)
+            yield target
         elif os.path.isdir(target):
-            try:
-                output = subprocess.check_output(
-                    ['grep', '-rl', find, target])
-                if output:
-                    for line in output.split('\n'):
-                        if line and find_and_replace_in_file(
-                           line, find, replace):
-                            found = True
-                            file_list.append(line)
-            except Exception:
-                pass  # nothing found in that directory
-    if not found:
-        LOG.error("[{}] not found in backup".format(find))
-    else:
-        LOG.info("Replaced [{}] with [{}] in {}".format(
-                 find, replace, file_list))
+            for root, _, files in os.walk(target):
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    if os.path.isfile(path) and not os.path.islink(path):
+                        yield path
+
+
+def _replace_in_file(path, pattern, replace):
+    """ Replace the matches of pattern in a file
+
+    The file is only rewritten if something matched, through a temporary
+    file renamed over it.  Returns whether the file was modified.
+    """
+    with open(path, 'rb') as f:
+        # Binary files, such as the table of contents of a database dump,
+        # are left as is.
+        if b'\0' in f.read(BINARY_CHECK_SIZE):
+            return False
+        f.seek(0)
+        tmp = None
+        unchanged = 0
+        try:
+            while True:
+                # The strings replaced never span lines
+                block = f.read(REPLACE_BLOCK_SIZE) + f.readline()
+                if not block:
+                    break
+                block, count = pattern.subn(replace, block)
+                if tmp is None:
+                    if not count:
+                        unchanged += len(block)
+                        continue
+                    tmp = tempfile.NamedTemporaryFile(
+                        dir=os.path.dirname(path),
+                        prefix='.' + os.path.basename(path), delete=False)
+                    with open(path, 'rb') as head:
+                        while unchanged:
+                            data = head.read(min(unchanged,
+                                                 REPLACE_BLOCK_SIZE))
+                            tmp.write(data)
+                            unchanged -= len(data)
+                tmp.write(block)
+        except Exception:
+            if tmp:
+                tmp.close()
+                os.remove(tmp.name)
+            raise
+
+    if tmp is None:
+        return False
+    tmp.close()
+    st = os.stat(path)
+    os.chmod(tmp.name, stat.S_IMODE(st.st_mode))
+    os.chown(tmp.name, st.st_uid, st.st_gid)
+    os.rename(tmp.name, path)
+    return True
+
+
+def find_and_replace(target_list, replacements):
+    """ Find and replace strings in all files of a list of files and
+        directories.
+
+    replacements is a list of (find, replace) pairs, the strings are looked
+    for within word boundaries.  All the strings are matched with a single
+    regular expression, so each file is read once whatever the number of
+    strings.  Returns the number of replacements of each string.
+    """
+    strings = {}
+    for find, repl in replacements:
+        # The first replacement of a string applies, as when the strings
+        # were replaced one after the other.
+        strings.setdefault(_to_bytes(find), (find, repl))
+    counts = dict((find, 0) for find, _ in strings.values())
+    if not strings:
+        return counts
+
+    # Longest strings first, for strings starting at the same position
+    pattern = re.compile(br'\b(?:' + b'|'.join(
+        re.escape(find) for find in sorted(strings, key=len, reverse=True)) +
+        br')\b')
+
+    def replace(match):
+        find, repl = strings[match.group(0)]
+        counts[find] += 1
+        return _to_bytes(repl)
+
+    start = time.time()
+    file_list = []
+    for path in _walk_files(target_list):
+        try:
+            if _replace_in_file(path, pattern, replace):
+                file_list.append(path)
+        except (IOError, OSError) as e:
+            LOG.error("Failed to replace strings in [{}]: {}".format(
+                      path, str(e)))
+    for find, repl in strings.values():
+        LOG.info("Replaced [{}] with [{}] {} times".format(
+                 find, repl, counts[find]))
+    LOG.info("Updated {} in {:.1f}s".format(file_list, time.time() - start))
+    return counts
 
 
 def remove_from_archive(archive, unwanted):
@@ -527,8 +579,9 @@ def remove_from_archive(archive, unwanted):
         raise CloneFail("Failed to modify backup archive")
 
 
-def update_oamip_in_archive(tmpdir):
-    """ Update OAM IP in system archive file. """
+def get_oamip_replacements():
+    """ Replacements of the OAM IPs in the system archive. """
+    replacements = []
     oam_list = sysinv_api.get_oam_ip()
     if not oam_list:
         raise CloneFail("Failed to get OAM IP")
@@ -554,71 +607,80 @@ def update_oamip_in_archive(tmpdir):
             ipstr_list[1] = 'db8'
             repl_ipstr = ":".join(ipstr_list)
         if repl_ipstr:
-            find_and_replace(
-                [os.path.join(tmpdir, 'etc/hosts'),
-                 os.path.join(tmpdir, 'etc/sysconfig/network-scripts'),
-                 os.path.join(tmpdir, 'etc/nfv/vim/config.ini'),
-                 os.path.join(tmpdir, 'etc/haproxy/haproxy.cfg'),
-                 os.path.join(tmpdir, 'etc/heat/heat.conf'),
-                 os.path.join(tmpdir, 'etc/keepalived/keepalived.conf'),
-                 os.path.join(tmpdir, 'etc/murano/murano.conf'),
-                 os.path.join(tmpdir, 'etc/vswitch/vswitch.ini'),
-                 os.path.join(tmpdir, 'etc/nova/nova.conf'),
-                 os.path.join(tmpdir, 'config/hosts'),
-                 os.path.join(tmpdir, 'hieradata'),
-                 os.path.join(tmpdir, 'postgres/keystone.sql.data'),
-                 os.path.join(tmpdir, 'postgres/sysinv.sql.data')],
-                find_str, repl_ipstr)
+            replacements.append((find_str, repl_ipstr))
         else:
             LOG.error("Failed to modify OAM IP:[{}]"
                       .format(oamfind))
             raise CloneFail("Failed to modify OAM IP")
+    return replacements
 
 
-def update_mac_in_archive(tmpdir):
-    """ Update MAC addresses in system archive file. """
-    hostname = utils.get_controller_hostname()
-    macs = sysinv_api.get_mac_addresses(hostname)
-    for intf, mac in macs.items():
-        find_and_replace(
-            [os.path.join(tmpdir, 'postgres/sysinv.sql.data')],
-            mac, "CLONEISOMAC_{}{}".format(hostname, intf))
-
+def _get_controller_hostnames():
+    hostnames = [utils.get_controller_hostname()]
     if (tsconfig.system_mode == si_const.SYSTEM_MODE_DUPLEX or
             tsconfig.system_mode == si_const.SYSTEM_MODE_DUPLEX_DIRECT):
-        hostname = utils.get_mate_controller_hostname()
+        hostnames.append(utils.get_mate_controller_hostname())
+    return hostnames
+
+
+def get_mac_replacements():
+    """ Replacements of the MAC addresses in the system archive. """
+    replacements = []
+    for hostname in _get_controller_hostnames():
         macs = sysinv_api.get_mac_addresses(hostname)
         for intf, mac in macs.items():
-            find_and_replace(
-                [os.path.join(tmpdir, 'postgres/sysinv.sql.data')],
-                mac, "CLONEISOMAC_{}{}".format(hostname, intf))
+            replacements.append(
+                (mac, "CLONEISOMAC_{}{}".format(hostname, intf)))
+    return replacements
 
 
-def update_disk_serial_id_in_archive(tmpdir):
-    """ Update disk serial id in system archive file. """
-    hostname = utils.get_controller_hostname()
-    disk_sids = sysinv_api.get_disk_serial_ids(hostname)
-    for d_dnode, d_sid in disk_sids.items():
-        find_and_replace(
-            [os.path.join(tmpdir, 'postgres/sysinv.sql.data')],
-            d_sid, "CLONEISODISKSID_{}{}".format(hostname, d_dnode))
-
-    if (tsconfig.system_mode == si_const.SYSTEM_MODE_DUPLEX or
-            tsconfig.system_mode == si_const.SYSTEM_MODE_DUPLEX_DIRECT):
-        hostname = utils.get_mate_controller_hostname()
+def get_disk_serial_id_replacements():
+    """ Replacements of the disk serial ids in the system archive. """
+    replacements = []
+    for hostname in _get_controller_hostnames():
         disk_sids = sysinv_api.get_disk_serial_ids(hostname)
         for d_dnode, d_sid in disk_sids.items():
-            find_and_replace(
-                [os.path.join(tmpdir, 'postgres/sysinv.sql.data')],
-                d_sid, "CLONEISODISKSID_{}{}".format(hostname, d_dnode))
-
-
-def update_sysuuid_in_archive(tmpdir):
-    """ Update system uuid in system archive file. """
-    sysuuid = sysinv_api.get_system_uuid()
-    find_and_replace(
-        [os.path.join(tmpdir, 'postgres/sysinv.sql.data')],
-        sysuuid, "CLONEISO_SYSTEM_UUID")
+            replacements.append(
+                (d_sid, "CLONEISODISKSID_{}{}".format(hostname, d_dnode)))
+    return replacements
+
+
+def get_sysuuid_replacements():
+    """ Replacement of the system uuid in the system archive. """
+    return [(sysinv_api.get_system_uuid(), "CLONEISO_SYSTEM_UUID")]
+
+
+def update_files_in_archive(tmpdir):
+    """ Update OAM IPs, MACs, disk serial ids and system uuid in the
+        extracted system archive.
+    """
+    oam_replacements = get_oamip_replacements()
+    counts = find_and_replace(
+        [os.path.join(tmpdir, 'etc/hosts'),
+         os.path.join(tmpdir, 'etc/sysconfig/network-scripts'),
+         os.path.join(tmpdir, 'etc/nfv/vim/config.ini'),
+         os.path.join(tmpdir, 'etc/haproxy/haproxy.cfg'),
+         os.path.join(tmpdir, 'etc/heat/heat.conf'),
+         os.path.join(tmpdir, 'etc/keepalived/keepalived.conf'),
+         os.path.join(tmpdir, 'etc/murano/murano.conf'),
+         os.path.join(tmpdir, 'etc/vswitch/vswitch.ini'),
+         os.path.join(tmpdir, 'etc/nova/nova.conf'),
+         os.path.join(tmpdir, 'config/hosts'),
+         os.path.join(tmpdir, 'hieradata'),
+         os.path.join(tmpdir, 'postgres/keystone.dump')],
+        oam_replacements)
+
+    # The sysinv database dump is read once for all the replacements
+    sysinv_counts = find_and_replace(
+        [os.path.join(tmpdir, 'postgres/sysinv.dump')],
+        oam_replacements + get_mac_replacements() +
+        get_disk_serial_id_replacements() + get_sysuuid_replacements())
+    for find, count in sysinv_counts.items():
+        counts[find] = counts.get(find, 0) + count
+
+    for find, count in counts.items():
+        if not count:
+            LOG.error("[{}] not found in backup".format(find))
 
 
 def update_backup_archive(backup_name, archive_dir):
@@ -634,6 +696,10 @@ def update_backup_archive(backup_name, archive_dir):
         # the stale file from original side.
         remove_from_archive(path_to_archive + '.tar',
                             'etc/udev/rules.d/70-persistent-net.rules')
+        # The archive is modified, the checksums of its manifest no longer
+        # apply.
+        remove_from_archive(path_to_archive + '.tar',
+                            backup_archive.MANIFEST_NAME)
         # Extract only a subset of directories which have files to be
         # updated for oam-ip and MAC addresses. After updating the files
         # these directories are added back to the archive.
@@ -644,10 +710,7 @@ def update_backup_archive(backup_name, archive_dir):
              'etc', 'postgres', 'config',
              'hieradata'],
             stdout=DEVNULL, stderr=DEVNULL)
-        update_oamip_in_archive(tmpdir)
-        update_mac_in_archive(tmpdir)
-        update_disk_serial_id_in_archive(tmpdir)
-        update_sysuuid_in_archive(tmpdir)
+        update_files_in_archive(tmpdir)
         subprocess.check_call(
             ['tar', '--update',
              '--directory=' + tmpdir,
@@ -0,0 +1,147 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""
+Dump and restore of the postgres databases
+
+The data of each database is dumped in the pg_dump directory format, one
+uncompressed file of COPY data per table, and restored with pg_restore.
+Databases are dumped and restored concurrently and large databases use the
+pg_dump/pg_restore parallel jobs, within a CPU budget.  Plain SQL dumps
+made by previous releases are still restored with psql.
+"""
+
+import glob
+import multiprocessing
+import os
+import pwd
+import subprocess
+import time
+from multiprocessing.pool import ThreadPool
+
+from controllerconfig.common import log
+
+LOG = log.get_logger(__name__)
+
+DEVNULL = open(os.devnull, 'w')
+
+SCHEMA_FILE = 'postgres.sql.config'
+# pg_dump directory format
+DUMP_SUFFIX = '.dump'
+# plain SQL INSERT statements, used by previous releases
+PLAIN_SUFFIX = '.sql.data'
+
+
+def get_cpu_budget():
+    """ Number of pg_dump/pg_restore jobs run at the same time """
+    # Leave half of the cores to the services of the active controller
+    return max(1, multiprocessing.cpu_count() // 2)
+
+
+def get_dump_path(directory, database):
+    """ Path of the data dump of a database """
+    return os.path.join(directory, database + DUMP_SUFFIX)
+
+
+def _run_concurrently(func, items, budget, callback=None):
+    """ Run func(item, jobs) for all items within the CPU budget
+
+    Each item gets an equal share of the budget as parallel jobs.
+    """
+    if not items:
+        return
+    concurrency = min(budget, len(items))
+    jobs = max(1, budget // concurrency)
+    pool = ThreadPool(concurrency)
+    try:
+        for item in pool.imap_unordered(lambda i: func(i, jobs), items):
+            if callback:
+                callback(item)
+        pool.close()
+    except Exception:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+
+def _dump_database(database, dest_dir, skip_tables, jobs):
+    start = time.time()
+    cmd = ['sudo', '-u', 'postgres', 'pg_dump',
+           '--format=directory', '--compress=0',
+           '--data-only', '--file=%s' % get_dump_path(dest_dir, database)]
+    if jobs > 1:
+        cmd.append('--jobs=%d' % jobs)
+    cmd.extend('--exclude-table=%s' % table for table in skip_tables)
+    cmd.append(database)
+    subprocess.check_call(cmd, stdout=DEVNULL, stderr=DEVNULL)
+    LOG.info("Dump of database %s took %.1fs" %
+             (database, time.time() - start))
+    return database
+
+
+def dump_databases(dest_dir, databases, skip_tables, budget=None,
+                   callback=None):
+    """ Dump the schemas and the data of the databases
+
+    skip_tables is the tuple of tables excluded from the dump of each
+    database.  dest_dir must be accessible to the postgres user.
+    """
+    # Backup roles, table spaces and schemas for databases.
+    subprocess.check_call([('sudo -u postgres pg_dumpall --clean ' +
+                            '--schema-only > %s' %
+                            os.path.join(dest_dir, SCHEMA_FILE))],
+                          shell=True, stderr=DEVNULL)
+
+    # pg_dump creates the directory of each database dump
+    os.chown(dest_dir, pwd.getpwnam('postgres').pw_uid, -1)
+
+    _run_concurrently(
+        lambda database, jobs: _dump_database(
+            database, dest_dir, skip_tables.get(database, ()), jobs),
+        list(databases), budget or get_cpu_budget(), callback)
+
+
+def _restore_database(path, jobs):
+    start = time.time()
+    if path.endswith(DUMP_SUFFIX):
+        database = os.path.basename(path)[:-len(DUMP_SUFFIX)]
+        cmd = ['sudo', '-u', 'postgres', 'pg_restore',
+               '--data-only', '--disable-triggers',
+               '--dbname=%s' % database]
+        if jobs > 1:
+            cmd.append('--jobs=%d' % jobs)
+        cmd.append(path)
+    else:
+        database = os.path.basename(path)[:-len(PLAIN_SUFFIX)]
+        cmd = ['sudo', '-u', 'postgres', 'psql', '-f', path, database]
+    subprocess.check_call(cmd, stdout=DEVNULL)
+    LOG.info("Restore of database %s took %.1fs" %
+             (database, time.time() - start))
+    return database
+
+
+def restore_databases(source_dir, budget=None, callback=None):
+    """ Restore the schemas and the data of the databases of a dump
+
+    callback is called with the name of each database once restored.
+    """
+    # Restore roles, table spaces and schemas for databases.
+    subprocess.check_call(['sudo', '-u', 'postgres', 'psql', '-f',
+                           os.path.join(source_dir, SCHEMA_FILE),
+                           'postgres'],
+                          stdout=DEVNULL, stderr=DEVNULL)
+
+    # Restore data for databases.
+    dumps = glob.glob(os.path.join(source_dir, '*' + DUMP_SUFFIX))
+    paths = dumps + glob.glob(os.path.join(source_dir, '*' + PLAIN_SUFFIX))
+    # The dumps may have been modified by root, e.g. when creating a clone
+    # image, pg_restore must still be able to read them.
+    for dump in dumps:
+        subprocess.check_call(['chown', '-R', 'postgres', dump],
+                              stdout=DEVNULL)
+    _run_concurrently(_restore_database, paths,
+                      budget or get_cpu_budget(), callback)
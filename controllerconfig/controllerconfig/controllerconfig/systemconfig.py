@@ -258,6 +258,12 @@ def show_help():
           "--config-file <name>     Perform configuration using INI file\n"
           "--backup <name>          Backup configuration using the given "
           "name\n"
+          "--incremental            With --backup, only store the content "
+          "which changed\n"
+          "                         since the previous incremental backups\n"
+          "--verify-backup <name>   Verify the backup file with the given "
+          "name,\n"
+          "                         full path required\n"
           "--clone-iso <name>       Clone and create an image with "
           "the given file name\n"
           "--clone-status           Status of the last installation of "
@@ -305,6 +311,8 @@ def main():
     archive_dir = constants.BACKUPS_PATH
     do_default_config = False
     do_backup = False
+    do_incremental = False
+    do_verify = False
     do_system_restore = False
     include_storage_reinstall = False
     do_images_restore = False
@@ -342,6 +350,16 @@ def main():
                 print("--backup requires the name of the backup")
                 exit(1)
             do_backup = True
+        elif sys.argv[arg] == "--incremental":
+            do_incremental = True
+        elif sys.argv[arg] == "--verify-backup":
+            arg += 1
+            if arg < len(sys.argv):
+                backup_name = sys.argv[arg]
+            else:
+                print("--verify-backup requires the filename of the backup")
+                exit(1)
+            do_verify = True
         elif sys.argv[arg] == "--restore-system":
             arg += 1
             if arg < len(sys.argv):
@@ -423,6 +441,7 @@ def main():
         arg += 1
 
     if [do_backup,
+            do_verify,
             do_system_restore,
             do_images_restore,
             do_complete_restore,
@@ -432,7 +451,12 @@ def main():
         print("Invalid combination of options selected")
         exit(1)
 
+    if do_incremental and not do_backup:
+        print("The --incremental option requires the --backup option")
+        exit(1)
+
     if answerfile and [do_backup,
+                       do_verify,
                        do_system_restore,
                        do_images_restore,
                        do_complete_restore,
@@ -445,7 +469,7 @@ def main():
 
     log.configure()
 
-    if not do_backup and not do_clone:
+    if not do_backup and not do_verify and not do_clone:
         # Check if that the command is being run from the console
         if utils.is_ssh_parent():
             if allow_ssh:
@@ -466,8 +490,12 @@ def main():
 
     try:
         if do_backup:
-            backup_restore.backup(backup_name, archive_dir)
+            backup_restore.backup(backup_name, archive_dir,
+                                  incremental=do_incremental)
             print("\nBackup complete")
+        elif do_verify:
+            backup_restore.verify_backup(backup_name)
+            print("\nBackup verified")
         elif do_system_restore:
             backup_restore.restore_system(backup_name,
                                           include_storage_reinstall)
@@ -0,0 +1,211 @@
+"""
+Copyright (c) 2019 Wind River Systems, Inc.
+
+SPDX-License-Identifier: Apache-2.0
+
+"""
+
+import mock
+import os
+import pytest
+import tarfile
+
+from controllerconfig.common.exceptions import RestoreFail
+from controllerconfig import backup_archive
+
+
+def _add_dir(archive, directory):
+    archive.add(directory, arcname=os.path.basename(directory))
+
+
+def _create_tree(tmpdir):
+    src = tmpdir.mkdir('src')
+    etc = src.mkdir('etc')
+    for i in range(10):
+        etc.join('file%d' % i).write('value = %d\n' % i * 100)
+    home = src.mkdir('home')
+    home.mkdir('sysadmin').join('data').write_binary(os.urandom(100000))
+    return str(etc), str(home)
+
+
+def _create_archive(tmpdir):
+    etc, home = _create_tree(tmpdir)
+    path = str(tmpdir.join('backup_system.tgz'))
+    components = [
+        backup_archive.Component('etc', 'backup etc', path, _add_dir, etc),
+        backup_archive.Component('home', 'backup home', path, _add_dir, home)]
+    completed = []
+    manifests = backup_archive.create_archives(
+        components, str(tmpdir.mkdir('staging')), workers=2,
+        callback=lambda c, step: completed.append(step))
+    assert completed == [1, 2]
+    return path, manifests[path]
+
+
+def test_create_archive(tmpdir):
+    """ Test the archive is a regular tgz file with a manifest """
+
+    path, manifest = _create_archive(tmpdir)
+
+    with tarfile.open(path) as archive:
+        names = archive.getnames()
+        assert names[0] == backup_archive.MANIFEST_NAME
+        assert 'etc/file9' in names
+        assert 'home/sysadmin/data' in names
+    assert os.path.getsize(path) > 0
+
+    assert [c['name'] for c in manifest['components']] == ['etc', 'home']
+    assert manifest['components'][1]['roots'] == ['home']
+    assert manifest['components'][1]['members'] == 3
+
+
+def test_read_manifest(tmpdir):
+    """ Test the manifest is read back and verified """
+
+    path, manifest = _create_archive(tmpdir)
+
+    read = backup_archive.verify_archive(path)
+    assert read['components'] == manifest['components']
+
+
+def test_verify_corrupted_archive(tmpdir):
+    """ Test a corrupted component is detected """
+
+    path, manifest = _create_archive(tmpdir)
+    with open(path, 'r+b') as f:
+        f.seek(-100, os.SEEK_END)
+        data = f.read(1)
+        f.seek(-100, os.SEEK_END)
+        f.write(bytearray([ord(data) ^ 0xff]))
+
+    with pytest.raises(RestoreFail):
+        backup_archive.verify_archive(path)
+
+
+def test_archive_without_manifest(tmpdir):
+    """ Test archives created by previous releases are not verified """
+
+    etc, home = _create_tree(tmpdir)
+    path = str(tmpdir.join('backup_system.tgz'))
+    with tarfile.open(path, 'w:gz') as archive:
+        archive.add(etc, arcname='etc')
+
+    assert backup_archive.read_manifest(path) is None
+    assert backup_archive.verify_archive(path) is None
+
+
+def test_scan_directories(tmpdir):
+    """ Test the inventory of directories and their size """
+
+    etc, home = _create_tree(tmpdir)
+    os.symlink('file0', os.path.join(etc, 'link'))
+
+    inventories = backup_archive.scan_directories(
+        [etc, home, str(tmpdir.join('missing'))], workers=2)
+
+    assert sorted(inventories.keys()) == [etc, home]
+    assert inventories[home].size == 100000
+    assert inventories[home].entries == [('', False),
+                                         ('sysadmin', False),
+                                         ('sysadmin/data', True)]
+    assert ('link', False) in inventories[etc].entries
+    assert inventories[etc].size == sum(
+        os.path.getsize(os.path.join(etc, 'file%d' % i)) for i in range(10))
+
+
+def test_add_directory_from_inventory(tmpdir):
+    """ Test an inventory is archived like the directory it was built from """
+
+    etc, home = _create_tree(tmpdir)
+    os.symlink('file0', os.path.join(etc, 'link'))
+    inventories = backup_archive.scan_directories([etc])
+    os.remove(os.path.join(etc, 'file1'))
+
+    path = str(tmpdir.join('inventory.tar'))
+    with tarfile.open(path, 'w') as archive:
+        backup_archive.add_directory(archive, etc, 'etc', inventories)
+    walked = str(tmpdir.join('walked.tar'))
+    with tarfile.open(walked, 'w') as archive:
+        backup_archive.add_directory(archive, etc, 'etc')
+
+    with tarfile.open(path) as archive, tarfile.open(walked) as expected:
+        assert sorted(archive.getnames()) == sorted(expected.getnames())
+        assert archive.getmember('etc/link').issym()
+        assert archive.extractfile('etc/file2').read() == \
+            expected.extractfile('etc/file2').read()
+
+
+def test_gzip_reader_seek(tmpdir):
+    """ Test random reads of a file of several gzip members """
+
+    data = os.urandom(3000000) + b'backup' * 1000000
+    path = str(tmpdir.join('data.gz'))
+    with open(path, 'wb') as f:
+        f.write(backup_archive._gzip_member(data[:2000000]))
+        f.write(backup_archive._gzip_member(data[2000000:]))
+
+    reader = backup_archive.GzipReader(path, spacing=1024 * 1024)
+    assert reader.read() == data
+    assert len(reader._checkpoints) > 5
+    for offset, size in [(7000000, 10), (5, 1000000), (1999990, 20),
+                         (len(data) - 3, 10), (1500000, -1)]:
+        reader.seek(offset)
+        expected = data[offset:] if size < 0 else data[offset:offset + size]
+        assert reader.read(size) == expected
+    reader.seek(-6, os.SEEK_END)
+    assert reader.read() == b'backup'
+    reader.close()
+
+
+def test_gzip_reader_checkpoints(tmpdir):
+    """ Test the checkpoints resume from the file with small reads """
+
+    data = b''.join(b'%08d' % i for i in range(200000))
+    path = str(tmpdir.join('data.gz'))
+    with open(path, 'wb') as f:
+        for start in range(0, len(data), 300000):
+            f.write(backup_archive._gzip_member(data[start:start + 300000]))
+
+    # checkpoints taken within a read block and at member boundaries
+    with mock.patch.object(backup_archive, 'READ_SIZE', 1000):
+        reader = backup_archive.GzipReader(path, spacing=50000)
+        assert reader.read() == data
+        checkpoints = reader._checkpoints
+        assert len(checkpoints) > 20
+        assert all(len(checkpoint) == 3 for checkpoint in checkpoints)
+        file_offsets = [checkpoint[1] for checkpoint in checkpoints]
+        assert file_offsets == sorted(file_offsets)
+        assert [o for o in file_offsets if o % 1000]
+
+        for offset, _, _ in reversed(checkpoints):
+            reader.seek(offset + 3)
+            assert reader.read(20) == data[offset + 3:offset + 23]
+        reader.close()
+
+
+def test_open_archive(tmpdir):
+    """ Test members are extracted from the index in any order """
+
+    path, manifest = _create_archive(tmpdir)
+
+    archive = backup_archive.open_archive(path)
+    assert 'etc/file3' in archive.index
+    assert archive.extractfile('home/sysadmin/data').read() == \
+        tmpdir.join('src', 'home', 'sysadmin', 'data').read_binary()
+    archive.extract('etc/file3', path=str(tmpdir.join('dest')))
+    assert tmpdir.join('dest', 'etc', 'file3').read() == \
+        tmpdir.join('src', 'etc', 'file3').read()
+    with pytest.raises(KeyError):
+        archive.getmember('etc/missing')
+    archive.close()
+
+
+def test_open_corrupted_archive(tmpdir):
+    """ Test an archive which is not a valid gzip file is rejected """
+
+    path = str(tmpdir.join('backup_system.tgz'))
+    with open(path, 'wb') as f:
+        f.write(b'\x1f\x8b' + os.urandom(1000))
+
+    with pytest.raises(tarfile.TarError):
+        backup_archive.open_archive(path)
@@ -0,0 +1,126 @@
+"""
+Copyright (c) 2019 Wind River Systems, Inc.
+
+SPDX-License-Identifier: Apache-2.0
+
+"""
+
+import os
+import pytest
+import random
+
+from controllerconfig.common.exceptions import RestoreFail
+from controllerconfig import backup_archive
+from controllerconfig import backup_store
+
+
+def _random_lines(seed, count):
+    generator = random.Random(seed)
+    return b''.join(b'%08x %s\n' % (i, str(generator.random()).encode())
+                    for i in range(count))
+
+
+def _add_dir(archive, directory):
+    archive.add(directory, arcname=os.path.basename(directory))
+
+
+def _backup(tmpdir, name, store):
+    path = str(tmpdir.join(name + backup_store.MANIFEST_SUFFIX))
+    components = [
+        backup_archive.Component('postgres', 'backup postgres', path,
+                                 _add_dir, str(tmpdir.join('postgres'))),
+        backup_archive.Component('home', 'backup home', path,
+                                 _add_dir, str(tmpdir.join('home')))]
+    backup_archive.create_archives(components, str(tmpdir), workers=2,
+                                   store=store)
+    return path
+
+
+def _create_tree(tmpdir):
+    tmpdir.mkdir('postgres').join('sysinv.dat').write_binary(
+        _random_lines(0, 200000))
+    tmpdir.mkdir('home').join('image').write_binary(
+        os.urandom(3 * backup_store.MAX_CHUNK_SIZE))
+
+
+def _split(data):
+    chunks = []
+    start = 0
+    while start < len(data):
+        end = backup_store.find_boundary(data, start) or len(data)
+        chunks.append(data[start:end])
+        start = end
+    return chunks
+
+
+def test_chunk_boundaries():
+    """ Test chunk boundaries only depend on the content """
+
+    data = _random_lines(1, 200000)
+    chunks = _split(data)
+    assert b''.join(chunks) == data
+    assert len(chunks) > 2
+    for chunk in chunks[:-1]:
+        assert (backup_store.MIN_CHUNK_SIZE <= len(chunk) <=
+                backup_store.MAX_CHUNK_SIZE)
+
+    # The chunks of a stream do not depend on the size of the writes
+    stored = []
+    store = backup_store.ChunkStore.__new__(backup_store.ChunkStore)
+    store.put = lambda chunk: stored.append(chunk) or str(len(stored))
+    writer = backup_store.ChunkWriter(store)
+    for i in range(0, len(data), 10000):
+        writer.write(data[i:i + 10000])
+    writer.close()
+    assert stored == chunks
+
+    # An insertion only changes the chunk it is in
+    shifted = _split(data[:1000] + b'inserted\n' + data[1000:])
+    assert shifted[1:] == chunks[1:]
+
+
+def test_incremental_backup(tmpdir):
+    """ Test unchanged content is stored once and restored """
+
+    _create_tree(tmpdir)
+    store = backup_store.ChunkStore(
+        backup_store.get_store_dir(str(tmpdir)), create=True)
+    first = _backup(tmpdir, 'first', store)
+    stored = len(store.chunks)
+
+    sysinv = tmpdir.join('postgres', 'sysinv.dat')
+    sysinv.write_binary(sysinv.read_binary().replace(b'00000100 ',
+                                                     b'00000100 changed '))
+    second = _backup(tmpdir, 'second', store)
+
+    # Only the chunks of the modified data and the tar headers are added
+    assert len(store.chunks) - stored < stored // 2
+
+    backup_store.verify_backup(first)
+    manifest = backup_store.verify_backup(second)
+    assert [c['name'] for c in manifest['components']] == ['postgres', 'home']
+
+    archive = backup_store.open_backup(second)
+    assert archive.getnames() == ['postgres', 'postgres/sysinv.dat',
+                                  'home', 'home/image']
+    assert (archive.extractfile('postgres/sysinv.dat').read() ==
+            sysinv.read_binary())
+    assert (archive.extractfile('home/image').read() ==
+            tmpdir.join('home', 'image').read_binary())
+
+
+def test_verify_corrupted_chunk(tmpdir):
+    """ Test a corrupted chunk is detected """
+
+    _create_tree(tmpdir)
+    store = backup_store.ChunkStore(
+        backup_store.get_store_dir(str(tmpdir)), create=True)
+    path = _backup(tmpdir, 'backup', store)
+
+    manifest = backup_store.read_manifest(path)
+    digest = manifest['components'][0]['chunks'][0][0]
+    with open(store.get_chunk_path(digest), 'wb') as f:
+        f.write(b'corrupted')
+
+    with pytest.raises(RestoreFail):
+        backup_store.verify_backup(path)
@@ -0,0 +1,43 @@
+"""
+Copyright (c) 2019 Wind River Systems, Inc.
+
+SPDX-License-Identifier: Apache-2.0
+
+"""
+
+import os
+import stat
+
+from controllerconfig import clone
+
+
+def test_find_and_replace(tmpdir):
+    """ Test all strings are replaced in a single pass over the files """
+
+    dump = tmpdir.mkdir('sysinv.dump')
+    data = dump.join('3001.dat')
+    data.write('1\t10.10.10.2\taa:bb:cc:dd:ee:ff\n'
+               '2\t10.10.10.20\t0a:bb:cc:dd:ee:ff\n' * 1000)
+    os.chmod(str(data), 0o640)
+    toc = dump.join('toc.dat')
+    toc.write_binary(b'\0\x0110.10.10.2')
+    hosts = tmpdir.join('hosts')
+    hosts.write('10.10.10.2 controller\n')
+
+    counts = clone.find_and_replace(
+        [str(dump), str(hosts)],
+        [('10.10.10.2', '192.0.10.2'),
+         ('aa:bb:cc:dd:ee:ff', 'CLONEISOMAC_controller-0eth0'),
+         ('aa:bb:cc:dd:ee:ff', 'CLONEISOMAC_controller-0vlan10'),
+         ('11:22:33:44:55:66', 'CLONEISOMAC_controller-0eth1')])
+
+    assert counts == {'10.10.10.2': 1001,
+                      'aa:bb:cc:dd:ee:ff': 1000,
+                      '11:22:33:44:55:66': 0}
+    assert data.read() == ('1\t192.0.10.2\tCLONEISOMAC_controller-0eth0\n'
+                           '2\t10.10.10.20\t0a:bb:cc:dd:ee:ff\n' * 1000)
+    assert stat.S_IMODE(os.stat(str(data)).st_mode) == 0o640
+    assert hosts.read() == '192.0.10.2 controller\n'
+    # Binary files are not modified
+    assert toc.read_binary() == b'\0\x0110.10.10.2'
+    assert sorted(os.listdir(str(dump))) == ['3001.dat', 'toc.dat']
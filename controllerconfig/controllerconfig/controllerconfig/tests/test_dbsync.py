@@ -0,0 +1,85 @@
+"""
+Copyright (c) 2019 Wind River Systems, Inc.
+
+SPDX-License-Identifier: Apache-2.0
+
+"""
+
+import os
+import pytest
+import subprocess
+
+from controllerconfig.upgrades import dbsync
+
+
+def test_get_stages():
+    """ Test keystone is migrated before the other services """
+
+    stages = dbsync.get_stages([('aodh', 'aodh-dbsync'),
+                                ('nova', 'nova-manage db sync'),
+                                ('nova', 'nova-manage api_db sync'),
+                                ('keystone', 'keystone-manage db_sync')])
+
+    assert stages == [[('keystone', ['keystone-manage db_sync'])],
+                      [('aodh', ['aodh-dbsync']),
+                       ('nova', ['nova-manage db sync',
+                                 'nova-manage api_db sync'])]]
+
+
+def test_resume_migrations(tmpdir):
+    """ Test a failed migration resumes from the failed command """
+
+    log_dir = str(tmpdir.join('log'))
+    marker = tmpdir.join('fixed')
+    commands = [
+        ('keystone', 'echo keystone >> %s' % tmpdir.join('keystone')),
+        ('heat', 'echo heat >> %s' % tmpdir.join('heat')),
+        ('nova', 'echo nova >> %s' % tmpdir.join('nova')),
+        ('nova', 'echo failing; test -f %s' % marker),
+        ('nova', 'echo api >> %s' % tmpdir.join('nova'))]
+
+    with pytest.raises(subprocess.CalledProcessError):
+        dbsync.run_migrations(commands, str(tmpdir), '18.03',
+                              concurrency=2, log_dir=log_dir)
+    assert tmpdir.join(dbsync.STATE_FILE).check()
+    assert 'failing' in tmpdir.join('log', 'nova.log').read()
+
+    marker.write('')
+    migrated = []
+    dbsync.run_migrations(commands, str(tmpdir), '18.03', concurrency=2,
+                          log_dir=log_dir, callback=migrated.append)
+
+    assert migrated[0] == 'keystone'
+    assert tmpdir.join('keystone').read() == 'keystone\n'
+    assert tmpdir.join('heat').read() == 'heat\n'
+    assert tmpdir.join('nova').read() == 'nova\napi\n'
+    assert not os.path.exists(str(tmpdir.join(dbsync.STATE_FILE)))
+
+
+def test_state_of_other_release(tmpdir):
+    """ Test the state of an upgrade from another release is ignored """
+
+    state = dbsync.MigrationState(str(tmpdir.join('state')), '17.06')
+    state.complete('keystone', 'keystone-manage db_sync', 1.0)
+
+    assert dbsync.MigrationState(str(tmpdir.join('state')), '17.06') \
+        .is_completed('keystone', 'keystone-manage db_sync')
+    assert not dbsync.MigrationState(str(tmpdir.join('state')), '18.03') \
+        .is_completed('keystone', 'keystone-manage db_sync')
+
+
+def test_clear_state(tmpdir):
+    """ Test the state of previous attempts is cleared """
+
+    state_dir = tmpdir.join('dbsync')
+    with pytest.raises(subprocess.CalledProcessError):
+        dbsync.run_migrations([('keystone', 'false')], str(state_dir),
+                              '18.03', log_dir=str(tmpdir.join('log')))
+    dbsync.MigrationState(str(state_dir.join(dbsync.STATE_FILE)), '18.03') \
+        .complete('keystone', 'keystone-manage db_sync', 1.0)
+    assert dbsync.has_state(str(state_dir))
+
+    dbsync.clear_state(str(state_dir))
+    assert not dbsync.has_state(str(state_dir))
+    # nothing to clear
+    dbsync.clear_state(str(state_dir))
@@ -0,0 +1,158 @@
+"""
+Copyright (c) 2019 Wind River Systems, Inc.
+
+SPDX-License-Identifier: Apache-2.0
+
+"""
+
+import mock
+import pytest
+import subprocess
+import threading
+import time
+
+from controllerconfig import pgdump
+
+
+def _commands(check_call):
+    return [c[0][0] for c in check_call.call_args_list]
+
+
+@mock.patch.object(pgdump.subprocess, 'check_call')
+def test_dump_database(check_call):
+    """ Test a database is dumped in directory format with parallel jobs """
+
+    assert pgdump._dump_database('sysinv', '/opt/backups',
+                                 ('i_host', 'i_user'), 4) == 'sysinv'
+    check_call.assert_called_once_with(
+        ['sudo', '-u', 'postgres', 'pg_dump',
+         '--format=directory', '--compress=0', '--data-only',
+         '--file=/opt/backups/sysinv.dump', '--jobs=4',
+         '--exclude-table=i_host', '--exclude-table=i_user', 'sysinv'],
+        stdout=pgdump.DEVNULL, stderr=pgdump.DEVNULL)
+
+
+@mock.patch.object(pgdump.subprocess, 'check_call')
+def test_dump_database_single_job(check_call):
+    """ Test --jobs is only passed for parallel dumps """
+
+    pgdump._dump_database('keystone', '/opt/backups', (), 1)
+    cmd = _commands(check_call)[0]
+    assert not [arg for arg in cmd if arg.startswith('--jobs')]
+    assert cmd[-1] == 'keystone'
+
+
+@mock.patch.object(pgdump.os, 'chown')
+@mock.patch.object(pgdump.pwd, 'getpwnam')
+@mock.patch.object(pgdump.subprocess, 'check_call')
+def test_dump_databases(check_call, getpwnam, chown):
+    """ Test the schemas are dumped before each database is dumped """
+
+    getpwnam.return_value.pw_uid = 26
+    dumped = []
+    pgdump.dump_databases('/opt/backups', ['sysinv', 'keystone'],
+                          {'sysinv': ('i_host',)}, budget=4,
+                          callback=dumped.append)
+
+    commands = _commands(check_call)
+    assert commands[0] == [
+        'sudo -u postgres pg_dumpall --clean --schema-only > '
+        '/opt/backups/postgres.sql.config']
+    chown.assert_called_once_with('/opt/backups', 26, -1)
+    dumps = sorted(commands[1:], key=lambda cmd: cmd[-1])
+    # each database gets half of the budget
+    assert dumps == [
+        ['sudo', '-u', 'postgres', 'pg_dump', '--format=directory',
+         '--compress=0', '--data-only', '--file=/opt/backups/keystone.dump',
+         '--jobs=2', 'keystone'],
+        ['sudo', '-u', 'postgres', 'pg_dump', '--format=directory',
+         '--compress=0', '--data-only', '--file=/opt/backups/sysinv.dump',
+         '--jobs=2', '--exclude-table=i_host', 'sysinv']]
+    assert sorted(dumped) == ['keystone', 'sysinv']
+
+
+@mock.patch.object(pgdump.subprocess, 'check_call')
+def test_restore_databases(check_call, tmpdir):
+    """ Test dumps are restored with pg_restore and legacy dumps with psql """
+
+    sysinv = tmpdir.mkdir('sysinv.dump')
+    sysinv.join('toc.dat').write('')
+    tmpdir.join('nova.sql.data').write('INSERT INTO ...;\n')
+    tmpdir.join('postgres.sql.config').write('')
+
+    restored = []
+    pgdump.restore_databases(str(tmpdir), budget=4,
+                             callback=restored.append)
+
+    commands = _commands(check_call)
+    assert commands[0] == ['sudo', '-u', 'postgres', 'psql', '-f',
+                           str(tmpdir.join('postgres.sql.config')),
+                           'postgres']
+    assert commands[1] == ['chown', '-R', 'postgres', str(sysinv)]
+    assert sorted(commands[2:]) == sorted([
+        ['sudo', '-u', 'postgres', 'pg_restore', '--data-only',
+         '--disable-triggers', '--dbname=sysinv', '--jobs=2', str(sysinv)],
+        ['sudo', '-u', 'postgres', 'psql', '-f',
+         str(tmpdir.join('nova.sql.data')), 'nova']])
+    assert sorted(restored) == ['nova', 'sysinv']
+
+
+@mock.patch.object(pgdump.subprocess, 'check_call')
+def test_restore_failure(check_call, tmpdir):
+    """ Test a failed restore is raised """
+
+    tmpdir.mkdir('sysinv.dump')
+    check_call.side_effect = [None, None,
+                              subprocess.CalledProcessError(1, 'pg_restore')]
+    with pytest.raises(subprocess.CalledProcessError):
+        pgdump.restore_databases(str(tmpdir), budget=1)
+
+
+def _run(items, budget):
+    lock = threading.Lock()
+    state = {'running': 0, 'max_running': 0}
+    calls = []
+
+    def func(item, jobs):
+        with lock:
+            calls.append((item, jobs))
+            state['running'] += 1
+            state['max_running'] = max(state['max_running'],
+                                       state['running'])
+        time.sleep(0.05)
+        with lock:
+            state['running'] -= 1
+        return item
+
+    done = []
+    pgdump._run_concurrently(func, items, budget, callback=done.append)
+    assert sorted(done) == sorted(items)
+    return sorted(calls), state['max_running']
+
+
+def test_run_concurrently_jobs():
+    """ Test the budget is split in parallel jobs between few items """
+
+    calls, max_running = _run(['a', 'b', 'c'], 8)
+    assert calls == [('a', 2), ('b', 2), ('c', 2)]
+    assert max_running == 3
+
+
+def test_run_concurrently_items():
+    """ Test the budget limits the number of items handled at once """
+
+    calls, max_running = _run(['a', 'b', 'c', 'd', 'e'], 2)
+    assert [jobs for _, jobs in calls] == [1] * 5
+    assert max_running == 2
+
+
+def test_run_concurrently_failure():
+    """ Test a failure is raised to the caller """
+
+    def func(item, jobs):
+        if item == 'b':
+            raise subprocess.CalledProcessError(1, item)
+        return item
+
+    with pytest.raises(subprocess.CalledProcessError):
+        pgdump._run_concurrently(func, ['a', 'b', 'c'], 2)
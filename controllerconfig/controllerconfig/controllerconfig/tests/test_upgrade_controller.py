@@ -0,0 +1,77 @@
+"""
+Copyright (c) 2019 Wind River Systems, Inc.
+
+SPDX-License-Identifier: Apache-2.0
+
+"""
+
+import mock
+import pytest
+
+from controllerconfig.upgrades import controller
+from controllerconfig.upgrades import dbsync
+
+
+@pytest.fixture
+def state_dir(tmpdir):
+    """ Migration state left by a failed upgrade """
+    path = tmpdir.mkdir('dbsync')
+    dbsync.MigrationState(str(path.join(dbsync.STATE_FILE)), '18.03') \
+        .complete('keystone', 'keystone-manage db_sync', 1.0)
+    with mock.patch.object(controller, 'DBSYNC_STATE_PATH', str(path)):
+        yield str(path)
+
+
+@mock.patch.object(controller.subprocess, 'check_call')
+@mock.patch.object(controller.pgdump, 'restore_databases')
+def test_import_clears_migration_state(restore_databases, check_call,
+                                       state_dir, tmpdir):
+    """ Test the migrations of a previous import are run again """
+
+    assert dbsync.has_state(state_dir)
+    controller.import_databases('18.03', '19.01', from_path=str(tmpdir),
+                                simplex=True)
+
+    restore_databases.assert_called_once_with(str(tmpdir.join('upgrade')),
+                                              callback=mock.ANY)
+    assert not dbsync.has_state(state_dir)
+
+
+@mock.patch.object(controller, 'complete_upgrade_controller')
+@mock.patch.object(controller.subprocess, 'check_call')
+@mock.patch.object(controller.subprocess, 'call', return_value=0)
+def test_resume(call, check_call, complete_upgrade_controller, state_dir):
+    """ Test a resumed upgrade migrates the imported databases """
+
+    controller.resume_upgrade_controller('18.03', '19.01')
+
+    # postgres is still running
+    assert not check_call.called
+    complete_upgrade_controller.assert_called_once_with('18.03', '19.01')
+    assert dbsync.has_state(state_dir)
+
+
+@mock.patch.object(controller, 'complete_upgrade_controller')
+def test_resume_without_state(complete_upgrade_controller, tmpdir):
+    """ Test an upgrade without failed migrations is not resumed """
+
+    with mock.patch.object(controller, 'DBSYNC_STATE_PATH', str(tmpdir)):
+        with pytest.raises(Exception):
+            controller.resume_upgrade_controller('18.03', '19.01')
+    assert not complete_upgrade_controller.called
+
+
+@mock.patch.object(controller.log, 'configure')
+@mock.patch.object(controller, 'upgrade_controller')
+@mock.patch.object(controller, 'resume_upgrade_controller')
+def test_main_resume(resume_upgrade_controller, upgrade_controller,
+                     configure):
+    """ Test --resume resumes the upgrade """
+
+    with mock.patch.object(controller.sys, 'argv',
+                           ['upgrade_controller', '--resume', '18.03',
+                            '19.01']):
+        controller.main()
+
+    resume_upgrade_controller.assert_called_once_with('18.03', '19.01')
+    assert not upgrade_controller.called
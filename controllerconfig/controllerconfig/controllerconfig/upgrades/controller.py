@@ -9,7 +9,6 @@
 #
 
 import copy
-import glob
 import json
 import psycopg2
 import os
@@ -46,14 +45,20 @@ from tsconfig.tsconfig import RESTORE_IN_PROGRESS_FLAG
 from controllerconfig.common import constants
 from controllerconfig.common import log
 from controllerconfig import utils as cutils
+from controllerconfig import backup_archive
 from controllerconfig import backup_restore
+from controllerconfig import pgdump
 
+from controllerconfig.upgrades import dbsync
 from controllerconfig.upgrades import utils
 
 LOG = log.get_logger(__name__)
 
 POSTGRES_MOUNT_PATH = '/mnt/postgresql'
 POSTGRES_DUMP_MOUNT_PATH = '/mnt/db_dump'
+# The state of the database migrations survives the temporary filesystems so
+# a failed migration can be resumed
+DBSYNC_STATE_PATH = os.path.join(PLATFORM_PATH, 'upgrade', 'dbsync')
 DB_CONNECTION_FORMAT = "connection=postgresql://%s:%s@127.0.0.1/%s\n"
 
 restore_patching_complete = '/etc/platform/.restore_patching_complete'
@@ -423,25 +428,22 @@ def import_databases(from_release, to_release, from_path=None, simplex=False):
 
     LOG.info("Importing databases")
 
-    try:
-        # Do postgres schema import (suppress stderr due to noise)
-        subprocess.check_call(['sudo -u postgres psql -f ' + from_dir +
-                               '/postgres.sql.config postgres'],
-                              shell=True,
-                              stdout=devnull,
-                              stderr=devnull)
-    except subprocess.CalledProcessError:
-        LOG.exception("Failed to import schemas.")
-        raise
+    # The migrations completed before were run on the previous import
+    dbsync.clear_state(DBSYNC_STATE_PATH)
 
     import_commands = []
 
-    # Do postgres data import
-    for data in glob.glob(from_dir + '/*.sql.data'):
-        db_elem = data.split('/')[-1].split('.')[0]
-        import_commands.append((db_elem,
-                                "sudo -u postgres psql -f " + data +
-                                " " + db_elem))
+    # Do postgres schema and data import, from the pg_dump directories or the
+    # plain SQL files of older releases
+    def imported(database):
+        print("Imported %s" % database)
+
+    try:
+        pgdump.restore_databases(from_dir, callback=imported)
+    except subprocess.CalledProcessError as ex:
+        LOG.exception("Failed to import databases, return code: %d" %
+                      ex.returncode)
+        raise
 
     # Import VIM data
     if not simplex:
@@ -687,19 +689,14 @@ def migrate_databases(from_release, shared_services, db_credentials,
                  '/etc/keystone/keystone-dbsync.conf db_sync')
             ]
 
-    # Execute migrate commands
-    for cmd in migrate_commands:
-        try:
-            print("Migrating %s" % cmd[0])
-            LOG.info("Executing migrate command: %s" % cmd[1])
-            subprocess.check_call([cmd[1]],
-                                  shell=True, stdout=devnull, stderr=devnull)
+    # Execute migrate commands, keystone first and then the other services
+    # concurrently. The commands completed by a failed attempt are skipped
+    # when the migration is retried.
+    def migrating(service):
+        print("Migrating %s" % service)
 
-        except subprocess.CalledProcessError as ex:
-            LOG.exception("Failed to execute command: '%s' during upgrade "
-                          "processing, return code: %d" %
-                          (cmd[1], ex.returncode))
-            raise
+    dbsync.run_migrations(migrate_commands, DBSYNC_STATE_PATH,
+                          from_release, callback=migrating)
 
     # We need to run nova's online DB migrations to complete any DB changes.
     # This needs to be done before the computes are upgraded. In other words
@@ -870,6 +867,54 @@ def upgrade_controller(from_release, to_release):
     print("Importing databases...")
     import_databases(from_release, to_release)
 
+    complete_upgrade_controller(from_release, to_release)
+
+
+def resume_upgrade_controller(from_release, to_release):
+    """ Resumes the database migrations of a failed controller-1 upgrade.
+
+    The databases imported by the failed attempt are still on the temporary
+    filesystems, the migrations completed by that attempt are skipped.
+    """
+
+    devnull = open(os.devnull, 'w')
+
+    if not dbsync.has_state(DBSYNC_STATE_PATH):
+        raise Exception("No database migration to resume")
+
+    LOG.info("Resuming upgrade of controller from %s to %s" %
+             (from_release, to_release))
+
+    # Start the postgres server unless it is still running
+    if subprocess.call(['sudo', '-u', 'postgres', 'pg_ctl', '-D',
+                        utils.POSTGRES_DATA_DIR, 'status'],
+                       stdout=devnull, stderr=devnull) != 0:
+        try:
+            subprocess.check_call(['sudo',
+                                   '-u',
+                                   'postgres',
+                                   'pg_ctl',
+                                   '-D',
+                                   utils.POSTGRES_DATA_DIR,
+                                   'start'],
+                                  stdout=devnull)
+        except subprocess.CalledProcessError:
+            LOG.exception("Failed to start postgres service")
+            raise
+        time.sleep(5)
+
+    # Left behind by the failed attempt
+    if os.path.exists("/tmp/python_keyring"):
+        shutil.rmtree("/tmp/python_keyring")
+
+    complete_upgrade_controller(from_release, to_release)
+
+
+def complete_upgrade_controller(from_release, to_release):
+    """ Migrates the imported databases and completes the upgrade. """
+
+    devnull = open(os.devnull, 'w')
+
     shared_services = get_shared_services()
 
     # Create /tmp/python_keyring - used by keystone manifest.
@@ -1004,6 +1049,12 @@ def upgrade_controller(from_release, to_release):
         "/tmp/etc_platform", os.path.basename(CONTROLLER_UPGRADE_STARTED_FLAG))
     os.remove(upgrade_complete_flag_file)
 
+    # Set by a failed attempt that was resumed
+    upgrade_fail_flag_file = os.path.join(
+        "/tmp/etc_platform", os.path.basename(CONTROLLER_UPGRADE_FAIL_FLAG))
+    if os.path.exists(upgrade_fail_flag_file):
+        os.remove(upgrade_fail_flag_file)
+
     unmount_filesystem("/tmp/etc_platform")
     os.rmdir("/tmp/etc_platform")
 
@@ -1012,22 +1063,26 @@ def upgrade_controller(from_release, to_release):
 
 
 def show_help():
-    print("Usage: %s <FROM_RELEASE> <TO_RELEASE>" % sys.argv[0])
+    print("Usage: %s [--resume] <FROM_RELEASE> <TO_RELEASE>" % sys.argv[0])
     print("Upgrade controller-1. For internal use only.")
+    print("--resume  Resume the database migrations of a failed upgrade")
 
 
 def main():
 
     from_release = None
     to_release = None
+    resume = False
     arg = 1
     while arg < len(sys.argv):
         if sys.argv[arg] in ['--help', '-h', '-?']:
             show_help()
             exit(1)
-        elif arg == 1:
+        elif sys.argv[arg] == '--resume':
+            resume = True
+        elif from_release is None:
             from_release = sys.argv[arg]
-        elif arg == 2:
+        elif to_release is None:
             to_release = sys.argv[arg]
         else:
             print("Invalid option %s. Use --help for more information." %
@@ -1042,7 +1097,10 @@ def main():
         exit(1)
 
     try:
-        upgrade_controller(from_release, to_release)
+        if resume:
+            resume_upgrade_controller(from_release, to_release)
+        else:
+            upgrade_controller(from_release, to_release)
     except Exception as e:
         LOG.exception(e)
         print("Upgrade failed: {}".format(e))
@@ -1292,7 +1350,7 @@ def upgrade_controller_simplex(backup_file):
     os.chdir('/')
 
     try:
-        archive = tarfile.open(backup_file)
+        archive = backup_archive.open_archive(backup_file)
     except tarfile.TarError as e:
         LOG.exception(e)
         raise Exception("Error opening backup file. Invalid backup file.")
@@ -0,0 +1,199 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""
+Database migrations of an upgrade
+
+The migration commands of a service run in sequence, the services run
+concurrently once the services they depend on are migrated.  The output
+of each command goes to the log of its service and each completed command
+is recorded in a state file, so a failed migration resumes from the
+commands which did not complete.  The state file must be kept on a
+persistent filesystem and cleared whenever the databases are imported
+again, since the commands it records were run on the previous import.
+"""
+
+import json
+import multiprocessing
+import os
+import subprocess
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+
+from controllerconfig.common import log
+
+LOG = log.get_logger(__name__)
+
+LOG_DIR = '/var/log/dbsync'
+STATE_FILE = '.dbsync-state'
+
+# Services which are migrated before any other
+FIRST_SERVICES = ('keystone',)
+
+
+def get_concurrency():
+    """ Number of services migrated at the same time """
+    return max(1, multiprocessing.cpu_count() // 2)
+
+
+def get_dependencies(service, services):
+    """ Services to migrate before a service """
+    if service in FIRST_SERVICES:
+        return []
+    return [s for s in FIRST_SERVICES if s in services]
+
+
+def get_stages(commands):
+    """ Group the commands by service, in stages of independent services
+
+    commands is a list of (service, command) tuples.  Returns a list of
+    stages, each a list of (service, [command, ...]).
+    """
+    services = []
+    service_commands = {}
+    for service, command in commands:
+        if service not in service_commands:
+            services.append(service)
+            service_commands[service] = []
+        service_commands[service].append(command)
+
+    stages = []
+    migrated = set()
+    remaining = list(services)
+    while remaining:
+        stage = [s for s in remaining
+                 if set(get_dependencies(s, services)) <= migrated]
+        if not stage:
+            raise Exception("Circular migration dependencies: %s" %
+                            ', '.join(remaining))
+        stages.append([(s, service_commands[s]) for s in stage])
+        migrated.update(stage)
+        remaining = [s for s in remaining if s not in migrated]
+    return stages
+
+
+class MigrationState(object):
+    """ Commands completed by the migrations of an upgrade
+
+    The state of a previous attempt only applies to an upgrade from the
+    same release.
+    """
+
+    def __init__(self, path, from_release):
+        self.path = path
+        self.from_release = from_release
+        self.completed = {}
+        self._lock = threading.Lock()
+        if os.path.isfile(path):
+            try:
+                with open(path) as f:
+                    state = json.load(f)
+            except (IOError, ValueError) as e:
+                LOG.warning("Ignoring migration state %s: %s" % (path, e))
+                return
+            if state.get('from_release') == from_release:
+                self.completed = state.get('completed', {})
+
+    def is_completed(self, service, command):
+        return command in self.completed.get(service, {})
+
+    def complete(self, service, command, duration):
+        with self._lock:
+            self.completed.setdefault(service, {})[command] = duration
+            with open(self.path + '.tmp', 'w') as f:
+                json.dump({'from_release': self.from_release,
+                           'completed': self.completed}, f, indent=2)
+            os.rename(self.path + '.tmp', self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def has_state(state_dir):
+    """ Whether the migrations of a previous attempt left a state """
+    return os.path.isfile(os.path.join(state_dir, STATE_FILE))
+
+
+def clear_state(state_dir):
+    """ Forget the commands completed by previous attempts """
+    path = os.path.join(state_dir, STATE_FILE)
+    if os.path.exists(path):
+        LOG.info("Removing migration state %s" % path)
+        os.remove(path)
+
+
+def _migrate_service(service, commands, state, log_dir, failed):
+    for command in commands:
+        if state.is_completed(service, command):
+            LOG.info("Skipping completed migrate command: %s" % command)
+            continue
+        if failed.is_set():
+            # Another migration failed, do not start new commands
+            return
+        LOG.info("Executing migrate command: %s" % command)
+        start = time.time()
+        with open(os.path.join(log_dir, service + '.log'), 'a') as f:
+            f.write("%s: %s\n" % (time.strftime("%Y-%m-%d %H:%M:%S"),
+                                  command))
+            f.flush()
+            try:
+                subprocess.check_call([command], shell=True, stdout=f,
+                                      stderr=subprocess.STDOUT)
+            except subprocess.CalledProcessError as ex:
+                failed.set()
+                LOG.exception("Failed to execute command: '%s' during "
+                              "upgrade processing, return code: %d, see "
+                              "%s" % (command, ex.returncode, f.name))
+                raise
+        duration = time.time() - start
+        state.complete(service, command, duration)
+        LOG.info("Migrate command %s took %.1fs" % (command, duration))
+
+
+def run_migrations(commands, state_dir, from_release, concurrency=None,
+                   log_dir=LOG_DIR, callback=None):
+    """ Run the migration commands of the services
+
+    commands is a list of (service, command) tuples, the commands of a
+    service run in the order of the list.  callback is called with the
+    name of each service before its migration.  The state of the
+    migrations is kept in state_dir until all of them complete.
+    """
+    for path in (log_dir, state_dir):
+        if not os.path.isdir(path):
+            os.makedirs(path)
+    state = MigrationState(os.path.join(state_dir, STATE_FILE),
+                           from_release)
+    concurrency = concurrency or get_concurrency()
+    failed = threading.Event()
+    start = time.time()
+
+    def migrate(item):
+        service, service_commands = item
+        if callback:
+            callback(service)
+        _migrate_service(service, service_commands, state, log_dir, failed)
+
+    for stage in get_stages(commands):
+        pool = ThreadPool(min(concurrency, len(stage)))
+        try:
+            # On a failure the migrations in progress still complete and
+            # the next attempt resumes after them.
+            pool.map(migrate, stage, chunksize=1)
+            pool.close()
+        except Exception:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+
+    for service, service_commands in sorted(state.completed.items()):
+        LOG.info("Migration of %s took %.1fs" %
+                 (service, sum(service_commands.values())))
+    LOG.info("Migrations took %.1fs" % (time.time() - start))
+    state.remove()
@@ -16,6 +16,7 @@ import subprocess
 import tsconfig.tsconfig as tsc
 
 from controllerconfig import backup_restore
+from controllerconfig import pgdump
 from controllerconfig.common import log
 from controllerconfig.common import constants
 from sysinv.common import constants as sysinv_constants
@@ -64,29 +65,12 @@ def get_upgrade_databases(shared_services):
 
 def export_postgres(dest_dir, shared_services):
     """ Export postgres databases """
-    devnull = open(os.devnull, 'w')
     try:
         upgrade_databases, upgrade_database_skip_tables = \
             get_upgrade_databases(shared_services)
-        # Dump roles, table spaces and schemas for databases.
-        subprocess.check_call([('sudo -u postgres pg_dumpall --clean ' +
-                                '--schema-only > %s/%s' %
-                                (dest_dir, 'postgres.sql.config'))],
-                              shell=True, stderr=devnull)
-
-        # Dump data for databases.
-        for _a, db_elem in enumerate(upgrade_databases):
-
-            db_cmd = 'sudo -u postgres pg_dump --format=plain --inserts '
-            db_cmd += '--disable-triggers --data-only %s ' % db_elem
-
-            for _b, table_elem in \
-                    enumerate(upgrade_database_skip_tables[db_elem]):
-                db_cmd += '--exclude-table=%s ' % table_elem
-
-            db_cmd += '> %s/%s.sql.data' % (dest_dir, db_elem)
-
-            subprocess.check_call([db_cmd], shell=True, stderr=devnull)
+        # Dump roles, table spaces, schemas and data for databases.
+        pgdump.dump_databases(dest_dir, upgrade_databases,
+                              upgrade_database_skip_tables)
 
     except subprocess.CalledProcessError:
         LOG.exception("Failed to export postgres databases for upgrade.")
@@ -143,9 +143,11 @@ def validate_hardware_compatibility():
 def update_sysuuid_in_archive(tmpdir):
     """Update system uuid in system archive file."""
     sysuuid = str(uuid.uuid4())
-    clone.find_and_replace(
-        [os.path.join(tmpdir, 'postgres/sysinv.sql.data')],
-        "CLONEISO_SYSTEM_UUID", sysuuid)
+    counts = clone.find_and_replace(
+        [os.path.join(tmpdir, 'postgres/sysinv.dump')],
+        [("CLONEISO_SYSTEM_UUID", sysuuid)])
+    if not counts["CLONEISO_SYSTEM_UUID"]:
+        LOG.error("CLONEISO_SYSTEM_UUID not found in backup")
     LOG.info("System uuid updated [%s]" % sysuuid)
 
 
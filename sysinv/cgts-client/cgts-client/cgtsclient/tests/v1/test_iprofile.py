@@ -0,0 +1,55 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import testtools
+
+from cgtsclient.tests import utils
+import cgtsclient.v1.iprofile
+
+PROFILE_UUID = '11111111-2222-3333-4444-555555555555'
+HOST_UUIDS = ['66666666-7777-8888-9999-000000000000',
+              '66666666-7777-8888-9999-000000000001']
+
+APPLY = {'profile_uuid': PROFILE_UUID,
+         'host_uuids': HOST_UUIDS}
+
+APPLY_RESULTS = [
+    {'host_uuid': HOST_UUIDS[0],
+     'hostname': 'compute-0',
+     'success': True,
+     'reason': None},
+    {'host_uuid': HOST_UUIDS[1],
+     'hostname': 'compute-1',
+     'success': False,
+     'reason': "Can not apply profile to an 'unlocked' host compute-1; "
+               "Please 'Lock' first."},
+]
+
+fixtures = {
+    '/v1/iprofile/apply':
+    {
+        'POST': (
+            {},
+            APPLY_RESULTS,
+        ),
+    },
+}
+
+
+class iprofileManagerTest(testtools.TestCase):
+
+    def setUp(self):
+        super(iprofileManagerTest, self).setUp()
+        self.api = utils.FakeAPI(fixtures)
+        self.mgr = cgtsclient.v1.iprofile.iprofileManager(self.api)
+
+    def test_apply(self):
+        results = self.mgr.apply(PROFILE_UUID, HOST_UUIDS)
+        expect = [
+            ('POST', '/v1/iprofile/apply', {}, APPLY),
+        ]
+        self.assertEqual(self.api.calls, expect)
+        self.assertEqual(results, APPLY_RESULTS)
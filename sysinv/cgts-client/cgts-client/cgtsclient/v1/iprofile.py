@@ -132,6 +132,13 @@ class iprofileManager(base.Manager):
         path = self._path("import_profile")
         return self._upload(path, file)
 
+    def apply(self, iprofile_id, ihost_ids):
+        path = self._path("apply")
+        new = {'profile_uuid': iprofile_id,
+               'host_uuids': ihost_ids}
+        resp, body = self.api.json_request('POST', path, body=new)
+        return body
+
 
 def _find_iprofile(cc, iprofilenameoruuid):
     iprofiles = cc.iprofile.list()
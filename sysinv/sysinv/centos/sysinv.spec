@@ -122,6 +122,7 @@ rm -rf $RPM_BUILD_ROOT
 %{_bindir}/sysinv-api
 %{_bindir}/sysinv-conductor
 %{_bindir}/sysinv-dbsync
+%{_bindir}/sysinv-dbstats
 %{_bindir}/sysinv-dnsmasq-lease-update
 %{_bindir}/sysinv-rootwrap
 %{_bindir}/sysinv-upgrade
@@ -14,6 +14,7 @@
 import os
 import pyudev
 import re
+import select
 import subprocess
 import sys
 
@@ -50,6 +51,53 @@ class DiskOperator(object):
         # self._get_free_memory_MiB()
         # self._get_free_memory_nodes_MiB()
 
+        # Attributes of a disk that only change when the disk is replaced
+        # or repartitioned, keyed by device node.  Entries are dropped when
+        # udev reports an add, remove or change event for the disk.
+        self._disk_cache = {}
+        self._monitor = None
+        self._start_monitor()
+
+    def _start_monitor(self):
+        try:
+            monitor = pyudev.Monitor.from_netlink(pyudev.Context())
+            monitor.filter_by('block', device_type='disk')
+            monitor.start()
+            self._monitor = monitor
+        except Exception as e:
+            LOG.warn("Unable to monitor udev disk events, disk attributes "
+                     "will not be cached: %s" % e)
+            self._monitor = None
+
+    def _receive_udev_event(self):
+        """Return the next pending udev disk event without blocking."""
+        if hasattr(self._monitor, 'poll'):
+            return self._monitor.poll(timeout=0)
+        readable, _, _ = select.select([self._monitor], [], [], 0)
+        if readable:
+            return self._monitor.receive_device()[1]
+        return None
+
+    def _process_udev_events(self):
+        """Invalidate the cached attributes of disks that udev reported as
+        added, removed or changed since the last audit.
+        """
+        if self._monitor is None:
+            self._disk_cache.clear()
+            return
+
+        try:
+            device = self._receive_udev_event()
+            while device is not None:
+                LOG.debug("[DiskEnum] udev %s event for %s" %
+                          (device.get('ACTION'), device.device_node))
+                self._disk_cache.pop(device.device_node, None)
+                device = self._receive_udev_event()
+        except Exception as e:
+            LOG.warn("Failed to read udev disk events, dropping disk "
+                     "attribute cache: %s" % e)
+            self._disk_cache.clear()
+
     def convert_range_string_to_list(self, s):
         olist = []
         s = s.strip()
@@ -92,35 +140,51 @@ class DiskOperator(object):
 
         return
 
+    def get_pv_names(self):
+        """Return the device names of all LVM physical volumes."""
+        pvs_process = subprocess.Popen(
+            ['pvs', '--noheadings', '-o', 'pv_name'],
+            stdout=subprocess.PIPE)
+        pvs_output = pvs_process.communicate()[0]
+        return set(line.strip() for line in pvs_output.splitlines())
+
+    def get_sector_size(self, device_node):
+        sector_size_bytes_process = subprocess.Popen(
+            ['blockdev', '--getss', device_node], stdout=subprocess.PIPE)
+        return int(sector_size_bytes_process.communicate()[0].rstrip())
+
     @utils.skip_udev_partition_probe
-    def get_disk_available_mib(self, device_node):
+    def get_disk_available_mib(self, device_node, is_gpt=None,
+                               pv_names=None, sector_size_bytes=None):
+        """Return the free space of a GPT disk in MiB.
+
+        The partition table type, the set of PV names and the sector size
+        are looked up when not supplied by the caller; idisk_get supplies
+        them once per audit instead of once per disk.
+        """
         # Check that partition table format is GPT.
         # Return 0 if not.
-        if not utils.disk_is_gpt(device_node=device_node):
+        if is_gpt is None:
+            is_gpt = utils.disk_is_gpt(device_node=device_node)
+        if not is_gpt:
             LOG.debug("Format of disk node %s is not GPT." % device_node)
             return 0
 
-        pvs_command = '{} {}'.format('pvs | grep -w ', device_node)
-        pvs_process = subprocess.Popen(pvs_command, stdout=subprocess.PIPE,
-                                       shell=True)
-        pvs_output = pvs_process.stdout.read()
+        if pv_names is None:
+            pv_names = self.get_pv_names()
 
-        if pvs_output:
+        if device_node in pv_names:
             LOG.debug("Disk %s is completely used by a PV => 0 available mib."
                       % device_node)
             return 0
 
-        # Get sector size command.
-        sector_size_bytes_cmd = '{} {}'.format('blockdev --getss', device_node)
-
         # Get total free space in sectors command.
         avail_space_sectors_cmd = '{} {} {}'.format(
             'sgdisk -p', device_node, "| grep \"Total free space\"")
 
         # Get the sector size.
-        sector_size_bytes_process = subprocess.Popen(
-            sector_size_bytes_cmd, stdout=subprocess.PIPE, shell=True)
-        sector_size_bytes = sector_size_bytes_process.stdout.read().rstrip()
+        if sector_size_bytes is None:
+            sector_size_bytes = self.get_sector_size(device_node)
 
         # Get the free space.
         avail_space_sectors_process = subprocess.Popen(
@@ -228,6 +292,104 @@ class DiskOperator(object):
 
         return device_id, device_wwn
 
+    def get_disk_model(self, device):
+        # ID_MODEL received from udev is not correct for disks that
+        # are used entirely for LVM. LVM replaced the model ID with
+        # its own identifier that starts with "LVM PV".For this
+        # reason we will attempt to retrieve the correct model ID
+        # by using 2 different commands: hdparm and lsblk and
+        # hdparm. If one of them fails, the other one can attempt
+        # to retrieve the information. Else we use udev.
+
+        # try hdparm command first
+        hdparm_command = 'hdparm -I %s |grep Model' % (
+            device.get('DEVNAME'))
+        hdparm_process = subprocess.Popen(
+            hdparm_command,
+            stdout=subprocess.PIPE,
+            shell=True)
+        hdparm_output = hdparm_process.communicate()[0]
+        if hdparm_process.returncode == 0:
+            second_half = hdparm_output.split(':')[1]
+            model_num = second_half.strip()
+        else:
+            # try lsblk command
+            lsblk_command = 'lsblk -dn --output MODEL %s' % (
+                                 device.get('DEVNAME'))
+            lsblk_process = subprocess.Popen(
+                                lsblk_command,
+                                stdout=subprocess.PIPE,
+                                shell=True)
+            lsblk_output = lsblk_process.communicate()[0]
+            if lsblk_process.returncode == 0:
+                model_num = lsblk_output.strip()
+            else:
+                # both hdparm and lsblk commands failed, try udev
+                model_num = device.get('ID_MODEL')
+        if not model_num:
+            model_num = constants.DEVICE_MODEL_UNKNOWN
+        return model_num
+
+    def get_disk_static_attributes(self, device):
+        """Return the attributes of a disk that do not change while the
+        disk is present, from the cache when possible.
+        """
+        cached = self._disk_cache.get(device.device_node)
+        if cached and cached['device_num'] == device.device_number:
+            return cached
+
+        attrs = {
+            'device_num': device.device_number,
+            'size_mib': 0,
+            'model_num': '',
+            'serial_id': '',
+            'sector_size_bytes': None,
+        }
+        cacheable = True
+
+        # Can merge all try/except in one block but this allows at least attributes with no exception to be filled
+        try:
+            attrs['size_mib'] = utils.get_disk_capacity_mib(device.device_node)
+        except Exception as e:
+            self.handle_exception("Could not retrieve disk size - %s "
+                                  % e)
+        if not attrs['size_mib']:
+            cacheable = False
+
+        try:
+            attrs['model_num'] = self.get_disk_model(device)
+        except Exception as e:
+            cacheable = False
+            self.handle_exception("Could not retrieve disk model "
+                                  "for disk %s. Exception: %s" %
+                                  (device.get('DEVNAME'), e))
+        try:
+            if 'ID_SCSI_SERIAL' in device:
+                attrs['serial_id'] = device['ID_SCSI_SERIAL']
+            else:
+                attrs['serial_id'] = device['ID_SERIAL_SHORT']
+        except Exception as e:
+            self.handle_exception("Could not retrieve disk "
+                                  "serial ID - %s " % e)
+
+        try:
+            attrs['sector_size_bytes'] = self.get_sector_size(
+                device.device_node)
+        except Exception as e:
+            cacheable = False
+            self.handle_exception("Could not retrieve disk %s sector "
+                                  "size - %s" % (device.device_node, e))
+
+        attrs['rotational'] = self.is_rotational(device)
+
+        # Obtain device ID and WWN.
+        attrs['device_id'], attrs['device_wwn'] = \
+            self.get_device_id_wwn(device)
+
+        if cacheable:
+            self._disk_cache[device.device_node] = attrs
+        return attrs
+
     def idisk_get(self):
         """Enumerate disk topology based on:
 
@@ -237,6 +399,10 @@ class DiskOperator(object):
         idisk = []
         context = pyudev.Context()
 
+        self._process_udev_events()
+        rootfs_node = self.get_rootfs_node()
+        pv_names = None
+
         for device in context.list_devices(DEVTYPE='disk'):
             if not utils.is_system_usable_block_device(device):
                 continue
@@ -259,81 +425,35 @@ class DiskOperator(object):
                     LOG.error("Device %s does not have an ID_PATH value provided "
                               "by udev" % device.device_node)
 
-                size_mib = 0
+                static = self.get_disk_static_attributes(device)
                 available_mib = 0
-                model_num = ''
-                serial_id = ''
-
-                # Can merge all try/except in one block but this allows at least attributes with no exception to be filled
-                try:
-                    size_mib = utils.get_disk_capacity_mib(device.device_node)
-                except Exception as e:
-                    self.handle_exception("Could not retrieve disk size - %s "
-                                          % e)
 
                 try:
+                    # udev probes the partition table type of each disk, so
+                    # parted is only needed when that property is missing.
+                    if 'ID_PART_TABLE_TYPE' in device:
+                        is_gpt = device['ID_PART_TABLE_TYPE'] == 'gpt'
+                    else:
+                        is_gpt = utils.disk_is_gpt(
+                            device_node=device.device_node)
+                    if is_gpt and pv_names is None:
+                        pv_names = self.get_pv_names()
                     available_mib = self.get_disk_available_mib(
-                        device_node=device.device_node)
+                        device_node=device.device_node,
+                        is_gpt=is_gpt,
+                        pv_names=pv_names,
+                        sector_size_bytes=static['sector_size_bytes'])
                 except Exception as e:
                     self.handle_exception("Could not retrieve disk %s free space" % e)
 
-                try:
-                    # ID_MODEL received from udev is not correct for disks that
-                    # are used entirely for LVM. LVM replaced the model ID with
-                    # its own identifier that starts with "LVM PV".For this
-                    # reason we will attempt to retrieve the correct model ID
-                    # by using 2 different commands: hdparm and lsblk and
-                    # hdparm. If one of them fails, the other one can attempt
-                    # to retrieve the information. Else we use udev.
-
-                    # try hdparm command first
-                    hdparm_command = 'hdparm -I %s |grep Model' % (
-                        device.get('DEVNAME'))
-                    hdparm_process = subprocess.Popen(
-                        hdparm_command,
-                        stdout=subprocess.PIPE,
-                        shell=True)
-                    hdparm_output = hdparm_process.communicate()[0]
-                    if hdparm_process.returncode == 0:
-                        second_half = hdparm_output.split(':')[1]
-                        model_num = second_half.strip()
-                    else:
-                        # try lsblk command
-                        lsblk_command = 'lsblk -dn --output MODEL %s' % (
-                                             device.get('DEVNAME'))
-                        lsblk_process = subprocess.Popen(
-                                            lsblk_command,
-                                            stdout=subprocess.PIPE,
-                                            shell=True)
-                        lsblk_output = lsblk_process.communicate()[0]
-                        if lsblk_process.returncode == 0:
-                            model_num = lsblk_output.strip()
-                        else:
-                            # both hdparm and lsblk commands failed, try udev
-                            model_num = device.get('ID_MODEL')
-                    if not model_num:
-                        model_num = constants.DEVICE_MODEL_UNKNOWN
-                except Exception as e:
-                    self.handle_exception("Could not retrieve disk model "
-                                          "for disk %s. Exception: %s" %
-                                          (device.get('DEVNAME'), e))
-                try:
-                    if 'ID_SCSI_SERIAL' in device:
-                        serial_id = device['ID_SCSI_SERIAL']
-                    else:
-                        serial_id = device['ID_SERIAL_SHORT']
-                except Exception as e:
-                    self.handle_exception("Could not retrieve disk "
-                                          "serial ID - %s " % e)
-
                 capabilities = dict()
-                if model_num:
-                    capabilities.update({'model_num': model_num})
+                if static['model_num']:
+                    capabilities.update({'model_num': static['model_num']})
 
-                if self.get_rootfs_node() == device.device_node:
+                if rootfs_node == device.device_node:
                     capabilities.update({'stor_function': 'rootfs'})
 
-                rotational = self.is_rotational(device)
+                rotational = static['rotational']
                 device_type = device.device_type
 
                 rotation_rate = constants.DEVICE_TYPE_UNDETERMINED
@@ -350,19 +470,17 @@ class DiskOperator(object):
 
                 # TODO else: what is the other possible stor_function value?
                 #      or do we just use pair { 'is_rootfs': True } instead?
-                # Obtain device ID and WWN.
-                device_id, device_wwn = self.get_device_id_wwn(device)
 
                 attr = {
                         'device_node': device.device_node,
                         'device_num': device.device_number,
                         'device_type': device_type,
                         'device_path': device_path,
-                        'device_id': device_id,
-                        'device_wwn': device_wwn,
-                        'size_mib': size_mib,
+                        'device_id': static['device_id'],
+                        'device_wwn': static['device_wwn'],
+                        'size_mib': static['size_mib'],
                         'available_mib': available_mib,
-                        'serial_id': serial_id,
+                        'serial_id': static['serial_id'],
                         'capabilities': capabilities,
                         'rpm': rotation_rate,
                        }
@@ -55,6 +55,7 @@ from sysinv.agent import pv
 from sysinv.agent import lvg
 from sysinv.agent import pci
 from sysinv.agent import node
+from sysinv.agent import rpcapi as agent_rpcapi
 from sysinv.agent.lldp import plugin as lldp_plugin
 from sysinv.common import constants
 from sysinv.common import exception
@@ -66,6 +67,8 @@ from sysinv.conductor import rpcapi as conductor_rpcapi
 from sysinv.openstack.common import context as mycontext
 from sysinv.openstack.common import log
 from sysinv.openstack.common import periodic_task
+from sysinv.openstack.common import rpc
+from sysinv.openstack.common.rpc import dispatcher as rpc_dispatcher
 from sysinv.openstack.common.rpc.common import Timeout
 from sysinv.openstack.common.rpc.common import serialize_remote_exception
 from oslo_config import cfg
@@ -130,6 +133,10 @@ class AgentManager(service.PeriodicService):
 
     RPC_API_VERSION = '1.0'
 
+    # Keep the agent audits on the serial timer unless the
+    # periodic_tasks_concurrent option asks otherwise
+    periodic_tasks_concurrent = False
+
     def __init__(self, host, topic):
         serializer = objects_base.SysinvObjectSerializer()
         super(AgentManager, self).__init__(host, topic, serializer=serializer)
@@ -159,6 +166,9 @@ class AgentManager(service.PeriodicService):
         self._tpmconfig_rpc_failure = False
         self._tpmconfig_host_first_apply = False
         self._first_grub_update = False
+        self._host_topic_conn = None
+        self._host_topic = None
+        self._runtime_manifest_queue = []
 
     def start(self):
         super(AgentManager, self).start()
@@ -174,6 +184,41 @@ class AgentManager(service.PeriodicService):
         if tsc.system_mode == constants.SYSTEM_MODE_SIMPLEX:
             utils.touch(SYSINV_READY_FLAG)
 
+    def stop(self):
+        self._close_host_topic()
+        super(AgentManager, self).stop()
+
+    def _subscribe_host_topic(self):
+        """Consume the requests sent to this host's own topic.
+
+        Requests meant for a single host are cast to that host's topic
+        instead of being broadcast to every agent.  The host uuid is only
+        known once the host is provisioned, so the consumer is created
+        then, on its own connection.
+        """
+        topic = agent_rpcapi.get_host_topic(self._ihost_uuid, self.topic)
+        if topic == self._host_topic:
+            return
+
+        self._close_host_topic()
+        dispatcher = rpc_dispatcher.RpcDispatcher([self], self.serializer)
+        conn = rpc.create_connection(new=True)
+        conn.create_consumer(topic, dispatcher, fanout=False)
+        conn.consume_in_thread()
+        self._host_topic_conn = conn
+        self._host_topic = topic
+        LOG.info("Consuming host requests on topic %s" % topic)
+
+    def _close_host_topic(self):
+        if self._host_topic_conn is None:
+            return
+        try:
+            self._host_topic_conn.close()
+        except Exception:
+            pass
+        self._host_topic_conn = None
+        self._host_topic = None
+
     def _report_to_conductor_iplatform_avail(self):
         # First report sent to conductor since boot
         utils.touch(SYSINV_FIRST_REPORT_FLAG)
@@ -739,6 +784,7 @@ class AgentManager(service.PeriodicService):
                 self._ihost_uuid = ihost['uuid']
                 self._ihost_personality = ihost['personality']
                 self._mgmt_ip = ihost['mgmt_ip']
+                self._subscribe_host_topic()
 
                 if os.path.isfile(tsc.PLATFORM_CONF_FILE):
                     # read the platform config file and check for UUID
@@ -1406,11 +1452,14 @@ class AgentManager(service.PeriodicService):
 
     @retrying.retry(wait_fixed=15 * 1000, stop_max_delay=300 * 1000,
                     retry_on_exception=_retry_on_missing_mgmt_ip)
-    @utils.synchronized(LOCK_AGENT_ACTION, external=False)
     def config_apply_runtime_manifest(self, context, config_uuid, config_dict):
         """Asynchronously, have the agent apply the runtime manifest with the
         list of supplied tasks.
 
+        Requests received while another runtime manifest is being applied
+        are queued, and queued requests for the same personality are merged
+        into a single puppet apply.
+
         :param context: request context
         :param config_uuid: configuration uuid
         :param config_dict: dictionary of attributes, such as:
@@ -1420,6 +1469,8 @@ class AgentManager(service.PeriodicService):
                                    string or dict of uuid strings
         :           puppet.REPORT_STATUS_CFG: (opt) name of cfg operation to
                                               report back to sysinv conductor
+        :           request_id:    (opt) uuid of the request, the apply
+                                   states are reported back to the conductor
         :          }
         if puppet.REPORT_STATUS_CFG is set then Sysinv Agent will return the
         config operation status by calling back report_config_status(...).
@@ -1455,6 +1506,54 @@ class AgentManager(service.PeriodicService):
 
         LOG.info("config_apply_runtime_manifest: %s %s %s" % (
             config_uuid, config_dict, self._ihost_personality))
+
+        self._runtime_manifest_queue.append(
+            (context, config_uuid, config_dict))
+        self._report_runtime_config(context, config_uuid, config_dict,
+                                    constants.RUNTIME_CONFIG_STATE_QUEUED)
+        self._apply_queued_runtime_manifests()
+
+    @utils.synchronized(LOCK_AGENT_ACTION, external=False)
+    def _apply_queued_runtime_manifests(self):
+        """Apply the queued runtime manifest requests.
+
+        The requests queued while waiting for the lock are applied together,
+        with one puppet apply per personality.
+        """
+        while self._runtime_manifest_queue:
+            requests = self._runtime_manifest_queue
+            personality = self._get_runtime_personality(
+                requests[0][2].get('personalities', []))
+            merged = [r for r in requests if personality ==
+                      self._get_runtime_personality(
+                          r[2].get('personalities', []))]
+            self._runtime_manifest_queue = [r for r in requests
+                                            if r not in merged]
+            self._apply_merged_runtime_manifest(merged)
+
+    def _apply_merged_runtime_manifest(self, requests):
+        """Apply the classes of several runtime manifest requests at once.
+
+        :param requests: list of (context, config_uuid, config_dict)
+        """
+        context, config_uuid, config_dict = requests[-1]
+
+        classes = []
+        for _, _, request_dict in requests:
+            for c in self._get_runtime_classes(request_dict):
+                if c not in classes:
+                    classes.append(c)
+        config_dict = dict(config_dict, classes=classes)
+        if len(requests) > 1:
+            LOG.info("Merged %d runtime manifest requests: %s" %
+                     (len(requests), classes))
+
+        for request_context, request_uuid, request_dict in requests:
+            self._report_runtime_config(
+                request_context, request_uuid, request_dict,
+                constants.RUNTIME_CONFIG_STATE_RUNNING)
+
+        start = time.time()
         try:
 
             if not os.path.exists(tsc.PUPPET_PATH):
@@ -1475,37 +1574,103 @@ class AgentManager(service.PeriodicService):
                 LOG.info("controller-active")
                 self._apply_runtime_manifest(config_dict)
 
-        except Exception:
-            # We got an error, serialize and return the exception to conductor
-            if config_dict.get(puppet.REPORT_STATUS_CFG):
-                config_dict['host_uuid'] = self._ihost_uuid
-                LOG.info("Manifests application failed. "
-                         "Reporting failure to conductor. "
-                         "Details: %s." % config_dict)
-                error = serialize_remote_exception(sys.exc_info())
+        except Exception as e:
+            duration = time.time() - start
+            error = serialize_remote_exception(sys.exc_info())
+            for request_context, request_uuid, request_dict in requests:
+                self._report_runtime_config(
+                    request_context, request_uuid, request_dict,
+                    constants.RUNTIME_CONFIG_STATE_FAILED,
+                    duration=duration, error=str(e))
+
+                # We got an error, serialize and return the exception to
+                # conductor
+                if request_dict.get(puppet.REPORT_STATUS_CFG):
+                    request_dict['host_uuid'] = self._ihost_uuid
+                    LOG.info("Manifests application failed. "
+                             "Reporting failure to conductor. "
+                             "Details: %s." % request_dict)
+                    rpcapi = conductor_rpcapi.ConductorAPI(
+                        topic=conductor_rpcapi.MANAGER_TOPIC)
+                    rpcapi.report_config_status(request_context,
+                                                request_dict,
+                                                status=puppet.REPORT_FAILURE,
+                                                error=error)
+            return
+
+        duration = time.time() - start
+        inventory_updates = []
+        for request_context, request_uuid, request_dict in requests:
+            self._report_runtime_config(
+                request_context, request_uuid, request_dict,
+                constants.RUNTIME_CONFIG_STATE_SUCCESS, duration=duration)
+
+            if request_dict.get(puppet.REPORT_STATUS_CFG):
+                request_dict['host_uuid'] = self._ihost_uuid
+                LOG.debug("Manifests application succeeded. "
+                          "Reporting success to conductor. "
+                          "Details: %s." % request_dict)
                 rpcapi = conductor_rpcapi.ConductorAPI(
                     topic=conductor_rpcapi.MANAGER_TOPIC)
-                rpcapi.report_config_status(context, config_dict,
-                                            status=puppet.REPORT_FAILURE,
-                                            error=error)
-            raise
-
-        if config_dict.get(puppet.REPORT_STATUS_CFG):
-            config_dict['host_uuid'] = self._ihost_uuid
-            LOG.debug("Manifests application succeeded. "
-                      "Reporting success to conductor. "
-                      "Details: %s." % config_dict)
-            rpcapi = conductor_rpcapi.ConductorAPI(
-                topic=conductor_rpcapi.MANAGER_TOPIC)
-            rpcapi.report_config_status(context, config_dict,
-                                        status=puppet.REPORT_SUCCESS,
-                                        error=None)
+                rpcapi.report_config_status(request_context, request_dict,
+                                            status=puppet.REPORT_SUCCESS,
+                                            error=None)
 
-        if config_dict.get(puppet.REPORT_INVENTORY_UPDATE):
-            self._report_inventory(context, config_dict)
+            inventory_update = request_dict.get(
+                puppet.REPORT_INVENTORY_UPDATE)
+            if inventory_update and inventory_update not in inventory_updates:
+                inventory_updates.append(inventory_update)
+                self._report_inventory(request_context, request_dict)
 
         self._report_config_applied(context)
 
+    @staticmethod
+    def _get_runtime_classes(config_dict):
+        classes = config_dict.get('classes', [])
+        if not isinstance(classes, list):
+            classes = [classes]
+        return classes
+
+    def _report_runtime_config(self, context, config_uuid, config_dict,
+                               state, duration=None, error=None):
+        """Report the state of a runtime manifest request to the conductor.
+
+        Only the requests that carry a request_id are tracked.
+        """
+        request_id = config_dict.get('request_id')
+        if not request_id:
+            return
+
+        runtime_config = {
+            'request_id': request_id,
+            'config_uuid': str(config_uuid),
+            'classes': ','.join(self._get_runtime_classes(config_dict)),
+            'state': state,
+        }
+        if duration is not None:
+            runtime_config['duration'] = duration
+        if error:
+            runtime_config['error'] = error
+        try:
+            rpcapi = conductor_rpcapi.ConductorAPI(
+                topic=conductor_rpcapi.MANAGER_TOPIC)
+            rpcapi.report_runtime_config_status(context, self._ihost_uuid,
+                                                runtime_config)
+        except Exception as e:
+            LOG.warn("Failed to report runtime config %s state %s: %s" %
+                     (request_id, state, e))
+
+    def _get_runtime_personality(self, personalities):
+        personality = None
+        for subfunction in self.subfunctions_list_get():
+            # We need to find the subfunction that matches the personality
+            # being requested. e.g. in AIO systems if we request a worker
+            # personality we should apply the manifest with that
+            # personality
+            if subfunction in personalities:
+                personality = subfunction
+        return personality
+
     def _apply_runtime_manifest(self, config_dict, hieradata_path=PUPPET_HIERADATA_PATH):
 
         LOG.info("_apply_runtime_manifest with hieradata_path = '%s' " % hieradata_path)
@@ -1517,17 +1682,8 @@ class AgentManager(service.PeriodicService):
             config = {
                 'classes': config_dict.get('classes', [])
             }
-            personalities = config_dict.get('personalities', [])
-
-            personality = None
-
-            for subfunction in self.subfunctions_list_get():
-                # We need to find the subfunction that matches the personality
-                # being requested. e.g. in AIO systems if we request a worker
-                # personality we should apply the manifest with that
-                # personality
-                if subfunction in personalities:
-                    personality = subfunction
+            personality = self._get_runtime_personality(
+                config_dict.get('personalities', []))
 
             if not personality:
                 LOG.error("failed to find 'personality' in host subfunctions")
@@ -17,6 +17,9 @@ from os.path import isfile
 from os.path import join
 import re
 import subprocess
+import time
+
+from eventlet import greenthread
 
 from sysinv.openstack.common import log as logging
 import tsconfig.tsconfig as tsc
@@ -51,6 +54,56 @@ COMPUTE_MIN_MB = 1600
 # units
 COMPUTE_MIN_NON_0_MB = 500
 
+# Platform reserved memory configuration
+WORKER_RESERVED_CONF = '/etc/platform/worker_reserved.conf'
+
+# Defines the time budget (in seconds) for collecting the PSS of all processes
+PSS_TIME_BUDGET = 5
+
+# Defines the number of processes read between yields to other greenthreads
+PSS_YIELD_INTERVAL = 20
+
+
+def get_total_pss_kb(time_budget=None):
+    """Sum the proportional set size of all processes.
+
+    Reads /proc/<pid>/smaps_rollup where the kernel provides it, otherwise
+    /proc/<pid>/smaps, one line at a time.  Processes that exit or cannot be
+    read are skipped.  Other greenthreads, such as the RPC consumers, run
+    every PSS_YIELD_INTERVAL processes.
+
+    :param time_budget: seconds after which collection stops
+    :returns: tuple of total PSS in KB and whether all processes were read
+    """
+    if os.path.exists('/proc/self/smaps_rollup'):
+        smaps = 'smaps_rollup'
+    else:
+        smaps = 'smaps'
+
+    deadline = None
+    if time_budget:
+        deadline = time.time() + time_budget
+
+    pss_kb = 0
+    count = 0
+    for pid in listdir('/proc'):
+        if not pid.isdigit():
+            continue
+        count += 1
+        if count % PSS_YIELD_INTERVAL == 0:
+            greenthread.sleep(0)
+        if deadline and time.time() > deadline:
+            return pss_kb, False
+        try:
+            with open('/proc/%s/%s' % (pid, smaps), 'r') as f:
+                for line in f:
+                    if line.startswith('Pss:'):
+                        pss_kb += int(line.split()[1])
+        except (IOError, OSError, ValueError, IndexError):
+            continue
+
+    return pss_kb, True
+
 
 class CPU:
     '''Class to encapsulate CPU data for System Inventory'''
@@ -101,6 +154,9 @@ class NodeOperator(object):
         self.total_memory_nodes_mb = []
         self.free_memory_nodes_mb = []
         self.topology = {}
+        self._worker_reserved = None
+        self._worker_reserved_mtime = None
+        self._pss_mb = None
 
         # self._get_cpu_topology()
         # self._get_total_memory_mb()
@@ -292,36 +348,83 @@ class NodeOperator(object):
         return [name for name in listdir(dir)
                 if os.path.isdir(join(dir, name))]
 
+    def _get_worker_reserved_config(self):
+        """Return the settings of worker_reserved.conf as a dict.
+
+        The file is only parsed again when its modification time changes.
+        """
+        mtime = os.stat(WORKER_RESERVED_CONF).st_mtime
+        if (self._worker_reserved is None or
+                mtime != self._worker_reserved_mtime):
+            config = {}
+            with open(WORKER_RESERVED_CONF, 'r') as infile:
+                for line in infile:
+                    if '=' in line and not line.startswith('#'):
+                        key, value = line.split("=", 1)
+                        config[key.strip()] = value.strip('\n')
+            self._worker_reserved = config
+            self._worker_reserved_mtime = mtime
+        return self._worker_reserved
+
     def _get_vswitch_reserved_memory(self, node):
         # Read vswitch memory from worker_reserved.conf
 
         vswitch_hugepages_nr = 0
         vswitch_hugepages_size = 0
         try:
-            with open('/etc/platform/worker_reserved.conf', 'r') as infile:
-                for line in infile:
-                    if line.startswith("COMPUTE_VSWITCH_MEMORY="):
-                        val = line.split("=")
-                        vswitch_reserves = val[1].strip('\n')[1:-1]
-                        for idx, reserve in enumerate(vswitch_reserves.split()):
-                            if idx != node:
-                                continue
-                            reserve = reserve.split(":")
-                            if reserve[0].strip('"') == "node%d" % node:
-                                pages_nr = re.sub('[^0-9]', '', reserve[2])
-                                pages_size = reserve[1]
-
-                                vswitch_hugepages_nr = int(pages_nr)
-                                if pages_size == "1048576kB":
-                                    vswitch_hugepages_size = SIZE_1G_MB
-                                else:
-                                    vswitch_hugepages_size = SIZE_2M_MB
-                        break
+            config = self._get_worker_reserved_config()
+            if "COMPUTE_VSWITCH_MEMORY" in config:
+                vswitch_reserves = config["COMPUTE_VSWITCH_MEMORY"][1:-1]
+                for idx, reserve in enumerate(vswitch_reserves.split()):
+                    if idx != node:
+                        continue
+                    reserve = reserve.split(":")
+                    if reserve[0].strip('"') == "node%d" % node:
+                        pages_nr = re.sub('[^0-9]', '', reserve[2])
+                        pages_size = reserve[1]
+
+                        vswitch_hugepages_nr = int(pages_nr)
+                        if pages_size == "1048576kB":
+                            vswitch_hugepages_size = SIZE_1G_MB
+                        else:
+                            vswitch_hugepages_size = SIZE_2M_MB
         except Exception as e:
             LOG.debug("Could not read vswitch reserved memory: %s", e)
 
         return vswitch_hugepages_nr, vswitch_hugepages_size
 
+    def _get_base_reserved_memory(self, node):
+        # Read base memory from worker_reserved.conf
+        base_mem_mb = 0
+        config = self._get_worker_reserved_config()
+        if "WORKER_BASE_RESERVED" in config:
+            base_reserves = config["WORKER_BASE_RESERVED"][1:-1]
+            for reserve in base_reserves.split():
+                reserve = reserve.split(":")
+                if reserve[0].strip('"') == "node%d" % node:
+                    base_mem_mb = int(reserve[1].strip('MB'))
+        return base_mem_mb
+
+    def _get_platform_pss_mb(self):
+        """Return the PSS of all processes in MB.
+
+        If the collection runs out of its time budget the previous complete
+        measurement is reused, when there is one.
+        """
+        start = time.time()
+        pss_kb, complete = get_total_pss_kb(PSS_TIME_BUDGET)
+        pss_mb = int(pss_kb / 1024.0)
+        if complete:
+            self._pss_mb = pss_mb
+        else:
+            LOG.warn("PSS collection exceeded its %ss budget" %
+                     PSS_TIME_BUDGET)
+            if self._pss_mb is not None:
+                pss_mb = self._pss_mb
+        LOG.debug("PSS %d MB collected in %.3fs" %
+                  (pss_mb, time.time() - start))
+        return pss_mb
+
     def _inode_get_memory_hugepages(self):
         """Collect hugepage info, including vswitch, and vm.
            Collect platform reserved if config.
@@ -492,34 +595,16 @@ class NodeOperator(object):
             # Calculate PSS
             pss_mb = 0
             if node == 0:
-                cmd = 'cat /proc/*/smaps 2>/dev/null | awk \'/^Pss:/ ' \
-                      '{a += $2;} END {printf "%d\\n", a/1024.0;}\''
                 try:
-                    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
-                                            shell=True)
-                    result = proc.stdout.read().strip()
-                    pss_mb = int(result)
-                except subprocess.CalledProcessError as e:
-                    LOG.error("Cannot calculate PSS (%s) (%d)", cmd,
-                              e.returncode)
+                    pss_mb = self._get_platform_pss_mb()
                 except OSError as e:
-                    LOG.error("Failed to execute (%s) OS error (%d)", cmd,
-                              e.errno)
+                    LOG.error("Cannot calculate PSS, OS error (%d)", e.errno)
 
             # need to multiply total_mb by 1024
             node_total_kb = total_hp_mb * SIZE_KB + free_kb + pss_mb * SIZE_KB
 
             # Read base memory from worker_reserved.conf
-            base_mem_mb = 0
-            with open('/etc/platform/worker_reserved.conf', 'r') as infile:
-                for line in infile:
-                    if "WORKER_BASE_RESERVED" in line:
-                        val = line.split("=")
-                        base_reserves = val[1].strip('\n')[1:-1]
-                        for reserve in base_reserves.split():
-                            reserve = reserve.split(":")
-                            if reserve[0].strip('"') == "node%d" % node:
-                                base_mem_mb = int(reserve[1].strip('MB'))
+            base_mem_mb = self._get_base_reserved_memory(node)
 
             # On small systems, clip memory overhead to more reasonable minimal
             # settings
@@ -636,7 +721,7 @@ class NodeOperator(object):
         '''
         imemory = []
 
-        if os.path.isfile("/etc/platform/worker_reserved.conf"):
+        if os.path.isfile(WORKER_RESERVED_CONF):
             imemory = self._inode_get_memory_hugepages()
         else:
             imemory = self._inode_get_memory_nonhugepages()
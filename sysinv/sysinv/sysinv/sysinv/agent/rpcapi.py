@@ -23,6 +23,10 @@
 Client side of the agent RPC API.
 """
 
+import collections
+import six
+
+from oslo_config import cfg
 from sysinv.objects import base as objects_base
 import sysinv.openstack.common.rpc.proxy
 from sysinv.openstack.common import log
@@ -31,6 +35,35 @@ LOG = log.getLogger(__name__)
 
 MANAGER_TOPIC = 'sysinv.agent_manager'
 
+agent_rpcapi_opts = [
+    cfg.BoolOpt('host_topics',
+                default=False,
+                help=('Send requests meant for a single host to that '
+                      'host\'s agent topic instead of broadcasting them to '
+                      'all agents. Only enable once every agent consumes '
+                      'its host topic: an agent subscribes once it knows '
+                      'its host and agents of previous releases never do, '
+                      'the requests cast to a topic nobody consumes are '
+                      'lost.')),
+]
+
+CONF = cfg.CONF
+CONF.register_opts(agent_rpcapi_opts, 'agent')
+
+# Number of agent requests sent per method, by delivery type
+_message_stats = collections.defaultdict(lambda: {'unicast': 0, 'fanout': 0})
+
+
+def get_host_topic(host_uuid, topic=MANAGER_TOPIC):
+    """Return the topic consumed only by the agent of the given host."""
+    return '%s.%s' % (topic, host_uuid)
+
+
+def get_message_stats():
+    """Return the number of unicast and fanout requests sent per method."""
+    return dict((method, dict(counts))
+                for method, counts in _message_stats.items())
+
 
 class AgentAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
     """Client side of the agent RPC API.
@@ -51,6 +84,27 @@ class AgentAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
             serializer=objects_base.SysinvObjectSerializer(),
             default_version=self.RPC_API_VERSION)
 
+    def _fanout_cast(self, context, msg):
+        _message_stats[msg['method']]['fanout'] += 1
+        return self.fanout_cast(context, msg)
+
+    def _cast_to_hosts(self, context, msg, host_uuids):
+        """Cast a request to the agents of the given hosts only.
+
+        The request is broadcast to all agents instead when host topics
+        are disabled or no host is given; agents ignore requests that are
+        not meant for them either way.
+        """
+        if isinstance(host_uuids, six.string_types):
+            host_uuids = [host_uuids]
+        if not CONF.agent.host_topics or not host_uuids:
+            return self._fanout_cast(context, msg)
+
+        for host_uuid in host_uuids:
+            _message_stats[msg['method']]['unicast'] += 1
+            self.cast(context, msg,
+                      topic=get_host_topic(host_uuid, self.topic))
+
     def ihost_inventory(self, context, values):
         """Synchronously, have a agent collect inventory for this ihost.
 
@@ -75,7 +129,7 @@ class AgentAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         # fanout / broadcast message to all inventory agents
         # to change systemname on all nodes ... standby controller and worker nodes
         LOG.debug("AgentApi.configure_isystemname: fanout_cast: sending systemname to agent")
-        retval = self.fanout_cast(context, self.make_msg('configure_isystemname',
+        retval = self._fanout_cast(context, self.make_msg('configure_isystemname',
                            systemname=systemname))
 
         return retval
@@ -100,7 +154,7 @@ class AgentAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
                   " iconfig %s %s to agent" % (iconfig_uuid, iconfig_dict))
 
         # fanout / broadcast message to all inventory agents
-        retval = self.fanout_cast(context, self.make_msg(
+        retval = self._fanout_cast(context, self.make_msg(
                            'iconfig_update_file',
                            iconfig_uuid=iconfig_uuid,
                            iconfig_dict=iconfig_dict))
@@ -117,13 +171,13 @@ class AgentAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         :                    written into /etc/platform/platform.conf
         """
 
-        LOG.debug("AgentApi.iconfig_update_install_uuid: fanout_cast: sending"
+        LOG.debug("AgentApi.iconfig_update_install_uuid: sending"
                   " install_uuid %s to agent" % install_uuid)
 
-        retval = self.fanout_cast(context, self.make_msg(
+        retval = self._cast_to_hosts(context, self.make_msg(
                            'iconfig_update_install_uuid',
                            host_uuid=host_uuid,
-                           install_uuid=install_uuid))
+                           install_uuid=install_uuid), host_uuid)
 
         return retval
 
@@ -132,14 +186,16 @@ class AgentAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
            manifest based upon the config_dict (including personalities).
         """
 
-        LOG.debug("config_apply_runtime_manifest: fanout_cast: sending"
+        LOG.debug("config_apply_runtime_manifest: sending"
                   " config %s %s to agent" % (config_uuid, config_dict))
 
-        # fanout / broadcast message to all inventory agents
-        retval = self.fanout_cast(context, self.make_msg(
-                                  'config_apply_runtime_manifest',
-                                  config_uuid=config_uuid,
-                                  config_dict=config_dict))
+        # send to the targeted hosts, or broadcast to all inventory agents
+        # when the manifest applies to every host of the personalities
+        retval = self._cast_to_hosts(context, self.make_msg(
+                                     'config_apply_runtime_manifest',
+                                     config_uuid=config_uuid,
+                                     config_dict=config_dict),
+                                     config_dict.get('host_uuids'))
         return retval
 
     def configure_ttys_dcd(self, context, uuid, ttys_dcd):
@@ -151,12 +207,11 @@ class AgentAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         :param ttys_dcd: the flag to enable/disable dcd
         :returns: none ... uses asynchronous cast().
         """
-        # fanout / broadcast message to all inventory agents
-        LOG.debug("AgentApi.configure_ttys_dcd: fanout_cast: sending "
+        LOG.debug("AgentApi.configure_ttys_dcd: sending "
                   "dcd update to agent: (%s) (%s" % (uuid, ttys_dcd))
-        retval = self.fanout_cast(
+        retval = self._cast_to_hosts(
             context, self.make_msg('configure_ttys_dcd',
-                                   uuid=uuid, ttys_dcd=ttys_dcd))
+                                   uuid=uuid, ttys_dcd=ttys_dcd), uuid)
 
         return retval
 
@@ -168,15 +223,14 @@ class AgentAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         :param software_version: the version of the load to remove
         :returns: none ... uses asynchronous cast().
         """
-        # fanout / broadcast message to all inventory agents
-        LOG.debug("AgentApi.delete_load: fanout_cast: sending "
+        LOG.debug("AgentApi.delete_load: sending "
                   "delete load to agent: (%s) (%s) " %
                   (host_uuid, software_version))
-        retval = self.fanout_cast(
+        retval = self._cast_to_hosts(
             context, self.make_msg(
                 'delete_load',
                 host_uuid=host_uuid,
-                software_version=software_version))
+                software_version=software_version), host_uuid)
 
         return retval
 
@@ -187,10 +241,10 @@ class AgentAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         :param software_upgrade: software_upgrade object
         :returns: none
         """
-        retval = self.fanout_cast(context,
-                                  self.make_msg(
-                                      'create_simplex_backup',
-                                      software_upgrade=software_upgrade))
+        retval = self._fanout_cast(context,
+                                   self.make_msg(
+                                       'create_simplex_backup',
+                                       software_upgrade=software_upgrade))
 
         return retval
 
@@ -204,7 +258,7 @@ class AgentAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         # fanout / broadcast message to all inventory agents
         LOG.debug("AgentApi.apply_tpm_config: fanout_cast: sending "
                   "apply_tpm_config to agent")
-        retval = self.fanout_cast(
+        retval = self._fanout_cast(
             context, self.make_msg(
                 'apply_tpm_config',
                 tpm_context=tpm_context))
@@ -223,10 +277,14 @@ class AgentAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         :returns: pass or fail
         """
 
+        topic = None
+        if CONF.agent.host_topics:
+            topic = get_host_topic(host_uuid, self.topic)
         return self.call(context,
                          self.make_msg('delete_pv',
                                        host_uuid=host_uuid,
                                        ipv_dict=ipv_dict),
+                         topic=topic,
                          timeout=300)
 
     def execute_command(self, context, host_uuid, command):
@@ -237,14 +295,13 @@ class AgentAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         :param command: the command to execute
         :returns: none ... uses asynchronous cast().
         """
-        # fanout / broadcast message to all inventory agents
-        LOG.debug("AgentApi.update_cpu_config: fanout_cast: sending "
+        LOG.debug("AgentApi.execute_command: sending "
                   "host uuid: (%s) " % host_uuid)
-        retval = self.fanout_cast(
+        retval = self._cast_to_hosts(
             context, self.make_msg(
                 'execute_command',
                 host_uuid=host_uuid,
-                command=command))
+                command=command), host_uuid)
 
         return retval
 
@@ -259,16 +316,15 @@ class AgentAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         :return:  none ... uses asynchronous cast().
         """
 
-        # fanout / broadcast message to all inventory agents
-        LOG.info("AgentApi.agent_update: fanout_cast: sending "
+        LOG.info("AgentApi.agent_update: sending "
                  "update request to agent for: (%s)" %
                  (', '.join(force_updates)))
-        retval = self.fanout_cast(
+        retval = self._cast_to_hosts(
             context, self.make_msg(
                 'agent_audit',
                 host_uuid=host_uuid,
                 force_updates=force_updates,
-                cinder_device=cinder_device))
+                cinder_device=cinder_device), host_uuid)
 
         return retval
 
@@ -283,12 +339,13 @@ class AgentAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         :returns: pass or fail
         """
 
-        return self.fanout_cast(
+        return self._cast_to_hosts(
             context,
             self.make_msg('disk_format_gpt',
                           host_uuid=host_uuid,
                           idisk_dict=idisk_dict,
-                          is_cinder_device=is_cinder_device))
+                          is_cinder_device=is_cinder_device),
+            host_uuid)
 
     def update_host_memory(self, context, host_uuid):
         """Asynchronously, have the agent to send host memory update
@@ -297,6 +354,7 @@ class AgentAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         :param host_uuid: ihost uuid unique id
         :returns: pass or fail
         """
-        return self.fanout_cast(context,
-                                self.make_msg('update_host_memory',
-                                              host_uuid=host_uuid))
+        return self._cast_to_hosts(context,
+                                   self.make_msg('update_host_memory',
+                                                 host_uuid=host_uuid),
+                                   host_uuid)
@@ -75,6 +75,7 @@ from sysinv.api.controllers.v1 import lldp_neighbour
 from sysinv.api.controllers.v1 import mtce_api
 from sysinv.api.controllers.v1 import pci_device
 from sysinv.api.controllers.v1 import route
+from sysinv.api.controllers.v1 import runtime_config
 from sysinv.api.controllers.v1 import sm_api
 from sysinv.api.controllers.v1 import state
 from sysinv.api.controllers.v1 import types
@@ -1078,6 +1079,10 @@ class HostController(rest.RestController):
     labels = label.LabelController(from_ihosts=True)
     "Expose labels as a sub-element of ihosts"
 
+    runtime_configs = runtime_config.RuntimeConfigController(
+        from_ihosts=True)
+    "Expose runtime manifest apply records as a sub-element of ihosts"
+
     interface_networks = interface_network.InterfaceNetworkController(
         parent="ihosts")
     "Expose interface_networks as a sub-element of ihosts"
@@ -361,7 +361,7 @@ class InterfaceController(rest.RestController):
                 marker)
 
         if ihost_uuid:
-            interfaces = pecan.request.dbapi.iinterface_get_by_ihost(
+            interfaces = pecan.request.dbapi.iinterface_get_by_ihost_eager(
                 ihost_uuid, limit,
                 marker_obj,
                 sort_key=sort_key,
@@ -72,6 +72,11 @@ CONF.import_opt('journal_default_size',
                 'sysinv.api.controllers.v1.storage',
                 group='journal')
 
+# Profile types whose apply only updates the database and can be committed
+# in a single transaction per host
+TRANSACTIONAL_PROFILE_TYPES = [constants.PROFILE_TYPE_CPU,
+                               constants.PROFILE_TYPE_MEMORY]
+
 # Defines the fields that must be copied in/out of interface profiles
 INTERFACE_PROFILE_FIELDS = ['ifname', 'iftype', 'imtu', 'networktype',
                             'ifclass', 'aemode', 'networks',
@@ -464,6 +469,32 @@ class StorageProfile(BaseProfile):
     "list of logical volume group objects"
 
 
+class ProfileApply(base.APIBase):
+    """API representation of a request to apply a profile to many hosts."""
+
+    profile_uuid = types.uuid
+    "uuid of the profile to apply"
+
+    host_uuids = [types.uuid]
+    "list of uuids of the hosts to apply the profile to"
+
+
+class ProfileApplyResult(base.APIBase):
+    """API representation of the outcome of applying a profile to a host."""
+
+    host_uuid = types.uuid
+    "uuid of the host"
+
+    hostname = wtypes.text
+    "name of the host"
+
+    success = bool
+    "whether the profile was applied to the host"
+
+    reason = wtypes.text
+    "reason the profile could not be applied"
+
+
 class ProfileCollection(collection.Collection):
     """API representation of a collection of ihosts."""
 
@@ -530,6 +561,7 @@ class ProfileController(rest.RestController):
         'memprofiles_list': ['GET'],
         'storprofiles_list': ['GET'],
         'import_profile': ['POST'],
+        'apply': ['POST'],
     }
 
     #############
@@ -1020,6 +1052,27 @@ class ProfileController(rest.RestController):
             raise wsme.exc.ClientSideError(_("Delete not allowed - recordtype "
                                              "is not a profile."))
 
+    @cutils.synchronized(LOCK_NAME)
+    @wsme_pecan.wsexpose([ProfileApplyResult], body=ProfileApply)
+    def apply(self, body):
+        """Apply a profile to several locked hosts in one request.
+
+        The profile is read and validated once. A host that fails is
+        reported in its result and does not stop the remaining hosts.
+        """
+        if self._from_chassis:
+            raise exception.OperationNotPermitted
+
+        if utils.get_system_mode() == constants.SYSTEM_MODE_SIMPLEX:
+            raise wsme.exc.ClientSideError(_(
+                "Applying a profile on a simplex system is not allowed."))
+
+        if not body.host_uuids:
+            raise wsme.exc.ClientSideError(_("No hosts specified."))
+
+        results = apply_profile_to_hosts(body.host_uuids, body.profile_uuid)
+        return [ProfileApplyResult(**r) for r in results]
+
     @cutils.synchronized(LOCK_NAME)
     @expose('json')
     def import_profile(self, file):
@@ -2394,7 +2447,112 @@ def memoryprofile_delete_data(profile):
 def apply_profile(host_id, profile_id):
     host = pecan.request.dbapi.ihost_get(host_id)
     profile = pecan.request.dbapi.ihost_get(profile_id)
+    return _apply_profile(host, profile)
+
+
+def apply_profile_to_hosts(host_ids, profile_id):
+    """Apply a profile to several hosts.
+
+    The profile data is read once and reused for every host. Each host is
+    applied independently; a failure is recorded in that host's result.
+
+    The changes of a cpu or memory profile are committed in one
+    transaction per host, so a host is either fully updated or left as it
+    was. Interface and storage profiles call the conductor while they are
+    applied, which needs to see their changes, so they are committed as
+    they are made.
+
+    Like the apply-profile host action, this does not regenerate any
+    configuration: the hosts are locked and are configured when unlocked.
 
+    :returns: list of dicts with host_uuid, hostname, success and reason
+    """
+    profile = pecan.request.dbapi.ihost_get(profile_id)
+    if profile.recordtype != "profile":
+        raise wsme.exc.ClientSideError(_("%s is not a profile." %
+                                         profile_id))
+    profiletype = _get_profiletype(profile)
+    transactional = profiletype in TRANSACTIONAL_PROFILE_TYPES
+
+    results = []
+    for host_id in host_ids:
+        result = {'host_uuid': host_id, 'hostname': None,
+                  'success': False, 'reason': None}
+        try:
+            host = pecan.request.dbapi.ihost_get(host_id)
+            result['hostname'] = host.hostname
+            if host.recordtype == "profile":
+                raise wsme.exc.ClientSideError(_(
+                    "Can not apply a profile to profile %s." % host.hostname))
+            if host.administrative == constants.ADMIN_UNLOCKED:
+                raise wsme.exc.ClientSideError(_(
+                    "Can not apply profile to an 'unlocked' host %s; "
+                    "Please 'Lock' first." % host.hostname))
+            if transactional:
+                with pecan.request.dbapi.transaction():
+                    _apply_profile(host, profile, profiletype)
+            else:
+                _apply_profile(host, profile, profiletype)
+            result['success'] = True
+        except exception.NotFound:
+            result['reason'] = _("Host %s not found." % host_id)
+        except wsme.exc.ClientSideError as cse:
+            result['reason'] = six.text_type(cse.msg)
+        except Exception as e:
+            LOG.exception(e)
+            result['reason'] = _("Failed to apply profile.")
+        results.append(result)
+
+    LOG.info("Applied profile %s to %d of %d hosts" %
+             (profile.hostname, len([r for r in results if r['success']]),
+              len(results)))
+    return results
+
+
+def _load_profile_data(profile, loader):
+    """Read a profile's data with loader unless it was already read.
+
+    This lets apply_profile_to_hosts read the profile once for all hosts.
+    """
+    loaded = getattr(profile, '_profile_data_loaded', None)
+    if loaded is None:
+        loaded = set()
+        profile._profile_data_loaded = loaded
+    if loader not in loaded:
+        loader(profile)
+        loaded.add(loader)
+
+
+def _cpuprofile_load(profile):
+    profile.cpus = pecan.request.dbapi.icpu_get_by_ihost(profile.uuid, sort_key=['forinodeid', 'core', 'thread'])
+    profile.nodes = pecan.request.dbapi.inode_get_by_ihost(profile.uuid, sort_key='numa_node')
+
+
+def _ifprofile_load(profile):
+    profile.ethernet_ports = pecan.request.dbapi.ethernet_port_get_by_host(profile.uuid)
+    profile.interfaces = pecan.request.dbapi.iinterface_get_by_ihost(profile.uuid)
+    profile.routes = _get_routes(profile.id)
+
+
+def _storprofile_load(profile):
+    profile.disks = pecan.request.dbapi.idisk_get_by_ihost(profile.uuid)
+    profile.stors = pecan.request.dbapi.istor_get_by_ihost(profile.uuid)
+
+
+def _localstorageprofile_load(profile):
+    profile.disks = pecan.request.dbapi.idisk_get_by_ihost(profile.uuid)
+    profile.partitions = pecan.request.dbapi.partition_get_by_ihost(
+        profile.uuid)
+    profile.ilvgs = pecan.request.dbapi.ilvg_get_by_ihost(profile.uuid)
+    profile.ipvs = pecan.request.dbapi.ipv_get_by_ihost(profile.uuid)
+
+
+def _memoryprofile_load(profile):
+    profile.memory = pecan.request.dbapi.imemory_get_by_ihost(profile.uuid)
+    profile.nodes = pecan.request.dbapi.inode_get_by_ihost(profile.uuid)
+
+
+def _apply_profile(host, profile, profiletype=None):
     """
     NOTE (neid):
         if adding a functionality for some or 'all' profiles (eg applying cpu, if AND stor)
@@ -2405,7 +2563,8 @@ def apply_profile(host_id, profile_id):
         TODO:   might need an action to continue on next profile type even if exception raised?
                 eg: if failed to apply cpuprofile, report error and continue to apply ifprofile
     """
-    profiletype = _get_profiletype(profile)
+    if profiletype is None:
+        profiletype = _get_profiletype(profile)
     if constants.PROFILE_TYPE_CPU in profiletype.lower():
         return cpuprofile_apply_to_host(host, profile)
     elif constants.PROFILE_TYPE_INTERFACE in profiletype.lower():
@@ -2429,8 +2588,7 @@ def cpuprofile_apply_to_host(host, profile):
         raise wsme.exc.ClientSideError("Host (%s) has no processors "
                                        "or cores." % host.hostname)
 
-    profile.cpus = pecan.request.dbapi.icpu_get_by_ihost(profile.uuid, sort_key=['forinodeid', 'core', 'thread'])
-    profile.nodes = pecan.request.dbapi.inode_get_by_ihost(profile.uuid, sort_key='numa_node')
+    _load_profile_data(profile, _cpuprofile_load)
     if not profile.cpus or not profile.nodes:
         raise wsme.exc.ClientSideError("Profile (%s) has no processors "
                                        "or cores." % profile.hostname)
@@ -2517,9 +2675,7 @@ def ifprofile_apply_to_host(host, profile):
     if not host.ethernet_ports:
         raise wsme.exc.ClientSideError(_("Host (%s) has no ports." % host.hostname))
 
-    profile.ethernet_ports = pecan.request.dbapi.ethernet_port_get_by_host(profile.uuid)
-    profile.interfaces = pecan.request.dbapi.iinterface_get_by_ihost(profile.uuid)
-    profile.routes = _get_routes(profile.id)
+    _load_profile_data(profile, _ifprofile_load)
 
     ifprofile_applicable(host, profile)
 
@@ -2730,8 +2886,7 @@ def storprofile_applicable(host, profile):
 @cutils.synchronized(storage_api.LOCK_NAME)
 def storprofile_apply_to_host(host, profile):
     # Prequisite checks
-    profile.disks = pecan.request.dbapi.idisk_get_by_ihost(profile.uuid)
-    profile.stors = pecan.request.dbapi.istor_get_by_ihost(profile.uuid)
+    _load_profile_data(profile, _storprofile_load)
     if not profile.disks:
         raise wsme.exc.ClientSideError(_("Profile (%s) has no disks" % profile.hostname))
 
@@ -2978,11 +3133,7 @@ def check_localstorageprofile_applicable(host, profile):
 def localstorageprofile_apply_to_host(host, profile):
     """Apply local storage profile to a host
     """
-    profile.disks = pecan.request.dbapi.idisk_get_by_ihost(profile.uuid)
-    profile.partitions = pecan.request.dbapi.partition_get_by_ihost(
-        profile.uuid)
-    profile.ilvgs = pecan.request.dbapi.ilvg_get_by_ihost(profile.uuid)
-    profile.ipvs = pecan.request.dbapi.ipv_get_by_ihost(profile.uuid)
+    _load_profile_data(profile, _localstorageprofile_load)
 
     host.disks = pecan.request.dbapi.idisk_get_by_ihost(host.uuid)
     host.partitions = pecan.request.dbapi.partition_get_by_ihost(host.uuid)
@@ -3157,8 +3308,7 @@ def memoryprofile_applicable(host, profile):
 @cutils.synchronized(memory_api.LOCK_NAME)
 def memoryprofile_apply_to_host(host, profile):
     # Prequisite checks
-    profile.memory = pecan.request.dbapi.imemory_get_by_ihost(profile.uuid)
-    profile.nodes = pecan.request.dbapi.inode_get_by_ihost(profile.uuid)
+    _load_profile_data(profile, _memoryprofile_load)
     if not profile.memory or not profile.nodes:
         raise wsme.exc.ClientSideError(_("Profile (%s) has no memory or processors"
                                          % profile.hostname))
@@ -3175,11 +3325,12 @@ def memoryprofile_apply_to_host(host, profile):
 
     # Create mapping between memory profile and host
     # for each node in the profile, there exists a node in the host
+    host_numa_nodes = dict((n.id, int(n.numa_node)) for n in host.nodes)
+    profile_numa_nodes = dict((n.id, int(n.numa_node)) for n in profile.nodes)
     for hmem in host.memory:
         for pmem in profile.memory:
-            host_inode = pecan.request.dbapi.inode_get(hmem.forinodeid)
-            profile_inode = pecan.request.dbapi.inode_get(pmem.forinodeid)
-            if int(host_inode.numa_node) == int(profile_inode.numa_node):
+            if (host_numa_nodes[hmem.forinodeid] ==
+                    profile_numa_nodes[pmem.forinodeid]):
                 data = {'vm_hugepages_nr_2M_pending': pmem.vm_hugepages_nr_2M_pending,
                         'vm_hugepages_nr_1G_pending': pmem.vm_hugepages_nr_1G_pending,
                         'platform_reserved_mib': pmem.platform_reserved_mib,
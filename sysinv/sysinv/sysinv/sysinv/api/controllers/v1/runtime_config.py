@@ -0,0 +1,145 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import pecan
+import wsmeext.pecan as wsme_pecan
+from pecan import rest
+from sysinv import objects
+from sysinv.api.controllers.v1 import base
+from sysinv.api.controllers.v1 import collection
+from sysinv.api.controllers.v1 import types
+from sysinv.api.controllers.v1 import utils
+from sysinv.common import exception
+from sysinv.openstack.common import log
+from sysinv.openstack.common.gettextutils import _
+from wsme import types as wtypes
+
+LOG = log.getLogger(__name__)
+
+
+class RuntimeConfig(base.APIBase):
+    """API representation of a runtime manifest apply on a host.
+
+    The records are created from the agent reports for each runtime
+    manifest apply request sent by the conductor.
+    """
+
+    uuid = types.uuid
+    "Unique UUID for this runtime config record"
+
+    request_id = types.uuid
+    "The uuid of the runtime manifest apply request"
+
+    config_uuid = wtypes.text
+    "The configuration uuid applied by the request"
+
+    classes = wtypes.text
+    "The comma separated puppet classes applied by the request"
+
+    state = wtypes.text
+    "The apply state: queued, running, success or failed"
+
+    duration = float
+    "The duration in seconds of the puppet apply"
+
+    error = wtypes.text
+    "The reason of a failed apply"
+
+    forihostid = int
+    "The id of the host the manifest is applied on"
+
+    host_uuid = types.uuid
+    "The uuid of the host the manifest is applied on"
+
+    created_at = wtypes.datetime.datetime
+
+    updated_at = wtypes.datetime.datetime
+
+    def __init__(self, **kwargs):
+        self.fields = objects.runtime_config.fields.keys()
+        for k in self.fields:
+            if not hasattr(self, k):
+                continue
+            setattr(self, k, kwargs.get(k, wtypes.Unset))
+        self.created_at = kwargs.get('created_at', wtypes.Unset)
+        self.updated_at = kwargs.get('updated_at', wtypes.Unset)
+
+    @classmethod
+    def convert_with_links(cls, rpc_runtime_config, expand=True):
+        runtime_config = RuntimeConfig(**rpc_runtime_config.as_dict())
+        if not expand:
+            runtime_config.unset_fields_except(['uuid',
+                                                'host_uuid',
+                                                'request_id',
+                                                'config_uuid',
+                                                'classes',
+                                                'state',
+                                                'duration',
+                                                'error',
+                                                'created_at',
+                                                'updated_at'])
+
+        # do not expose the id attribute
+        runtime_config.forihostid = wtypes.Unset
+
+        return runtime_config
+
+
+class RuntimeConfigCollection(collection.Collection):
+    """API representation of a collection of runtime config records."""
+
+    runtime_configs = [RuntimeConfig]
+    "A list containing runtime config objects"
+
+    def __init__(self, **kwargs):
+        self._type = 'runtime_configs'
+
+    @classmethod
+    def convert_with_links(cls, rpc_runtime_configs, limit, url=None,
+                           expand=False, **kwargs):
+        collection = RuntimeConfigCollection()
+        collection.runtime_configs = [
+            RuntimeConfig.convert_with_links(p, expand)
+            for p in rpc_runtime_configs]
+        collection.next = collection.get_next(limit, url=url, **kwargs)
+        return collection
+
+
+class RuntimeConfigController(rest.RestController):
+    """REST controller for runtime manifest apply records."""
+
+    def __init__(self, from_ihosts=False):
+        self._from_ihosts = from_ihosts
+
+    def _get_runtime_configs_collection(self, host_uuid, marker, limit,
+                                        sort_key, sort_dir, expand=False,
+                                        resource_url=None):
+        if not host_uuid:
+            raise exception.InvalidParameterValue(_(
+                  "Host id not specified."))
+
+        limit = utils.validate_limit(limit)
+        sort_dir = utils.validate_sort_dir(sort_dir)
+        marker_obj = None
+        if marker:
+            marker_obj = objects.runtime_config.get_by_uuid(
+                pecan.request.context, marker)
+
+        runtime_configs = pecan.request.dbapi.runtime_config_get_by_host(
+            host_uuid, limit, marker_obj, sort_key=sort_key,
+            sort_dir=sort_dir)
+
+        return RuntimeConfigCollection.convert_with_links(
+            runtime_configs, limit, url=resource_url, expand=expand,
+            sort_key=sort_key, sort_dir=sort_dir)
+
+    @wsme_pecan.wsexpose(RuntimeConfigCollection, types.uuid, types.uuid,
+                         int, wtypes.text, wtypes.text)
+    def get_all(self, uuid=None, marker=None, limit=None,
+                sort_key='id', sort_dir='desc'):
+        """Retrieve the runtime manifest apply records of a host."""
+        return self._get_runtime_configs_collection(uuid, marker, limit,
+                                                    sort_key, sort_dir)
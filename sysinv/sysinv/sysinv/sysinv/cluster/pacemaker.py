@@ -9,8 +9,10 @@ PaceMaker
 """
 
 import os
+import subprocess
 import sys
-import uuid
+import threading
+import time
 import logging
 from lxml import etree
 
@@ -26,6 +28,12 @@ RESOURCE_STATE_ENABLED = 'enabled'
 RESOURCE_STATE_DISABLED = 'disabled'
 RESOURCE_STATE_FAILED = 'failed'
 
+# Seconds a parsed CIB is reused by subsequent loads
+CIB_CACHE_TTL = 5
+
+_cib_cache = {'time': 0, 'cib': None}
+_cib_cache_lock = threading.Lock()
+
 
 class PaceMakerNode(object):
     """ Pacemaker Node information about a node making up the cluster
@@ -48,91 +56,168 @@ class PaceMakerResource(object):
         self.state = RESOURCE_STATE_NOT_SET
 
 
+class PaceMakerCib(object):
+    """ Indexes of the node and resource state held in a CIB
+    """
+
+    def __init__(self):
+        # node name -> value of the standby attribute
+        self.standby = {}
+        # node name -> (in_ccm, crmd)
+        self.node_states = {}
+        # (node name, resource name) -> (operation, rc-code)
+        self.resource_ops = {}
+
+    @classmethod
+    def parse(cls, source):
+        """ Build the indexes from a CIB XML stream in a single pass
+        """
+
+        cib = cls()
+        root = None
+        for event, element in etree.iterparse(source, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = element
+                continue
+
+            if element.tag == 'nvpair':
+                cib._index_standby(element)
+
+            elif element.tag == 'lrm_resource':
+                cib._index_resource(element)
+                element.clear()
+
+            elif element.tag == 'node_state':
+                cib.node_states[element.get('id')] = (element.get('in_ccm'),
+                                                      element.get('crmd'))
+                element.clear()
+
+            elif element.tag in ('resources', 'constraints', 'rsc_defaults',
+                                 'op_defaults'):
+                element.clear()
+
+        if root is None or len(root) == 0:
+            return None
+        return cib
+
+    def _index_standby(self, nvpair):
+        attributes = nvpair.getparent()
+        node = attributes.getparent() if attributes is not None else None
+        if node is None or node.tag != 'node':
+            return
+        nodes = node.getparent()
+        if nodes is None or nodes.tag != 'nodes':
+            return
+
+        node_name = node.get('id')
+        if (attributes.tag == 'instance_attributes' and
+                attributes.get('id') == 'nodes-%s' % node_name and
+                nvpair.get('id') == 'nodes-%s-standby' % node_name and
+                node_name not in self.standby):
+            self.standby[node_name] = (nvpair.get('name'),
+                                       nvpair.get('value'))
+
+    def _index_resource(self, lrm_resource):
+        ancestors = list(lrm_resource.iterancestors())
+        if len(ancestors) < 3:
+            return
+        lrm_resources, lrm, node_state = ancestors[:3]
+        if (lrm_resources.tag != 'lrm_resources' or lrm.tag != 'lrm' or
+                node_state.tag != 'node_state' or
+                lrm.get('id') != node_state.get('id')):
+            return
+
+        op = lrm_resource.find('lrm_rsc_op')
+        key = (node_state.get('id'), lrm_resource.get('id'))
+        if op is not None and key not in self.resource_ops:
+            self.resource_ops[key] = (op.get('operation'), op.get('rc-code'))
+
+
 class Pacemaker(object):
     """ Pacemaker
     """
 
     def __init__(self):
-        self._xmldoc = None
+        self._cib = None
 
-    def load(self):
-        """ Ask for the latest information on the cluster
+    @staticmethod
+    def invalidate():
+        """ Discard the cached CIB after changing the cluster state
         """
 
-        pacemaker_xml_filename = ('/tmp/pacemaker_%s.xml'
-                                  % str(uuid.uuid4()))
-
-        try:
-            if not os.path.exists('/usr/sbin/cibadmin'):
-                return
+        with _cib_cache_lock:
+            _cib_cache['cib'] = None
 
-            os.system("/usr/sbin/cibadmin --query > %s"
-                      % pacemaker_xml_filename)
+    def load(self, max_age=CIB_CACHE_TTL):
+        """ Ask for the latest information on the cluster
 
-            if not os.path.exists(pacemaker_xml_filename):
-                return
+            A CIB read less than max_age seconds ago is reused.
+        """
 
-            self._xmldoc = etree.parse(pacemaker_xml_filename)
-            if self._xmldoc is None:
-                os.remove(pacemaker_xml_filename)
+        with _cib_cache_lock:
+            if (_cib_cache['cib'] is not None and
+                    time.time() - _cib_cache['time'] < max_age):
+                self._cib = _cib_cache['cib']
                 return
 
-            if not etree.iselement(self._xmldoc.getroot()):
-                self._xmldoc = None
-                os.remove(pacemaker_xml_filename)
-                return
+            self._cib = None
+            try:
+                if not os.path.exists('/usr/sbin/cibadmin'):
+                    return
 
-            if len(self._xmldoc.getroot()) == 0:
-                self._xmldoc = None
-                os.remove(pacemaker_xml_filename)
-                return
+                with open(os.devnull, 'w') as fnull:
+                    process = subprocess.Popen(
+                        ['/usr/sbin/cibadmin', '--query'],
+                        stdout=subprocess.PIPE, stderr=fnull)
+                    try:
+                        cib = PaceMakerCib.parse(process.stdout)
+                    finally:
+                        process.stdout.close()
+                        process.wait()
 
-            os.remove(pacemaker_xml_filename)
+                if process.returncode != 0 or cib is None:
+                    return
 
-        except Exception:
-            if os.path.exists(pacemaker_xml_filename):
-                os.remove(pacemaker_xml_filename)
+                self._cib = cib
+                _cib_cache['cib'] = cib
+                _cib_cache['time'] = time.time()
 
-            LOG.error("error:", sys.exc_info()[0])
+            except Exception:
+                LOG.error("error:", sys.exc_info()[0])
 
     def get_resource(self, node_name, resource_name):
         """ Get a resource's information and state
         """
 
-        if self._xmldoc is None:
+        if self._cib is None:
             return None
 
-        xmlroot = self._xmldoc.getroot()
-
-        xmlresource = xmlroot.find(".//status/node_state[@id='%s']/"
-                                   "lrm[@id='%s']/lrm_resources/"
-                                   "lrm_resource[@id='%s']/lrm_rsc_op"
-                                   % (node_name, node_name, resource_name))
-        if not etree.iselement(xmlresource):
+        op = self._cib.resource_ops.get((node_name, resource_name))
+        if op is None:
             return None
+        operation, rc_code = op
 
         resource = PaceMakerResource(node_name, resource_name)
 
-        resource.last_operation = xmlresource.attrib["operation"]
+        resource.last_operation = operation
 
-        if (xmlresource.attrib["operation"] == "start" or
-                xmlresource.attrib["operation"] == "promote"):
-            if xmlresource.attrib["rc-code"] == "0":
+        if operation == "start" or operation == "promote":
+            if rc_code == "0":
                 resource.state = RESOURCE_STATE_ENABLED
             else:
                 resource.state = RESOURCE_STATE_FAILED
 
-        elif (xmlresource.attrib["operation"] == "stop" or
-              xmlresource.attrib["operation"] == "demote"):
-            if xmlresource.attrib["rc-code"] == "0":
+        elif operation == "stop" or operation == "demote":
+            if rc_code == "0":
                 resource.state = RESOURCE_STATE_DISABLED
             else:
                 resource.state = RESOURCE_STATE_FAILED
 
-        elif xmlresource.attrib["operation"] == "monitor":
-            if xmlresource.attrib["rc-code"] == "0":
+        elif operation == "monitor":
+            if rc_code == "0":
                 resource.state = RESOURCE_STATE_ENABLED
-            elif xmlresource.attrib["rc-code"] == "7":
+            elif rc_code == "7":
                 resource.state = RESOURCE_STATE_DISABLED
             else:
                 resource.state = RESOURCE_STATE_FAILED
@@ -145,32 +230,25 @@ class Pacemaker(object):
         """ Get a node's information and state
         """
 
-        if self._xmldoc is None:
+        if self._cib is None:
             return None
 
         node = PaceMakerNode(node_name)
 
-        xmlroot = self._xmldoc.getroot()
-
         # Check the static configuration for state.
-        xmlnode = xmlroot.find((".//nodes/node[@id='%s']"
-                                "/instance_attributes[@id='nodes-%s']"
-                                "/nvpair[@id='nodes-%s-standby']"
-                                % (node_name, node_name, node_name)))
-        if etree.iselement(xmlnode):
-            if xmlnode.attrib["name"] == "standby":
-                if xmlnode.attrib["value"] == "on":
-                    node.state = NODE_STATE_OFFLINE
-                    return node
+        standby = self._cib.standby.get(node_name)
+        if standby == ("standby", "on"):
+            node.state = NODE_STATE_OFFLINE
+            return node
 
         # Now check the running status for state.
-        xmlnode = xmlroot.find(".//status/node_state[@id='%s']"
-                               % node_name)
-        if not etree.iselement(xmlnode):
+        node_state = self._cib.node_states.get(node_name)
+        if node_state is None:
             return None
 
-        if xmlnode.attrib["in_ccm"] == "true":
-            if xmlnode.attrib["crmd"] == "online":
+        in_ccm, crmd = node_state
+        if in_ccm == "true":
+            if crmd == "online":
                 node.state = NODE_STATE_ONLINE
             else:
                 node.state = NODE_STATE_OFFLINE
@@ -197,6 +275,7 @@ class Pacemaker(object):
                 return False
 
             os.system("/usr/sbin/crm node %s %s" % (action, node_name))
+            self.invalidate()
             return True
 
         except Exception:
@@ -214,6 +293,7 @@ class Pacemaker(object):
             # Lifetime follows the duration format specified in ISO_8601
             os.system("/usr/sbin/crm resource migrate %s %s P%sS"
                       % (resource_name, node_name, lifetime))
+            self.invalidate()
             return True
 
         except Exception:
@@ -26,6 +26,7 @@ from oslo_config import cfg
 from oslo_log import log
 from sysinv.common import service as sysinv_service
 from sysinv.common import wsgi_service
+from sysinv.db.sqlalchemy import dbstats
 from sysinv import sanity_coverage
 
 LOG = log.getLogger(__name__)
@@ -67,6 +68,7 @@ def main():
         sanity_coverage.start()
     # Parse config file and command line options
     sysinv_service.prepare_service(sys.argv)
+    dbstats.setup('api')
 
     launcher_api = sysinv_api()
     launcher_pxe = sysinv_pxe()
@@ -41,6 +41,14 @@ def main():
     # Pase config file and command line options, then start logging
     sysinv_service.prepare_service(sys.argv)
 
-    mgr = manager.ConductorManager(CONF.host, manager.MANAGER_TOPIC)
-    launcher = service.launch(mgr)
+    if CONF.conductor.workers > 1:
+        # one process per worker, each consuming its own shard topic
+        launcher = service.ProcessLauncher()
+        for worker_id in range(CONF.conductor.workers):
+            mgr = manager.ConductorManager(CONF.host, manager.MANAGER_TOPIC,
+                                           worker_id=worker_id)
+            launcher.launch_service(mgr, workers=1)
+    else:
+        mgr = manager.ConductorManager(CONF.host, manager.MANAGER_TOPIC)
+        launcher = service.launch(mgr)
     launcher.wait()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""
+Display the database statistics published by the sysinv services.
+"""
+
+import glob
+import os
+import sys
+import time
+
+from oslo_config import cfg
+
+from sysinv.common import constants
+from sysinv.common import service
+from sysinv.db.sqlalchemy import dbstats
+from sysinv.openstack.common import jsonutils
+
+CONF = cfg.CONF
+
+CONF.register_cli_opts([
+    cfg.BoolOpt('json',
+                default=False,
+                help='Print the statistics as JSON'),
+    cfg.BoolOpt('all',
+                default=False,
+                help='Include the statistics of exited processes'),
+    cfg.IntOpt('top',
+               default=20,
+               help='Number of statement types, or db api methods with '
+                    '[dbstats] caller_stats, listed per process, ordered by '
+                    'total statement time'),
+])
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def load_stats(include_exited=False):
+    """Load the statistics files of the sysinv service processes."""
+    results = []
+    pattern = os.path.join(constants.SYSINV_LOCK_PATH,
+                           dbstats.DBSTATS_FILE_PREFIX + '*.json')
+    for path in sorted(glob.glob(pattern)):
+        try:
+            with open(path) as f:
+                stats = jsonutils.loads(f.read())
+        except (IOError, ValueError):
+            continue
+        if include_exited or _is_running(stats.get('pid', 0)):
+            results.append(stats)
+    return results
+
+
+def _print_histogram(buckets, histogram):
+    labels = ['<=%dms' % b for b in buckets] + ['>%dms' % buckets[-1]]
+    print("    %s" % '  '.join('%s:%d' % (label, count)
+                               for label, count in zip(labels, histogram)
+                               if count))
+
+
+def print_stats(stats, top):
+    now = time.time()
+    pool = stats['pool']
+    print("%s pid %d (updated %ds ago)" % (
+        stats['service'], stats['pid'], now - stats['updated_at']))
+    print("  pool %s size=%s checked_out=%s overflow=%s max_checked_out=%d" %
+          (pool.get('class'), pool.get('size'), pool.get('checked_out'),
+           pool.get('overflow'), pool['max_checked_out']))
+    if pool['checkouts']:
+        print("  checkouts=%d mean=%.2fms max=%.2fms" % (
+            pool['checkouts'],
+            pool['checkout_time'] * 1000 / pool['checkouts'],
+            pool['max_checkout_time'] * 1000))
+        _print_histogram(stats['buckets'], pool['checkout_histogram'])
+    print("  slow queries=%d" % stats['slow_queries'])
+
+    methods = sorted(stats['statements'].items(),
+                     key=lambda m: m[1]['total_time'], reverse=True)
+    print("  %-40s %8s %10s %10s %10s %6s" % (
+        'statement', 'count', 'total(s)', 'mean(ms)', 'max(ms)', 'slow'))
+    for method, s in methods[:top]:
+        print("  %-40s %8d %10.3f %10.2f %10.2f %6d" % (
+            method, s['count'], s['total_time'],
+            s['total_time'] * 1000 / s['count'], s['max_time'] * 1000,
+            s['slow']))
+        _print_histogram(stats['buckets'], s['histogram'])
+
+
+def main():
+    service.prepare_service(sys.argv)
+    results = load_stats(include_exited=CONF.all)
+    if CONF.json:
+        print(jsonutils.dumps(results, indent=2))
+        return
+    if not results:
+        print("No database statistics found in %s" %
+              constants.SYSINV_LOCK_PATH)
+        return
+    for stats in results:
+        print_stats(stats, CONF.top)
+        print("")
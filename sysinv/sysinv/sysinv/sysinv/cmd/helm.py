@@ -13,6 +13,7 @@ import sys
 
 from oslo_config import cfg
 
+from sysinv.common import plugin_profiler
 from sysinv.common import service
 from sysinv.db import api
 from sysinv.helm import helm
@@ -20,23 +21,48 @@ from sysinv.helm import helm
 CONF = cfg.CONF
 
 
-def create_app_overrides_action(path, app_name=None, repository=None, namespace=None):
+def _get_operator(path, repository):
     dbapi = api.get_instance()
     operator = helm.HelmOperator(dbapi=dbapi, path=path, docker_repository=repository)
+    if CONF.action.profile or CONF.action.profile_output:
+        operator.profiler.enable(keep_runs=True)
+    return operator
+
+
+def _report_profile(operator):
+    if CONF.action.profile:
+        plugin_profiler.print_runs(operator.profiler.runs)
+    if CONF.action.profile_output:
+        plugin_profiler.write_runs(operator.profiler.runs,
+                                   CONF.action.profile_output)
+
+
+def create_app_overrides_action(path, app_name=None, repository=None, namespace=None):
+    operator = _get_operator(path, repository)
     operator.generate_helm_application_overrides(app_name, namespace)
+    return operator
 
 
 def create_armada_app_overrides_action(path, app_name=None, repository=None, namespace=None):
-    dbapi = api.get_instance()
-    operator = helm.HelmOperator(dbapi=dbapi, path=path, docker_repository=repository)
+    operator = _get_operator(path, repository)
     operator.generate_helm_application_overrides(app_name, namespace,
                                                  armada_format=True)
+    return operator
 
 
 def create_chart_override_action(path, chart_name=None, repository=None, namespace=None):
-    dbapi = api.get_instance()
-    operator = helm.HelmOperator(dbapi=dbapi, path=path, docker_repository=repository)
+    operator = _get_operator(path, repository)
     operator.generate_helm_chart_overrides(chart_name, namespace)
+    return operator
+
+
+def add_profile_arguments(parser):
+    parser.add_argument('--profile', action='store_true',
+                        help='Print the time, queries and output size of '
+                             'each chart')
+    parser.add_argument('--profile-output', metavar='FILE',
+                        help='Write the profile of each chart to FILE '
+                             'as JSON')
 
 
 def add_action_parsers(subparsers):
@@ -46,6 +72,7 @@ def add_action_parsers(subparsers):
     parser.add_argument('app_name', nargs='?')
     parser.add_argument('repository', nargs='?')
     parser.add_argument('namespace', nargs='?')
+    add_profile_arguments(parser)
 
     parser = subparsers.add_parser('create-armada-app-overrides')
     parser.set_defaults(func=create_armada_app_overrides_action)
@@ -53,6 +80,7 @@ def add_action_parsers(subparsers):
     parser.add_argument('app_name', nargs='?')
     parser.add_argument('repository', nargs='?')
     parser.add_argument('namespace', nargs='?')
+    add_profile_arguments(parser)
 
     parser = subparsers.add_parser('create-chart-overrides')
     parser.set_defaults(func=create_chart_override_action)
@@ -60,6 +88,7 @@ def add_action_parsers(subparsers):
     parser.add_argument('chart_name', nargs='?')
     parser.add_argument('repository', nargs='?')
     parser.add_argument('namespace', nargs='?')
+    add_profile_arguments(parser)
 
 
 CONF.register_cli_opt(
@@ -73,20 +102,22 @@ def main():
     service.prepare_service(sys.argv)
     if CONF.action.name == 'create-app-overrides':
 
-        CONF.action.func(CONF.action.path,
-                         CONF.action.app_name,
-                         CONF.action.repository,
-                         CONF.action.namespace)
+        operator = CONF.action.func(CONF.action.path,
+                                    CONF.action.app_name,
+                                    CONF.action.repository,
+                                    CONF.action.namespace)
     elif CONF.action.name == 'create-armada-app-overrides':
-        CONF.action.func(CONF.action.path,
-                         CONF.action.app_name,
-                         CONF.action.repository,
-                         CONF.action.namespace)
+        operator = CONF.action.func(CONF.action.path,
+                                    CONF.action.app_name,
+                                    CONF.action.repository,
+                                    CONF.action.namespace)
     elif CONF.action.name == 'create-chart-overrides':
         try:
-            CONF.action.func(CONF.action.path,
-                             CONF.action.chart_name,
-                             CONF.action.repository,
-                             CONF.action.namespace)
+            operator = CONF.action.func(CONF.action.path,
+                                        CONF.action.chart_name,
+                                        CONF.action.repository,
+                                        CONF.action.namespace)
         except Exception as e:
             print(e)
+            return
+    _report_profile(operator)
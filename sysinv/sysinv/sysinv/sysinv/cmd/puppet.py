@@ -14,6 +14,7 @@ import sys
 
 from oslo_config import cfg
 
+from sysinv.common import plugin_profiler
 from sysinv.common import service
 from sysinv.db import api
 from sysinv.puppet import puppet
@@ -21,22 +22,39 @@ from sysinv.puppet import puppet
 CONF = cfg.CONF
 
 
+def _get_operator(dbapi=None, path=None):
+    operator = puppet.PuppetOperator(dbapi=dbapi, path=path)
+    if CONF.action.profile or CONF.action.profile_output:
+        operator.profiler.enable(keep_runs=True)
+    return operator
+
+
+def _report_profile(operator):
+    if CONF.action.profile:
+        plugin_profiler.print_runs(operator.profiler.runs)
+    if CONF.action.profile_output:
+        plugin_profiler.write_runs(operator.profiler.runs,
+                                   CONF.action.profile_output)
+
+
 def create_static_config_action(path):
-    operator = puppet.PuppetOperator(path=path)
+    operator = _get_operator(path=path)
     operator.create_static_config()
     operator.create_secure_config()
+    return operator
 
 
 def create_system_config_action(path):
     dbapi = api.get_instance()
-    operator = puppet.PuppetOperator(dbapi=dbapi, path=path)
+    operator = _get_operator(dbapi=dbapi, path=path)
     operator.update_system_config()
     operator.update_secure_system_config()
+    return operator
 
 
 def create_host_config_action(path, hostname=None):
     dbapi = api.get_instance()
-    operator = puppet.PuppetOperator(dbapi=dbapi, path=path)
+    operator = _get_operator(dbapi=dbapi, path=path)
 
     if hostname:
         host = dbapi.ihost_get_by_hostname(hostname)
@@ -45,21 +63,34 @@ def create_host_config_action(path, hostname=None):
         hosts = dbapi.ihost_get_list()
         for host in hosts:
             operator.update_host_config(host)
+    return operator
+
+
+def add_profile_arguments(parser):
+    parser.add_argument('--profile', action='store_true',
+                        help='Print the time, queries and output size of '
+                             'each plugin')
+    parser.add_argument('--profile-output', metavar='FILE',
+                        help='Write the profile of each plugin to FILE '
+                             'as JSON')
 
 
 def add_action_parsers(subparsers):
     parser = subparsers.add_parser('create-static-config')
     parser.set_defaults(func=create_static_config_action)
     parser.add_argument('path', nargs='?')
+    add_profile_arguments(parser)
 
     parser = subparsers.add_parser('create-system-config')
     parser.set_defaults(func=create_system_config_action)
     parser.add_argument('path', nargs='?')
+    add_profile_arguments(parser)
 
     parser = subparsers.add_parser('create-host-config')
     parser.set_defaults(func=create_host_config_action)
     parser.add_argument('path', nargs='?')
     parser.add_argument('hostname', nargs='?')
+    add_profile_arguments(parser)
 
 
 CONF.register_cli_opt(
@@ -72,6 +103,7 @@ CONF.register_cli_opt(
 def main():
     service.prepare_service(sys.argv)
     if CONF.action.name == 'create-host-config':
-        CONF.action.func(CONF.action.path, CONF.action.hostname)
+        operator = CONF.action.func(CONF.action.path, CONF.action.hostname)
     else:
-        CONF.action.func(CONF.action.path)
+        operator = CONF.action.func(CONF.action.path)
+    _report_profile(operator)
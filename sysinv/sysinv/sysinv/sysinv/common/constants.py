@@ -191,6 +191,16 @@ IDISK_DEV_FUNC_CINDER = 'cinder_device'
 CONFIG_STATUS_OUT_OF_DATE = "Config out-of-date"
 CONFIG_STATUS_REINSTALL = "Reinstall required"
 
+# runtime manifest apply states reported by the agents
+RUNTIME_CONFIG_STATE_QUEUED = "queued"
+RUNTIME_CONFIG_STATE_RUNNING = "running"
+RUNTIME_CONFIG_STATE_SUCCESS = "success"
+RUNTIME_CONFIG_STATE_FAILED = "failed"
+RUNTIME_CONFIG_STATES = [RUNTIME_CONFIG_STATE_QUEUED,
+                         RUNTIME_CONFIG_STATE_RUNNING,
+                         RUNTIME_CONFIG_STATE_SUCCESS,
+                         RUNTIME_CONFIG_STATE_FAILED]
+
 # when reinstall starts, mtc update the db with task = 'Reinstalling'
 TASK_REINSTALLING = "Reinstalling"
 
@@ -189,6 +189,10 @@ class CephPoolSetQuotaFailure(CephFailure):
                 + ": %(reason)s"
 
 
+class CephPoolGetFailure(CephFailure):
+    message = _("Error getting the OSD pool %(pool)s") + ": %(reason)s"
+
+
 class CephPoolGetQuotaFailure(CephFailure):
     message = _("Error geting the OSD pool quota for %(pool)s") \
                 + ": %(reason)s"
@@ -1179,6 +1183,15 @@ class HostLabelInvalid(Invalid):
     message = _("Host label is invalid. Reason: %(reason)s")
 
 
+class RuntimeConfigNotFound(NotFound):
+    message = _("Runtime configuration %(uuid)s could not be found.")
+
+
+class RuntimeConfigAlreadyExists(Conflict):
+    message = _("Runtime configuration for request %(request_id)s already "
+                "exists.")
+
+
 class K8sNodeNotFound(NotFound):
     message = _("Kubernetes Node %(name)s could not be found.")
 
@@ -30,9 +30,11 @@ class Health(object):
     SUCCESS_MSG = _('OK')
     FAIL_MSG = _('Fail')
 
-    def __init__(self, dbapi):
+    def __init__(self, dbapi, ceph_operator=None):
         self._dbapi = dbapi
-        self._ceph = ceph.CephApiOperator()
+        # The conductor shares its CephOperator so that health checks are
+        # served from its cached ceph snapshot.
+        self._ceph = ceph_operator or ceph.CephApiOperator()
 
     def _check_hosts_provisioned(self, hosts):
         """Checks that each host is provisioned"""
@@ -14,41 +14,47 @@ from sysinv.openstack.common import log
 LOG = log.getLogger(__name__)
 
 
-def _get_port_interface_id_index(dbapi, host):
+def _get_interface_topology(dbapi, host, topology=None):
+    """
+    Returns the interface topology of the host, loading it when it was not
+    supplied by the caller.
+    """
+    if topology is None:
+        topology = dbapi.interface_topology_get(host.id)
+    return topology
+
+
+def _get_port_interface_id_index(dbapi, host, topology=None):
     """
     Builds a dictionary of ports indexed by interface id.
     """
+    topology = _get_interface_topology(dbapi, host, topology)
     ports = {}
-    for port in dbapi.ethernet_port_get_by_host(host.id):
+    for port in topology['ports']:
         ports[port.interface_id] = port
     return ports
 
 
-def _get_interface_name_index(dbapi, host):
+def _get_interface_name_index(dbapi, host, topology=None):
     """
     Builds a dictionary of interfaces indexed by interface name.
     """
+    topology = _get_interface_topology(dbapi, host, topology)
     interfaces = {}
-    for iface in dbapi.iinterface_get_by_ihost(host.id):
+    for iface in topology['interfaces']:
         interfaces[iface.ifname] = iface
     return interfaces
 
 
-def _get_interface_name_datanets(dbapi, host):
+def _get_interface_name_datanets(dbapi, host, topology=None):
     """
     Builds a dictionary of datanets indexed by interface name.
     """
+    topology = _get_interface_topology(dbapi, host, topology)
     datanets = {}
-    for iface in dbapi.iinterface_get_by_ihost(host.id):
-        ifdatanets = dbapi.interface_datanetwork_get_by_interface(iface.uuid)
-
-        datanetworks = []
-        for ifdatanet in ifdatanets:
-            datanetworks.append(ifdatanet.datanetwork_uuid)
-
+    for iface in topology['interfaces']:
         datanetworks_list = []
-        for datanetwork in datanetworks:
-            dn = dbapi.datanetwork_get(datanetwork)
+        for dn in topology['datanetworks'].get(iface.id, []):
             datanetwork_dict = \
                 {'name': dn.name,
                  'uuid': dn.uuid,
@@ -69,12 +75,13 @@ def _get_interface_name_datanets(dbapi, host):
     return datanets
 
 
-def _get_address_interface_name_index(dbapi, host):
+def _get_address_interface_name_index(dbapi, host, topology=None):
     """
     Builds a dictionary of address lists indexed by interface name.
     """
+    topology = _get_interface_topology(dbapi, host, topology)
     addresses = collections.defaultdict(list)
-    for address in dbapi.addresses_get_by_host(host.id):
+    for address in topology['addresses']:
         addresses[address.ifname].append(address)
     return addresses
 
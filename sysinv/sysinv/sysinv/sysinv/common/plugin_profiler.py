@@ -0,0 +1,179 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+"""Per plugin profiling of the puppet and helm configuration generation.
+
+When enabled, each call of a plugin (get_host_config, get_overrides, ...)
+records its wall time, the number of statements it executed and the size
+of the configuration it generated.  The calls are grouped in runs, one per
+operator request (e.g. the hieradata of a host), and a run that takes
+longer than the log threshold is logged as a table of its plugins.
+"""
+
+import contextlib
+import functools
+import time
+
+import eventlet
+import yaml
+
+from oslo_config import cfg
+
+from sysinv.db.sqlalchemy import statements
+from sysinv.openstack.common import jsonutils
+from sysinv.openstack.common import log
+
+plugin_profiler_opts = [
+    cfg.BoolOpt('enabled',
+                default=False,
+                help='Record the time, statements and output size of each '
+                     'puppet and helm plugin'),
+    cfg.FloatOpt('log_threshold',
+                 default=30.0,
+                 help='Log the plugins of the runs that take longer than '
+                      'this many seconds, 0 logs every run'),
+]
+
+CONF = cfg.CONF
+CONF.register_opts(plugin_profiler_opts, group='plugin_profiler')
+
+LOG = log.getLogger(__name__)
+
+
+def _get_size(output):
+    try:
+        return len(yaml.dump(output, default_flow_style=False))
+    except Exception:
+        return None
+
+
+def _get_label(name, args):
+    targets = [str(getattr(arg, 'hostname', arg)) for arg in args
+               if arg is not None]
+    return '%s(%s)' % (name, ', '.join(targets))
+
+
+def profile_run(func):
+    """Decorate an operator method to profile it as a run"""
+
+    @functools.wraps(func)
+    def _wrapper(self, *args, **kwargs):
+        with self.profiler.run(func.__name__, *args):
+            return func(self, *args, **kwargs)
+    return _wrapper
+
+
+class PluginProfiler(object):
+    """Profile the plugin calls of an operator."""
+
+    def __init__(self, name):
+        self.name = name
+        self.enabled = CONF.plugin_profiler.enabled
+        # completed runs, only kept for a caller that asks for them
+        self.runs = None
+
+    def enable(self, keep_runs=False):
+        self.enabled = True
+        if keep_runs and self.runs is None:
+            self.runs = []
+
+    def _get_run(self):
+        thread_context = eventlet.greenthread.getcurrent()
+        return getattr(thread_context, '_%s_profiler_run' % self.name, None)
+
+    def _set_run(self, run):
+        thread_context = eventlet.greenthread.getcurrent()
+        setattr(thread_context, '_%s_profiler_run' % self.name, run)
+
+    @contextlib.contextmanager
+    def run(self, name, *args):
+        """Group the plugin calls of an operator request.
+
+        A run started within another one is part of it.
+        """
+        if not self.enabled or self._get_run() is not None:
+            yield
+            return
+
+        counter = statements.StatementCounter()
+        run = {'name': _get_label(name, args),
+               'operator': self.name,
+               'start': time.time(),
+               'plugins': []}
+        self._set_run(run)
+        try:
+            with counter:
+                yield
+        finally:
+            self._set_run(None)
+            run['elapsed'] = time.time() - run['start']
+            run['queries'] = counter.count
+            self._complete(run)
+
+    def profile(self, plugin, method, func, *args, **kwargs):
+        """Call a plugin method and record its profile in the run."""
+        run = self._get_run()
+        if run is None:
+            return func(*args, **kwargs)
+
+        counter = statements.StatementCounter()
+        start = time.time()
+        output = None
+        error = None
+        try:
+            with counter:
+                output = func(*args, **kwargs)
+            return output
+        except Exception as e:
+            error = '%s: %s' % (type(e).__name__, e)
+            raise
+        finally:
+            elapsed = time.time() - start
+            run['plugins'].append({
+                'plugin': plugin,
+                'method': method,
+                'elapsed': elapsed,
+                'queries': counter.count,
+                'size': _get_size(output) if error is None else None,
+                'error': error})
+
+    def _complete(self, run):
+        if self.runs is not None:
+            self.runs.append(run)
+        threshold = CONF.plugin_profiler.log_threshold
+        if run['elapsed'] >= threshold:
+            LOG.warn("%s %s took %.3fs with %d queries\n%s" % (
+                self.name, run['name'], run['elapsed'], run['queries'],
+                format_run(run)))
+
+
+def format_run(run, top=None):
+    """Return the plugins of a run as a table, slowest first."""
+    plugins = sorted(run['plugins'], key=lambda p: p['elapsed'],
+                     reverse=True)
+    lines = ["  %-32s %-28s %10s %8s %10s" % (
+        'plugin', 'method', 'time(s)', 'queries', 'size')]
+    for p in plugins[:top]:
+        lines.append("  %-32s %-28s %10.3f %8d %10s%s" % (
+            p['plugin'], p['method'], p['elapsed'], p['queries'],
+            '-' if p['size'] is None else p['size'],
+            ' %s' % p['error'] if p['error'] else ''))
+    return '\n'.join(lines)
+
+
+def print_runs(runs):
+    for run in runs:
+        print("%s %s: %.3fs, %d queries" % (
+            run['operator'], run['name'], run['elapsed'], run['queries']))
+        print(format_run(run))
+        print("")
+
+
+def write_runs(runs, path):
+    with open(path, 'w') as f:
+        f.write(jsonutils.dumps(runs, indent=2))
@@ -47,12 +47,24 @@ CONF = cfg.CONF
 
 class PeriodicService(rpc_service.Service, periodic_task.PeriodicTasks):
 
+    # Whether the periodic tasks run in their own greenthreads when the
+    # periodic_tasks_concurrent option is not set
+    periodic_tasks_concurrent = True
+
     def start(self):
         super(PeriodicService, self).start()
         admin_context = context.RequestContext('admin', 'admin', is_admin=True)
-        self.tg.add_timer(cfg.CONF.periodic_interval,
-                          self.manager.periodic_tasks,
-                          context=admin_context)
+        concurrent = cfg.CONF.periodic_tasks_concurrent
+        if concurrent is None:
+            concurrent = self.manager.periodic_tasks_concurrent
+        if concurrent:
+            self.manager.start_periodic_task_threads(
+                admin_context, self.tg,
+                default_spacing=cfg.CONF.periodic_interval)
+        else:
+            self.tg.add_timer(cfg.CONF.periodic_interval,
+                              self.manager.periodic_tasks,
+                              context=admin_context)
 
 
 def prepare_service(argv=[]):
@@ -12,10 +12,14 @@
 
 from __future__ import absolute_import
 
+import collections
 import os
+import threading
+import time
 import uuid
 import copy
 import tsconfig.tsconfig as tsc
+from oslo_config import cfg
 from requests.exceptions import RequestException
 from requests.exceptions import ReadTimeout
 
@@ -38,6 +42,17 @@ from sysinv.openstack.common.rpc.common import CommonRpcContext
 LOG = logging.getLogger(__name__)
 CEPH_POOLS = copy.deepcopy(constants.CEPH_POOLS)
 
+ceph_opts = [
+    cfg.IntOpt('ceph_snapshot_ttl',
+               default=30,
+               help=('Number of seconds a snapshot of the ceph cluster '
+                     'status, usage and pool attributes is served from '
+                     'memory before it is refreshed')),
+]
+
+CONF = cfg.CONF
+CONF.register_opts(ceph_opts, 'conductor')
+
 SERVICE_TYPE_CEPH = constants.SERVICE_TYPE_CEPH
 
 
@@ -49,6 +64,15 @@ class CephOperator(object):
     executed_default_quota_check = False
     executed_default_quota_check_by_tier = {}
 
+    # Views of the snapshot read from ceph-rest-api and the timeout (in
+    # seconds) applied to each request. The tier sizes are reported by
+    # ceph-manager.
+    SNAPSHOT_VIEWS = [('status', 10),
+                      ('df', 10),
+                      ('osd_stat', 30),
+                      ('osd_dump', 10)]
+    SNAPSHOT_TIERS_SIZE = 'tiers_size'
+
     def __init__(self, db_api):
         self._fm_api = fm_api.FaultAPIs()
         self._db_api = db_api
@@ -57,6 +81,11 @@ class CephOperator(object):
         self._db_cluster = None
         self._db_primary_tier = None
         self._cluster_name = 'ceph_cluster'
+        # view -> {'output': ..., 'reason': ..., 'time': ...}
+        self._snapshot = {}
+        self._snapshot_locks = dict(
+            (view, threading.Lock()) for view in
+            [v for v, _ in self.SNAPSHOT_VIEWS] + [self.SNAPSHOT_TIERS_SIZE])
         self._init_db_cluster_and_tier()
 
     # Properties: During config_controller we will not initially have a cluster
@@ -89,24 +118,114 @@ class CephOperator(object):
         except AttributeError:
             return None
 
-    def ceph_status_ok(self, timeout=10):
-        """
-            returns rc bool. True if ceph ok, False otherwise
-            :param timeout: ceph api timeout
-        """
-        rc = True
+    def get_ceph_snapshot(self, force_refresh=False, views=None):
+        """Get a snapshot of the ceph cluster state.
+
+        The status, df, osd_stat and osd_dump views of ceph-rest-api and the
+        tier sizes reported by ceph-manager are each fetched when first read
+        and served from memory for CONF.conductor.ceph_snapshot_ttl seconds.
+        Concurrent callers needing a refresh of a view wait for a single
+        fetch. A view that could not be fetched is not served from memory,
+        the next caller fetches it again.
 
+        :param force_refresh: bypass the cached views
+        :param views: the views to get, all of them by default
+        :returns: dict of {view: {'output': <body or None>,
+                                  'reason': <failure reason or None>}}
+        """
+        if views is None:
+            views = self._snapshot_locks.keys()
+        snapshot = {}
+        for view in views:
+            output, reason = self._get_snapshot_view(view, force_refresh)
+            snapshot[view] = {'output': output, 'reason': reason}
+        return snapshot
+
+    def invalidate_ceph_snapshot(self):
+        """Discard the cached views after changing the cluster state"""
+        self._snapshot = {}
+
+    def _fetch_ceph_view(self, view):
+        """Fetch a view as an (output, reason) tuple"""
+        if view == self.SNAPSHOT_TIERS_SIZE:
+            try:
+                return rpc.call(CommonRpcContext(),
+                                constants.CEPH_MANAGER_RPC_TOPIC,
+                                {'method': 'get_tiers_size',
+                                 'args': {}}), None
+            except Exception as e:
+                LOG.warn("ceph-manager get_tiers_size failed: %s" % e)
+                return None, str(e)
+
+        timeout = dict(self.SNAPSHOT_VIEWS)[view]
+        output = None
         try:
-            response, body = self._ceph_api.status(body='json',
-                                                   timeout=timeout)
-            if (body['output']['health']['overall_status'] !=
-                    constants.CEPH_HEALTH_OK):
-                rc = False
+            response, body = getattr(self._ceph_api, view)(
+                body='json', timeout=timeout)
+            if response.ok:
+                output = body['output']
+                reason = None
+            else:
+                reason = response.reason
+        except ReadTimeout:
+            reason = ('Ceph API %s() timeout after %s seconds' %
+                      (view, timeout))
         except Exception as e:
-            rc = False
-            LOG.warn("ceph status exception: %s " % e)
+            reason = str(e)
+        if reason:
+            LOG.warn("ceph %s failed: %s" % (view, reason))
+        return output, reason
+
+    def _get_snapshot_view(self, view, force_refresh=False):
+        """Get a view of the ceph snapshot as an (output, reason) tuple"""
+        entry = self._snapshot.get(view)
+        if (not force_refresh and entry is not None and
+                entry['reason'] is None and
+                time.time() - entry['time'] <
+                CONF.conductor.ceph_snapshot_ttl):
+            return entry['output'], entry['reason']
+
+        requested = time.time()
+        with self._snapshot_locks[view]:
+            # Another caller may have fetched the view while we were
+            # waiting, share its result even if it failed
+            entry = self._snapshot.get(view)
+            if entry is not None and entry['time'] >= requested:
+                return entry['output'], entry['reason']
+
+            output, reason = self._fetch_ceph_view(view)
+            self._snapshot[view] = {'output': output,
+                                    'reason': reason,
+                                    'time': time.time()}
+            LOG.debug("Ceph %s refreshed in %.2f seconds" %
+                      (view, time.time() - requested))
+            return output, reason
+
+    def _get_snapshot_pool(self, pool_name, force_refresh=False):
+        """Get a pool entry of the osd_dump view, or None if not found
+
+        :raises: CephPoolGetFailure if the osd map could not be retrieved
+        """
+        osd_dump, reason = self._get_snapshot_view('osd_dump', force_refresh)
+        if osd_dump is None:
+            raise exception.CephPoolGetFailure(pool=pool_name, reason=reason)
+        for pool in osd_dump['pools']:
+            if pool['pool_name'] == pool_name:
+                return pool
+        return None
 
-        return rc
+    def ceph_status_ok(self, force_refresh=False):
+        """
+            returns rc bool. True if ceph ok, False otherwise
+            :param force_refresh: bypass the cached ceph snapshot
+        """
+        status, reason = self._get_snapshot_view('status', force_refresh)
+        if status is None:
+            LOG.warn("ceph status exception: %s " % reason)
+            return False
+
+        return (status['health']['overall_status'] ==
+                constants.CEPH_HEALTH_OK)
 
     def _get_fsid(self):
         try:
@@ -281,6 +400,7 @@ class CephOperator(object):
             force=None, body='json')
         if response.ok:
             LOG.info('OSD set pool param: pool={}, name={}, value={}'.format(pool_name, param, value))
+            self.invalidate_ceph_snapshot()
         else:
             raise exception.CephPoolSetParamFailure(
                 pool_name=pool_name,
@@ -289,20 +409,21 @@ class CephOperator(object):
                 reason=response.reason)
         return response, body
 
-    def osd_get_pool_quota(self, pool_name):
+    def osd_get_pool_quota(self, pool_name, force_refresh=False):
         """Get the quota for an OSD pool
         :param pool_name:
+        :param force_refresh: bypass the cached ceph snapshot
         """
 
-        resp, quota = self._ceph_api.osd_get_pool_quota(pool_name, body='json')
-        if resp.ok:
-            return {"max_objects": quota["output"]["quota_max_objects"],
-                    "max_bytes": quota["output"]["quota_max_bytes"]}
-        else:
+        pool = self._get_snapshot_pool(pool_name, force_refresh)
+        if pool is None:
+            reason = "pool does not exist"
             LOG.error("Getting the quota for %(name)s pool failed:%(reason)s)"
-                      % {"name": pool_name, "reason": resp.reason})
+                      % {"name": pool_name, "reason": reason})
             raise exception.CephPoolGetFailure(pool=pool_name,
-                                               reason=resp.reason)
+                                               reason=reason)
+        return {"max_objects": pool["quota_max_objects"],
+                "max_bytes": pool["quota_max_bytes"]}
 
     def osd_create(self, stor_uuid, **kwargs):
         """ Create osd via ceph api
@@ -386,7 +507,7 @@ class CephOperator(object):
 
         # check if osdmap is emtpy as an indication for Backup and Restore
         # case where ceph config needs to be restored.
-        osd_stats = self.get_osd_stats()
+        osd_stats = self.get_osd_stats(force_refresh=True)
         if int(osd_stats['num_osds']) > 0:
             return True
 
@@ -415,6 +536,7 @@ class CephOperator(object):
                 name, pg_num, pgp_num, pool_type="replicated",
                 ruleset=ruleset, body='json')
             if response.ok:
+                self.invalidate_ceph_snapshot()
                 LOG.info(_("Created OSD pool: pool_name={}, pg_num={}, "
                            "pgp_num={}, pool_type=replicated, ruleset={}, "
                            "size={}, min_size={}").format(name, pg_num,
@@ -558,6 +680,7 @@ class CephOperator(object):
             sure='--yes-i-really-really-mean-it',
             body='json')
         if response.ok:
+            self.invalidate_ceph_snapshot()
             LOG.info(_("Deleted OSD pool {}").format(pool_name))
         else:
             e = exception.CephPoolDeleteFailure(
@@ -577,20 +700,26 @@ class CephOperator(object):
         else:
             return pools['output']
 
-    def get_osd_pool_quota(self, pool_name):
+    def get_osd_pool_quota(self, pool_name, force_refresh=False):
         """Get the quota for an OSD pool
         :param pool_name:
+        :param force_refresh: bypass the cached ceph snapshot
         """
 
-        resp, quota = self._ceph_api.osd_get_pool_quota(pool_name, body='json')
-        if not resp.ok:
+        try:
+            pool = self._get_snapshot_pool(pool_name, force_refresh)
+            reason = "pool does not exist"
+        except exception.CephPoolGetFailure as e:
+            pool = None
+            reason = e.kwargs.get('reason')
+        if pool is None:
             e = exception.CephPoolGetQuotaFailure(
-                pool=pool_name, reason=resp.reason)
+                pool=pool_name, reason=reason)
             LOG.error(e)
             raise e
         else:
-            return {"max_objects": quota["output"]["quota_max_objects"],
-                    "max_bytes": quota["output"]["quota_max_bytes"]}
+            return {"max_objects": pool["quota_max_objects"],
+                    "max_bytes": pool["quota_max_bytes"]}
 
     # TODO(CephPoolsDecouple): remove
     def set_osd_pool_quota(self, pool, max_bytes=0, max_objects=0):
@@ -627,6 +756,8 @@ class CephOperator(object):
                 LOG.error(e)
                 raise e
 
+        self.invalidate_ceph_snapshot()
+
     # TODO(CephPoolsDecouple): rework if needed: we determine the existing
     # pools on the spot
     def get_pools_values(self):
@@ -986,45 +1117,36 @@ class CephOperator(object):
     def osd_remove(self, *args, **kwargs):
         return self._ceph_api.osd_remove(*args, **kwargs)
 
-    def get_cluster_df_stats(self, timeout=10):
+    def get_cluster_df_stats(self, force_refresh=False):
         """Get the usage information for the ceph cluster.
-        :param timeout:
+        :param force_refresh: bypass the cached ceph snapshot
         """
 
-        resp, body = self._ceph_api.df(body='json',
-                                       timeout=timeout)
-        if not resp.ok:
-            e = exception.CephGetClusterUsageFailure(reason=resp.reason)
+        df, reason = self._get_snapshot_view('df', force_refresh)
+        if df is None:
+            e = exception.CephGetClusterUsageFailure(reason=reason)
             LOG.error(e)
             raise e
         else:
-            return body["output"]["stats"]
+            return df["stats"]
 
-    def get_pools_df_stats(self, timeout=10):
-        resp, body = self._ceph_api.df(body='json',
-                                       timeout=timeout)
-        if not resp.ok:
-            e = exception.CephGetPoolsUsageFailure(reason=resp.reason)
+    def get_pools_df_stats(self, force_refresh=False):
+        df, reason = self._get_snapshot_view('df', force_refresh)
+        if df is None:
+            e = exception.CephGetPoolsUsageFailure(reason=reason)
             LOG.error(e)
             raise e
         else:
-            return body["output"]["pools"]
+            return df["pools"]
 
-    def get_osd_stats(self, timeout=30):
-        try:
-            resp, body = self._ceph_api.osd_stat(body='json',
-                                                 timeout=timeout)
-        except ReadTimeout as e:
-            resp = type('Response', (),
-                        dict(ok=False,
-                             reason=('Ceph API osd_stat() timeout '
-                                     'after {} seconds').format(timeout)))
-        if not resp.ok:
-            e = exception.CephGetOsdStatsFailure(reason=resp.reason)
+    def get_osd_stats(self, force_refresh=False):
+        osd_stat, reason = self._get_snapshot_view('osd_stat', force_refresh)
+        if osd_stat is None:
+            e = exception.CephGetOsdStatsFailure(reason=reason)
             LOG.error(e)
             raise e
         else:
-            return body["output"]
+            return osd_stat
 
     def get_ceph_cluster_info_availability(self):
         # TODO(CephPoolsDecouple): rework
@@ -1069,11 +1191,12 @@ class CephOperator(object):
                         {'method': 'get_primary_tier_size',
                          'args': {}})
 
-    def get_ceph_tiers_size(self):
-        return rpc.call(CommonRpcContext(),
-                        constants.CEPH_MANAGER_RPC_TOPIC,
-                        {'method': 'get_tiers_size',
-                         'args': {}})
+    def get_ceph_tiers_size(self, force_refresh=False):
+        tiers_size, reason = self._get_snapshot_view('tiers_size',
+                                                     force_refresh)
+        if tiers_size is None:
+            raise exception.CephFailure(reason=reason)
+        return tiers_size
 
     def ceph_manager_sees_cluster_up(self):
         """Determine if the ceph manager sees an active cluster.
@@ -1114,17 +1237,52 @@ class CephOperator(object):
 
         return storage_hosts_upgraded
 
+    # TODO(CephPoolsDecouple): remove
+    def _calculate_tier_osds(self, tiers_obj, storage_hosts, stors_by_host,
+                             replication):
+        """
+        Count the OSDs of a tier across the storage hosts
+
+        storage_hosts: storage host objects
+        stors_by_host: dict of host id to the list of stors on that host
+        replication: configured replication of the tier
+        returns osds_raw     actual osds
+                osds         osds adjusted to a multiple of the replication
+        """
+        osds = 0
+        last_storage = storage_hosts[0]
+        for i in storage_hosts:
+            if i.hostname > last_storage.hostname:
+                last_storage = i
+
+            # either cinder or ceph
+            stors = stors_by_host.get(i.id, [])
+            osds += len([s for s in stors if s.tier_name == tiers_obj.name])
+
+        osds_raw = osds
+        stors = stors_by_host.get(last_storage.id, [])
+        storage_gap = len(storage_hosts) % replication
+        stors_number = len([s for s in stors if s.tier_name == tiers_obj.name])
+        if storage_gap != 0 and stors_number != 0:
+            osds_adjust = (replication - storage_gap) * stors_number
+            osds += osds_adjust
+            LOG.debug("OSD - number of storage hosts is not a multiple of replication factor, "
+                     "adjusting osds by %d to osds=%d" % (osds_adjust, osds))
+
+        return osds_raw, osds
+
     # TODO(CephPoolsDecouple): remove
     # TIER SUPPORT
     def _calculate_target_pg_num_for_tier_pool(self, tiers_obj, pool_name,
-                                               storage_hosts):
+                                               osds, replication):
         """
         Calculate target pg_num based upon storage hosts, OSDs, and tier
 
-        storage_hosts: storage host objects
         tier_obj: storage tier object
+        pool_name: name of the pool on the tier
+        osds: number of tier OSDs adjusted to a multiple of the replication
+        replication: configured replication of the tier
         returns target_pg_num  calculated target policy group number
-                osds_raw       actual osds
 
         Primary Tier:
             Minimum: <= 2 storage applies minimum. (512, 512, 256, 256, 128)
@@ -1168,10 +1326,6 @@ class CephOperator(object):
         Determine number of OSD (in multiples of storage replication factor) on
         the first host-unlock of storage pair.
         """
-        # Get configured ceph replication
-        replication, min_replication = \
-            StorageBackendConfig.get_ceph_pool_replication(self._db_api, tiers_obj)
-
         if tiers_obj.uuid == self.primary_tier_uuid:
             is_primary_tier = True
             pools = CEPH_POOLS
@@ -1180,28 +1334,6 @@ class CephOperator(object):
             pools = constants.SB_TIER_CEPH_POOLS
 
         target_pg_num = None
-
-        osds = 0
-        stors = None
-        last_storage = storage_hosts[0]
-        for i in storage_hosts:
-            if i.hostname > last_storage.hostname:
-                last_storage = i
-
-            # either cinder or ceph
-            stors = self._db_api.istor_get_by_ihost(i.uuid)
-            osds += len([s for s in stors if s.tier_name == tiers_obj.name])
-
-        osds_raw = osds
-        stors = self._db_api.istor_get_by_ihost(last_storage.uuid)
-        storage_gap = len(storage_hosts) % replication
-        stors_number = len([s for s in stors if s.tier_name == tiers_obj.name])
-        if storage_gap != 0 and stors_number != 0:
-            osds_adjust = (replication - storage_gap) * stors_number
-            osds += osds_adjust
-            LOG.debug("OSD - number of storage hosts is not a multiple of replication factor, "
-                     "adjusting osds by %d to osds=%d" % (osds_adjust, osds))
-
         data_pt = None
 
         for pool in pools:
@@ -1224,104 +1356,126 @@ class CephOperator(object):
             # find next highest power of 2 via shift bit length
             target_pg_num = 1 << (int(target_pg_num_raw) - 1).bit_length()
 
-        LOG.info("OSD pool %s target_pg_num_raw=%s target_pg_num=%s "
-                 "osds_raw=%s osds=%s" %
-                 (pool_name, target_pg_num_raw, target_pg_num, osds_raw, osds))
+        LOG.debug("OSD pool %s target_pg_num_raw=%s target_pg_num=%s "
+                  "osds=%s" %
+                  (pool_name, target_pg_num_raw, target_pg_num, osds))
 
-        return target_pg_num, osds_raw
+        return target_pg_num
 
     # TODO(CephPoolsDecouple): remove
-    def audit_osd_pool_on_tier(self, tier_obj, storage_hosts, pool_name):
-        """ Audit an osd pool and update pg_num, pgp_num accordingly.
-            storage_hosts; list of known storage host objects
-            :param storage_hosts: list of storage host objects
-            :param pool_name:
+    def audit_osd_pool_on_tier(self, tier_obj, pool, osds_raw, osds,
+                               replication, pg_audit_enabled):
+        """ Audit an osd pool and compute its pg_num, pgp_num updates.
+            :param tier_obj: storage tier object
+            :param pool: osd_dump entry of the pool
+            :param osds_raw: actual number of OSDs of the tier
+            :param osds: OSDs of the tier adjusted to the replication
+            :param replication: configured replication of the tier
+            :param pg_audit_enabled: whether pg_num may be increased
+            :returns: list of (param, value) to set on the pool, in order
         """
 
-        tier_pool_name = pool_name
+        pool_name = pool['pool_name']
+        cur_pg_num = pool['pg_num']
+        cur_pgp_num = pool['pg_placement_num']
+        updates = []
 
-        # Check if the pool exists
-        response, body = self._ceph_api.osd_pool_get(
-            tier_pool_name, "pg_num", body='json')
-        if not response.ok:
-            # Pool does not exist, log error
-            LOG.error("OSD pool %(name)s get failed: %(reason)s, "
-                      "details %(details)s" %
-                      {"name": tier_pool_name, "reason": response.reason,
-                       "details": body})
-            return
-        cur_pg_num = body['output']['pg_num']
-
-        response, body = self._ceph_api.osd_pool_get(
-            tier_pool_name, "pgp_num", body='json')
-        if not response.ok:
-            # Pool does not exist, log error
-            LOG.error("OSD pool %(name)s get "
-                      "failed: %(reason)s, details: %(details)s" %
-                      {"name": tier_pool_name, "reason": response.reason,
-                       "details": body})
-            return
-        cur_pgp_num = body['output']['pgp_num']
-
-        LOG.info("OSD pool name %s, cur_pg_num=%s, cur_pgp_num=%s" %
-                 (tier_pool_name, cur_pg_num, cur_pgp_num))
+        LOG.debug("OSD pool name %s, cur_pg_num=%s, cur_pgp_num=%s" %
+                  (pool_name, cur_pg_num, cur_pgp_num))
         # First ensure our pg_num and pgp_num match
         if cur_pgp_num < cur_pg_num:
             # The pgp_num needs to match the pg_num. Ceph has no limits on
             # how much the pgp_num can be stepped.
             target_pgp_num = cur_pg_num
-            LOG.info("Increasing pgps from %d to %d" % (cur_pgp_num,
-                                                        target_pgp_num))
-            response, body = self._ceph_api.osd_set_pool_param(
-                tier_pool_name, 'pgp_num', target_pgp_num, force=None, body='text')
-            if not response.ok:
-                # Do not fail the operation - just log it
-                LOG.error("OSD pool %(name)s set pgp_num "
-                          "failed: %(reason)s, details: %(details)s",
-                          {"name": tier_pool_name, "reason": response.reason,
-                           "details": body})
-                return
+            LOG.info("Increasing pgps of %s from %d to %d" %
+                     (pool_name, cur_pgp_num, target_pgp_num))
+            updates.append(('pgp_num', target_pgp_num))
 
-        # Only perform pg_num audit if ceph cluster is healthy
-        if not self.ceph_status_ok():
-            if not os.path.exists(constants.SYSINV_RUNNING_IN_LAB):
-                LOG.info("Ceph Status not healthy, skipping OSD pg_num audit")
-                return
+        if not pg_audit_enabled:
+            return updates
 
-        target_pg_num, osds = self._calculate_target_pg_num_for_tier_pool(
-            tier_obj, tier_pool_name, storage_hosts)
+        target_pg_num = self._calculate_target_pg_num_for_tier_pool(
+            tier_obj, pool_name, osds, replication)
 
         # Check whether the number of pgs needs to be increased
-        if cur_pg_num < target_pg_num:
+        if target_pg_num and cur_pg_num < target_pg_num:
             # This is tricky, because ceph only allows the number of pgs
             # on an OSD to be increased by 32 in one step. (Check? force)
-            max_pg_num = cur_pg_num + (osds * 32)
+            max_pg_num = cur_pg_num + (osds_raw * 32)
             if target_pg_num > max_pg_num:
                 LOG.warn("Stepping pg_num - current: %d, target: %d, "
                          "step: %d " % (cur_pg_num, target_pg_num,
                                         max_pg_num))
                 target_pg_num = max_pg_num
 
-            LOG.info("Increasing pg_num from %d to %d" % (cur_pg_num,
-                                                          target_pg_num))
-            response, body = self._ceph_api.osd_set_pool_param(
-                tier_pool_name, 'pg_num', target_pg_num, body='text')
-            # Add: force='--yes-i-really-mean-it' for cached pools
-            # once changing PGs is considered stable
+            LOG.info("Increasing pg_num of %s from %d to %d" %
+                     (pool_name, cur_pg_num, target_pg_num))
+            updates.append(('pg_num', target_pg_num))
+
+            # Ceph needs time to increase the number of pgs before
+            # we attempt to increase the pgp number. We will wait for the
+            # audit to call us and increase the pgp number at that point.
+
+        return updates
+
+    # TODO(CephPoolsDecouple): remove
+    def _apply_osd_pool_updates(self, pool_name, updates):
+        """ Set the pool parameters in order, stopping at the first failure.
+            The cached ceph snapshot is left for the caller to invalidate.
+            :param pool_name: pool name
+            :param updates: list of (param, value) to set, max_bytes and
+                            max_objects are set as quotas
+            :returns: number of parameters set
+        """
+
+        applied = 0
+        for param, value in updates:
+            if param in ('max_bytes', 'max_objects'):
+                response, body = self._ceph_api.osd_set_pool_quota(
+                    pool_name, param, value, body='json')
+            elif param == 'pgp_num':
+                response, body = self._ceph_api.osd_set_pool_param(
+                    pool_name, param, value, force=None, body='text')
+            else:
+                # Add: force='--yes-i-really-mean-it' for cached pools
+                # once changing PGs is considered stable
+                response, body = self._ceph_api.osd_set_pool_param(
+                    pool_name, param, value, body='text')
             if not response.ok:
                 # Do not fail the operation - just log it
-                LOG.error("OSD pool %(name)s set pg_num "
+                LOG.error("OSD pool %(name)s set %(param)s "
                           "failed: %(reason)s, details: %(details)s",
-                          {"name": tier_pool_name, "reason": response.reason,
-                           "details": body})
-                return
+                          {"name": pool_name, "param": param,
+                           "reason": response.reason, "details": body})
+                break
+            LOG.info("Set OSD pool %s %s=%s" % (pool_name, param, value))
+            applied += 1
 
-                # Ceph needs time to increase the number of pgs before
-                # we attempt to increase the pgp number. We will wait for the
-                # audit to call us and increase the pgp number at that point.
+        return applied
+
+    # TODO(CephPoolsDecouple): remove
+    def _get_osd_pool_quota_updates(self, pool, max_bytes, max_objects=0):
+        """ Compute the quota updates of a pool, as set_osd_pool_quota.
+            :param pool: osd_dump entry of the pool
+            :returns: list of (param, value) to set on the pool
+        """
+
+        updates = []
+        if pool['quota_max_bytes'] != max_bytes:
+            updates.append(('max_bytes', max_bytes))
+        if pool['quota_max_objects'] != max_objects:
+            updates.append(('max_objects', max_objects))
+        return updates
 
     # TODO(CephPoolsDecouple): remove
     def audit_osd_quotas_for_tier(self, tier_obj):
+        """ Compute the default quotas of the pools of a tier.
+            The storage backend is updated with the computed sizes, the
+            quotas are left for the caller to set.
+            :param tier_obj: storage tier object
+            :returns: dict of {pool name: max_bytes}
+        """
+        quotas = {}
 
         # TODO(rchurch): Make this smarter.Just look at the OSD for the tier to
         # determine if we can continue. For now making sure all are up/in is ok
@@ -1334,11 +1488,11 @@ class CephOperator(object):
                      int(osd_stats['num_in_osds']))):
                 LOG.info("Not all OSDs are up. "
                          "Not configuring default quotas.")
-                return
+                return quotas
         except Exception as e:
             LOG.error("Error contacting cluster for getting "
                       "osd information. Exception:  %s", e)
-            return
+            return quotas
 
         try:
             primary_tier_gib = int(self.get_ceph_primary_tier_size())
@@ -1347,17 +1501,17 @@ class CephOperator(object):
             # don't yet dynamically update the ceph quotas
             if primary_tier_gib == 0:
                 LOG.info("Ceph cluster is up, but no storage nodes detected.")
-                return
+                return quotas
         except Exception as e:
             LOG.error("Error contacting cluster for getting "
                       "cluster information. Exception:  %s", e)
-            return
+            return quotas
 
         if tier_obj.forbackendid is None:
             LOG.error("Tier %s does not have a backend attached. Quotas "
                       "enforcement is skipped until a backend is attached."
                       % tier_obj.name)
-            return
+            return quotas
 
         # Get the storage backend
         storage_ceph = self._db_api.storage_ceph_get(tier_obj.forbackendid)
@@ -1408,8 +1562,8 @@ class CephOperator(object):
                     self._db_api.storage_ceph_update(storage_ceph.uuid,
                                                      {'cinder_pool_gib':
                                                       cinder_pool_gib})
-                    self.set_osd_pool_quota(constants.CEPH_POOL_VOLUMES_NAME,
-                                            cinder_pool_gib * 1024 ** 3)
+                    quotas[constants.CEPH_POOL_VOLUMES_NAME] = (
+                        cinder_pool_gib * 1024 ** 3)
                 else:
                     glance_pool_gib = primary_tier_gib / 2
                     kube_pool_gib = primary_tier_gib - glance_pool_gib
@@ -1418,15 +1572,15 @@ class CephOperator(object):
                     self._db_api.storage_ceph_update(storage_ceph.uuid,
                                                      {'glance_pool_gib':
                                                       glance_pool_gib})
-                    self.set_osd_pool_quota(constants.CEPH_POOL_IMAGES_NAME,
-                                            glance_pool_gib * 1024 ** 3)
+                    quotas[constants.CEPH_POOL_IMAGES_NAME] = (
+                        glance_pool_gib * 1024 ** 3)
 
                     # Set the quota for the k8s pool.
                     self._db_api.storage_ceph_update(storage_ceph.uuid,
                                                      {'kube_pool_gib':
                                                       kube_pool_gib})
-                    self.set_osd_pool_quota(constants.CEPH_POOL_KUBE_NAME,
-                                            kube_pool_gib * 1024 ** 3)
+                    quotas[constants.CEPH_POOL_KUBE_NAME] = (
+                        kube_pool_gib * 1024 ** 3)
 
                 self.executed_default_quota_check_by_tier[tier_obj.name] = True
             elif (upgrade is not None and
@@ -1441,15 +1595,15 @@ class CephOperator(object):
                     self._db_api.storage_ceph_update(storage_ceph.uuid,
                                                      {'cinder_pool_gib':
                                                       cinder_pool_gib})
-                    self.set_osd_pool_quota(constants.CEPH_POOL_VOLUMES_NAME,
-                                            cinder_pool_gib * 1024 ** 3)
+                    quotas[constants.CEPH_POOL_VOLUMES_NAME] = (
+                        cinder_pool_gib * 1024 ** 3)
                 else:
                     glance_pool_gib = primary_tier_gib
                     self._db_api.storage_ceph_update(storage_ceph.uuid,
                                                      {'glance_pool_gib':
                                                       glance_pool_gib})
-                    self.set_osd_pool_quota(constants.CEPH_POOL_IMAGES_NAME,
-                                            glance_pool_gib * 1024 ** 3)
+                    quotas[constants.CEPH_POOL_IMAGES_NAME] = (
+                        glance_pool_gib * 1024 ** 3)
 
                 self.executed_default_quota_check_by_tier[tier_obj.name] = True
             elif (primary_tier_gib > 0 and
@@ -1490,14 +1644,14 @@ class CephOperator(object):
             # Set the quota for the cinder-volumes pool.
             self._db_api.storage_ceph_update(
                 storage_ceph.uuid, {'cinder_pool_gib': cinder_pool_gib})
-            self.set_osd_pool_quota(
-                constants.CEPH_POOL_VOLUMES_NAME, cinder_pool_gib * 1024 ** 3)
+            quotas[constants.CEPH_POOL_VOLUMES_NAME] = (
+                cinder_pool_gib * 1024 ** 3)
 
             # Set the quota for the k8s pool.
             self._db_api.storage_ceph_update(
                 storage_ceph.uuid, {'kube_pool_gib': kube_pool_gib})
-            self.set_osd_pool_quota(
-                constants.CEPH_POOL_KUBE_NAME, kube_pool_gib * 1024 ** 3)
+            quotas[constants.CEPH_POOL_KUBE_NAME] = (
+                kube_pool_gib * 1024 ** 3)
 
             # Adjust pool quotas based on pool relationships.
             if tier_size_gib == tier_pools_sum:
@@ -1507,13 +1661,75 @@ class CephOperator(object):
                 # Special case: For now with one pool allow no quota
                 self.executed_default_quota_check_by_tier[tier_obj.name] = True
 
+        return quotas
+
+    # TODO(CephPoolsDecouple): remove
+    def _get_tier_pool_names(self, tier_obj, pools_by_name):
+        """ Get the names of the pools expected on a tier.
+            :param tier_obj: storage tier object
+            :param pools_by_name: dict of the osd_dump pool entries by name
+        """
+
+        if tier_obj.uuid != self.primary_tier_uuid:
+            # Adjust the pool name based on the current tier
+            return ["%s-%s" % (p['pool_name'], tier_obj.name)
+                    for p in constants.SB_TIER_CEPH_POOLS]
+
+        # To be safe let configure_osd_pools() be the only place that can
+        # update the object pool name in CEPH_POOLS, so the rgw object pool
+        # name is resolved here from the pools that exist in ceph.
+        pool_names = []
+        for pool in CEPH_POOLS:
+            pool_name = pool['pool_name']
+            if pool_name in constants.CEPH_POOL_OBJECT_GATEWAY_NAME:
+                if constants.CEPH_POOL_OBJECT_GATEWAY_NAME_JEWEL in pools_by_name:
+                    pool_name = constants.CEPH_POOL_OBJECT_GATEWAY_NAME_JEWEL
+                elif constants.CEPH_POOL_OBJECT_GATEWAY_NAME_HAMMER in pools_by_name:
+                    pool_name = constants.CEPH_POOL_OBJECT_GATEWAY_NAME_HAMMER
+                else:
+                    LOG.error("Rados gateway object data pool does not exist.")
+                    continue
+            pool_names.append(pool_name)
+        return pool_names
+
     # TODO(CephPoolsDecouple): remove
     def audit_osd_pools_by_tier(self):
         """ Check osd pool pg_num vs calculated target pg_num.
             Set pool quotas default values dynamically depending
             on cluster size.
+
+            The attributes of all pools are read once per audit from the
+            ceph snapshot, the quota and pg_num updates of all the tiers are
+            computed from it and only the parameters that differ from the
+            computed targets are sent to ceph.
         """
 
+        start = time.time()
+        summary = {'tiers': 0, 'pools': 0, 'missing': 0,
+                   'updates': 0, 'failed': 0}
+        try:
+            self._audit_osd_pools_by_tier(summary)
+        finally:
+            summary['elapsed'] = time.time() - start
+            LOG.info("OSD pool audit: %(tiers)d tiers, %(pools)d pools, "
+                     "%(missing)d missing, %(updates)d updates sent, "
+                     "%(failed)d pools failed in %(elapsed).2f seconds" %
+                     summary)
+
+    # TODO(CephPoolsDecouple): remove
+    def _audit_osd_pools_by_tier(self, summary):
+        osd_dump, reason = self._get_snapshot_view('osd_dump')
+        if osd_dump is None:
+            LOG.warn(_('OSD pool audit skipped. Reason: %(reason)s') %
+                     {'reason': reason})
+            return
+        pools_by_name = dict((p['pool_name'], p) for p in osd_dump['pools'])
+
+        # pool name -> list of (param, value) to set, in order
+        pool_updates = collections.OrderedDict()
+        # pool name -> tier whose default quotas are set on the pool
+        quota_tiers = {}
+
         tiers = self._db_api.storage_tier_get_by_cluster(self.cluster_db_uuid)
         ceph_tiers = [t for t in tiers if t.type == constants.SB_TIER_TYPE_CEPH]
         for t in ceph_tiers:
@@ -1523,50 +1739,86 @@ class CephOperator(object):
                     not self.executed_default_quota_check_by_tier[t.name]):
 
                 self.executed_default_quota_check_by_tier[t.name] = False
-                self.audit_osd_quotas_for_tier(t)
-
-            audit = []
-            storage_hosts = self._db_api.ihost_get_by_personality(constants.STORAGE)
-            # osd audit is not required for <= 2 hosts
-            if storage_hosts and len(storage_hosts) > 2:
-                if t.uuid == self.primary_tier_uuid:
-
-                    # Query ceph to get rgw object pool name.
-                    # To be safe let configure_osd_pools() be the only place that can
-                    # update the object pool name in CEPH_POOLS, so we make a local
-                    # copy of CEPH_POOLS here.
-                    pools_snapshot = copy.deepcopy(CEPH_POOLS)
-                    for pool in pools_snapshot:
-                        if pool['pool_name'] == constants.CEPH_POOL_OBJECT_GATEWAY_NAME_JEWEL:
-                            try:
-                                pool_name = self.get_ceph_object_pool_name()
-                                if pool_name is None:
-                                    LOG.error("Rados gateway object data pool does not exist.")
-                                else:
-                                    pool['pool_name'] = pool_name
-                            except RequestException as e:
-                                LOG.warn(_('Failed to retrieve rados gateway object data pool. '
-                                           'Reason: %(reason)s') % {'reason': str(e.message)})
-                                break
-
-                    audit = [(pools_snapshot, storage_hosts)]
+                quotas = self.audit_osd_quotas_for_tier(t)
+                for pool_name, max_bytes in quotas.items():
+                    pool = pools_by_name.get(pool_name)
+                    if pool is None:
+                        LOG.error("OSD pool %s does not exist, quota not "
+                                  "set" % pool_name)
+                        summary['missing'] += 1
+                        self.executed_default_quota_check_by_tier[t.name] = \
+                            False
+                        continue
+                    quota_tiers[pool_name] = t.name
+                    pool_updates.setdefault(pool_name, []).extend(
+                        self._get_osd_pool_quota_updates(pool, max_bytes))
+
+        storage_hosts = self._db_api.ihost_get_by_personality(constants.STORAGE)
+        # osd audit is not required for <= 2 hosts
+        if storage_hosts and len(storage_hosts) > 2:
+            self._audit_osd_pools_pg_num(ceph_tiers, storage_hosts,
+                                         pools_by_name, pool_updates,
+                                         summary)
 
-                else:
-                    # Adjust the pool name based on the current tier
-                    pools_snapshot = copy.deepcopy(constants.SB_TIER_CEPH_POOLS)
-                    for p in pools_snapshot:
-                        p['pool_name'] += "-%s" % t.name
-                    audit = [(pools_snapshot, storage_hosts)]
-
-                if audit is not None:
-                    for pools, storage_hosts in audit:
-                        for pool in pools:
-                            try:
-                                self.audit_osd_pool_on_tier(t,
-                                                            storage_hosts,
-                                                            pool['pool_name'])
-                            except RequestException as e:
-                                LOG.warn(_('OSD pool %(pool_name)s audit failed. '
-                                           'Reason: %(reason)s') % {
-                                               'pool_name': pool['pool_name'],
-                                               'reason': str(e.message)})
+        try:
+            for pool_name, updates in pool_updates.items():
+                if not updates:
+                    continue
+                try:
+                    applied = self._apply_osd_pool_updates(pool_name, updates)
+                except RequestException as e:
+                    LOG.warn(_('OSD pool %(pool_name)s audit failed. '
+                               'Reason: %(reason)s') % {
+                                   'pool_name': pool_name,
+                                   'reason': str(e.message)})
+                    applied = 0
+                summary['updates'] += applied
+                if applied < len(updates):
+                    summary['failed'] += 1
+                    if pool_name in quota_tiers:
+                        # check the default quotas again on the next audit
+                        self.executed_default_quota_check_by_tier[
+                            quota_tiers[pool_name]] = False
+        finally:
+            if summary['updates']:
+                self.invalidate_ceph_snapshot()
+
+    # TODO(CephPoolsDecouple): remove
+    def _audit_osd_pools_pg_num(self, ceph_tiers, storage_hosts,
+                                pools_by_name, pool_updates, summary):
+        """ Add the pg_num and pgp_num updates of the pools of the tiers.
+            :param pool_updates: dict of {pool name: [(param, value)]}
+        """
+
+        stors_by_host = {}
+        for stor in self._db_api.istor_get_all():
+            stors_by_host.setdefault(stor.forihostid, []).append(stor)
+
+        # Only perform pg_num audit if ceph cluster is healthy
+        pg_audit_enabled = self.ceph_status_ok()
+        if not pg_audit_enabled:
+            if os.path.exists(constants.SYSINV_RUNNING_IN_LAB):
+                pg_audit_enabled = True
+            else:
+                LOG.info("Ceph Status not healthy, skipping OSD pg_num audit")
+
+        for t in ceph_tiers:
+            summary['tiers'] += 1
+            replication, min_replication = \
+                StorageBackendConfig.get_ceph_pool_replication(self._db_api, t)
+            osds_raw, osds = self._calculate_tier_osds(
+                t, storage_hosts, stors_by_host, replication)
+
+            for pool_name in self._get_tier_pool_names(t, pools_by_name):
+                summary['pools'] += 1
+                pool = pools_by_name.get(pool_name)
+                if pool is None:
+                    # Pool does not exist, log error
+                    LOG.error("OSD pool %s does not exist" % pool_name)
+                    summary['missing'] += 1
+                    continue
+
+                pool_updates.setdefault(pool_name, []).extend(
+                    self.audit_osd_pool_on_tier(
+                        t, pool, osds_raw, osds, replication,
+                        pg_audit_enabled))
@@ -0,0 +1,156 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+"""RPC dispatcher that records per method statistics for the conductor."""
+
+import sys
+import time
+
+from eventlet import event
+from eventlet import semaphore
+
+from sysinv.openstack.common.rpc import dispatcher as rpc_dispatcher
+
+
+class _Pending(object):
+    """The queued requests of a coalesce key.
+
+    Only the newest generation is dispatched, the result is sent to the
+    superseded requests through the result event.
+    """
+
+    def __init__(self):
+        self.generation = 0
+        self.result = event.Event()
+
+
+class MeteredDispatcher(rpc_dispatcher.RpcDispatcher):
+    """RpcDispatcher that keeps call counts and durations per method.
+
+    The dispatcher also serves as an RPC lane: at most ``concurrency``
+    requests are handled at once, the others wait in the lane queue.  For
+    the methods listed in ``coalesce``, a queued request is dropped when a
+    newer request with the same scalar arguments (e.g. the same host uuid)
+    arrives, since the newer one supersedes it.  The superseded request is
+    not dispatched, its caller gets the result, or the exception, of the
+    request that superseded it.
+    """
+
+    def __init__(self, callbacks, serializer=None, lane=None,
+                 concurrency=None, coalesce=None):
+        super(MeteredDispatcher, self).__init__(callbacks, serializer)
+        self.lane = lane
+        self.concurrency = concurrency
+        self.coalesce = frozenset(coalesce or [])
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.coalesced = 0
+        self._semaphore = None
+        if concurrency:
+            self._semaphore = semaphore.Semaphore(concurrency)
+        self._pending = {}
+        self._method_stats = {}
+
+    def _get_method_stats(self, method):
+        stats = self._method_stats.get(method)
+        if stats is None:
+            stats = {'calls': 0,
+                     'failures': 0,
+                     'coalesced': 0,
+                     'total_time': 0.0,
+                     'max_time': 0.0,
+                     'total_wait': 0.0}
+            self._method_stats[method] = stats
+        return stats
+
+    @staticmethod
+    def _coalesce_key(method, kwargs):
+        return (method,) + tuple(sorted(
+            (k, v) for k, v in kwargs.items()
+            if not isinstance(v, (list, dict))))
+
+    def _wait(self, method, kwargs):
+        """Wait for a slot in the lane.
+
+        :returns: A tuple (superseded, pending). superseded is True if the
+                  request was superseded while queued.  pending is the
+                  _Pending shared by the queued requests with the same
+                  coalesce key, or None if the method is not coalesced.
+        """
+        pending = None
+        if method in self.coalesce:
+            key = self._coalesce_key(method, kwargs)
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = _Pending()
+            pending.generation += 1
+            generation = pending.generation
+
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            if self._semaphore:
+                self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        if pending is not None:
+            if pending.generation != generation:
+                if self._semaphore:
+                    self._semaphore.release()
+                return True, pending
+            del self._pending[key]
+        return False, pending
+
+    def dispatch(self, ctxt, version, method, namespace, **kwargs):
+        stats = self._get_method_stats(method)
+        queued_at = time.time()
+        superseded, pending = self._wait(method, kwargs)
+        if superseded:
+            self.coalesced += 1
+            stats['coalesced'] += 1
+            return pending.result.wait()
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        start = time.time()
+        stats['total_wait'] += start - queued_at
+        try:
+            result = super(MeteredDispatcher, self).dispatch(
+                ctxt, version, method, namespace, **kwargs)
+        except Exception:
+            stats['failures'] += 1
+            if pending is not None:
+                pending.result.send_exception(*sys.exc_info())
+            raise
+        else:
+            if pending is not None:
+                pending.result.send(result)
+            return result
+        finally:
+            elapsed = time.time() - start
+            self.in_flight -= 1
+            if self._semaphore:
+                self._semaphore.release()
+            stats['calls'] += 1
+            stats['total_time'] += elapsed
+            stats['max_time'] = max(stats['max_time'], elapsed)
+
+    def get_stats(self):
+        """Return a snapshot of the dispatcher statistics."""
+        return {'lane': self.lane,
+                'concurrency': self.concurrency,
+                'in_flight': self.in_flight,
+                'max_in_flight': self.max_in_flight,
+                'queued': self.queued,
+                'max_queued': self.max_queued,
+                'coalesced': self.coalesced,
+                'methods': dict((method, dict(stats)) for method, stats
+                                in self._method_stats.items())}
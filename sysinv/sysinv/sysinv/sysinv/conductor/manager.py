@@ -29,6 +29,7 @@ collection of inventory data for each host.
 
 """
 
+import collections
 import errno
 import filecmp
 import glob
@@ -52,6 +53,7 @@ from cryptography import x509
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
+from eventlet import greenthread
 from fm_api import constants as fm_constants
 from fm_api import fm_api
 from netaddr import IPAddress
@@ -80,17 +82,22 @@ from sysinv.common.retrying import retry
 from sysinv.common.storage_backend_conf import StorageBackendConfig
 from cephclient import wrapper as ceph
 from sysinv.conductor import ceph as iceph
+from sysinv.conductor import dispatcher as conductor_dispatcher
 from sysinv.conductor import kube_app
 from sysinv.conductor import openstack
+from sysinv.conductor import rpcapi as conductor_rpcapi
 from sysinv.db import api as dbapi
+from sysinv.db.sqlalchemy import dbstats
 from sysinv.objects import base as objects_base
 from sysinv.openstack.common import excutils
 from sysinv.openstack.common import jsonutils
 from sysinv.openstack.common import log
 from sysinv.openstack.common import periodic_task
+from sysinv.openstack.common import rpc
 from sysinv.openstack.common import timeutils
 from sysinv.openstack.common import uuidutils
 from sysinv.openstack.common.gettextutils import _
+from sysinv.openstack.common.rpc import service as rpc_service
 from sysinv.puppet import common as puppet_common
 from sysinv.puppet import puppet
 from sysinv.helm import helm
@@ -115,6 +122,33 @@ conductor_opts = [
        cfg.IntOpt('osd_remove_retry_interval',
                   default=5,
                   help='Interval in seconds between retries to remove Ceph OSD.'),
+       cfg.IntOpt('api_lane_concurrency',
+                  default=64,
+                  help=('Maximum number of API originated requests handled '
+                        'concurrently.')),
+       cfg.BoolOpt('reports_lane',
+                   default=True,
+                   help=('Consume the agent inventory reports on a separate '
+                         'reports lane. When disabled, the reports that are '
+                         'not sharded across workers are handled on the '
+                         'main topic.')),
+       cfg.IntOpt('reports_lane_concurrency',
+                  default=8,
+                  help=('Maximum number of agent inventory reports handled '
+                        'concurrently.')),
+       cfg.IntOpt('config_update_delay',
+                  default=0,
+                  help=('Seconds to wait for further configuration requests '
+                        'before regenerating and applying the host '
+                        'configuration. Requests received in the meantime '
+                        'are merged, but their RPC calls return before the '
+                        'update is applied and its errors are only logged. '
+                        '0 applies each request immediately and returns its '
+                        'errors to the caller.')),
+       cfg.IntOpt('config_update_max_delay',
+                  default=10,
+                  help=('Maximum number of seconds a configuration request '
+                        'is delayed while merging further requests.')),
                   ]
 
 CONF = cfg.CONF
@@ -140,6 +174,33 @@ CONFIG_REBOOT_REQUIRED = (1 << 127)
 
 LOCK_NAME_UPDATE_CONFIG = 'update_config_'
 
+# conductor workers
+CONDUCTOR_LEADER_LOCK = 'sysinv-conductor-leader'
+CONDUCTOR_LEADER_LOCK_RETRY = 5
+CONDUCTOR_LEADER_LOCK_CHECK_INTERVAL = 30
+CONDUCTOR_WORKER_STATS_INTERVAL = 30
+CONDUCTOR_WORKER_STATS_FILE = 'conductor-worker-%d.json'
+
+# number of runtime manifest apply records kept per host
+RUNTIME_CONFIG_HISTORY = 100
+
+# agent reports that carry the full inventory of a host, a queued report is
+# superseded by a newer one for the same host.  The superseded report is not
+# handled, its call returns the result of the newer report, which brings the
+# host up to date.
+CONDUCTOR_COALESCED_REPORTS = [
+    'iport_update_by_ihost',
+    'lldp_agent_update_by_host',
+    'lldp_neighbour_update_by_host',
+    'pci_device_update_by_host',
+    'inumas_update_by_ihost',
+    'imemory_update_by_ihost',
+    'idisk_update_by_ihost',
+    'ilvg_update_by_ihost',
+    'ipv_update_by_ihost',
+    'ipartition_update_by_ihost',
+]
+
 
 class ConductorManager(service.PeriodicService):
     """Sysinv Conductor service main class."""
@@ -147,10 +208,25 @@ class ConductorManager(service.PeriodicService):
     RPC_API_VERSION = '1.1'
     my_host_id = None
 
-    def __init__(self, host, topic):
+    def __init__(self, host, topic, worker_id=None):
         serializer = objects_base.SysinvObjectSerializer()
         super(ConductorManager, self).__init__(host, topic,
                                                serializer=serializer)
+        # Worker 0 is the leader: it runs the periodic audits and handles
+        # every request.  The other workers only handle the host inventory
+        # reports that are sharded to them.
+        self.worker_id = worker_id or 0
+        self._leader_lock = None
+        self._dispatchers = {}
+        self._reports_conn = None
+
+        # Pending configuration requests, see _config_queue_flush()
+        self._config_queue = collections.OrderedDict()
+        self._config_queue_first = None
+        self._config_queue_last = None
+        self._config_queue_running = False
+        self._config_queue_flushing = None
+        self._config_queue_failures = 0
         self.dbapi = None
         self.fm_api = None
         self.fm_log = None
@@ -170,11 +246,203 @@ class ConductorManager(service.PeriodicService):
         self._pv_op_timeouts = {}
         self._stor_bck_op_timeouts = {}
 
+    @property
+    def is_leader(self):
+        return self.worker_id == 0
+
     def start(self):
+        # the pools and statistics of the database engines belong to the
+        # process of each worker
+        dbstats.setup('conductor')
+
+        if not self.is_leader:
+            self.dbapi = dbapi.get_instance()
+            self.fm_api = fm_api.FaultAPIs()
+            self.fm_log = fm.FmCustomerLog()
+            cutils.check_lock_path()
+            # accept the sharded host reports only, the periodic tasks
+            # are run by the leader
+            rpc_service.Service.start(self)
+            self._start_worker_stats()
+            LOG.info("sysinv-conductor worker %d started" % self.worker_id)
+            return
+
+        self._acquire_leader_lock()
         self._start()
         # accept API calls and run periodic tasks after
         # initializing conductor manager service
         super(ConductorManager, self).start()
+        self.tg.add_timer(CONDUCTOR_LEADER_LOCK_CHECK_INTERVAL,
+                          self._check_leader_lock)
+        self._start_worker_stats()
+
+    def stop(self):
+        if self._config_queue:
+            try:
+                self._config_queue_flush()
+            except Exception:
+                # already logged by _config_queue_flush()
+                pass
+        if self._reports_conn:
+            try:
+                self._reports_conn.close()
+            except Exception:
+                pass
+            self._reports_conn = None
+        super(ConductorManager, self).stop()
+        self._release_leader_lock()
+
+    def _release_leader_lock(self):
+        if self._leader_lock:
+            try:
+                self.dbapi.advisory_lock_release(self._leader_lock)
+            except Exception as e:
+                LOG.warn("Failed to release conductor leader lock: %s" % e)
+            self._leader_lock = None
+
+    def _acquire_leader_lock(self):
+        """Wait for the database lock that elects the conductor leader.
+
+        Guards against two leaders (e.g. a stale process during a restart)
+        running the periodic audits concurrently.
+        """
+        self.dbapi = dbapi.get_instance()
+        while True:
+            self._leader_lock = self.dbapi.advisory_lock_acquire(
+                CONDUCTOR_LEADER_LOCK)
+            if self._leader_lock:
+                LOG.info("sysinv-conductor acquired leader lock")
+                return
+            LOG.info("sysinv-conductor leader lock held, retrying in %ds" %
+                     CONDUCTOR_LEADER_LOCK_RETRY)
+            time.sleep(CONDUCTOR_LEADER_LOCK_RETRY)
+
+    def _check_leader_lock(self):
+        """Verify that the leader lock is still held, or take it again.
+
+        The lock belongs to a database connection: the database releases it
+        if the connection drops, and another conductor may then take it.
+        The periodic tasks are suspended while the lock is not held.
+        """
+        try:
+            if (self._leader_lock and
+                    self.dbapi.advisory_lock_held(self._leader_lock)):
+                return
+            if self._leader_lock:
+                LOG.error("sysinv-conductor lost leader lock, periodic "
+                          "tasks suspended")
+                self._release_leader_lock()
+            self._leader_lock = self.dbapi.advisory_lock_acquire(
+                CONDUCTOR_LEADER_LOCK)
+            if self._leader_lock:
+                LOG.info("sysinv-conductor acquired leader lock, periodic "
+                         "tasks resumed")
+        except Exception as e:
+            LOG.warn("Failed to check conductor leader lock: %s" % e)
+
+    def _run_periodic_task_once(self, context, task_name, task, timeout,
+                                stats):
+        if self._leader_lock is None:
+            LOG.debug("Periodic task %s skipped without the leader lock" %
+                      task_name)
+            return
+        return super(ConductorManager, self)._run_periodic_task_once(
+            context, task_name, task, timeout, stats)
+
+    def create_rpc_dispatcher(self):
+        return self._create_lane_dispatcher(
+            conductor_rpcapi.LANE_API,
+            CONF.conductor.api_lane_concurrency)
+
+    def _create_lane_dispatcher(self, lane, concurrency, coalesce=None):
+        dispatcher = conductor_dispatcher.MeteredDispatcher(
+            [self.manager], self.serializer, lane=lane,
+            concurrency=concurrency, coalesce=coalesce)
+        self._dispatchers[lane] = dispatcher
+        return dispatcher
+
+    def create_rpc_consumers(self, dispatcher):
+        reports = self._create_lane_dispatcher(
+            conductor_rpcapi.LANE_REPORTS,
+            CONF.conductor.reports_lane_concurrency,
+            coalesce=CONDUCTOR_COALESCED_REPORTS)
+        topics = []
+        conn = self.conn
+        if self.is_leader:
+            super(ConductorManager, self).create_rpc_consumers(dispatcher)
+            if CONF.conductor.reports_lane:
+                topics.append(conductor_rpcapi.get_lane_topic(
+                    conductor_rpcapi.LANE_REPORTS, self.topic))
+                # The reports are consumed on their own connection: a full
+                # reports lane stalls the consumer of its connection.
+                self._reports_conn = rpc.create_connection(new=True)
+                conn = self._reports_conn
+        if CONF.conductor.workers > 1:
+            topics.append(conductor_rpcapi.get_shard_topic(self.worker_id,
+                                                           self.topic))
+        for topic in topics:
+            conn.create_consumer(topic, reports, fanout=False)
+        if self._reports_conn:
+            self._reports_conn.consume_in_thread()
+
+    def _get_worker_stats_file(self, worker_id):
+        return os.path.join(constants.SYSINV_LOCK_PATH,
+                            CONDUCTOR_WORKER_STATS_FILE % worker_id)
+
+    def _start_worker_stats(self):
+        if CONF.conductor.workers > 1:
+            self.tg.add_timer(CONDUCTOR_WORKER_STATS_INTERVAL,
+                              self._write_worker_stats)
+
+    def _get_worker_stats(self):
+        stats = {'lanes': dict((lane, dispatcher.get_stats())
+                               for lane, dispatcher
+                               in self._dispatchers.items())}
+        stats.update({'worker_id': self.worker_id,
+                      'agent_messages': agent_rpcapi.get_message_stats(),
+                      'pid': os.getpid(),
+                      'leader': self.is_leader,
+                      'config_update_failures': self._config_queue_failures,
+                      'updated_at': time.time()})
+        return stats
+
+    def _write_worker_stats(self):
+        """Publish the RPC statistics of this worker for the leader."""
+        try:
+            path = self._get_worker_stats_file(self.worker_id)
+            with open(path + '.tmp', 'w') as f:
+                f.write(jsonutils.dumps(self._get_worker_stats()))
+            os.rename(path + '.tmp', path)
+        except Exception as e:
+            LOG.warn("Failed to write conductor worker stats: %s" % e)
+
+    def get_conductor_topology(self, context):
+        """Return the conductor topology the clients shard reports with.
+
+        :param context: request context.
+        :returns: dictionary with the number of conductor workers and
+                  whether the leader consumes the reports lane.
+        """
+        return {'workers': CONF.conductor.workers,
+                'reports_lane': CONF.conductor.reports_lane}
+
+    def get_conductor_worker_stats(self, context):
+        """Return the RPC statistics of the conductor workers.
+
+        :param context: request context.
+        :returns: list of per worker and per lane in flight and queued
+                  counts, per method call counts, failures and
+                  durations, and per method counts of the unicast and
+                  fanout requests sent to the agents.
+        """
+        workers = [self._get_worker_stats()]
+        for worker_id in range(1, CONF.conductor.workers):
+            try:
+                with open(self._get_worker_stats_file(worker_id)) as f:
+                    workers.append(jsonutils.loads(f.read()))
+            except (IOError, ValueError):
+                workers.append({'worker_id': worker_id})
+        return workers
 
     def _start(self):
         self.dbapi = dbapi.get_instance()
@@ -205,8 +473,19 @@ class ConductorManager(service.PeriodicService):
 
     def periodic_tasks(self, context, raise_on_error=False):
         """ Periodic tasks are run at pre-specified intervals. """
+        if self._leader_lock is None:
+            LOG.debug("Periodic tasks skipped without the leader lock")
+            return
         return self.run_periodic_tasks(context, raise_on_error=raise_on_error)
 
+    def get_periodic_task_stats(self, context):
+        """Return the run statistics of the conductor periodic tasks.
+
+        :param context: request context.
+        :returns: dict of statistics keyed by periodic task name.
+        """
+        return super(ConductorManager, self).get_periodic_task_stats()
+
     @contextmanager
     def session(self):
         session = dbapi.get_instance().get_session(autocommit=True)
@@ -5345,12 +5624,19 @@ class ConductorManager(service.PeriodicService):
 
     def update_dns_config(self, context):
         """Update the DNS configuration"""
+        self._config_queue_call(context, self._update_dns_config)
+
+    def _update_dns_config(self, context):
         personalities = [constants.CONTROLLER]
         config_uuid = self._config_update_hosts(context, personalities)
         self._update_resolv_file(context, config_uuid, personalities)
 
     def update_ntp_config(self, context, service_change=False):
         """Update the NTP configuration"""
+        self._config_queue_call(context, self._update_ntp_config,
+                                service_change)
+
+    def _update_ntp_config(self, context, service_change):
         if service_change:
             personalities = [constants.CONTROLLER,
                              constants.WORKER,
@@ -5408,14 +5694,12 @@ class ConductorManager(service.PeriodicService):
         personalities = [constants.CONTROLLER,
                          constants.WORKER,
                          constants.STORAGE]
-        config_uuid = self._config_update_hosts(context, personalities)
-
         config_dict = {
             "personalities": personalities,
             "classes": 'platform::network::runtime'
         }
 
-        self._config_apply_runtime_manifest(context, config_uuid, config_dict)
+        self._config_queue_runtime_manifest(context, config_dict)
 
     def update_sriov_config(self, context, host_uuid):
         """update sriov configuration for a host
@@ -5427,9 +5711,6 @@ class ConductorManager(service.PeriodicService):
         # update manifest files and notify agent to apply them
         personalities = [constants.CONTROLLER,
                          constants.WORKER]
-        config_uuid = self._config_update_hosts(context, personalities,
-                                                host_uuids=[host_uuid])
-
         config_dict = {
             "personalities": personalities,
             'host_uuids': host_uuid,
@@ -5438,8 +5719,8 @@ class ConductorManager(service.PeriodicService):
                 puppet_common.REPORT_PCI_SRIOV_CONFIG,
         }
 
-        self._config_apply_runtime_manifest(
-            context, config_uuid, config_dict, force=True)
+        self._config_queue_runtime_manifest(
+            context, config_dict, target_host_uuids=[host_uuid], force=True)
 
     def configure_system_https(self, context):
         """Update the system https configuration.
@@ -6023,6 +6304,48 @@ class ConductorManager(service.PeriodicService):
             self.fm_api.clear_fault(fm_constants.FM_ALARM_ID_STORAGE_BACKEND_FAILED,
                                     entity_instance_id)
 
+    def report_runtime_config_status(self, context, host_uuid,
+                                     runtime_config):
+        """Callback from Sysinv Agent on runtime manifest apply progress.
+
+        :param context: request context
+        :param host_uuid: uuid of the host that applies the manifest
+        :param runtime_config: dict with the request_id, config_uuid,
+                               classes and state of the apply, and its
+                               duration and error once completed.
+        """
+        try:
+            host = self.dbapi.ihost_get(host_uuid)
+        except exception.ServerNotFound:
+            LOG.warn("Runtime config reported for unknown host %s" %
+                     host_uuid)
+            return
+
+        values = dict(runtime_config)
+        request_id = values['request_id']
+        try:
+            record = self.dbapi.runtime_config_get_by_request(host.id,
+                                                              request_id)
+        except exception.RuntimeConfigNotFound:
+            try:
+                self.dbapi.runtime_config_create(host.id, values)
+                self.dbapi.runtime_config_prune(host.id,
+                                                RUNTIME_CONFIG_HISTORY)
+                return
+            except exception.RuntimeConfigAlreadyExists:
+                # reported concurrently with the previous state
+                record = self.dbapi.runtime_config_get_by_request(
+                    host.id, request_id)
+
+        # reports may be handled out of order, don't go back to a previous
+        # state
+        states = constants.RUNTIME_CONFIG_STATES
+        if (record.state in states and values['state'] in states and
+                states.index(values['state']) < states.index(record.state)):
+            return
+        del values['request_id']
+        self.dbapi.runtime_config_update(record.uuid, values)
+
     def report_config_status(self, context, iconfig, status, error=None):
         """ Callback from Sysinv Agent on manifest apply success or failure
 
@@ -7156,6 +7479,10 @@ class ConductorManager(service.PeriodicService):
         if service == constants.SERVICE_TYPE_CEPH:
             return self._ceph.update_service_config(do_apply)
 
+        self._config_queue_call(context, self._update_service_config,
+                                service, do_apply)
+
+    def _update_service_config(self, context, service, do_apply):
         # On service parameter add just update the host profile
         # for personalities pertinent to that service
         if service == constants.SERVICE_TYPE_NETWORK:
@@ -7208,14 +7535,16 @@ class ConductorManager(service.PeriodicService):
                     "classes": ['platform::haproxy::runtime',
                                 'openstack::keystone::server::runtime']
                 }
-                self._config_apply_runtime_manifest(context, config_uuid, config_dict)
+                self._config_queue_runtime_manifest(
+                    context, config_dict, config_uuid=config_uuid)
 
             elif service == constants.SERVICE_TYPE_HORIZON:
                 config_dict = {
                     "personalities": personalities,
                     "classes": ['openstack::horizon::runtime']
                 }
-                self._config_apply_runtime_manifest(context, config_uuid, config_dict)
+                self._config_queue_runtime_manifest(
+                    context, config_dict, config_uuid=config_uuid)
 
             elif service == constants.SERVICE_TYPE_NETWORK:
                 if not self._config_is_reboot_required(config_uuid):
@@ -7224,7 +7553,8 @@ class ConductorManager(service.PeriodicService):
                         "personalities": personalities,
                         "classes": ['openstack::neutron::server::runtime']
                     }
-                    self._config_apply_runtime_manifest(context, config_uuid, config_dict)
+                    self._config_queue_runtime_manifest(
+                        context, config_dict, config_uuid=config_uuid)
 
             elif service == constants.SERVICE_TYPE_CINDER:
                 self._update_emc_state()
@@ -7247,7 +7577,8 @@ class ConductorManager(service.PeriodicService):
                     "classes": ['openstack::cinder::service_param::runtime'],
                     "host_uuids": [ctrl.uuid for ctrl in valid_ctrls],
                 }
-                self._config_apply_runtime_manifest(context, config_uuid, config_dict)
+                self._config_queue_runtime_manifest(
+                    context, config_dict, config_uuid=config_uuid)
 
                 multipath_state_changed = self._multipath_update_state()
                 if multipath_state_changed:
@@ -7260,38 +7591,41 @@ class ConductorManager(service.PeriodicService):
                     "personalities": personalities,
                     "classes": ['platform::mtce::runtime']
                 }
-                self._config_apply_runtime_manifest(context, config_uuid, config_dict)
+                self._config_queue_runtime_manifest(
+                    context, config_dict, config_uuid=config_uuid)
 
             elif service == constants.SERVICE_TYPE_NOVA:
                 personalities = [constants.CONTROLLER]
-                config_uuid = self._config_update_hosts(context, personalities)
                 config_dict = {
                     "personalities": personalities,
                     "classes": ['openstack::nova::controller::runtime']
                 }
-                self._config_apply_runtime_manifest(context, config_uuid, config_dict)
+                self._config_queue_runtime_manifest(
+                    context, config_dict, config_uuid=config_uuid)
 
                 personalities = [constants.WORKER]
-                config_uuid = self._config_update_hosts(context, personalities)
                 config_dict = {
                     "personalities": personalities,
                     "classes": ['openstack::nova::compute::runtime']
                 }
-                self._config_apply_runtime_manifest(context, config_uuid, config_dict)
+                self._config_queue_runtime_manifest(
+                    context, config_dict, config_uuid=config_uuid)
 
             elif service == constants.SERVICE_TYPE_PANKO:
                 config_dict = {
                     "personalities": personalities,
                     "classes": ['openstack::panko::runtime']
                 }
-                self._config_apply_runtime_manifest(context, config_uuid, config_dict)
+                self._config_queue_runtime_manifest(
+                    context, config_dict, config_uuid=config_uuid)
 
             elif service == constants.SERVICE_TYPE_AODH:
                 config_dict = {
                     "personalities": personalities,
                     "classes": ['openstack::aodh::runtime']
                 }
-                self._config_apply_runtime_manifest(context, config_uuid, config_dict)
+                self._config_queue_runtime_manifest(
+                    context, config_dict, config_uuid=config_uuid)
 
             elif service == constants.SERVICE_TYPE_SWIFT:
                 personalities = [constants.CONTROLLER]
@@ -7299,7 +7633,8 @@ class ConductorManager(service.PeriodicService):
                     "personalities": personalities,
                     "classes": ['openstack::swift::runtime']
                 }
-                self._config_apply_runtime_manifest(context, config_uuid, config_dict)
+                self._config_queue_runtime_manifest(
+                    context, config_dict, config_uuid=config_uuid)
 
             elif service == constants.SERVICE_TYPE_BARBICAN:
                 personalities = [constants.CONTROLLER]
@@ -7307,7 +7642,8 @@ class ConductorManager(service.PeriodicService):
                     "personalities": personalities,
                     "classes": ['openstack::barbican::runtime']
                 }
-                self._config_apply_runtime_manifest(context, config_uuid, config_dict)
+                self._config_queue_runtime_manifest(
+                    context, config_dict, config_uuid=config_uuid)
 
             elif service == constants.SERVICE_TYPE_HTTP:
                 # the platform::config class will be applied that will
@@ -7316,8 +7652,8 @@ class ConductorManager(service.PeriodicService):
                 config_dict = {
                     "personalities": personalities,
                     "classes": ['platform::patching::runtime']}
-                self._config_apply_runtime_manifest(context, config_uuid,
-                                                    config_dict)
+                self._config_queue_runtime_manifest(
+                    context, config_dict, config_uuid=config_uuid)
 
                 # the runtime classes on controllers will be applied
                 personalities = [constants.CONTROLLER]
@@ -7328,8 +7664,8 @@ class ConductorManager(service.PeriodicService):
                                 'openstack::horizon::firewall',
                                 'platform::patching::runtime']
                 }
-                self._config_apply_runtime_manifest(context, config_uuid,
-                                                    config_dict)
+                self._config_queue_runtime_manifest(
+                    context, config_dict, config_uuid=config_uuid)
 
     def update_security_feature_config(self, context):
         """Update the kernel options configuration"""
@@ -7575,18 +7911,15 @@ class ConductorManager(service.PeriodicService):
             LOG.info("update_cpu_config, host uuid: (%s), force: (%s)",
                      host_uuid, str(force))
             personalities = [constants.CONTROLLER, constants.WORKER]
-            config_uuid = self._config_update_hosts(context,
-                                                    personalities,
-                                                    host_uuids=[host_uuid])
             config_dict = {
                 "personalities": personalities,
                 "host_uuids": [host_uuid],
                 "classes": ['platform::compute::grub::runtime']
             }
-            self._config_apply_runtime_manifest(context, config_uuid,
-                                                config_dict,
-                                                force=force,
-                                                host_uuids=[host_uuid])
+            self._config_queue_runtime_manifest(context, config_dict,
+                                                target_host_uuids=[host_uuid],
+                                                host_uuids=[host_uuid],
+                                                force=force)
 
     def _update_resolv_file(self, context, config_uuid, personalities):
         """Generate and update the resolv.conf files on the system"""
@@ -8238,6 +8571,156 @@ class ConductorManager(service.PeriodicService):
             if host.personality and host.personality in personalities:
                 self._update_host_config_reinstall(context, host)
 
+    def _config_queue_call(self, context, func, *args):
+        """Queue a configuration update operation.
+
+        An operation that is already queued with the same arguments is only
+        run once, it regenerates the configuration from the database when
+        the queue is flushed.
+        """
+        key = (func.__name__,) + args
+        if key not in self._config_queue:
+            self._config_queue[key] = {'context': context,
+                                       'func': func,
+                                       'args': args}
+        self._config_queue_schedule()
+
+    def _config_queue_runtime_manifest(self, context, config_dict,
+                                       target_host_uuids=None,
+                                       host_uuids=None, force=False,
+                                       config_uuid=None):
+        """Queue a hosts config update and runtime manifest apply.
+
+        Queued applies for the same personalities and hosts are merged: the
+        config target and hiera data of each host are updated once and a
+        single runtime apply of all of their classes is sent to the agents.
+
+        An apply requested while the queue is being flushed, e.g. by a
+        queued update operation, is run right away.
+
+        :param context: request context.
+        :param config_dict: runtime manifest config_dict
+        :param target_host_uuids: hosts whose config_target will be updated,
+                                  all hosts of the personalities if not set
+        :param host_uuids: hosts whose hiera data will be regenerated, all
+                           hosts of the personalities if not set
+        :param force: force the apply on hosts that are not provisioned
+        :param config_uuid: configuration uuid the config_target of the
+                            hosts was already updated to, the config_target
+                            is not updated again if set
+        """
+        config_dict = dict(config_dict)
+        personalities = config_dict.pop('personalities')
+        classes = config_dict.pop('classes')
+        if not isinstance(classes, list):
+            classes = [classes]
+
+        key = ('runtime_manifest',
+               tuple(sorted(personalities)),
+               tuple(target_host_uuids or []),
+               tuple(host_uuids or []),
+               force,
+               config_uuid,
+               repr(sorted(config_dict.items())))
+        entry = self._config_queue.get(key)
+        if entry is None:
+            config_dict.update({'personalities': personalities,
+                                'classes': []})
+            entry = {'context': context,
+                     'config_dict': config_dict,
+                     'target_host_uuids': target_host_uuids,
+                     'host_uuids': host_uuids,
+                     'force': force,
+                     'config_uuid': config_uuid}
+        for c in classes:
+            if c not in entry['config_dict']['classes']:
+                entry['config_dict']['classes'].append(c)
+
+        if self._config_queue_flushing is greenthread.getcurrent():
+            self._config_queue_apply(entry)
+            return
+        self._config_queue[key] = entry
+        self._config_queue_schedule()
+
+    def _config_queue_apply(self, entry):
+        """Run a queued configuration update."""
+        if 'func' in entry:
+            entry['func'](entry['context'], *entry['args'])
+            return
+
+        config_uuid = entry['config_uuid']
+        if config_uuid is None:
+            config_uuid = self._config_update_hosts(
+                entry['context'],
+                entry['config_dict']['personalities'],
+                host_uuids=entry['target_host_uuids'])
+        self._config_apply_runtime_manifest(
+            entry['context'], config_uuid, entry['config_dict'],
+            host_uuids=entry['host_uuids'],
+            force=entry['force'])
+
+    def _config_queue_schedule(self):
+        now = time.time()
+        self._config_queue_last = now
+        if self._config_queue_first is None:
+            self._config_queue_first = now
+
+        if CONF.conductor.config_update_delay <= 0:
+            self._config_queue_flush()
+        elif not self._config_queue_running:
+            self._config_queue_running = True
+            self.tg.add_thread(self._config_queue_run)
+
+    def _config_queue_run(self):
+        try:
+            while self._config_queue:
+                deadline = min(
+                    self._config_queue_last +
+                    CONF.conductor.config_update_delay,
+                    self._config_queue_first +
+                    CONF.conductor.config_update_max_delay)
+                remaining = deadline - time.time()
+                if remaining > 0:
+                    time.sleep(remaining)
+                    continue
+                try:
+                    self._config_queue_flush()
+                except Exception:
+                    # the RPC callers have returned, the failures are
+                    # logged and counted by _config_queue_flush()
+                    pass
+        finally:
+            self._config_queue_running = False
+
+    def _config_queue_flush(self):
+        """Run the queued configuration updates in the order received.
+
+        A failed update does not prevent the following ones from running.
+        The failures are logged and counted in the worker stats, and the
+        first one is raised once the queue is flushed.
+        """
+        queue = self._config_queue
+        self._config_queue = collections.OrderedDict()
+        self._config_queue_first = None
+
+        failure = None
+        flushing = self._config_queue_flushing
+        self._config_queue_flushing = greenthread.getcurrent()
+        try:
+            for key, entry in queue.items():
+                try:
+                    self._config_queue_apply(entry)
+                except Exception as e:
+                    LOG.exception("Failed to apply queued configuration "
+                                  "update %s: %s" % (key[0], e))
+                    self._config_queue_failures += 1
+                    if failure is None:
+                        failure = e
+        finally:
+            self._config_queue_flushing = flushing
+        if failure is not None:
+            raise failure
+
     def _config_update_hosts(self, context, personalities, host_uuids=None,
                              reboot=False):
         """"Update the hosts configuration status for all hosts affected
@@ -8358,7 +8841,9 @@ class ConductorManager(service.PeriodicService):
                                    host_uuids=host_uuids,
                                    force=force)
 
-        config_dict.update({'force': force})
+        # the agents report the apply states for this request id
+        config_dict.update({'force': force,
+                            'request_id': str(uuid.uuid4())})
         rpcapi = agent_rpcapi.AgentAPI()
         rpcapi.config_apply_runtime_manifest(context,
                                              config_uuid=config_uuid,
@@ -8640,9 +9125,13 @@ class ConductorManager(service.PeriodicService):
 
         return ilvgs
 
-    def _add_port_to_list(self, interface_id, networktype, port_list):
+    def _add_port_to_list(self, interface_id, networktype, port_list,
+                          ports=None):
         info = {}
-        ports = self.dbapi.port_get_all(interfaceid=interface_id)
+        if ports is None:
+            ports = self.dbapi.port_get_all(interfaceid=interface_id)
+        else:
+            ports = ports.get(interface_id, [])
         if ports:
             info['name'] = ports[0]['name']
             info['numa_node'] = ports[0]['numa_node']
@@ -8656,7 +9145,11 @@ class ConductorManager(service.PeriodicService):
         Gets the platform interfaces and associated numa nodes
         """
         info_list = []
-        interface_list = self.dbapi.iinterface_get_all(ihost_id, expunge=True)
+        topology = self.dbapi.interface_topology_get(ihost_id)
+        interface_list = topology['interfaces']
+        ports = collections.defaultdict(list)
+        for port in topology['ports']:
+            ports[port.interface_id].append(port)
         for interface in interface_list:
             ntype = interface['networktype']
             if (ntype == constants.NETWORK_TYPE_INFRA or
@@ -8669,7 +9162,8 @@ class ConductorManager(service.PeriodicService):
                                 if i['iftype'] == 'ethernet':
                                     info_list = self._add_port_to_list(i['id'],
                                                                        ntype,
-                                                                       info_list)
+                                                                       info_list,
+                                                                       ports)
                                 elif i['iftype'] == 'ae':
                                     for uses in i['uses']:
                                         for a in interface_list:
@@ -8678,11 +9172,13 @@ class ConductorManager(service.PeriodicService):
                                                 info_list = self._add_port_to_list(
                                                                     a['id'],
                                                                     ntype,
-                                                                    info_list)
+                                                                    info_list,
+                                                                    ports)
                 elif interface['iftype'] == 'ethernet':
                     info_list = self._add_port_to_list(interface['id'],
                                                        ntype,
-                                                       info_list)
+                                                       info_list,
+                                                       ports)
 
         LOG.info("platform_interfaces host_id=%s info_list=%s" %
                  (ihost_id, info_list))
@@ -9418,7 +9914,7 @@ class ConductorManager(service.PeriodicService):
         :param force: set to true to ignore minor and warning alarms
         :param upgrade: set to true to perform an upgrade health check
         """
-        health_util = health.Health(self.dbapi)
+        health_util = health.Health(self.dbapi, ceph_operator=self._ceph)
 
         if upgrade is True:
             return health_util.get_system_health_upgrade(context=context,
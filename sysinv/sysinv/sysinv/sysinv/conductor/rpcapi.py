@@ -23,14 +23,59 @@
 Client side of the conductor RPC API.
 """
 
+import time
+import zlib
+
+from oslo_config import cfg
 from sysinv.objects import base as objects_base
 import sysinv.openstack.common.rpc.proxy
 from sysinv.openstack.common import log
+from sysinv.openstack.common.rpc import common as rpc_common
 
 LOG = log.getLogger(__name__)
 
 MANAGER_TOPIC = 'sysinv.conductor_manager'
 
+# RPC lanes: agent inventory reports are consumed separately from the API
+# originated requests so that a burst of reports can't delay them.
+LANE_API = 'api'
+LANE_REPORTS = 'reports'
+
+conductor_rpcapi_opts = [
+    cfg.IntOpt('workers',
+               default=1,
+               help=('Number of conductor worker processes. Host inventory '
+                     'reports are sharded across the workers by host uuid; '
+                     'the clients get the number of workers from the '
+                     'conductor.')),
+]
+
+CONF = cfg.CONF
+CONF.register_opts(conductor_rpcapi_opts, 'conductor')
+
+# How long the clients reuse the conductor topology before asking again
+TOPOLOGY_CACHE_TTL = 60
+
+# Conductor topology as last reported by the conductor
+_topology = {'topology': None, 'updated_at': 0}
+
+
+def get_shard(host_uuid, workers=None):
+    """Return the conductor worker that handles reports for a host."""
+    if workers is None:
+        workers = CONF.conductor.workers
+    if workers <= 1 or not host_uuid:
+        return 0
+    return (zlib.crc32(str(host_uuid).encode('utf-8')) & 0xffffffff) % workers
+
+
+def get_shard_topic(shard, topic=MANAGER_TOPIC):
+    return '%s.shard%d' % (topic, shard)
+
+
+def get_lane_topic(lane, topic=MANAGER_TOPIC):
+    return '%s.%s' % (topic, lane)
+
 
 class ConductorAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
     """Client side of the conductor RPC API.
@@ -53,6 +98,52 @@ class ConductorAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
             default_version='1.0',
             version_cap=self.RPC_API_VERSION)
 
+    def _get_topology(self, context):
+        """Return the conductor topology, asking the conductor if needed.
+
+        The clients shard the reports with the number of workers the
+        conductor actually runs, so their own configuration doesn't matter.
+        """
+        now = time.time()
+        if (_topology['topology'] is None or
+                now - _topology['updated_at'] >= TOPOLOGY_CACHE_TTL):
+            try:
+                topology = self.call(
+                    context, self.make_msg('get_conductor_topology'))
+            except rpc_common.RemoteError as e:
+                if e.exc_type != 'AttributeError':
+                    raise
+                # conductor without workers nor lanes
+                topology = {'workers': 1, 'reports_lane': False}
+            _topology['topology'] = topology
+            _topology['updated_at'] = now
+        return _topology['topology']
+
+    def _get_host_topic(self, context, host_uuid):
+        """Return the topic for an inventory report of a host.
+
+        Reports go to the low priority reports lane.  With several conductor
+        workers, they are sharded by host uuid so the reports of one host
+        are always handled by the same worker.
+
+        A full inventory report that is superseded by a newer report of the
+        same host while it is queued is dropped, and its call returns the
+        result of the newer report.
+        """
+        workers = self._get_topology(context)['workers']
+        if workers <= 1:
+            return self._get_reports_topic(context)
+        return get_shard_topic(get_shard(host_uuid, workers), self.topic)
+
+    def _get_reports_topic(self, context):
+        """Return the reports lane topic of the leader conductor.
+
+        The main topic is used when the conductor has no reports lane.
+        """
+        if not self._get_topology(context).get('reports_lane'):
+            return self.topic
+        return get_lane_topic(LANE_REPORTS, self.topic)
+
     def handle_dhcp_lease(self, context, tags, mac, ip_address, cid=None):
         """Synchronously, have a conductor handle a DHCP lease update.
 
@@ -221,7 +312,8 @@ class ConductorAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         return self.call(context,
                          self.make_msg('iport_update_by_ihost',
                                        ihost_uuid=ihost_uuid,
-                                       inic_dict_array=inic_dict_array))
+                                       inic_dict_array=inic_dict_array),
+                         topic=self._get_host_topic(context, ihost_uuid))
 
     def lldp_agent_update_by_host(self, context,
                                   host_uuid, agent_dict_array):
@@ -238,7 +330,8 @@ class ConductorAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         return self.call(context,
                          self.make_msg('lldp_agent_update_by_host',
                                        host_uuid=host_uuid,
-                                       agent_dict_array=agent_dict_array))
+                                       agent_dict_array=agent_dict_array),
+                         topic=self._get_host_topic(context, host_uuid))
 
     def lldp_neighbour_update_by_host(self, context,
                                       host_uuid, neighbour_dict_array):
@@ -257,7 +350,8 @@ class ConductorAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
             context,
             self.make_msg('lldp_neighbour_update_by_host',
                           host_uuid=host_uuid,
-                          neighbour_dict_array=neighbour_dict_array))
+                          neighbour_dict_array=neighbour_dict_array),
+            topic=self._get_host_topic(context, host_uuid))
 
     def pci_device_update_by_host(self, context,
                                   host_uuid, pci_device_dict_array):
@@ -273,7 +367,8 @@ class ConductorAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         return self.call(context,
                          self.make_msg('pci_device_update_by_host',
                                        host_uuid=host_uuid,
-                                       pci_device_dict_array=pci_device_dict_array))
+                                       pci_device_dict_array=pci_device_dict_array),
+                         topic=self._get_host_topic(context, host_uuid))
 
     def inumas_update_by_ihost(self, context,
                                ihost_uuid, inuma_dict_array):
@@ -290,7 +385,8 @@ class ConductorAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         return self.call(context,
                          self.make_msg('inumas_update_by_ihost',
                                        ihost_uuid=ihost_uuid,
-                                       inuma_dict_array=inuma_dict_array))
+                                       inuma_dict_array=inuma_dict_array),
+                         topic=self._get_host_topic(context, ihost_uuid))
 
     def icpus_update_by_ihost(self, context,
                               ihost_uuid, icpu_dict_array,
@@ -332,7 +428,8 @@ class ConductorAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
                          self.make_msg('imemory_update_by_ihost',
                                        ihost_uuid=ihost_uuid,
                                        imemory_dict_array=imemory_dict_array,
-                                       force_update=force_update))
+                                       force_update=force_update),
+                         topic=self._get_host_topic(context, ihost_uuid))
 
     def idisk_update_by_ihost(self, context,
                               ihost_uuid, idisk_dict_array):
@@ -350,7 +447,8 @@ class ConductorAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         return self.call(context,
                          self.make_msg('idisk_update_by_ihost',
                                        ihost_uuid=ihost_uuid,
-                                       idisk_dict_array=idisk_dict_array))
+                                       idisk_dict_array=idisk_dict_array),
+                         topic=self._get_host_topic(context, ihost_uuid))
 
     def ilvg_update_by_ihost(self, context,
                              ihost_uuid, ilvg_dict_array):
@@ -369,7 +467,8 @@ class ConductorAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         return self.call(context,
                          self.make_msg('ilvg_update_by_ihost',
                                        ihost_uuid=ihost_uuid,
-                                       ilvg_dict_array=ilvg_dict_array))
+                                       ilvg_dict_array=ilvg_dict_array),
+                         topic=self._get_host_topic(context, ihost_uuid))
 
     def ipv_update_by_ihost(self, context,
                             ihost_uuid, ipv_dict_array):
@@ -392,6 +491,7 @@ class ConductorAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
                          self.make_msg('ipv_update_by_ihost',
                                        ihost_uuid=ihost_uuid,
                                        ipv_dict_array=ipv_dict_array),
+                         topic=self._get_host_topic(context, ihost_uuid),
                          version='1.1')
 
     def ipartition_update_by_ihost(self, context,
@@ -411,7 +511,8 @@ class ConductorAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         return self.call(context,
                          self.make_msg('ipartition_update_by_ihost',
                                        ihost_uuid=ihost_uuid,
-                                       ipart_dict_array=ipart_dict_array))
+                                       ipart_dict_array=ipart_dict_array),
+                         topic=self._get_host_topic(context, ihost_uuid))
 
     def update_partition_config(self, context, partition):
         """Asynchronously, have a conductor configure the physical volume
@@ -1799,3 +1900,48 @@ class ConductorAPI(sysinv.openstack.common.rpc.proxy.RpcProxy):
         return self.call(context,
                          self.make_msg('perform_app_delete',
                                        rpc_app=rpc_app))
+
+    def get_periodic_task_stats(self, context):
+        """Synchronously, retrieve the conductor periodic task statistics.
+
+        :param context: request context.
+        :returns: dict of run count, failures, timeouts, overruns and
+                  last/max durations keyed by periodic task name.
+        """
+        return self.call(context,
+                         self.make_msg('get_periodic_task_stats'))
+
+    def report_runtime_config_status(self, context, host_uuid,
+                                     runtime_config):
+        """Asynchronously, record the state of a runtime manifest apply.
+
+        :param context: request context.
+        :param host_uuid: uuid of the host that applies the manifest
+        :param runtime_config: dict with the request_id, config_uuid,
+                               classes and state of the apply, and its
+                               duration and error once completed.
+        """
+        return self.cast(context,
+                         self.make_msg('report_runtime_config_status',
+                                       host_uuid=host_uuid,
+                                       runtime_config=runtime_config),
+                         topic=self._get_reports_topic(context))
+
+    def get_conductor_topology(self, context):
+        """Synchronously, retrieve the conductor topology.
+
+        :param context: request context.
+        :returns: dictionary with the number of conductor workers.
+        """
+        return self.call(context,
+                         self.make_msg('get_conductor_topology'))
+
+    def get_conductor_worker_stats(self, context):
+        """Synchronously, retrieve the conductor worker RPC statistics.
+
+        :param context: request context.
+        :returns: list of in flight counts and per method call counts,
+                  failures and durations for each conductor worker.
+        """
+        return self.call(context,
+                         self.make_msg('get_conductor_worker_stats'))
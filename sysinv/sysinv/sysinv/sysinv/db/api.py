@@ -59,6 +59,40 @@ class Connection(object):
     # def get_session(self, autocommit):
     #     """Create a new database session instance."""
 
+    @abc.abstractmethod
+    def advisory_lock_acquire(self, name):
+        """Try to acquire a database wide advisory lock without waiting.
+
+        :param name: The name of the lock.
+        :returns: A lock handle to pass to advisory_lock_release, or None
+                  if the lock is held by another database connection.
+        """
+
+    @abc.abstractmethod
+    def advisory_lock_release(self, lock):
+        """Release an advisory lock.
+
+        :param lock: The handle returned by advisory_lock_acquire.
+        """
+
+    @abc.abstractmethod
+    def advisory_lock_held(self, lock):
+        """Check that an advisory lock is still held.
+
+        The lock is lost if its database connection is dropped.
+
+        :param lock: The handle returned by advisory_lock_acquire.
+        :returns: True if the lock is still held.
+        """
+
+    @abc.abstractmethod
+    def transaction(self):
+        """Return a context manager grouping database writes.
+
+        The calls made by the current thread within the context are
+        committed together when it exits, or rolled back if it raises.
+        """
+
     @abc.abstractmethod
     def isystem_create(self, values):
         """Create a new isystem.
@@ -887,6 +921,41 @@ class Connection(object):
         :returns: A list of ports.
         """
 
+    @abc.abstractmethod
+    def iinterface_get_by_ihost_eager(self, ihost, limit=None,
+                                      marker=None, sort_key=None,
+                                      sort_dir=None):
+        """List all the interfaces for a given ihost.
+
+        The networks, datanetworks, uses and used_by references of the
+        interfaces are loaded eagerly, with a fixed number of queries
+        regardless of the number of interfaces.
+
+        :param ihost: The id or uuid of an ihost.
+        :param limit: Maximum number of interfaces to return.
+        :param marker: the last item of the previous page; we return the next
+                       result set.
+        :param sort_key: Attribute by which results should be sorted
+        :param sort_dir: direction in which results should be sorted
+                         (asc, desc)
+        :returns: A list of interfaces.
+        """
+
+    @abc.abstractmethod
+    def interface_topology_get(self, ihost):
+        """Return the interface topology of a given ihost.
+
+        The interfaces and their ports, addresses, routes, networks and
+        datanetworks are loaded with a fixed number of queries regardless
+        of the number of interfaces.
+
+        :param ihost: The id or uuid of an ihost.
+        :returns: A dict with the lists of 'interfaces', 'ports',
+                  'addresses' and 'routes' of the host, and the
+                  'networks' and 'datanetworks' lists indexed by
+                  interface id.
+        """
+
     @abc.abstractmethod
     def iinterface_update(self, iinterface_id, values):
         """Update properties of a cpu.
@@ -4351,3 +4420,69 @@ class Connection(object):
 
         :param uuid: The uuid of an interface network association.
         """
+
+    @abc.abstractmethod
+    def runtime_config_create(self, forihostid, values):
+        """Create a runtime manifest apply record for a host.
+
+        :param forihostid: The id of the host.
+        :param values: A dict containing several items used to identify
+                       and track the apply request, for example:
+                        {
+                         'request_id': uuid of the apply request,
+                         'config_uuid': the applied configuration uuid,
+                         'classes': the applied puppet classes,
+                         'state': queued, running, success or failed,
+                        }
+        :returns: A runtime config record.
+        """
+
+    @abc.abstractmethod
+    def runtime_config_get(self, uuid):
+        """Return a runtime manifest apply record.
+
+        :param uuid: The uuid of a runtime config record.
+        :returns: A runtime config record.
+        """
+
+    @abc.abstractmethod
+    def runtime_config_get_by_request(self, forihostid, request_id):
+        """Return the runtime manifest apply record of a host for a request.
+
+        :param forihostid: The id of the host.
+        :param request_id: The uuid of the apply request.
+        :returns: A runtime config record.
+        """
+
+    @abc.abstractmethod
+    def runtime_config_get_by_host(self, host, limit=None, marker=None,
+                                   sort_key=None, sort_dir=None):
+        """List the runtime manifest apply records of a host.
+
+        :param host: The id or uuid of a host.
+        :param limit: Maximum number of records to return.
+        :param marker: the last item of the previous page; we return the next
+                       result set.
+        :param sort_key: Attribute by which results should be sorted
+        :param sort_dir: direction in which results should be sorted
+                         (asc, desc)
+        :returns: A list of runtime config records.
+        """
+
+    @abc.abstractmethod
+    def runtime_config_update(self, uuid, values):
+        """Update properties of a runtime manifest apply record.
+
+        :param uuid: The uuid of a runtime config record.
+        :param values: Dict of values to update.
+        :returns: A runtime config record.
+        """
+
+    @abc.abstractmethod
+    def runtime_config_prune(self, forihostid, keep):
+        """Delete all but the most recent apply records of a host.
+
+        :param forihostid: The id of the host.
+        :param keep: The number of records to keep.
+        :returns: The number of deleted records.
+        """
@@ -23,6 +23,7 @@
 
 import eventlet
 import re
+import zlib
 
 from oslo_config import cfg
 from oslo_db import exception as db_exc
@@ -33,6 +34,7 @@ from oslo_db.sqlalchemy import utils as db_utils
 
 from sqlalchemy import or_
 from sqlalchemy import inspect
+from sqlalchemy import text
 
 from sqlalchemy.orm.exc import DetachedInstanceError
 from sqlalchemy.orm.exc import NoResultFound
@@ -1121,6 +1123,15 @@ def add_label_filter_by_host(query, hostid):
         return query.filter(models.ihost.uuid == hostid)
 
 
+def add_runtime_config_filter_by_host(query, value):
+    if utils.is_int_like(value):
+        return query.filter_by(forihostid=value)
+    else:
+        query = query.join(models.ihost,
+                           models.RuntimeConfig.forihostid == models.ihost.id)
+        return query.filter(models.ihost.uuid == value)
+
+
 class Connection(api.Connection):
     """SqlAlchemy connection."""
 
@@ -1130,6 +1141,47 @@ class Connection(api.Connection):
     def get_session(self, autocommit=True):
         return get_session(autocommit)
 
+    def advisory_lock_acquire(self, name):
+        engine = context_manager.get_legacy_facade().get_engine()
+        key = zlib.crc32(name.encode('utf-8')) & 0x7fffffff
+        connection = engine.connect()
+        if engine.name == 'postgresql':
+            acquired = connection.execute(
+                text('SELECT pg_try_advisory_lock(:key)'), key=key).scalar()
+            if not acquired:
+                connection.close()
+                return None
+        # Other backends are only used by a single process, the lock is
+        # always granted.
+        return (connection, key)
+
+    def advisory_lock_release(self, lock):
+        connection, key = lock
+        try:
+            if connection.engine.name == 'postgresql':
+                connection.execute(
+                    text('SELECT pg_advisory_unlock(:key)'), key=key)
+        finally:
+            connection.close()
+
+    def advisory_lock_held(self, lock):
+        connection, key = lock
+        try:
+            if connection.engine.name == 'postgresql':
+                return bool(connection.execute(
+                    text("SELECT count(*) FROM pg_locks "
+                         "WHERE locktype = 'advisory' AND granted AND "
+                         "pid = pg_backend_pid() AND objid = :key"),
+                    key=key).scalar())
+            connection.execute(text('SELECT 1'))
+            return True
+        except Exception as e:
+            LOG.warn("Advisory lock check failed: %s" % e)
+            return False
+
+    def transaction(self):
+        return _session_for_write()
+
     @objects.objectify(objects.system)
     def isystem_create(self, values):
         if not values.get('uuid'):
@@ -2149,6 +2201,81 @@ class Connection(api.Connection):
         return _paginate_query(models.Interfaces, limit, marker,
                                sort_key, sort_dir, query)
 
+    def _interface_topology_query(self, ihost, session=None,
+                                  topology=False):
+        interfaces = with_polymorphic(models.Interfaces, '*')
+        datanetworks = with_polymorphic(models.DataNetworks, '*', flat=True)
+        query = model_query(interfaces, session=session)
+        query = (query.join(models.ihost,
+                            models.ihost.id == models.Interfaces.forihostid))
+        query = query.options(contains_eager(interfaces.host))
+        query, field = add_filter_by_many_identities(
+                            query, models.ihost, [ihost])
+
+        # Load the associations of all the interfaces with one query per
+        # relationship rather than one query per interface when they are
+        # converted to objects.
+        query = query.options(
+            subqueryload(interfaces.interface_networks),
+            subqueryload(interfaces.interface_datanetworks).joinedload(
+                models.InterfaceDataNetworks.datanetwork.of_type(
+                    datanetworks)))
+        if topology:
+            query = query.options(subqueryload(interfaces.addresses),
+                                  subqueryload(interfaces.routes))
+        return query
+
+    def iinterface_get_by_ihost_eager(self, ihost, limit=None, marker=None,
+                                      sort_key=None, sort_dir=None):
+        with _session_for_read() as session:
+            return self._iinterface_get_by_ihost_eager(
+                ihost, session=session, limit=limit, marker=marker,
+                sort_key=sort_key, sort_dir=sort_dir)
+
+    @objects.objectify(objects.interface)
+    def _iinterface_get_by_ihost_eager(self, ihost, session=None,
+                                       limit=None, marker=None,
+                                       sort_key=None, sort_dir=None):
+        query = self._interface_topology_query(ihost, session=session)
+        return _paginate_query(models.Interfaces, limit, marker,
+                               sort_key, sort_dir, query)
+
+    def interface_topology_get(self, ihost):
+        with _session_for_read() as session:
+            query = self._interface_topology_query(ihost, session=session,
+                                                   topology=True)
+            db_interfaces = query.order_by(models.Interfaces.id).all()
+
+            query = model_query(models.EthernetPorts, session=session)
+            query = add_port_filter_by_host(query, ihost)
+            db_ports = query.order_by(models.EthernetPorts.id).all()
+
+            topology = {
+                'interfaces': [], 'ports': [], 'addresses': [], 'routes': [],
+                'networks': {}, 'datanetworks': {}}
+            for db_port in db_ports:
+                topology['ports'].append(
+                    objects.ethernet_port.from_db_object(db_port))
+            for db_interface in db_interfaces:
+                topology['interfaces'].append(
+                    objects.interface.from_db_object(db_interface))
+                topology['networks'][db_interface.id] = [
+                    objects.network.from_db_object(i.network)
+                    for i in db_interface.interface_networks]
+                topology['datanetworks'][db_interface.id] = [
+                    objects.datanetwork.from_db_object(i.datanetwork)
+                    for i in db_interface.interface_datanetworks]
+                for db_address in db_interface.addresses:
+                    topology['addresses'].append(
+                        objects.address.from_db_object(db_address))
+                for db_route in db_interface.routes:
+                    topology['routes'].append(
+                        objects.route.from_db_object(db_route))
+
+        topology['addresses'].sort(key=lambda a: a.id)
+        topology['routes'].sort(key=lambda r: r.id)
+        return topology
+
     @objects.objectify(objects.interface)
     def iinterface_get_by_network(self, network,
                                 limit=None, marker=None,
@@ -7531,6 +7658,76 @@ class Connection(api.Connection):
         query = query.filter(models.Label.label_key == label)
         return query.count()
 
+    def _runtime_config_get(self, uuid, session=None):
+        query = model_query(models.RuntimeConfig, session=session)
+        query = query.filter_by(uuid=uuid)
+        try:
+            result = query.one()
+        except NoResultFound:
+            raise exception.RuntimeConfigNotFound(uuid=uuid)
+        return result
+
+    @objects.objectify(objects.runtime_config)
+    def runtime_config_create(self, forihostid, values):
+        if not values.get('uuid'):
+            values['uuid'] = uuidutils.generate_uuid()
+        values['forihostid'] = int(forihostid)
+
+        runtime_config = models.RuntimeConfig()
+        runtime_config.update(values)
+        with _session_for_write() as session:
+            try:
+                session.add(runtime_config)
+                session.flush()
+            except db_exc.DBDuplicateEntry:
+                raise exception.RuntimeConfigAlreadyExists(
+                    request_id=values['request_id'])
+            return self._runtime_config_get(values['uuid'])
+
+    @objects.objectify(objects.runtime_config)
+    def runtime_config_get(self, uuid):
+        return self._runtime_config_get(uuid)
+
+    @objects.objectify(objects.runtime_config)
+    def runtime_config_get_by_request(self, forihostid, request_id):
+        query = model_query(models.RuntimeConfig)
+        query = query.filter_by(forihostid=forihostid, request_id=request_id)
+        try:
+            return query.one()
+        except NoResultFound:
+            raise exception.RuntimeConfigNotFound(uuid=request_id)
+
+    @objects.objectify(objects.runtime_config)
+    def runtime_config_get_by_host(self, host, limit=None, marker=None,
+                                   sort_key=None, sort_dir=None):
+        query = model_query(models.RuntimeConfig)
+        query = add_runtime_config_filter_by_host(query, host)
+        return _paginate_query(models.RuntimeConfig, limit, marker,
+                               sort_key, sort_dir, query)
+
+    @objects.objectify(objects.runtime_config)
+    def runtime_config_update(self, uuid, values):
+        with _session_for_write() as session:
+            query = model_query(models.RuntimeConfig, session=session)
+            query = query.filter_by(uuid=uuid)
+
+            count = query.update(values, synchronize_session='fetch')
+            if count == 0:
+                raise exception.RuntimeConfigNotFound(uuid=uuid)
+            return query.one()
+
+    def runtime_config_prune(self, forihostid, keep):
+        with _session_for_write() as session:
+            query = model_query(models.RuntimeConfig.id, session=session)
+            query = query.filter_by(forihostid=forihostid)
+            query = query.order_by(models.RuntimeConfig.id.desc())
+            stale = [r.id for r in query.offset(keep)]
+            if stale:
+                query = model_query(models.RuntimeConfig, session=session)
+                query = query.filter(models.RuntimeConfig.id.in_(stale))
+                query.delete(synchronize_session=False)
+            return len(stale)
+
     def _kube_app_get(self, name):
         query = model_query(models.KubeApp)
         query = query.filter_by(name=name)
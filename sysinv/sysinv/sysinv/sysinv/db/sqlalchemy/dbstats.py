@@ -0,0 +1,280 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+"""Connection pool tuning and statement statistics for the sysinv engine.
+
+Each service sizes its own connection pool through a [<service>_database]
+section, e.g. [conductor_database] max_pool_size, falling back to the
+[database] settings.  When enabled, the latency of every statement is
+recorded per statement type, or per calling db api method with
+caller_stats, along with the time spent checking connections out of the
+pool.  Each process writes its statistics to the
+sysinv lock directory, where sysinv-dbstats reads them.
+"""
+
+import os
+import sys
+import time
+
+from oslo_config import cfg
+from oslo_db.sqlalchemy import enginefacade
+from sqlalchemy import event
+
+from sysinv.common import constants
+from sysinv.db.sqlalchemy import api
+from sysinv.db.sqlalchemy import statements
+from sysinv.openstack.common import jsonutils
+from sysinv.openstack.common import log
+from sysinv.openstack.common import loopingcall
+
+pool_opts = [
+    cfg.IntOpt('max_pool_size',
+               help='Maximum number of SQL connections to keep open in the '
+                    'pool, defaults to the [database] setting'),
+    cfg.IntOpt('max_overflow',
+               help='Number of connections allowed above max_pool_size, '
+                    'defaults to the [database] setting'),
+    cfg.IntOpt('pool_timeout',
+               help='Seconds to wait for a connection from the pool, '
+                    'defaults to the [database] setting'),
+    cfg.IntOpt('connection_recycle_time',
+               help='Seconds after which a pooled connection is replaced, '
+                    'defaults to the [database] setting'),
+]
+
+dbstats_opts = [
+    cfg.BoolOpt('enabled',
+                default=True,
+                help='Record statement latencies and pool checkout times'),
+    cfg.BoolOpt('caller_stats',
+                default=False,
+                help='Record the statements per calling db api method '
+                     'instead of per statement type. The caller is found '
+                     'by walking the stack of each statement, which adds '
+                     'overhead'),
+    cfg.FloatOpt('slow_query_threshold',
+                 default=1.0,
+                 help='Log the statements that take longer than this many '
+                      'seconds, 0 disables the slow query log'),
+    cfg.IntOpt('report_interval',
+               default=60,
+               help='Interval in seconds at which the statistics are '
+                    'written for sysinv-dbstats'),
+]
+
+CONF = cfg.CONF
+CONF.register_opts(dbstats_opts, group='dbstats')
+
+LOG = log.getLogger(__name__)
+
+# upper bounds, in milliseconds, of the latency histogram buckets; the last
+# bucket counts everything slower
+LATENCY_BUCKETS = [1, 5, 10, 50, 100, 500, 1000, 5000]
+
+DBSTATS_FILE_PREFIX = 'dbstats-'
+DBSTATS_FILE = DBSTATS_FILE_PREFIX + '%s-%d.json'
+
+_stats = None
+_timer = None
+
+
+def get_pool_group(service):
+    return '%s_database' % service
+
+
+def get_stats_file(service, pid):
+    return os.path.join(constants.SYSINV_LOCK_PATH,
+                        DBSTATS_FILE % (service, pid))
+
+
+def _get_bucket(elapsed):
+    elapsed_ms = elapsed * 1000
+    for i, bound in enumerate(LATENCY_BUCKETS):
+        if elapsed_ms <= bound:
+            return i
+    return len(LATENCY_BUCKETS)
+
+
+def _get_statement_type(statement):
+    """Return the SQL command of a statement, e.g. SELECT."""
+    words = statement.split(None, 1)
+    return words[0].upper() if words else 'unknown'
+
+
+def _get_caller(frame):
+    """Return the name of the outermost db api method on the stack."""
+    caller = None
+    while frame is not None:
+        if frame.f_globals.get('__name__') == api.__name__:
+            caller = frame.f_code.co_name
+        frame = frame.f_back
+    return caller or 'unknown'
+
+
+class EngineStats(object):
+    """Statement and pool checkout statistics of a service process."""
+
+    def __init__(self, service):
+        self.service = service
+        self.started_at = time.time()
+        self.statements = {}
+        self.slow_queries = 0
+        self.checkouts = 0
+        self.checkout_time = 0.0
+        self.max_checkout_time = 0.0
+        self.checkout_histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.max_checked_out = 0
+        self.pool = {}
+
+    def record_statement(self, method, elapsed, slow=False):
+        stats = self.statements.get(method)
+        if stats is None:
+            stats = {'count': 0,
+                     'slow': 0,
+                     'total_time': 0.0,
+                     'max_time': 0.0,
+                     'histogram': [0] * (len(LATENCY_BUCKETS) + 1)}
+            self.statements[method] = stats
+        stats['count'] += 1
+        stats['total_time'] += elapsed
+        stats['max_time'] = max(stats['max_time'], elapsed)
+        stats['histogram'][_get_bucket(elapsed)] += 1
+        if slow:
+            stats['slow'] += 1
+            self.slow_queries += 1
+
+    def record_checkout(self, elapsed, pool):
+        self.checkouts += 1
+        self.checkout_time += elapsed
+        self.max_checkout_time = max(self.max_checkout_time, elapsed)
+        self.checkout_histogram[_get_bucket(elapsed)] += 1
+        self.pool = _get_pool_status(pool)
+        self.max_checked_out = max(self.max_checked_out,
+                                   self.pool.get('checked_out', 0))
+
+    def get_stats(self):
+        """Return a snapshot of the statistics."""
+        return {'service': self.service,
+                'pid': os.getpid(),
+                'started_at': self.started_at,
+                'updated_at': time.time(),
+                'buckets': LATENCY_BUCKETS,
+                'slow_queries': self.slow_queries,
+                'pool': dict(self.pool,
+                             checkouts=self.checkouts,
+                             checkout_time=self.checkout_time,
+                             max_checkout_time=self.max_checkout_time,
+                             checkout_histogram=list(
+                                 self.checkout_histogram),
+                             max_checked_out=self.max_checked_out),
+                'statements': dict(
+                    (method, dict(stats, histogram=list(stats['histogram'])))
+                    for method, stats in self.statements.items())}
+
+
+def _get_pool_status(pool):
+    status = {'class': pool.__class__.__name__}
+    for key, attr in (('size', 'size'),
+                      ('checked_out', 'checkedout'),
+                      ('overflow', 'overflow')):
+        func = getattr(pool, attr, None)
+        if func is not None:
+            status[key] = func()
+    return status
+
+
+def _record_statement(statement, elapsed):
+    if CONF.dbstats.caller_stats:
+        method = _get_caller(sys._getframe(1))
+    else:
+        method = _get_statement_type(statement)
+    threshold = CONF.dbstats.slow_query_threshold
+    slow = bool(threshold) and elapsed >= threshold
+    if slow:
+        LOG.warn("Slow query in %s (%.3fs): %s" % (method, elapsed,
+                                                    statement))
+    _stats.record_statement(method, elapsed, slow=slow)
+
+
+def _wrap_pool(engine):
+    """Time the connection checkouts of the engine pool."""
+    pool = engine.pool
+    connect = pool.connect
+
+    def timed_connect():
+        start = time.time()
+        try:
+            return connect()
+        finally:
+            _stats.record_checkout(time.time() - start, pool)
+
+    pool.connect = timed_connect
+
+
+def _install(engine):
+    global _timer
+
+    # dispose() replaces the pool, wrap the new one
+    event.listen(engine, 'engine_disposed', _wrap_pool)
+    _wrap_pool(engine)
+
+    # the engines are created in the service process (after any fork), which
+    # is where the statistics are published from
+    interval = CONF.dbstats.report_interval
+    if interval > 0 and _timer is None:
+        _timer = loopingcall.FixedIntervalLoopingCall(write_stats)
+        _timer.start(interval=interval, initial_delay=interval)
+
+
+def write_stats():
+    """Publish the statistics of this process for sysinv-dbstats."""
+    if _stats is None:
+        return
+    try:
+        path = get_stats_file(_stats.service, os.getpid())
+        with open(path + '.tmp', 'w') as f:
+            f.write(jsonutils.dumps(_stats.get_stats()))
+        os.rename(path + '.tmp', path)
+    except Exception as e:
+        LOG.warn("Failed to write database statistics: %s" % e)
+
+
+def get_stats():
+    """Return the statistics of this process, or None when disabled."""
+    if _stats is None:
+        return None
+    return _stats.get_stats()
+
+
+def setup(service):
+    """Configure the sysinv engines for a service.
+
+    Applies the [<service>_database] pool settings and installs the
+    statistics hooks.  Must be called before the first database access of
+    the process.
+    """
+    global _stats
+
+    group = get_pool_group(service)
+    CONF.register_opts(pool_opts, group=group)
+    settings = dict((opt.dest, CONF[group][opt.dest]) for opt in pool_opts
+                    if CONF[group][opt.dest] is not None)
+    if settings:
+        LOG.info("%s database pool settings: %s" % (service, settings))
+    if CONF.dbstats.enabled:
+        _stats = EngineStats(service)
+        statements.observe(_record_statement)
+
+    # model_query() and the session helpers of the db api use the global
+    # oslo_db facade, get_session() and the advisory locks use the
+    # api.context_manager facade.
+    for context_manager in (enginefacade.writer, api.context_manager):
+        if settings:
+            context_manager.configure(**settings)
+        if _stats is not None:
+            context_manager.append_on_engine_create(_install)
@@ -0,0 +1,2712 @@
+-- sysinv baseline schema version 86
+CREATE TYPE public."accessEnum" AS ENUM (
+    'ro',
+    'rw',
+    'reserve1',
+    'reserve2'
+);
+
+CREATE TYPE public."actionEnum" AS ENUM (
+    'none',
+    'lock',
+    'force-lock',
+    'unlock',
+    'reset',
+    'swact',
+    'force-swact',
+    'reboot',
+    'power-on',
+    'power-off',
+    'reinstall',
+    'reserve1',
+    'reserve2'
+);
+
+CREATE TYPE public."administrativeEnum" AS ENUM (
+    'locked',
+    'unlocked',
+    'reserve1',
+    'reserve2'
+);
+
+CREATE TYPE public."availabilityEnum" AS ENUM (
+    'available',
+    'intest',
+    'degraded',
+    'failed',
+    'power-off',
+    'offline',
+    'offduty',
+    'online',
+    'dependency',
+    'not-installed',
+    'reserve1',
+    'reserve2'
+);
+
+CREATE TYPE public."invPersonalityEnum" AS ENUM (
+    'controller',
+    'worker',
+    'network',
+    'storage',
+    'profile',
+    'reserve1',
+    'reserve2'
+);
+
+CREATE TYPE public."invprovisionStateEnum" AS ENUM (
+    'unprovisioned',
+    'inventoried',
+    'configured',
+    'provisioning',
+    'provisioned',
+    'reserve1',
+    'reserve2'
+);
+
+CREATE TYPE public."logTransportEnum" AS ENUM (
+    'udp',
+    'tcp',
+    'tls'
+);
+
+CREATE TYPE public."operationalEnum" AS ENUM (
+    'disabled',
+    'enabled',
+    'reserve1',
+    'reserve2'
+);
+
+CREATE TYPE public."recordtypeEnum" AS ENUM (
+    'standard',
+    'profile',
+    'sprofile',
+    'reserve1',
+    'reserve2'
+);
+
+CREATE TYPE public."snmpTransportType" AS ENUM (
+    'udp',
+    'reserve1',
+    'reserve2'
+);
+
+CREATE TYPE public."snmpVersionEnum" AS ENUM (
+    'snmpv2c_trap',
+    'reserve1',
+    'reserve2'
+);
+
+CREATE TABLE public.address_modes (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    family integer NOT NULL,
+    mode character varying(32) NOT NULL,
+    interface_id integer NOT NULL,
+    address_pool_id integer
+);
+
+CREATE SEQUENCE public.address_modes_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.address_modes_id_seq OWNED BY public.address_modes.id;
+
+CREATE TABLE public.address_pool_ranges (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    start character varying(50) NOT NULL,
+    "end" character varying(50) NOT NULL,
+    address_pool_id integer NOT NULL
+);
+
+CREATE SEQUENCE public.address_pool_ranges_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.address_pool_ranges_id_seq OWNED BY public.address_pool_ranges.id;
+
+CREATE TABLE public.address_pools (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    name character varying(128) NOT NULL,
+    family integer NOT NULL,
+    network character varying(50) NOT NULL,
+    prefix integer NOT NULL,
+    "order" character varying(32) NOT NULL,
+    controller0_address_id integer,
+    controller1_address_id integer,
+    floating_address_id integer,
+    gateway_address_id integer
+);
+
+CREATE SEQUENCE public.address_pools_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.address_pools_id_seq OWNED BY public.address_pools.id;
+
+CREATE TABLE public.addresses (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    name character varying(255),
+    family integer NOT NULL,
+    address character varying(50) NOT NULL,
+    prefix integer NOT NULL,
+    enable_dad boolean,
+    interface_id integer,
+    address_pool_id integer
+);
+
+CREATE SEQUENCE public.addresses_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.addresses_id_seq OWNED BY public.addresses.id;
+
+CREATE TABLE public.ae_interfaces (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    aemode character varying(255),
+    aedict text,
+    txhashpolicy character varying(255),
+    schedpolicy character varying(255),
+    imac character varying(255),
+    imtu integer
+);
+
+CREATE TABLE public.ceph_mon (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    device_path character varying(255),
+    ceph_mon_gib integer,
+    forihostid integer,
+    state character varying(255),
+    task character varying(255)
+);
+
+CREATE SEQUENCE public.ceph_mon_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.ceph_mon_id_seq OWNED BY public.ceph_mon.id;
+
+CREATE TABLE public.certificate (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    certtype character varying(64),
+    issuer character varying(255),
+    signature character varying(255),
+    start_date timestamp without time zone,
+    expiry_date timestamp without time zone,
+    capabilities text
+);
+
+CREATE SEQUENCE public.certificate_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.certificate_id_seq OWNED BY public.certificate.id;
+
+CREATE TABLE public.clusters (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(255),
+    cluster_uuid character varying(255),
+    type character varying(255),
+    name character varying(255),
+    capabilities text,
+    system_id integer
+);
+
+CREATE SEQUENCE public.clusters_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.clusters_id_seq OWNED BY public.clusters.id;
+
+CREATE TABLE public.controller_fs (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    forisystemid integer,
+    state character varying(255),
+    name character varying(64),
+    size integer,
+    logical_volume character varying(64),
+    replicated boolean
+);
+
+CREATE SEQUENCE public.controller_fs_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.controller_fs_id_seq OWNED BY public.controller_fs.id;
+
+CREATE TABLE public.datanetworks (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    name character varying(255),
+    network_type character varying(255),
+    description character varying(255),
+    mtu integer NOT NULL
+);
+
+CREATE TABLE public.datanetworks_flat (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL
+);
+
+CREATE SEQUENCE public.datanetworks_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.datanetworks_id_seq OWNED BY public.datanetworks.id;
+
+CREATE TABLE public.datanetworks_vlan (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL
+);
+
+CREATE TABLE public.datanetworks_vxlan (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    multicast_group character varying(64),
+    port_num integer NOT NULL,
+    ttl integer NOT NULL,
+    mode character varying(32) NOT NULL
+);
+
+CREATE TABLE public.drbdconfig (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    link_util integer,
+    num_parallel integer,
+    rtt_ms double precision,
+    forisystemid integer
+);
+
+CREATE SEQUENCE public.drbdconfig_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.drbdconfig_id_seq OWNED BY public.drbdconfig.id;
+
+CREATE TABLE public.ethernet_interfaces (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    imac character varying(255),
+    imtu integer
+);
+
+CREATE TABLE public.ethernet_ports (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    mac character varying(255),
+    mtu integer,
+    speed integer,
+    link_mode character varying(255),
+    duplex character varying(255),
+    autoneg character varying(255),
+    bootp character varying(255),
+    capabilities text
+);
+
+CREATE TABLE public.helm_overrides (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    name character varying(255) NOT NULL,
+    namespace character varying(255) NOT NULL,
+    user_overrides text,
+    system_overrides text
+);
+
+CREATE SEQUENCE public.helm_overrides_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.helm_overrides_id_seq OWNED BY public.helm_overrides.id;
+
+CREATE TABLE public.host_upgrade (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    forihostid integer,
+    software_load integer NOT NULL,
+    target_load integer NOT NULL
+);
+
+CREATE SEQUENCE public.host_upgrade_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.host_upgrade_id_seq OWNED BY public.host_upgrade.id;
+
+CREATE TABLE public.i_alarm_history (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(255),
+    alarm_id character varying(255),
+    alarm_state character varying(255),
+    entity_type_id character varying(255),
+    entity_instance_id character varying(255),
+    "timestamp" timestamp without time zone,
+    severity character varying(255),
+    reason_text character varying(255),
+    alarm_type character varying(255),
+    probable_cause character varying(255),
+    proposed_repair_action character varying(255),
+    service_affecting boolean,
+    suppression boolean
+);
+
+CREATE SEQUENCE public.i_alarm_history_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_alarm_history_id_seq OWNED BY public.i_alarm_history.id;
+
+CREATE TABLE public.i_community (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    community character varying(255),
+    view character varying(255),
+    access public."accessEnum"
+);
+
+CREATE SEQUENCE public.i_community_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_community_id_seq OWNED BY public.i_community.id;
+
+CREATE TABLE public.i_customer_log (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(255),
+    log_id character varying(255),
+    entity_type_id character varying(255),
+    entity_instance_id character varying(255),
+    "timestamp" timestamp without time zone,
+    severity character varying(255),
+    reason_text character varying(255),
+    log_type character varying(255),
+    probable_cause character varying(255),
+    service_affecting boolean
+);
+
+CREATE SEQUENCE public.i_customer_log_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_customer_log_id_seq OWNED BY public.i_customer_log.id;
+
+CREATE TABLE public.i_dns (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    nameservers character varying(255),
+    forisystemid integer
+);
+
+CREATE SEQUENCE public.i_dns_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_dns_id_seq OWNED BY public.i_dns.id;
+
+CREATE TABLE public.i_horizon_lockout (
+    lockout_time integer,
+    lockout_retries integer
+);
+
+CREATE TABLE public.i_host (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    reserved boolean,
+    recordtype public."recordtypeEnum",
+    uuid character varying(36),
+    id integer NOT NULL,
+    hostname character varying(255),
+    mgmt_mac character varying(255),
+    mgmt_ip character varying(255),
+    bm_ip character varying(255),
+    bm_mac character varying(255),
+    bm_type character varying(255),
+    bm_username character varying(255),
+    personality public."invPersonalityEnum",
+    serialid character varying(255),
+    location text,
+    administrative public."administrativeEnum",
+    operational public."operationalEnum",
+    availability public."availabilityEnum",
+    action public."actionEnum",
+    task character varying(64),
+    uptime integer,
+    capabilities text,
+    config_status character varying(255),
+    config_applied character varying(255),
+    config_target character varying(255),
+    forisystemid integer,
+    invprovision public."invprovisionStateEnum",
+    ihost_action character varying(255),
+    vim_progress_status character varying(255),
+    subfunctions character varying(255),
+    subfunction_oper character varying(255),
+    subfunction_avail character varying(255),
+    boot_device character varying(255),
+    rootfs_device character varying(255),
+    install_output character varying(255),
+    console character varying(255),
+    vsc_controllers character varying(255),
+    ttys_dcd boolean,
+    peer_id integer,
+    action_state character varying(255),
+    mtce_info character varying(255),
+    install_state character varying(255),
+    install_state_info character varying(255),
+    iscsi_initiator_name character varying(64),
+    tboot character varying(64)
+);
+
+CREATE SEQUENCE public.i_host_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_host_id_seq OWNED BY public.i_host.id;
+
+CREATE TABLE public.i_icpu (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    cpu integer,
+    core integer,
+    thread integer,
+    cpu_family character varying(255),
+    cpu_model character varying(255),
+    allocated_function character varying(255),
+    capabilities text,
+    forihostid integer,
+    forinodeid integer
+);
+
+CREATE SEQUENCE public.i_icpu_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_icpu_id_seq OWNED BY public.i_icpu.id;
+
+CREATE TABLE public.i_idisk (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    device_node character varying(255),
+    device_num integer,
+    device_type character varying(255),
+    size_mib integer,
+    serial_id character varying(255),
+    capabilities text,
+    forihostid integer,
+    foristorid integer,
+    foripvid integer,
+    rpm character varying(255),
+    device_id character varying(255),
+    device_path character varying(255),
+    device_wwn character varying(255),
+    available_mib integer
+);
+
+CREATE SEQUENCE public.i_idisk_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_idisk_id_seq OWNED BY public.i_idisk.id;
+
+CREATE TABLE public.i_imemory (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    memtotal_mib integer,
+    memavail_mib integer,
+    platform_reserved_mib integer,
+    hugepages_configured boolean,
+    vswitch_hugepages_size_mib integer,
+    vswitch_hugepages_reqd integer,
+    vswitch_hugepages_nr integer,
+    vswitch_hugepages_avail integer,
+    capabilities text,
+    forihostid integer,
+    forinodeid integer,
+    "vm_hugepages_nr_2M" integer,
+    "vm_hugepages_nr_1G" integer,
+    "vm_hugepages_use_1G" boolean,
+    "vm_hugepages_possible_2M" integer,
+    "vm_hugepages_possible_1G" integer,
+    "vm_hugepages_nr_2M_pending" integer,
+    "vm_hugepages_nr_1G_pending" integer,
+    "vm_hugepages_avail_2M" integer,
+    "vm_hugepages_avail_1G" integer,
+    "vm_hugepages_nr_4K" integer,
+    node_memtotal_mib integer
+);
+
+CREATE SEQUENCE public.i_imemory_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_imemory_id_seq OWNED BY public.i_imemory.id;
+
+CREATE TABLE public.i_interface (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    ifname character varying(255),
+    iftype character varying(255),
+    imac character varying(255),
+    imtu integer,
+    networktype character varying(255),
+    aemode character varying(255),
+    txhashpolicy character varying(255),
+    providernetworks character varying(255),
+    providernetworksdict text,
+    schedpolicy character varying(255),
+    ifcapabilities text,
+    farend text,
+    forihostid integer,
+    sriov_numvfs integer,
+    aedict text
+);
+
+CREATE SEQUENCE public.i_interface_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_interface_id_seq OWNED BY public.i_interface.id;
+
+CREATE TABLE public.i_istor (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    osdid integer,
+    idisk_uuid character varying(255),
+    state character varying(255),
+    function character varying(255),
+    capabilities text,
+    forihostid integer,
+    fortierid integer
+);
+
+CREATE SEQUENCE public.i_istor_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_istor_id_seq OWNED BY public.i_istor.id;
+
+CREATE TABLE public.i_lvg (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    vg_state character varying(13),
+    lvm_vg_name character varying(64),
+    lvm_vg_uuid character varying(64),
+    lvm_vg_access character varying(64),
+    lvm_max_lv integer,
+    lvm_cur_lv integer,
+    lvm_max_pv integer,
+    lvm_cur_pv integer,
+    lvm_vg_size bigint,
+    lvm_vg_total_pe integer,
+    lvm_vg_free_pe integer,
+    capabilities text,
+    forihostid integer,
+    CONSTRAINT "vgStateEnum" CHECK (((vg_state)::text = ANY ((ARRAY['unprovisioned'::character varying, 'adding'::character varying, 'provisioned'::character varying, 'removing'::character varying, 'reserve1'::character varying, 'reserve2'::character varying])::text[])))
+);
+
+CREATE SEQUENCE public.i_lvg_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_lvg_id_seq OWNED BY public.i_lvg.id;
+
+CREATE TABLE public.i_node (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    numa_node integer,
+    capabilities text,
+    forihostid integer
+);
+
+CREATE SEQUENCE public.i_node_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_node_id_seq OWNED BY public.i_node.id;
+
+CREATE TABLE public.i_ntp (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    ntpservers character varying(255),
+    forisystemid integer,
+    enabled boolean
+);
+
+CREATE SEQUENCE public.i_ntp_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_ntp_id_seq OWNED BY public.i_ntp.id;
+
+CREATE TABLE public.i_pv (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    pv_state character varying(32),
+    pv_type character varying(9),
+    disk_or_part_uuid character varying,
+    disk_or_part_device_node character varying(64),
+    lvm_pv_name character varying(64),
+    lvm_vg_name character varying(64),
+    lvm_pv_uuid character varying(64),
+    lvm_pv_size bigint,
+    lvm_pe_total integer,
+    lvm_pe_alloced integer,
+    capabilities text,
+    forihostid integer,
+    forilvgid integer,
+    disk_or_part_device_path character varying(255),
+    CONSTRAINT "physicalVolTypeEnum" CHECK (((pv_type)::text = ANY ((ARRAY['disk'::character varying, 'partition'::character varying, 'reserve1'::character varying, 'reserve2'::character varying])::text[])))
+);
+
+CREATE SEQUENCE public.i_pv_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_pv_id_seq OWNED BY public.i_pv.id;
+
+CREATE TABLE public.i_sensorgroups (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    host_id integer,
+    sensorgroupname character varying(255),
+    path character varying(255),
+    datatype character varying(255),
+    sensortype character varying(255),
+    description character varying(255),
+    state character varying(255),
+    possible_states character varying(255),
+    audit_interval_group integer,
+    record_ttl integer,
+    algorithm character varying(255),
+    actions_critical_choices character varying(255),
+    actions_major_choices character varying(255),
+    actions_minor_choices character varying(255),
+    actions_minor_group character varying(255),
+    actions_major_group character varying(255),
+    actions_critical_group character varying(255),
+    suppress boolean,
+    capabilities text
+);
+
+CREATE TABLE public.i_sensorgroups_analog (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    unit_base_group character varying(255),
+    unit_modifier_group character varying(255),
+    unit_rate_group character varying(255),
+    t_minor_lower_group character varying(255),
+    t_minor_upper_group character varying(255),
+    t_major_lower_group character varying(255),
+    t_major_upper_group character varying(255),
+    t_critical_lower_group character varying(255),
+    t_critical_upper_group character varying(255)
+);
+
+CREATE TABLE public.i_sensorgroups_discrete (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL
+);
+
+CREATE SEQUENCE public.i_sensorgroups_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_sensorgroups_id_seq OWNED BY public.i_sensorgroups.id;
+
+CREATE TABLE public.i_sensors (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    host_id integer,
+    sensorgroup_id integer,
+    sensorname character varying(255),
+    path character varying(255),
+    datatype character varying(255),
+    sensortype character varying(255),
+    status character varying(255),
+    state character varying(255),
+    state_requested character varying(255),
+    sensor_action_requested character varying(255),
+    audit_interval integer,
+    algorithm character varying(255),
+    actions_minor character varying(255),
+    actions_major character varying(255),
+    actions_critical character varying(255),
+    suppress boolean,
+    capabilities text
+);
+
+CREATE TABLE public.i_sensors_analog (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    unit_base character varying(255),
+    unit_modifier character varying(255),
+    unit_rate character varying(255),
+    t_minor_lower character varying(255),
+    t_minor_upper character varying(255),
+    t_major_lower character varying(255),
+    t_major_upper character varying(255),
+    t_critical_lower character varying(255),
+    t_critical_upper character varying(255)
+);
+
+CREATE TABLE public.i_sensors_discrete (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL
+);
+
+CREATE SEQUENCE public.i_sensors_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_sensors_id_seq OWNED BY public.i_sensors.id;
+
+CREATE TABLE public.i_service (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    servicename character varying(255),
+    hostname character varying(255),
+    forihostid integer,
+    activity character varying,
+    state character varying,
+    reason text
+);
+
+CREATE SEQUENCE public.i_service_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_service_id_seq OWNED BY public.i_service.id;
+
+CREATE TABLE public.i_system (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    name character varying(255),
+    description character varying(255),
+    capabilities text,
+    contact character varying(255),
+    location character varying(255),
+    services integer,
+    software_version character varying(255),
+    system_type character varying(255),
+    system_mode character varying(255),
+    timezone character varying(255),
+    security_profile character varying(255),
+    region_name text,
+    service_project_name text,
+    distributed_cloud_role character varying(255),
+    security_feature character varying(255)
+);
+
+CREATE SEQUENCE public.i_system_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_system_id_seq OWNED BY public.i_system.id;
+
+CREATE TABLE public.i_trap_destination (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    ip_address character varying(40),
+    community character varying(255),
+    port integer,
+    type public."snmpVersionEnum",
+    transport public."snmpTransportType"
+);
+
+CREATE SEQUENCE public.i_trap_destination_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_trap_destination_id_seq OWNED BY public.i_trap_destination.id;
+
+CREATE TABLE public.i_user (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    root_sig character varying(255),
+    reserved_1 character varying(255),
+    reserved_2 character varying(255),
+    reserved_3 character varying(255),
+    forisystemid integer,
+    passwd_hash character varying(255),
+    passwd_expiry_days integer
+);
+
+CREATE SEQUENCE public.i_user_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.i_user_id_seq OWNED BY public.i_user.id;
+
+CREATE TABLE public.interface_datanetworks (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    interface_id integer,
+    datanetwork_id integer
+);
+
+CREATE SEQUENCE public.interface_datanetworks_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.interface_datanetworks_id_seq OWNED BY public.interface_datanetworks.id;
+
+CREATE TABLE public.interface_networks (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    interface_id integer,
+    network_id integer
+);
+
+CREATE SEQUENCE public.interface_networks_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.interface_networks_id_seq OWNED BY public.interface_networks.id;
+
+CREATE TABLE public.interfaces (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    forihostid integer,
+    iftype character varying(255),
+    ifname character varying(255),
+    networktype character varying(255),
+    sriov_numvfs integer,
+    ifcapabilities text,
+    farend text,
+    ifclass character varying(255)
+);
+
+CREATE SEQUENCE public.interfaces_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.interfaces_id_seq OWNED BY public.interfaces.id;
+
+CREATE TABLE public.interfaces_to_interfaces (
+    used_by_id integer NOT NULL,
+    uses_id integer NOT NULL
+);
+
+CREATE TABLE public.journal (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    device_path character varying(255),
+    size_mib integer,
+    onistor_uuid character varying(36),
+    foristorid integer
+);
+
+CREATE SEQUENCE public.journal_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.journal_id_seq OWNED BY public.journal.id;
+
+CREATE TABLE public.kube_app (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    id integer NOT NULL,
+    name character varying(255) NOT NULL,
+    manifest_name character varying(255) NOT NULL,
+    manifest_file character varying(255),
+    status character varying(255) NOT NULL,
+    progress character varying(255)
+);
+
+CREATE SEQUENCE public.kube_app_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.kube_app_id_seq OWNED BY public.kube_app.id;
+
+CREATE TABLE public.label (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    host_id integer,
+    label_key character varying(384),
+    label_value character varying(128)
+);
+
+CREATE SEQUENCE public.label_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.label_id_seq OWNED BY public.label.id;
+
+CREATE TABLE public.lldp_agents (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    host_id integer,
+    port_id integer,
+    status character varying(255)
+);
+
+CREATE SEQUENCE public.lldp_agents_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.lldp_agents_id_seq OWNED BY public.lldp_agents.id;
+
+CREATE TABLE public.lldp_neighbours (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    host_id integer,
+    port_id integer,
+    msap character varying(511) NOT NULL
+);
+
+CREATE SEQUENCE public.lldp_neighbours_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.lldp_neighbours_id_seq OWNED BY public.lldp_neighbours.id;
+
+CREATE TABLE public.lldp_tlvs (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    agent_id integer,
+    neighbour_id integer,
+    type character varying(255),
+    value character varying(255)
+);
+
+CREATE SEQUENCE public.lldp_tlvs_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.lldp_tlvs_id_seq OWNED BY public.lldp_tlvs.id;
+
+CREATE TABLE public.loads (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    state character varying(255),
+    software_version character varying(255),
+    compatible_version character varying(255),
+    required_patches character varying(2047)
+);
+
+CREATE SEQUENCE public.loads_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.loads_id_seq OWNED BY public.loads.id;
+
+CREATE TABLE public.networks (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    type character varying(255),
+    dynamic boolean NOT NULL,
+    address_pool_id integer NOT NULL,
+    name character varying(255)
+);
+
+CREATE SEQUENCE public.networks_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.networks_id_seq OWNED BY public.networks.id;
+
+CREATE TABLE public.partition (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    start_mib integer,
+    end_mib integer,
+    size_mib integer,
+    device_path character varying(255),
+    type_guid character varying(36),
+    type_name character varying(64),
+    idisk_id integer,
+    idisk_uuid character varying(36),
+    capabilities text,
+    status integer,
+    foripvid integer,
+    forihostid integer,
+    device_node character varying(64)
+);
+
+CREATE SEQUENCE public.partition_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.partition_id_seq OWNED BY public.partition.id;
+
+CREATE TABLE public.pci_devices (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(255),
+    host_id integer,
+    name character varying(255),
+    pciaddr character varying(255),
+    pclass_id character varying(6),
+    pvendor_id character varying(4),
+    pdevice_id character varying(4),
+    pclass character varying(255),
+    pvendor character varying(255),
+    pdevice character varying(255),
+    psvendor character varying(255),
+    psdevice character varying(255),
+    numa_node integer,
+    driver character varying(255),
+    sriov_totalvfs integer,
+    sriov_numvfs integer,
+    sriov_vfs_pci_address character varying(1020),
+    enabled boolean,
+    extra_info text
+);
+
+CREATE SEQUENCE public.pci_devices_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.pci_devices_id_seq OWNED BY public.pci_devices.id;
+
+CREATE TABLE public.peers (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(255),
+    name character varying(255),
+    status character varying(255),
+    info text,
+    capabilities text,
+    cluster_id integer
+);
+
+CREATE SEQUENCE public.peers_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.peers_id_seq OWNED BY public.peers.id;
+
+CREATE TABLE public.ports (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    host_id integer,
+    node_id integer,
+    interface_id integer,
+    type character varying(255),
+    name character varying(255),
+    namedisplay character varying(255),
+    pciaddr character varying(255),
+    dev_id integer,
+    sriov_totalvfs integer,
+    sriov_numvfs integer,
+    sriov_vfs_pci_address character varying(1020),
+    driver character varying(255),
+    pclass character varying(255),
+    pvendor character varying(255),
+    pdevice character varying(255),
+    psvendor character varying(255),
+    psdevice character varying(255),
+    dpdksupport boolean,
+    numa_node integer,
+    capabilities text
+);
+
+CREATE SEQUENCE public.ports_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.ports_id_seq OWNED BY public.ports.id;
+
+CREATE TABLE public.ptp (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    enabled boolean,
+    mode character varying(16),
+    transport character varying(4),
+    mechanism character varying(4),
+    system_id integer
+);
+
+CREATE SEQUENCE public.ptp_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.ptp_id_seq OWNED BY public.ptp.id;
+
+CREATE TABLE public.remotelogging (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    enabled boolean,
+    transport public."logTransportEnum",
+    ip_address character varying(50),
+    port integer,
+    key_file character varying(255),
+    system_id integer
+);
+
+CREATE SEQUENCE public.remotelogging_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.remotelogging_id_seq OWNED BY public.remotelogging.id;
+
+CREATE TABLE public.routes (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    family integer NOT NULL,
+    network character varying(50) NOT NULL,
+    prefix integer NOT NULL,
+    gateway character varying(50) NOT NULL,
+    metric integer NOT NULL,
+    interface_id integer NOT NULL
+);
+
+CREATE SEQUENCE public.routes_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.routes_id_seq OWNED BY public.routes.id;
+
+CREATE TABLE public.runtime_config (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    forihostid integer,
+    request_id character varying(36),
+    config_uuid character varying(36),
+    classes text,
+    state character varying(255),
+    duration double precision,
+    error text
+);
+
+CREATE SEQUENCE public.runtime_config_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.runtime_config_id_seq OWNED BY public.runtime_config.id;
+
+CREATE TABLE public.sdn_controller (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    ip_address character varying(255),
+    port integer,
+    transport character varying(255),
+    state character varying(255)
+);
+
+CREATE SEQUENCE public.sdn_controller_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.sdn_controller_id_seq OWNED BY public.sdn_controller.id;
+
+CREATE TABLE public.service_parameter (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    service character varying(16),
+    section character varying(255),
+    name character varying(255),
+    value character varying(255),
+    personality character varying(255),
+    resource character varying(255)
+);
+
+CREATE SEQUENCE public.service_parameter_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.service_parameter_id_seq OWNED BY public.service_parameter.id;
+
+CREATE TABLE public.services (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    name character varying(255) NOT NULL,
+    enabled boolean,
+    region_name text,
+    capabilities text
+);
+
+CREATE SEQUENCE public.services_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.services_id_seq OWNED BY public.services.id;
+
+CREATE TABLE public.software_upgrade (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    state character varying(128) NOT NULL,
+    from_load integer NOT NULL,
+    to_load integer NOT NULL
+);
+
+CREATE SEQUENCE public.software_upgrade_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.software_upgrade_id_seq OWNED BY public.software_upgrade.id;
+
+CREATE TABLE public.storage_backend (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    backend character varying(255),
+    state character varying(255),
+    task character varying(255),
+    forisystemid integer,
+    services text,
+    capabilities text,
+    name character varying(255)
+);
+
+CREATE SEQUENCE public.storage_backend_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.storage_backend_id_seq OWNED BY public.storage_backend.id;
+
+CREATE TABLE public.storage_ceph (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    cinder_pool_gib integer,
+    glance_pool_gib integer,
+    ephemeral_pool_gib integer,
+    object_pool_gib integer,
+    object_gateway boolean,
+    tier_id integer,
+    kube_pool_gib integer
+);
+
+CREATE TABLE public.storage_ceph_external (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    ceph_conf character varying(255)
+);
+
+CREATE TABLE public.storage_external (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL
+);
+
+CREATE TABLE public.storage_file (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL
+);
+
+CREATE TABLE public.storage_lvm (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL
+);
+
+CREATE TABLE public.storage_tiers (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    name character varying(255),
+    type character varying(64),
+    status character varying(64),
+    capabilities text,
+    forbackendid integer,
+    forclusterid integer
+);
+
+CREATE SEQUENCE public.storage_tiers_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.storage_tiers_id_seq OWNED BY public.storage_tiers.id;
+
+CREATE TABLE public.tpmconfig (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    tpm_path character varying(255)
+);
+
+CREATE SEQUENCE public.tpmconfig_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.tpmconfig_id_seq OWNED BY public.tpmconfig.id;
+
+CREATE TABLE public.tpmdevice (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    uuid character varying(36),
+    state character varying(255),
+    host_id integer,
+    "binary" bytea,
+    tpm_data text,
+    capabilities text
+);
+
+CREATE SEQUENCE public.tpmdevice_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+ALTER SEQUENCE public.tpmdevice_id_seq OWNED BY public.tpmdevice.id;
+
+CREATE TABLE public.virtual_interfaces (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    imac character varying(255),
+    imtu integer
+);
+
+CREATE TABLE public.vlan_interfaces (
+    created_at timestamp without time zone,
+    updated_at timestamp without time zone,
+    deleted_at timestamp without time zone,
+    id integer NOT NULL,
+    vlan_id character varying(255),
+    vlan_type character varying(255),
+    imac character varying(255),
+    imtu integer
+);
+
+ALTER TABLE ONLY public.address_modes ALTER COLUMN id SET DEFAULT nextval('public.address_modes_id_seq'::regclass);
+
+ALTER TABLE ONLY public.address_pool_ranges ALTER COLUMN id SET DEFAULT nextval('public.address_pool_ranges_id_seq'::regclass);
+
+ALTER TABLE ONLY public.address_pools ALTER COLUMN id SET DEFAULT nextval('public.address_pools_id_seq'::regclass);
+
+ALTER TABLE ONLY public.addresses ALTER COLUMN id SET DEFAULT nextval('public.addresses_id_seq'::regclass);
+
+ALTER TABLE ONLY public.ceph_mon ALTER COLUMN id SET DEFAULT nextval('public.ceph_mon_id_seq'::regclass);
+
+ALTER TABLE ONLY public.certificate ALTER COLUMN id SET DEFAULT nextval('public.certificate_id_seq'::regclass);
+
+ALTER TABLE ONLY public.clusters ALTER COLUMN id SET DEFAULT nextval('public.clusters_id_seq'::regclass);
+
+ALTER TABLE ONLY public.controller_fs ALTER COLUMN id SET DEFAULT nextval('public.controller_fs_id_seq'::regclass);
+
+ALTER TABLE ONLY public.datanetworks ALTER COLUMN id SET DEFAULT nextval('public.datanetworks_id_seq'::regclass);
+
+ALTER TABLE ONLY public.drbdconfig ALTER COLUMN id SET DEFAULT nextval('public.drbdconfig_id_seq'::regclass);
+
+ALTER TABLE ONLY public.helm_overrides ALTER COLUMN id SET DEFAULT nextval('public.helm_overrides_id_seq'::regclass);
+
+ALTER TABLE ONLY public.host_upgrade ALTER COLUMN id SET DEFAULT nextval('public.host_upgrade_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_alarm_history ALTER COLUMN id SET DEFAULT nextval('public.i_alarm_history_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_community ALTER COLUMN id SET DEFAULT nextval('public.i_community_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_customer_log ALTER COLUMN id SET DEFAULT nextval('public.i_customer_log_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_dns ALTER COLUMN id SET DEFAULT nextval('public.i_dns_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_host ALTER COLUMN id SET DEFAULT nextval('public.i_host_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_icpu ALTER COLUMN id SET DEFAULT nextval('public.i_icpu_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_idisk ALTER COLUMN id SET DEFAULT nextval('public.i_idisk_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_imemory ALTER COLUMN id SET DEFAULT nextval('public.i_imemory_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_interface ALTER COLUMN id SET DEFAULT nextval('public.i_interface_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_istor ALTER COLUMN id SET DEFAULT nextval('public.i_istor_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_lvg ALTER COLUMN id SET DEFAULT nextval('public.i_lvg_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_node ALTER COLUMN id SET DEFAULT nextval('public.i_node_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_ntp ALTER COLUMN id SET DEFAULT nextval('public.i_ntp_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_pv ALTER COLUMN id SET DEFAULT nextval('public.i_pv_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_sensorgroups ALTER COLUMN id SET DEFAULT nextval('public.i_sensorgroups_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_sensors ALTER COLUMN id SET DEFAULT nextval('public.i_sensors_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_service ALTER COLUMN id SET DEFAULT nextval('public.i_service_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_system ALTER COLUMN id SET DEFAULT nextval('public.i_system_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_trap_destination ALTER COLUMN id SET DEFAULT nextval('public.i_trap_destination_id_seq'::regclass);
+
+ALTER TABLE ONLY public.i_user ALTER COLUMN id SET DEFAULT nextval('public.i_user_id_seq'::regclass);
+
+ALTER TABLE ONLY public.interface_datanetworks ALTER COLUMN id SET DEFAULT nextval('public.interface_datanetworks_id_seq'::regclass);
+
+ALTER TABLE ONLY public.interface_networks ALTER COLUMN id SET DEFAULT nextval('public.interface_networks_id_seq'::regclass);
+
+ALTER TABLE ONLY public.interfaces ALTER COLUMN id SET DEFAULT nextval('public.interfaces_id_seq'::regclass);
+
+ALTER TABLE ONLY public.journal ALTER COLUMN id SET DEFAULT nextval('public.journal_id_seq'::regclass);
+
+ALTER TABLE ONLY public.kube_app ALTER COLUMN id SET DEFAULT nextval('public.kube_app_id_seq'::regclass);
+
+ALTER TABLE ONLY public.label ALTER COLUMN id SET DEFAULT nextval('public.label_id_seq'::regclass);
+
+ALTER TABLE ONLY public.lldp_agents ALTER COLUMN id SET DEFAULT nextval('public.lldp_agents_id_seq'::regclass);
+
+ALTER TABLE ONLY public.lldp_neighbours ALTER COLUMN id SET DEFAULT nextval('public.lldp_neighbours_id_seq'::regclass);
+
+ALTER TABLE ONLY public.lldp_tlvs ALTER COLUMN id SET DEFAULT nextval('public.lldp_tlvs_id_seq'::regclass);
+
+ALTER TABLE ONLY public.loads ALTER COLUMN id SET DEFAULT nextval('public.loads_id_seq'::regclass);
+
+ALTER TABLE ONLY public.networks ALTER COLUMN id SET DEFAULT nextval('public.networks_id_seq'::regclass);
+
+ALTER TABLE ONLY public.partition ALTER COLUMN id SET DEFAULT nextval('public.partition_id_seq'::regclass);
+
+ALTER TABLE ONLY public.pci_devices ALTER COLUMN id SET DEFAULT nextval('public.pci_devices_id_seq'::regclass);
+
+ALTER TABLE ONLY public.peers ALTER COLUMN id SET DEFAULT nextval('public.peers_id_seq'::regclass);
+
+ALTER TABLE ONLY public.ports ALTER COLUMN id SET DEFAULT nextval('public.ports_id_seq'::regclass);
+
+ALTER TABLE ONLY public.ptp ALTER COLUMN id SET DEFAULT nextval('public.ptp_id_seq'::regclass);
+
+ALTER TABLE ONLY public.remotelogging ALTER COLUMN id SET DEFAULT nextval('public.remotelogging_id_seq'::regclass);
+
+ALTER TABLE ONLY public.routes ALTER COLUMN id SET DEFAULT nextval('public.routes_id_seq'::regclass);
+
+ALTER TABLE ONLY public.runtime_config ALTER COLUMN id SET DEFAULT nextval('public.runtime_config_id_seq'::regclass);
+
+ALTER TABLE ONLY public.sdn_controller ALTER COLUMN id SET DEFAULT nextval('public.sdn_controller_id_seq'::regclass);
+
+ALTER TABLE ONLY public.service_parameter ALTER COLUMN id SET DEFAULT nextval('public.service_parameter_id_seq'::regclass);
+
+ALTER TABLE ONLY public.services ALTER COLUMN id SET DEFAULT nextval('public.services_id_seq'::regclass);
+
+ALTER TABLE ONLY public.software_upgrade ALTER COLUMN id SET DEFAULT nextval('public.software_upgrade_id_seq'::regclass);
+
+ALTER TABLE ONLY public.storage_backend ALTER COLUMN id SET DEFAULT nextval('public.storage_backend_id_seq'::regclass);
+
+ALTER TABLE ONLY public.storage_tiers ALTER COLUMN id SET DEFAULT nextval('public.storage_tiers_id_seq'::regclass);
+
+ALTER TABLE ONLY public.tpmconfig ALTER COLUMN id SET DEFAULT nextval('public.tpmconfig_id_seq'::regclass);
+
+ALTER TABLE ONLY public.tpmdevice ALTER COLUMN id SET DEFAULT nextval('public.tpmdevice_id_seq'::regclass);
+
+ALTER TABLE ONLY public.address_modes
+    ADD CONSTRAINT address_modes_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.address_modes
+    ADD CONSTRAINT address_modes_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.address_pool_ranges
+    ADD CONSTRAINT address_pool_ranges_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.address_pool_ranges
+    ADD CONSTRAINT address_pool_ranges_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.address_pools
+    ADD CONSTRAINT address_pools_name_key UNIQUE (name);
+
+ALTER TABLE ONLY public.address_pools
+    ADD CONSTRAINT address_pools_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.address_pools
+    ADD CONSTRAINT address_pools_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.addresses
+    ADD CONSTRAINT addresses_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.addresses
+    ADD CONSTRAINT addresses_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.ae_interfaces
+    ADD CONSTRAINT ae_interfaces_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.ceph_mon
+    ADD CONSTRAINT ceph_mon_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.ceph_mon
+    ADD CONSTRAINT ceph_mon_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.certificate
+    ADD CONSTRAINT certificate_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.certificate
+    ADD CONSTRAINT certificate_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.clusters
+    ADD CONSTRAINT clusters_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.controller_fs
+    ADD CONSTRAINT controller_fs_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.controller_fs
+    ADD CONSTRAINT controller_fs_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.datanetworks_flat
+    ADD CONSTRAINT datanetworks_flat_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.datanetworks
+    ADD CONSTRAINT datanetworks_name_key UNIQUE (name);
+
+ALTER TABLE ONLY public.datanetworks
+    ADD CONSTRAINT datanetworks_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.datanetworks
+    ADD CONSTRAINT datanetworks_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.datanetworks_vlan
+    ADD CONSTRAINT datanetworks_vlan_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.datanetworks_vxlan
+    ADD CONSTRAINT datanetworks_vxlan_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.drbdconfig
+    ADD CONSTRAINT drbdconfig_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.drbdconfig
+    ADD CONSTRAINT drbdconfig_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.ethernet_interfaces
+    ADD CONSTRAINT ethernet_interfaces_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.ethernet_ports
+    ADD CONSTRAINT ethernet_ports_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.helm_overrides
+    ADD CONSTRAINT helm_overrides_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.host_upgrade
+    ADD CONSTRAINT host_upgrade_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.host_upgrade
+    ADD CONSTRAINT host_upgrade_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.i_alarm_history
+    ADD CONSTRAINT i_alarm_history_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_community
+    ADD CONSTRAINT i_community_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_community
+    ADD CONSTRAINT i_community_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.i_customer_log
+    ADD CONSTRAINT i_customer_log_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_dns
+    ADD CONSTRAINT i_dns_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_dns
+    ADD CONSTRAINT i_dns_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.i_host
+    ADD CONSTRAINT i_host_mgmt_ip_key UNIQUE (mgmt_ip);
+
+ALTER TABLE ONLY public.i_host
+    ADD CONSTRAINT i_host_mgmt_mac_key UNIQUE (mgmt_mac);
+
+ALTER TABLE ONLY public.i_host
+    ADD CONSTRAINT i_host_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_host
+    ADD CONSTRAINT i_host_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.i_icpu
+    ADD CONSTRAINT i_icpu_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_icpu
+    ADD CONSTRAINT i_icpu_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.i_idisk
+    ADD CONSTRAINT i_idisk_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_idisk
+    ADD CONSTRAINT i_idisk_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.i_imemory
+    ADD CONSTRAINT i_imemory_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_imemory
+    ADD CONSTRAINT i_imemory_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.i_interface
+    ADD CONSTRAINT i_interface_imac_key UNIQUE (imac);
+
+ALTER TABLE ONLY public.i_interface
+    ADD CONSTRAINT i_interface_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_istor
+    ADD CONSTRAINT i_istor_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_istor
+    ADD CONSTRAINT i_istor_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.i_lvg
+    ADD CONSTRAINT i_lvg_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_lvg
+    ADD CONSTRAINT i_lvg_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.i_node
+    ADD CONSTRAINT i_node_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_node
+    ADD CONSTRAINT i_node_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.i_ntp
+    ADD CONSTRAINT i_ntp_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_ntp
+    ADD CONSTRAINT i_ntp_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.i_pv
+    ADD CONSTRAINT i_pv_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_pv
+    ADD CONSTRAINT i_pv_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.i_sensorgroups_analog
+    ADD CONSTRAINT i_sensorgroups_analog_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_sensorgroups_discrete
+    ADD CONSTRAINT i_sensorgroups_discrete_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_sensorgroups
+    ADD CONSTRAINT i_sensorgroups_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_sensorgroups
+    ADD CONSTRAINT i_sensorgroups_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.i_sensors_analog
+    ADD CONSTRAINT i_sensors_analog_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_sensors_discrete
+    ADD CONSTRAINT i_sensors_discrete_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_sensors
+    ADD CONSTRAINT i_sensors_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_sensors
+    ADD CONSTRAINT i_sensors_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.i_service
+    ADD CONSTRAINT i_service_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_service
+    ADD CONSTRAINT i_service_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.i_system
+    ADD CONSTRAINT i_system_description_key UNIQUE (description);
+
+ALTER TABLE ONLY public.i_system
+    ADD CONSTRAINT i_system_name_key UNIQUE (name);
+
+ALTER TABLE ONLY public.i_system
+    ADD CONSTRAINT i_system_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_system
+    ADD CONSTRAINT i_system_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.i_trap_destination
+    ADD CONSTRAINT i_trap_destination_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_trap_destination
+    ADD CONSTRAINT i_trap_destination_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.i_user
+    ADD CONSTRAINT i_user_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.i_user
+    ADD CONSTRAINT i_user_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.interface_datanetworks
+    ADD CONSTRAINT interface_datanetworks_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.interface_datanetworks
+    ADD CONSTRAINT interface_datanetworks_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.interface_networks
+    ADD CONSTRAINT interface_networks_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.interface_networks
+    ADD CONSTRAINT interface_networks_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.interfaces
+    ADD CONSTRAINT interfaces_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.interfaces_to_interfaces
+    ADD CONSTRAINT interfaces_to_interfaces_pkey PRIMARY KEY (used_by_id, uses_id);
+
+ALTER TABLE ONLY public.interfaces
+    ADD CONSTRAINT interfaces_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.journal
+    ADD CONSTRAINT journal_foristorid_key UNIQUE (foristorid);
+
+ALTER TABLE ONLY public.journal
+    ADD CONSTRAINT journal_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.journal
+    ADD CONSTRAINT journal_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.kube_app
+    ADD CONSTRAINT kube_app_name_key UNIQUE (name);
+
+ALTER TABLE ONLY public.kube_app
+    ADD CONSTRAINT kube_app_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.label
+    ADD CONSTRAINT label_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.label
+    ADD CONSTRAINT label_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.lldp_agents
+    ADD CONSTRAINT lldp_agents_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.lldp_agents
+    ADD CONSTRAINT lldp_agents_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.lldp_neighbours
+    ADD CONSTRAINT lldp_neighbours_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.lldp_neighbours
+    ADD CONSTRAINT lldp_neighbours_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.lldp_tlvs
+    ADD CONSTRAINT lldp_tlvs_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.loads
+    ADD CONSTRAINT loads_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.loads
+    ADD CONSTRAINT loads_software_version_key UNIQUE (software_version);
+
+ALTER TABLE ONLY public.networks
+    ADD CONSTRAINT networks_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.networks
+    ADD CONSTRAINT networks_type_key UNIQUE (type);
+
+ALTER TABLE ONLY public.networks
+    ADD CONSTRAINT networks_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.partition
+    ADD CONSTRAINT partition_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.partition
+    ADD CONSTRAINT partition_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.pci_devices
+    ADD CONSTRAINT pci_devices_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.peers
+    ADD CONSTRAINT peers_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.ports
+    ADD CONSTRAINT ports_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.ports
+    ADD CONSTRAINT ports_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.ptp
+    ADD CONSTRAINT ptp_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.ptp
+    ADD CONSTRAINT ptp_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.remotelogging
+    ADD CONSTRAINT remotelogging_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.remotelogging
+    ADD CONSTRAINT remotelogging_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.routes
+    ADD CONSTRAINT routes_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.routes
+    ADD CONSTRAINT routes_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.runtime_config
+    ADD CONSTRAINT runtime_config_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.runtime_config
+    ADD CONSTRAINT runtime_config_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.sdn_controller
+    ADD CONSTRAINT sdn_controller_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.sdn_controller
+    ADD CONSTRAINT sdn_controller_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.service_parameter
+    ADD CONSTRAINT service_parameter_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.service_parameter
+    ADD CONSTRAINT service_parameter_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.services
+    ADD CONSTRAINT services_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.software_upgrade
+    ADD CONSTRAINT software_upgrade_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.software_upgrade
+    ADD CONSTRAINT software_upgrade_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.storage_backend
+    ADD CONSTRAINT storage_backend_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.storage_backend
+    ADD CONSTRAINT storage_backend_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.storage_ceph_external
+    ADD CONSTRAINT storage_ceph_external_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.storage_ceph
+    ADD CONSTRAINT storage_ceph_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.storage_external
+    ADD CONSTRAINT storage_external_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.storage_file
+    ADD CONSTRAINT storage_file_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.storage_lvm
+    ADD CONSTRAINT storage_lvm_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.storage_tiers
+    ADD CONSTRAINT storage_tiers_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.tpmconfig
+    ADD CONSTRAINT tpmconfig_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.tpmconfig
+    ADD CONSTRAINT tpmconfig_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.tpmdevice
+    ADD CONSTRAINT tpmdevice_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.tpmdevice
+    ADD CONSTRAINT tpmdevice_uuid_key UNIQUE (uuid);
+
+ALTER TABLE ONLY public.addresses
+    ADD CONSTRAINT "u_address@family@interface" UNIQUE (family, address, interface_id);
+
+ALTER TABLE ONLY public.i_idisk
+    ADD CONSTRAINT u_devhost UNIQUE (device_path, forihostid);
+
+ALTER TABLE ONLY public.address_modes
+    ADD CONSTRAINT "u_family@interface" UNIQUE (family, interface_id);
+
+ALTER TABLE ONLY public.routes
+    ADD CONSTRAINT "u_family@network@prefix@gateway@host" UNIQUE (family, network, prefix, gateway, interface_id);
+
+ALTER TABLE ONLY public.runtime_config
+    ADD CONSTRAINT "u_forihostid@request_id" UNIQUE (forihostid, request_id);
+
+ALTER TABLE ONLY public.label
+    ADD CONSTRAINT "u_host_id@label_key" UNIQUE (host_id, label_key);
+
+ALTER TABLE ONLY public.i_icpu
+    ADD CONSTRAINT u_hostcpu UNIQUE (cpu, forihostid);
+
+ALTER TABLE ONLY public.i_imemory
+    ADD CONSTRAINT u_hostnode UNIQUE (forihostid, forinodeid);
+
+ALTER TABLE ONLY public.i_node
+    ADD CONSTRAINT u_hostnuma UNIQUE (numa_node, forihostid);
+
+ALTER TABLE ONLY public.i_interface
+    ADD CONSTRAINT u_ifnameihost UNIQUE (ifname, forihostid);
+
+ALTER TABLE ONLY public.interface_datanetworks
+    ADD CONSTRAINT "u_interface_id@datanetwork_id" UNIQUE (interface_id, datanetwork_id);
+
+ALTER TABLE ONLY public.interface_networks
+    ADD CONSTRAINT "u_interface_id@network_id" UNIQUE (interface_id, network_id);
+
+ALTER TABLE ONLY public.interfaces
+    ADD CONSTRAINT u_interfacenameihost UNIQUE (ifname, forihostid);
+
+ALTER TABLE ONLY public.lldp_neighbours
+    ADD CONSTRAINT u_msap_port_id UNIQUE (msap, port_id);
+
+ALTER TABLE ONLY public.peers
+    ADD CONSTRAINT "u_name@cluster" UNIQUE (name, cluster_id);
+
+ALTER TABLE ONLY public.clusters
+    ADD CONSTRAINT "u_name@system" UNIQUE (name, system_id);
+
+ALTER TABLE ONLY public.helm_overrides
+    ADD CONSTRAINT u_name_namespace UNIQUE (name, namespace);
+
+ALTER TABLE ONLY public.i_istor
+    ADD CONSTRAINT u_osdhost UNIQUE (osdid, forihostid);
+
+ALTER TABLE ONLY public.partition
+    ADD CONSTRAINT u_partition_path_host_id UNIQUE (device_path, forihostid);
+
+ALTER TABLE ONLY public.ports
+    ADD CONSTRAINT u_pciaddr_dev_host_id UNIQUE (pciaddr, dev_id, host_id);
+
+ALTER TABLE ONLY public.i_sensorgroups
+    ADD CONSTRAINT u_sensorgroupname_path_hostid UNIQUE (sensorgroupname, path, host_id);
+
+ALTER TABLE ONLY public.i_sensors
+    ADD CONSTRAINT u_sensorname_path_host_id UNIQUE (sensorname, path, host_id);
+
+ALTER TABLE ONLY public.service_parameter
+    ADD CONSTRAINT u_service_section_name_personality_resource UNIQUE (service, section, name, personality, resource);
+
+ALTER TABLE ONLY public.i_service
+    ADD CONSTRAINT u_servicehost UNIQUE (servicename, hostname);
+
+ALTER TABLE ONLY public.virtual_interfaces
+    ADD CONSTRAINT virtual_interfaces_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.vlan_interfaces
+    ADD CONSTRAINT vlan_interfaces_pkey PRIMARY KEY (id);
+
+CREATE INDEX ix_address_modes_interface_id ON public.address_modes USING btree (interface_id);
+
+CREATE INDEX ix_addresses_interface_id ON public.addresses USING btree (interface_id);
+
+CREATE INDEX ix_ceph_mon_forihostid ON public.ceph_mon USING btree (forihostid);
+
+CREATE UNIQUE INDEX ix_clusters_cluster_uuid ON public.clusters USING btree (cluster_uuid);
+
+CREATE UNIQUE INDEX ix_clusters_name ON public.clusters USING btree (name);
+
+CREATE UNIQUE INDEX ix_clusters_uuid ON public.clusters USING btree (uuid);
+
+CREATE INDEX ix_i_alarm_history_alarm_id ON public.i_alarm_history USING btree (alarm_id);
+
+CREATE INDEX ix_i_alarm_history_alarm_type ON public.i_alarm_history USING btree (alarm_type);
+
+CREATE INDEX ix_i_alarm_history_entity_instance_id ON public.i_alarm_history USING btree (entity_instance_id);
+
+CREATE INDEX ix_i_alarm_history_entity_type_id ON public.i_alarm_history USING btree (entity_type_id);
+
+CREATE INDEX ix_i_alarm_history_severity ON public.i_alarm_history USING btree (severity);
+
+CREATE UNIQUE INDEX ix_i_alarm_history_uuid ON public.i_alarm_history USING btree (uuid);
+
+CREATE UNIQUE INDEX ix_i_community_community ON public.i_community USING btree (community);
+
+CREATE INDEX ix_i_customer_log_entity_instance_id ON public.i_customer_log USING btree (entity_instance_id);
+
+CREATE INDEX ix_i_customer_log_entity_type_id ON public.i_customer_log USING btree (entity_type_id);
+
+CREATE INDEX ix_i_customer_log_log_id ON public.i_customer_log USING btree (log_id);
+
+CREATE INDEX ix_i_customer_log_log_type ON public.i_customer_log USING btree (log_type);
+
+CREATE INDEX ix_i_customer_log_severity ON public.i_customer_log USING btree (severity);
+
+CREATE UNIQUE INDEX ix_i_customer_log_uuid ON public.i_customer_log USING btree (uuid);
+
+CREATE UNIQUE INDEX ix_i_host_hostname ON public.i_host USING btree (hostname);
+
+CREATE INDEX ix_i_icpu_forihostid ON public.i_icpu USING btree (forihostid);
+
+CREATE INDEX ix_i_icpu_forinodeid ON public.i_icpu USING btree (forinodeid);
+
+CREATE INDEX ix_i_idisk_forihostid ON public.i_idisk USING btree (forihostid);
+
+CREATE INDEX ix_i_idisk_foripvid ON public.i_idisk USING btree (foripvid);
+
+CREATE INDEX ix_i_imemory_forihostid ON public.i_imemory USING btree (forihostid);
+
+CREATE INDEX ix_i_imemory_forinodeid ON public.i_imemory USING btree (forinodeid);
+
+CREATE INDEX ix_i_istor_forihostid ON public.i_istor USING btree (forihostid);
+
+CREATE INDEX ix_i_istor_idisk_uuid ON public.i_istor USING btree (idisk_uuid);
+
+CREATE INDEX ix_i_lvg_forihostid ON public.i_lvg USING btree (forihostid);
+
+CREATE INDEX ix_i_lvg_vg_state ON public.i_lvg USING btree (vg_state);
+
+CREATE INDEX ix_i_node_forihostid ON public.i_node USING btree (forihostid);
+
+CREATE INDEX ix_i_pv_forihostid ON public.i_pv USING btree (forihostid);
+
+CREATE INDEX ix_i_pv_forilvgid ON public.i_pv USING btree (forilvgid);
+
+CREATE INDEX ix_i_pv_pv_state ON public.i_pv USING btree (pv_state);
+
+CREATE INDEX ix_i_sensorgroups_host_id ON public.i_sensorgroups USING btree (host_id);
+
+CREATE INDEX ix_i_sensors_host_id ON public.i_sensors USING btree (host_id);
+
+CREATE UNIQUE INDEX ix_i_trap_destination_ip_address ON public.i_trap_destination USING btree (ip_address);
+
+CREATE INDEX ix_interface_datanetworks_interface_id ON public.interface_datanetworks USING btree (interface_id);
+
+CREATE INDEX ix_interface_networks_interface_id ON public.interface_networks USING btree (interface_id);
+
+CREATE INDEX ix_interfaces_forihostid ON public.interfaces USING btree (forihostid);
+
+CREATE INDEX ix_label_host_id ON public.label USING btree (host_id);
+
+CREATE INDEX ix_lldp_agents_host_id ON public.lldp_agents USING btree (host_id);
+
+CREATE INDEX ix_lldp_agents_port_id ON public.lldp_agents USING btree (port_id);
+
+CREATE INDEX ix_lldp_neighbours_host_id ON public.lldp_neighbours USING btree (host_id);
+
+CREATE INDEX ix_lldp_neighbours_port_id ON public.lldp_neighbours USING btree (port_id);
+
+CREATE INDEX ix_partition_forihostid ON public.partition USING btree (forihostid);
+
+CREATE INDEX ix_partition_foripvid ON public.partition USING btree (foripvid);
+
+CREATE INDEX ix_partition_idisk_uuid ON public.partition USING btree (idisk_uuid);
+
+CREATE INDEX ix_partition_status ON public.partition USING btree (status);
+
+CREATE INDEX ix_pci_devices_host_id ON public.pci_devices USING btree (host_id);
+
+CREATE UNIQUE INDEX ix_pci_devices_uuid ON public.pci_devices USING btree (uuid);
+
+CREATE INDEX ix_peers_name ON public.peers USING btree (name);
+
+CREATE UNIQUE INDEX ix_peers_uuid ON public.peers USING btree (uuid);
+
+CREATE INDEX ix_ports_host_id ON public.ports USING btree (host_id);
+
+CREATE INDEX ix_ports_interface_id ON public.ports USING btree (interface_id);
+
+CREATE UNIQUE INDEX ix_remotelogging_ip_address ON public.remotelogging USING btree (ip_address);
+
+CREATE INDEX ix_routes_interface_id ON public.routes USING btree (interface_id);
+
+CREATE INDEX ix_runtime_config_forihostid ON public.runtime_config USING btree (forihostid);
+
+CREATE UNIQUE INDEX ix_storage_ceph_external_ceph_conf ON public.storage_ceph_external USING btree (ceph_conf);
+
+CREATE UNIQUE INDEX ix_storage_tiers_name ON public.storage_tiers USING btree (name);
+
+CREATE UNIQUE INDEX ix_storage_tiers_uuid ON public.storage_tiers USING btree (uuid);
+
+ALTER TABLE ONLY public.address_modes
+    ADD CONSTRAINT address_modes_address_pool_id_fkey FOREIGN KEY (address_pool_id) REFERENCES public.address_pools(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.address_modes
+    ADD CONSTRAINT address_modes_interface_id_fkey FOREIGN KEY (interface_id) REFERENCES public.interfaces(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.address_pool_ranges
+    ADD CONSTRAINT address_pool_ranges_address_pool_id_fkey FOREIGN KEY (address_pool_id) REFERENCES public.address_pools(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.addresses
+    ADD CONSTRAINT addresses_address_pool_id_fkey FOREIGN KEY (address_pool_id) REFERENCES public.address_pools(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.addresses
+    ADD CONSTRAINT addresses_interface_id_fkey FOREIGN KEY (interface_id) REFERENCES public.interfaces(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.ae_interfaces
+    ADD CONSTRAINT ae_interfaces_id_fkey FOREIGN KEY (id) REFERENCES public.interfaces(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.ceph_mon
+    ADD CONSTRAINT ceph_mon_forihostid_fkey FOREIGN KEY (forihostid) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.clusters
+    ADD CONSTRAINT clusters_system_id_fkey FOREIGN KEY (system_id) REFERENCES public.i_system(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.controller_fs
+    ADD CONSTRAINT controller_fs_forisystemid_fkey FOREIGN KEY (forisystemid) REFERENCES public.i_system(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.datanetworks_flat
+    ADD CONSTRAINT datanetworks_flat_id_fkey FOREIGN KEY (id) REFERENCES public.datanetworks(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.datanetworks_vlan
+    ADD CONSTRAINT datanetworks_vlan_id_fkey FOREIGN KEY (id) REFERENCES public.datanetworks(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.datanetworks_vxlan
+    ADD CONSTRAINT datanetworks_vxlan_id_fkey FOREIGN KEY (id) REFERENCES public.datanetworks(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.drbdconfig
+    ADD CONSTRAINT drbdconfig_forisystemid_fkey FOREIGN KEY (forisystemid) REFERENCES public.i_system(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.ethernet_interfaces
+    ADD CONSTRAINT ethernet_interfaces_id_fkey FOREIGN KEY (id) REFERENCES public.interfaces(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.ethernet_ports
+    ADD CONSTRAINT ethernet_ports_id_fkey FOREIGN KEY (id) REFERENCES public.ports(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.host_upgrade
+    ADD CONSTRAINT host_upgrade_forihostid_fkey FOREIGN KEY (forihostid) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.host_upgrade
+    ADD CONSTRAINT host_upgrade_software_load_fkey FOREIGN KEY (software_load) REFERENCES public.loads(id);
+
+ALTER TABLE ONLY public.host_upgrade
+    ADD CONSTRAINT host_upgrade_target_load_fkey FOREIGN KEY (target_load) REFERENCES public.loads(id);
+
+ALTER TABLE ONLY public.i_dns
+    ADD CONSTRAINT i_dns_forisystemid_fkey FOREIGN KEY (forisystemid) REFERENCES public.i_system(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_host
+    ADD CONSTRAINT i_host_forisystemid_fkey FOREIGN KEY (forisystemid) REFERENCES public.i_system(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_host
+    ADD CONSTRAINT i_host_peer_id_fkey FOREIGN KEY (peer_id) REFERENCES public.peers(id);
+
+ALTER TABLE ONLY public.i_icpu
+    ADD CONSTRAINT i_icpu_forihostid_fkey FOREIGN KEY (forihostid) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_icpu
+    ADD CONSTRAINT i_icpu_forinodeid_fkey FOREIGN KEY (forinodeid) REFERENCES public.i_node(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_idisk
+    ADD CONSTRAINT i_idisk_forihostid_fkey FOREIGN KEY (forihostid) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_idisk
+    ADD CONSTRAINT i_idisk_foripvid_fkey FOREIGN KEY (foripvid) REFERENCES public.i_pv(id);
+
+ALTER TABLE ONLY public.i_idisk
+    ADD CONSTRAINT i_idisk_foristorid_fkey FOREIGN KEY (foristorid) REFERENCES public.i_istor(id);
+
+ALTER TABLE ONLY public.i_imemory
+    ADD CONSTRAINT i_imemory_forihostid_fkey FOREIGN KEY (forihostid) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_imemory
+    ADD CONSTRAINT i_imemory_forinodeid_fkey FOREIGN KEY (forinodeid) REFERENCES public.i_node(id);
+
+ALTER TABLE ONLY public.i_interface
+    ADD CONSTRAINT i_interface_forihostid_fkey FOREIGN KEY (forihostid) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_istor
+    ADD CONSTRAINT i_istor_forihostid_fkey FOREIGN KEY (forihostid) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_istor
+    ADD CONSTRAINT i_istor_fortierid_fkey FOREIGN KEY (fortierid) REFERENCES public.storage_tiers(id);
+
+ALTER TABLE ONLY public.i_lvg
+    ADD CONSTRAINT i_lvg_forihostid_fkey FOREIGN KEY (forihostid) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_node
+    ADD CONSTRAINT i_node_forihostid_fkey FOREIGN KEY (forihostid) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_ntp
+    ADD CONSTRAINT i_ntp_forisystemid_fkey FOREIGN KEY (forisystemid) REFERENCES public.i_system(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_pv
+    ADD CONSTRAINT i_pv_forihostid_fkey FOREIGN KEY (forihostid) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_pv
+    ADD CONSTRAINT i_pv_forilvgid_fkey FOREIGN KEY (forilvgid) REFERENCES public.i_lvg(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_sensorgroups_analog
+    ADD CONSTRAINT i_sensorgroups_analog_id_fkey FOREIGN KEY (id) REFERENCES public.i_sensorgroups(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_sensorgroups_discrete
+    ADD CONSTRAINT i_sensorgroups_discrete_id_fkey FOREIGN KEY (id) REFERENCES public.i_sensorgroups(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_sensorgroups
+    ADD CONSTRAINT i_sensorgroups_host_id_fkey FOREIGN KEY (host_id) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_sensors_analog
+    ADD CONSTRAINT i_sensors_analog_id_fkey FOREIGN KEY (id) REFERENCES public.i_sensors(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_sensors_discrete
+    ADD CONSTRAINT i_sensors_discrete_id_fkey FOREIGN KEY (id) REFERENCES public.i_sensors(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_sensors
+    ADD CONSTRAINT i_sensors_host_id_fkey FOREIGN KEY (host_id) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_sensors
+    ADD CONSTRAINT i_sensors_sensorgroup_id_fkey FOREIGN KEY (sensorgroup_id) REFERENCES public.i_sensorgroups(id) ON DELETE SET NULL;
+
+ALTER TABLE ONLY public.i_service
+    ADD CONSTRAINT i_service_forihostid_fkey FOREIGN KEY (forihostid) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.i_user
+    ADD CONSTRAINT i_user_forisystemid_fkey FOREIGN KEY (forisystemid) REFERENCES public.i_system(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.interface_datanetworks
+    ADD CONSTRAINT interface_datanetworks_datanetwork_id_fkey FOREIGN KEY (datanetwork_id) REFERENCES public.datanetworks(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.interface_datanetworks
+    ADD CONSTRAINT interface_datanetworks_interface_id_fkey FOREIGN KEY (interface_id) REFERENCES public.interfaces(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.interface_networks
+    ADD CONSTRAINT interface_networks_interface_id_fkey FOREIGN KEY (interface_id) REFERENCES public.interfaces(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.interface_networks
+    ADD CONSTRAINT interface_networks_network_id_fkey FOREIGN KEY (network_id) REFERENCES public.networks(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.interfaces
+    ADD CONSTRAINT interfaces_forihostid_fkey FOREIGN KEY (forihostid) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.interfaces_to_interfaces
+    ADD CONSTRAINT interfaces_to_interfaces_used_by_id_fkey FOREIGN KEY (used_by_id) REFERENCES public.interfaces(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.interfaces_to_interfaces
+    ADD CONSTRAINT interfaces_to_interfaces_uses_id_fkey FOREIGN KEY (uses_id) REFERENCES public.interfaces(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.journal
+    ADD CONSTRAINT journal_foristorid_fkey FOREIGN KEY (foristorid) REFERENCES public.i_istor(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.label
+    ADD CONSTRAINT label_host_id_fkey FOREIGN KEY (host_id) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.lldp_agents
+    ADD CONSTRAINT lldp_agents_host_id_fkey FOREIGN KEY (host_id) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.lldp_agents
+    ADD CONSTRAINT lldp_agents_port_id_fkey FOREIGN KEY (port_id) REFERENCES public.ports(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.lldp_neighbours
+    ADD CONSTRAINT lldp_neighbours_host_id_fkey FOREIGN KEY (host_id) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.lldp_neighbours
+    ADD CONSTRAINT lldp_neighbours_port_id_fkey FOREIGN KEY (port_id) REFERENCES public.ports(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.lldp_tlvs
+    ADD CONSTRAINT lldp_tlvs_agent_id_fkey FOREIGN KEY (agent_id) REFERENCES public.lldp_agents(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.lldp_tlvs
+    ADD CONSTRAINT lldp_tlvs_neighbour_id_fkey FOREIGN KEY (neighbour_id) REFERENCES public.lldp_neighbours(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.networks
+    ADD CONSTRAINT networks_address_pool_id_fkey FOREIGN KEY (address_pool_id) REFERENCES public.address_pools(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.partition
+    ADD CONSTRAINT partition_forihostid_fkey FOREIGN KEY (forihostid) REFERENCES public.i_host(id);
+
+ALTER TABLE ONLY public.partition
+    ADD CONSTRAINT partition_foripvid_fkey FOREIGN KEY (foripvid) REFERENCES public.i_pv(id);
+
+ALTER TABLE ONLY public.partition
+    ADD CONSTRAINT partition_idisk_id_fkey FOREIGN KEY (idisk_id) REFERENCES public.i_idisk(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.pci_devices
+    ADD CONSTRAINT pci_devices_host_id_fkey FOREIGN KEY (host_id) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.peers
+    ADD CONSTRAINT peers_cluster_id_fkey FOREIGN KEY (cluster_id) REFERENCES public.clusters(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.ports
+    ADD CONSTRAINT ports_host_id_fkey FOREIGN KEY (host_id) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.ports
+    ADD CONSTRAINT ports_interface_id_fkey FOREIGN KEY (interface_id) REFERENCES public.interfaces(id) ON DELETE SET NULL;
+
+ALTER TABLE ONLY public.ports
+    ADD CONSTRAINT ports_node_id_fkey FOREIGN KEY (node_id) REFERENCES public.i_node(id) ON DELETE SET NULL;
+
+ALTER TABLE ONLY public.ptp
+    ADD CONSTRAINT ptp_system_id_fkey FOREIGN KEY (system_id) REFERENCES public.i_system(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.remotelogging
+    ADD CONSTRAINT remotelogging_system_id_fkey FOREIGN KEY (system_id) REFERENCES public.i_system(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.routes
+    ADD CONSTRAINT routes_interface_id_fkey FOREIGN KEY (interface_id) REFERENCES public.interfaces(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.runtime_config
+    ADD CONSTRAINT runtime_config_forihostid_fkey FOREIGN KEY (forihostid) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.software_upgrade
+    ADD CONSTRAINT software_upgrade_from_load_fkey FOREIGN KEY (from_load) REFERENCES public.loads(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.software_upgrade
+    ADD CONSTRAINT software_upgrade_to_load_fkey FOREIGN KEY (to_load) REFERENCES public.loads(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.storage_backend
+    ADD CONSTRAINT storage_backend_forisystemid_fkey FOREIGN KEY (forisystemid) REFERENCES public.i_system(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.storage_ceph_external
+    ADD CONSTRAINT storage_ceph_external_id_fkey FOREIGN KEY (id) REFERENCES public.storage_backend(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.storage_ceph
+    ADD CONSTRAINT storage_ceph_id_fkey FOREIGN KEY (id) REFERENCES public.storage_backend(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.storage_ceph
+    ADD CONSTRAINT storage_ceph_tier_id_fkey FOREIGN KEY (tier_id) REFERENCES public.storage_tiers(id);
+
+ALTER TABLE ONLY public.storage_external
+    ADD CONSTRAINT storage_external_id_fkey FOREIGN KEY (id) REFERENCES public.storage_backend(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.storage_file
+    ADD CONSTRAINT storage_file_id_fkey FOREIGN KEY (id) REFERENCES public.storage_backend(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.storage_lvm
+    ADD CONSTRAINT storage_lvm_id_fkey FOREIGN KEY (id) REFERENCES public.storage_backend(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.storage_tiers
+    ADD CONSTRAINT storage_tiers_forbackendid_fkey FOREIGN KEY (forbackendid) REFERENCES public.storage_backend(id);
+
+ALTER TABLE ONLY public.storage_tiers
+    ADD CONSTRAINT storage_tiers_forclusterid_fkey FOREIGN KEY (forclusterid) REFERENCES public.clusters(id);
+
+ALTER TABLE ONLY public.tpmdevice
+    ADD CONSTRAINT tpmdevice_host_id_fkey FOREIGN KEY (host_id) REFERENCES public.i_host(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.virtual_interfaces
+    ADD CONSTRAINT virtual_interfaces_id_fkey FOREIGN KEY (id) REFERENCES public.interfaces(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.vlan_interfaces
+    ADD CONSTRAINT vlan_interfaces_id_fkey FOREIGN KEY (id) REFERENCES public.interfaces(id) ON DELETE CASCADE;
@@ -0,0 +1,1340 @@
+-- sysinv baseline schema version 86
+BEGIN TRANSACTION;
+CREATE TABLE address_modes (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	family INTEGER NOT NULL,
+	mode VARCHAR(32) NOT NULL,
+	interface_id INTEGER NOT NULL,
+	address_pool_id INTEGER,
+	PRIMARY KEY (id),
+	CONSTRAINT "u_family@interface" UNIQUE (family, interface_id),
+	UNIQUE (uuid),
+	FOREIGN KEY(interface_id) REFERENCES interfaces (id) ON DELETE CASCADE,
+	FOREIGN KEY(address_pool_id) REFERENCES address_pools (id) ON DELETE CASCADE
+);
+CREATE TABLE address_pool_ranges (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	start VARCHAR(50) NOT NULL,
+	"end" VARCHAR(50) NOT NULL,
+	address_pool_id INTEGER NOT NULL,
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	FOREIGN KEY(address_pool_id) REFERENCES address_pools (id) ON DELETE CASCADE
+);
+CREATE TABLE address_pools (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	name VARCHAR(128) NOT NULL,
+	family INTEGER NOT NULL,
+	network VARCHAR(50) NOT NULL,
+	prefix INTEGER NOT NULL,
+	"order" VARCHAR(32) NOT NULL, controller0_address_id INTEGER, controller1_address_id INTEGER, floating_address_id INTEGER, gateway_address_id INTEGER,
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	UNIQUE (name)
+);
+CREATE TABLE addresses (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	name VARCHAR(255),
+	family INTEGER NOT NULL,
+	address VARCHAR(50) NOT NULL,
+	prefix INTEGER NOT NULL,
+	enable_dad BOOLEAN,
+	interface_id INTEGER,
+	address_pool_id INTEGER,
+	PRIMARY KEY (id),
+	CONSTRAINT "u_address@family@interface" UNIQUE (family, address, interface_id),
+	UNIQUE (uuid),
+	CHECK (enable_dad IN (0, 1)),
+	FOREIGN KEY(interface_id) REFERENCES interfaces (id) ON DELETE CASCADE,
+	FOREIGN KEY(address_pool_id) REFERENCES address_pools (id) ON DELETE CASCADE
+);
+CREATE TABLE ae_interfaces (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	aemode VARCHAR(255),
+	aedict TEXT,
+	txhashpolicy VARCHAR(255),
+	schedpolicy VARCHAR(255),
+	imac VARCHAR(255),
+	imtu INTEGER,
+	PRIMARY KEY (id),
+	FOREIGN KEY(id) REFERENCES interfaces (id) ON DELETE CASCADE
+);
+CREATE TABLE ceph_mon (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	device_path VARCHAR(255),
+	ceph_mon_gib INTEGER,
+	forihostid INTEGER, state VARCHAR(255), task VARCHAR(255),
+	PRIMARY KEY (id),
+	FOREIGN KEY(forihostid) REFERENCES i_host (id) ON DELETE CASCADE,
+	UNIQUE (uuid)
+);
+CREATE TABLE certificate (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	certtype VARCHAR(64),
+	issuer VARCHAR(255),
+	signature VARCHAR(255),
+	start_date DATETIME,
+	expiry_date DATETIME,
+	capabilities TEXT,
+	PRIMARY KEY (id),
+	UNIQUE (uuid)
+);
+CREATE TABLE clusters (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(255),
+	cluster_uuid VARCHAR(255),
+	type VARCHAR(255),
+	name VARCHAR(255),
+	capabilities TEXT,
+	system_id INTEGER,
+	PRIMARY KEY (id),
+	CONSTRAINT "u_name@system" UNIQUE (name, system_id),
+	FOREIGN KEY(system_id) REFERENCES i_system (id) ON DELETE CASCADE
+);
+CREATE TABLE controller_fs (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	forisystemid INTEGER,
+	state VARCHAR(255),
+	name VARCHAR(64),
+	size INTEGER,
+	logical_volume VARCHAR(64),
+	replicated BOOLEAN,
+	PRIMARY KEY (id),
+	FOREIGN KEY(forisystemid) REFERENCES i_system (id) ON DELETE CASCADE,
+	UNIQUE (uuid),
+	CHECK (replicated IN (0, 1))
+);
+CREATE TABLE datanetworks (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	name VARCHAR(255),
+	network_type VARCHAR(255),
+	description VARCHAR(255),
+	mtu INTEGER NOT NULL,
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	UNIQUE (name)
+);
+CREATE TABLE datanetworks_flat (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(id) REFERENCES datanetworks (id) ON DELETE CASCADE
+);
+CREATE TABLE datanetworks_vlan (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(id) REFERENCES datanetworks (id) ON DELETE CASCADE
+);
+CREATE TABLE datanetworks_vxlan (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	multicast_group VARCHAR(64),
+	port_num INTEGER NOT NULL,
+	ttl INTEGER NOT NULL,
+	mode VARCHAR(32) NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(id) REFERENCES datanetworks (id) ON DELETE CASCADE
+);
+CREATE TABLE drbdconfig (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	link_util INTEGER,
+	num_parallel INTEGER,
+	rtt_ms FLOAT,
+	forisystemid INTEGER,
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	FOREIGN KEY(forisystemid) REFERENCES i_system (id) ON DELETE CASCADE
+);
+CREATE TABLE ethernet_interfaces (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	imac VARCHAR(255),
+	imtu INTEGER,
+	PRIMARY KEY (id),
+	FOREIGN KEY(id) REFERENCES interfaces (id) ON DELETE CASCADE
+);
+CREATE TABLE ethernet_ports (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	mac VARCHAR(255),
+	mtu INTEGER,
+	speed INTEGER,
+	link_mode VARCHAR(255),
+	duplex VARCHAR(255),
+	autoneg VARCHAR(255),
+	bootp VARCHAR(255),
+	capabilities TEXT,
+	PRIMARY KEY (id),
+	FOREIGN KEY(id) REFERENCES ports (id) ON DELETE CASCADE
+);
+CREATE TABLE helm_overrides (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	name VARCHAR(255) NOT NULL,
+	namespace VARCHAR(255) NOT NULL,
+	user_overrides TEXT, system_overrides TEXT,
+	PRIMARY KEY (id),
+	CONSTRAINT u_name_namespace UNIQUE (name, namespace)
+);
+CREATE TABLE host_upgrade (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	forihostid INTEGER,
+	software_load INTEGER NOT NULL,
+	target_load INTEGER NOT NULL,
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	FOREIGN KEY(forihostid) REFERENCES i_host (id) ON DELETE CASCADE,
+	FOREIGN KEY(software_load) REFERENCES loads (id),
+	FOREIGN KEY(target_load) REFERENCES loads (id)
+);
+CREATE TABLE i_alarm_history (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(255),
+	alarm_id VARCHAR(255),
+	alarm_state VARCHAR(255),
+	entity_type_id VARCHAR(255),
+	entity_instance_id VARCHAR(255),
+	timestamp DATETIME,
+	severity VARCHAR(255),
+	reason_text VARCHAR(255),
+	alarm_type VARCHAR(255),
+	probable_cause VARCHAR(255),
+	proposed_repair_action VARCHAR(255),
+	service_affecting BOOLEAN,
+	suppression BOOLEAN,
+	PRIMARY KEY (id),
+	CHECK (service_affecting IN (0, 1)),
+	CHECK (suppression IN (0, 1))
+);
+CREATE TABLE i_community (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	community VARCHAR(255),
+	"view" VARCHAR(255),
+	access VARCHAR(8),
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	CONSTRAINT "accessEnum" CHECK (access IN ('ro', 'rw', 'reserve1', 'reserve2'))
+);
+CREATE TABLE i_customer_log (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(255),
+	log_id VARCHAR(255),
+	entity_type_id VARCHAR(255),
+	entity_instance_id VARCHAR(255),
+	timestamp DATETIME,
+	severity VARCHAR(255),
+	reason_text VARCHAR(255),
+	log_type VARCHAR(255),
+	probable_cause VARCHAR(255),
+	service_affecting BOOLEAN,
+	PRIMARY KEY (id),
+	CHECK (service_affecting IN (0, 1))
+);
+CREATE TABLE i_dns (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	nameservers VARCHAR(255),
+	forisystemid INTEGER,
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	FOREIGN KEY(forisystemid) REFERENCES i_system (id) ON DELETE CASCADE
+);
+CREATE TABLE i_horizon_lockout (
+	lockout_time INTEGER,
+	lockout_retries INTEGER
+);
+CREATE TABLE i_host (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	reserved BOOLEAN,
+	recordtype VARCHAR(8),
+	uuid VARCHAR(36),
+	id INTEGER NOT NULL,
+	hostname VARCHAR(255),
+	mgmt_mac VARCHAR(255),
+	mgmt_ip VARCHAR(255),
+	bm_ip VARCHAR(255),
+	bm_mac VARCHAR(255),
+	bm_type VARCHAR(255),
+	bm_username VARCHAR(255),
+	personality VARCHAR(10),
+	serialid VARCHAR(255),
+	location TEXT,
+	administrative VARCHAR(8),
+	operational VARCHAR(8),
+	availability VARCHAR(13),
+	action VARCHAR(11),
+	task VARCHAR(64),
+	uptime INTEGER,
+	capabilities TEXT,
+	config_status VARCHAR(255),
+	config_applied VARCHAR(255),
+	config_target VARCHAR(255),
+	forisystemid INTEGER,
+	invprovision VARCHAR(13),
+	ihost_action VARCHAR(255),
+	vim_progress_status VARCHAR(255),
+	subfunctions VARCHAR(255),
+	subfunction_oper VARCHAR(255),
+	subfunction_avail VARCHAR(255),
+	boot_device VARCHAR(255),
+	rootfs_device VARCHAR(255),
+	install_output VARCHAR(255),
+	console VARCHAR(255),
+	vsc_controllers VARCHAR(255),
+	ttys_dcd BOOLEAN,
+	peer_id INTEGER, action_state VARCHAR(255), mtce_info VARCHAR(255), install_state VARCHAR(255), install_state_info VARCHAR(255), iscsi_initiator_name VARCHAR(64), tboot VARCHAR(64),
+	PRIMARY KEY (id),
+	CHECK (reserved IN (0, 1)),
+	CHECK (ttys_dcd IN (0, 1)),
+	FOREIGN KEY(forisystemid) REFERENCES i_system (id) ON DELETE CASCADE,
+	UNIQUE (uuid),
+	UNIQUE (mgmt_mac),
+	UNIQUE (mgmt_ip),
+	CHECK (reserved IN (0, 1)),
+	CHECK (recordtype IN ('standard', 'profile', 'sprofile', 'reserve1', 'reserve2')),
+	CHECK (personality IN ('controller', 'worker', 'network', 'storage', 'profile', 'reserve1', 'reserve2')),
+	CHECK (administrative IN ('locked', 'unlocked', 'reserve1', 'reserve2')),
+	CHECK (operational IN ('disabled', 'enabled', 'reserve1', 'reserve2')),
+	CHECK (availability IN ('available', 'intest', 'degraded', 'failed', 'power-off', 'offline', 'offduty', 'online', 'dependency', 'not-installed', 'reserve1', 'reserve2')),
+	CHECK (action IN ('none', 'lock', 'force-lock', 'unlock', 'reset', 'swact', 'force-swact', 'reboot', 'power-on', 'power-off', 'reinstall', 'reserve1', 'reserve2')),
+	FOREIGN KEY(peer_id) REFERENCES peers (id)
+);
+CREATE TABLE i_icpu (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	cpu INTEGER,
+	core INTEGER,
+	thread INTEGER,
+	cpu_family VARCHAR(255),
+	cpu_model VARCHAR(255),
+	allocated_function VARCHAR(255),
+	capabilities TEXT,
+	forihostid INTEGER,
+	forinodeid INTEGER,
+	PRIMARY KEY (id),
+	CONSTRAINT u_hostcpu UNIQUE (cpu, forihostid),
+	UNIQUE (uuid),
+	FOREIGN KEY(forihostid) REFERENCES i_host (id) ON DELETE CASCADE,
+	FOREIGN KEY(forinodeid) REFERENCES i_node (id) ON DELETE CASCADE
+);
+CREATE TABLE i_idisk (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	device_node VARCHAR(255),
+	device_num INTEGER,
+	device_type VARCHAR(255),
+	size_mib INTEGER,
+	serial_id VARCHAR(255),
+	capabilities TEXT,
+	forihostid INTEGER,
+	foristorid INTEGER,
+	foripvid INTEGER,
+	rpm VARCHAR(255),
+	device_id VARCHAR(255),
+	device_path VARCHAR(255),
+	device_wwn VARCHAR(255), available_mib INTEGER,
+	PRIMARY KEY (id),
+	FOREIGN KEY(forihostid) REFERENCES i_host (id) ON DELETE CASCADE,
+	FOREIGN KEY(foristorid) REFERENCES i_istor (id),
+	FOREIGN KEY(foripvid) REFERENCES i_pv (id),
+	UNIQUE (uuid),
+	CONSTRAINT u_devhost UNIQUE (device_path, forihostid)
+);
+CREATE TABLE i_imemory (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	memtotal_mib INTEGER,
+	memavail_mib INTEGER,
+	platform_reserved_mib INTEGER,
+	hugepages_configured BOOLEAN,
+	vswitch_hugepages_size_mib INTEGER,
+	vswitch_hugepages_reqd INTEGER,
+	vswitch_hugepages_nr INTEGER,
+	vswitch_hugepages_avail INTEGER,
+	capabilities TEXT,
+	forihostid INTEGER,
+	forinodeid INTEGER,
+	"vm_hugepages_nr_2M" INTEGER,
+	"vm_hugepages_nr_1G" INTEGER,
+	"vm_hugepages_use_1G" BOOLEAN,
+	"vm_hugepages_possible_2M" INTEGER,
+	"vm_hugepages_possible_1G" INTEGER,
+	"vm_hugepages_nr_2M_pending" INTEGER,
+	"vm_hugepages_nr_1G_pending" INTEGER,
+	"vm_hugepages_avail_2M" INTEGER,
+	"vm_hugepages_avail_1G" INTEGER,
+	"vm_hugepages_nr_4K" INTEGER,
+	node_memtotal_mib INTEGER,
+	PRIMARY KEY (id),
+	CHECK (hugepages_configured IN (0, 1)),
+	CHECK ("vm_hugepages_use_1G" IN (0, 1)),
+	FOREIGN KEY(forihostid) REFERENCES i_host (id) ON DELETE CASCADE,
+	FOREIGN KEY(forinodeid) REFERENCES i_node (id),
+	CONSTRAINT u_hostnode UNIQUE (forihostid, forinodeid),
+	UNIQUE (uuid),
+	CHECK (hugepages_configured IN (0, 1)),
+	CHECK (hugepages_configured IN (0, 1))
+);
+CREATE TABLE i_interface (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	ifname VARCHAR(255),
+	iftype VARCHAR(255),
+	imac VARCHAR(255),
+	imtu INTEGER,
+	networktype VARCHAR(255),
+	aemode VARCHAR(255),
+	txhashpolicy VARCHAR(255),
+	providernetworks VARCHAR(255),
+	providernetworksdict TEXT,
+	schedpolicy VARCHAR(255),
+	ifcapabilities TEXT,
+	farend TEXT,
+	forihostid INTEGER, sriov_numvfs INTEGER, aedict TEXT,
+	PRIMARY KEY (id),
+	CONSTRAINT u_ifnameihost UNIQUE (ifname, forihostid),
+	UNIQUE (imac),
+	FOREIGN KEY(forihostid) REFERENCES i_host (id) ON DELETE CASCADE
+);
+CREATE TABLE i_istor (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	osdid INTEGER,
+	idisk_uuid VARCHAR(255),
+	state VARCHAR(255),
+	function VARCHAR(255),
+	capabilities TEXT,
+	forihostid INTEGER,
+	fortierid INTEGER,
+	PRIMARY KEY (id),
+	FOREIGN KEY(forihostid) REFERENCES i_host (id) ON DELETE CASCADE,
+	CONSTRAINT u_osdhost UNIQUE (osdid, forihostid),
+	UNIQUE (uuid),
+	FOREIGN KEY(fortierid) REFERENCES storage_tiers (id)
+);
+CREATE TABLE i_lvg (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	vg_state VARCHAR(13),
+	lvm_vg_name VARCHAR(64),
+	lvm_vg_uuid VARCHAR(64),
+	lvm_vg_access VARCHAR(64),
+	lvm_max_lv INTEGER,
+	lvm_cur_lv INTEGER,
+	lvm_max_pv INTEGER,
+	lvm_cur_pv INTEGER,
+	lvm_vg_size BIGINT,
+	lvm_vg_total_pe INTEGER,
+	lvm_vg_free_pe INTEGER,
+	capabilities TEXT,
+	forihostid INTEGER,
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	CONSTRAINT "vgStateEnum" CHECK (vg_state IN ('unprovisioned', 'adding', 'provisioned', 'removing', 'reserve1', 'reserve2')),
+	FOREIGN KEY(forihostid) REFERENCES i_host (id) ON DELETE CASCADE
+);
+CREATE TABLE i_node (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	numa_node INTEGER,
+	capabilities TEXT,
+	forihostid INTEGER,
+	PRIMARY KEY (id),
+	CONSTRAINT u_hostnuma UNIQUE (numa_node, forihostid),
+	UNIQUE (uuid),
+	FOREIGN KEY(forihostid) REFERENCES i_host (id) ON DELETE CASCADE
+);
+CREATE TABLE i_ntp (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	ntpservers VARCHAR(255),
+	forisystemid INTEGER, enabled BOOLEAN,
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	FOREIGN KEY(forisystemid) REFERENCES i_system (id) ON DELETE CASCADE
+);
+CREATE TABLE i_pv (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	pv_state VARCHAR(13),
+	pv_type VARCHAR(9),
+	disk_or_part_uuid VARCHAR,
+	disk_or_part_device_node VARCHAR(64),
+	lvm_pv_name VARCHAR(64),
+	lvm_vg_name VARCHAR(64),
+	lvm_pv_uuid VARCHAR(64),
+	lvm_pv_size BIGINT,
+	lvm_pe_total INTEGER,
+	lvm_pe_alloced INTEGER,
+	capabilities TEXT,
+	forihostid INTEGER,
+	forilvgid INTEGER,
+	disk_or_part_device_path VARCHAR(255),
+	PRIMARY KEY (id),
+	FOREIGN KEY(forihostid) REFERENCES i_host (id) ON DELETE CASCADE,
+	FOREIGN KEY(forilvgid) REFERENCES i_lvg (id) ON DELETE CASCADE,
+	UNIQUE (uuid),
+	CHECK (pv_state IN ('unprovisioned', 'adding', 'provisioned', 'removing', 'reserve1', 'reserve2')),
+	CHECK (pv_type IN ('disk', 'partition', 'reserve1', 'reserve2'))
+);
+CREATE TABLE i_sensorgroups (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	host_id INTEGER,
+	sensorgroupname VARCHAR(255),
+	path VARCHAR(255),
+	datatype VARCHAR(255),
+	sensortype VARCHAR(255),
+	description VARCHAR(255),
+	state VARCHAR(255),
+	possible_states VARCHAR(255),
+	audit_interval_group INTEGER,
+	record_ttl INTEGER,
+	algorithm VARCHAR(255),
+	actions_critical_choices VARCHAR(255),
+	actions_major_choices VARCHAR(255),
+	actions_minor_choices VARCHAR(255),
+	actions_minor_group VARCHAR(255),
+	actions_major_group VARCHAR(255),
+	actions_critical_group VARCHAR(255),
+	suppress BOOLEAN,
+	capabilities TEXT,
+	PRIMARY KEY (id),
+	CONSTRAINT u_sensorgroupname_path_hostid UNIQUE (sensorgroupname, path, host_id),
+	UNIQUE (uuid),
+	FOREIGN KEY(host_id) REFERENCES i_host (id) ON DELETE CASCADE,
+	CHECK (suppress IN (0, 1))
+);
+CREATE TABLE i_sensorgroups_analog (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	unit_base_group VARCHAR(255),
+	unit_modifier_group VARCHAR(255),
+	unit_rate_group VARCHAR(255),
+	t_minor_lower_group VARCHAR(255),
+	t_minor_upper_group VARCHAR(255),
+	t_major_lower_group VARCHAR(255),
+	t_major_upper_group VARCHAR(255),
+	t_critical_lower_group VARCHAR(255),
+	t_critical_upper_group VARCHAR(255),
+	PRIMARY KEY (id),
+	FOREIGN KEY(id) REFERENCES i_sensorgroups (id) ON DELETE CASCADE
+);
+CREATE TABLE i_sensorgroups_discrete (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(id) REFERENCES i_sensorgroups (id) ON DELETE CASCADE
+);
+CREATE TABLE i_sensors (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	host_id INTEGER,
+	sensorgroup_id INTEGER,
+	sensorname VARCHAR(255),
+	path VARCHAR(255),
+	datatype VARCHAR(255),
+	sensortype VARCHAR(255),
+	status VARCHAR(255),
+	state VARCHAR(255),
+	state_requested VARCHAR(255),
+	sensor_action_requested VARCHAR(255),
+	audit_interval INTEGER,
+	algorithm VARCHAR(255),
+	actions_minor VARCHAR(255),
+	actions_major VARCHAR(255),
+	actions_critical VARCHAR(255),
+	suppress BOOLEAN,
+	capabilities TEXT,
+	PRIMARY KEY (id),
+	CONSTRAINT u_sensorname_path_host_id UNIQUE (sensorname, path, host_id),
+	UNIQUE (uuid),
+	FOREIGN KEY(host_id) REFERENCES i_host (id) ON DELETE CASCADE,
+	FOREIGN KEY(sensorgroup_id) REFERENCES i_sensorgroups (id) ON DELETE SET NULL,
+	CHECK (suppress IN (0, 1))
+);
+CREATE TABLE i_sensors_analog (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	unit_base VARCHAR(255),
+	unit_modifier VARCHAR(255),
+	unit_rate VARCHAR(255),
+	t_minor_lower VARCHAR(255),
+	t_minor_upper VARCHAR(255),
+	t_major_lower VARCHAR(255),
+	t_major_upper VARCHAR(255),
+	t_critical_lower VARCHAR(255),
+	t_critical_upper VARCHAR(255),
+	PRIMARY KEY (id),
+	FOREIGN KEY(id) REFERENCES i_sensors (id) ON DELETE CASCADE
+);
+CREATE TABLE i_sensors_discrete (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(id) REFERENCES i_sensors (id) ON DELETE CASCADE
+);
+CREATE TABLE i_service (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	servicename VARCHAR(255),
+	hostname VARCHAR(255),
+	forihostid INTEGER,
+	activity VARCHAR,
+	state VARCHAR,
+	reason TEXT,
+	PRIMARY KEY (id),
+	CONSTRAINT u_servicehost UNIQUE (servicename, hostname),
+	UNIQUE (uuid),
+	FOREIGN KEY(forihostid) REFERENCES i_host (id) ON DELETE CASCADE
+);
+CREATE TABLE i_system (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	name VARCHAR(255),
+	description VARCHAR(255),
+	capabilities TEXT,
+	contact VARCHAR(255),
+	location VARCHAR(255),
+	services INTEGER,
+	software_version VARCHAR(255), system_type VARCHAR(255), system_mode VARCHAR(255), timezone VARCHAR(255), security_profile VARCHAR(255), region_name TEXT, service_project_name TEXT, distributed_cloud_role VARCHAR(255), security_feature VARCHAR(255),
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	UNIQUE (name),
+	UNIQUE (description)
+);
+CREATE TABLE i_trap_destination (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	ip_address VARCHAR(40),
+	community VARCHAR(255),
+	port INTEGER,
+	type VARCHAR(12),
+	transport VARCHAR(8),
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	CONSTRAINT "snmpVersionEnum" CHECK (type IN ('snmpv2c_trap', 'reserve1', 'reserve2')),
+	CONSTRAINT "snmpTransportType" CHECK (transport IN ('udp', 'reserve1', 'reserve2'))
+);
+CREATE TABLE i_user (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	root_sig VARCHAR(255),
+	reserved_1 VARCHAR(255),
+	reserved_2 VARCHAR(255),
+	reserved_3 VARCHAR(255),
+	forisystemid INTEGER, passwd_hash VARCHAR(255), passwd_expiry_days INTEGER,
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	FOREIGN KEY(forisystemid) REFERENCES i_system (id) ON DELETE CASCADE
+);
+CREATE TABLE interface_datanetworks (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	interface_id INTEGER,
+	datanetwork_id INTEGER,
+	PRIMARY KEY (id),
+	CONSTRAINT "u_interface_id@datanetwork_id" UNIQUE (interface_id, datanetwork_id),
+	UNIQUE (uuid),
+	FOREIGN KEY(interface_id) REFERENCES interfaces (id) ON DELETE CASCADE,
+	FOREIGN KEY(datanetwork_id) REFERENCES datanetworks (id) ON DELETE CASCADE
+);
+CREATE TABLE interface_networks (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	interface_id INTEGER,
+	network_id INTEGER,
+	PRIMARY KEY (id),
+	CONSTRAINT "u_interface_id@network_id" UNIQUE (interface_id, network_id),
+	UNIQUE (uuid),
+	FOREIGN KEY(interface_id) REFERENCES interfaces (id) ON DELETE CASCADE,
+	FOREIGN KEY(network_id) REFERENCES networks (id) ON DELETE CASCADE
+);
+CREATE TABLE interfaces (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	forihostid INTEGER,
+	iftype VARCHAR(255),
+	ifname VARCHAR(255),
+	networktype VARCHAR(255),
+	sriov_numvfs INTEGER,
+	ifcapabilities TEXT,
+	farend TEXT, ifclass VARCHAR(255),
+	PRIMARY KEY (id),
+	CONSTRAINT u_interfacenameihost UNIQUE (ifname, forihostid),
+	UNIQUE (uuid),
+	FOREIGN KEY(forihostid) REFERENCES i_host (id) ON DELETE CASCADE
+);
+CREATE TABLE interfaces_to_interfaces (
+	used_by_id INTEGER NOT NULL,
+	uses_id INTEGER NOT NULL,
+	PRIMARY KEY (used_by_id, uses_id),
+	FOREIGN KEY(used_by_id) REFERENCES interfaces (id) ON DELETE CASCADE,
+	FOREIGN KEY(uses_id) REFERENCES interfaces (id) ON DELETE CASCADE
+);
+CREATE TABLE journal (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	device_path VARCHAR(255),
+	size_mib INTEGER,
+	onistor_uuid VARCHAR(36),
+	foristorid INTEGER,
+	PRIMARY KEY (id),
+	FOREIGN KEY(foristorid) REFERENCES i_istor (id) ON DELETE CASCADE,
+	UNIQUE (uuid),
+	UNIQUE (foristorid)
+);
+CREATE TABLE kube_app (
+	created_at DATETIME,
+	updated_at DATETIME,
+	id INTEGER NOT NULL,
+	name VARCHAR(255) NOT NULL,
+	manifest_name VARCHAR(255) NOT NULL,
+	manifest_file VARCHAR(255),
+	status VARCHAR(255) NOT NULL,
+	progress VARCHAR(255),
+	PRIMARY KEY (id),
+	UNIQUE (name)
+);
+CREATE TABLE label (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	host_id INTEGER,
+	label_key VARCHAR(384),
+	label_value VARCHAR(128),
+	PRIMARY KEY (id),
+	CONSTRAINT "u_host_id@label_key" UNIQUE (host_id, label_key),
+	UNIQUE (uuid),
+	FOREIGN KEY(host_id) REFERENCES i_host (id) ON DELETE CASCADE
+);
+CREATE TABLE lldp_agents (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	host_id INTEGER,
+	port_id INTEGER,
+	status VARCHAR(255),
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	FOREIGN KEY(host_id) REFERENCES i_host (id) ON DELETE CASCADE,
+	FOREIGN KEY(port_id) REFERENCES ports (id) ON DELETE CASCADE
+);
+CREATE TABLE lldp_neighbours (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	host_id INTEGER,
+	port_id INTEGER,
+	msap VARCHAR(511) NOT NULL,
+	PRIMARY KEY (id),
+	CONSTRAINT u_msap_port_id UNIQUE (msap, port_id),
+	UNIQUE (uuid),
+	FOREIGN KEY(host_id) REFERENCES i_host (id) ON DELETE CASCADE,
+	FOREIGN KEY(port_id) REFERENCES ports (id) ON DELETE CASCADE
+);
+CREATE TABLE lldp_tlvs (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	agent_id INTEGER,
+	neighbour_id INTEGER,
+	type VARCHAR(255),
+	value VARCHAR(255),
+	PRIMARY KEY (id),
+	FOREIGN KEY(agent_id) REFERENCES lldp_agents (id) ON DELETE CASCADE,
+	FOREIGN KEY(neighbour_id) REFERENCES lldp_neighbours (id) ON DELETE CASCADE
+);
+CREATE TABLE loads (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	state VARCHAR(255),
+	software_version VARCHAR(255),
+	compatible_version VARCHAR(255),
+	required_patches VARCHAR(2047),
+	PRIMARY KEY (id),
+	UNIQUE (software_version)
+);
+CREATE TABLE networks (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	type VARCHAR(255),
+	dynamic BOOLEAN NOT NULL,
+	address_pool_id INTEGER NOT NULL,
+	name VARCHAR(255),
+	PRIMARY KEY (id),
+	CHECK (dynamic IN (0, 1)),
+	FOREIGN KEY(address_pool_id) REFERENCES address_pools (id) ON DELETE CASCADE,
+	UNIQUE (uuid),
+	UNIQUE (type),
+	CHECK (dynamic IN (0, 1))
+);
+CREATE TABLE partition (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	start_mib INTEGER,
+	end_mib INTEGER,
+	size_mib INTEGER,
+	device_path VARCHAR(255),
+	type_guid VARCHAR(36),
+	type_name VARCHAR(64),
+	idisk_id INTEGER,
+	idisk_uuid VARCHAR(36),
+	capabilities TEXT,
+	status INTEGER,
+	foripvid INTEGER,
+	forihostid INTEGER,
+	device_node VARCHAR(64),
+	PRIMARY KEY (id),
+	FOREIGN KEY(idisk_id) REFERENCES i_idisk (id) ON DELETE CASCADE,
+	FOREIGN KEY(foripvid) REFERENCES i_pv (id),
+	FOREIGN KEY(forihostid) REFERENCES i_host (id),
+	UNIQUE (uuid),
+	CONSTRAINT u_partition_path_host_id UNIQUE (device_path, forihostid)
+);
+CREATE TABLE pci_devices (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(255),
+	host_id INTEGER,
+	name VARCHAR(255),
+	pciaddr VARCHAR(255),
+	pclass_id VARCHAR(6),
+	pvendor_id VARCHAR(4),
+	pdevice_id VARCHAR(4),
+	pclass VARCHAR(255),
+	pvendor VARCHAR(255),
+	pdevice VARCHAR(255),
+	psvendor VARCHAR(255),
+	psdevice VARCHAR(255),
+	numa_node INTEGER,
+	driver VARCHAR(255),
+	sriov_totalvfs INTEGER,
+	sriov_numvfs INTEGER,
+	sriov_vfs_pci_address VARCHAR(1020),
+	enabled BOOLEAN,
+	extra_info TEXT,
+	PRIMARY KEY (id),
+	FOREIGN KEY(host_id) REFERENCES i_host (id) ON DELETE CASCADE,
+	CHECK (enabled IN (0, 1))
+);
+CREATE TABLE peers (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(255),
+	name VARCHAR(255),
+	status VARCHAR(255),
+	info TEXT,
+	capabilities TEXT,
+	cluster_id INTEGER,
+	PRIMARY KEY (id),
+	CONSTRAINT "u_name@cluster" UNIQUE (name, cluster_id),
+	FOREIGN KEY(cluster_id) REFERENCES clusters (id) ON DELETE CASCADE
+);
+CREATE TABLE ports (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	host_id INTEGER,
+	node_id INTEGER,
+	interface_id INTEGER,
+	type VARCHAR(255),
+	name VARCHAR(255),
+	namedisplay VARCHAR(255),
+	pciaddr VARCHAR(255),
+	dev_id INTEGER,
+	sriov_totalvfs INTEGER,
+	sriov_numvfs INTEGER,
+	sriov_vfs_pci_address VARCHAR(1020),
+	driver VARCHAR(255),
+	pclass VARCHAR(255),
+	pvendor VARCHAR(255),
+	pdevice VARCHAR(255),
+	psvendor VARCHAR(255),
+	psdevice VARCHAR(255),
+	dpdksupport BOOLEAN,
+	numa_node INTEGER,
+	capabilities TEXT,
+	PRIMARY KEY (id),
+	CONSTRAINT u_pciaddr_dev_host_id UNIQUE (pciaddr, dev_id, host_id),
+	UNIQUE (uuid),
+	FOREIGN KEY(host_id) REFERENCES i_host (id) ON DELETE CASCADE,
+	FOREIGN KEY(node_id) REFERENCES i_node (id) ON DELETE SET NULL,
+	FOREIGN KEY(interface_id) REFERENCES interfaces (id) ON DELETE SET NULL,
+	CHECK (dpdksupport IN (0, 1))
+);
+CREATE TABLE ptp (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	enabled BOOLEAN,
+	mode VARCHAR(16),
+	transport VARCHAR(4),
+	mechanism VARCHAR(4),
+	system_id INTEGER,
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	CHECK (enabled IN (0, 1)),
+	FOREIGN KEY(system_id) REFERENCES i_system (id) ON DELETE CASCADE
+);
+CREATE TABLE remotelogging (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	enabled BOOLEAN,
+	transport VARCHAR(3),
+	ip_address VARCHAR(50),
+	port INTEGER,
+	key_file VARCHAR(255),
+	system_id INTEGER,
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	CHECK (enabled IN (0, 1)),
+	CONSTRAINT "logTransportEnum" CHECK (transport IN ('udp', 'tcp', 'tls')),
+	FOREIGN KEY(system_id) REFERENCES i_system (id) ON DELETE CASCADE
+);
+CREATE TABLE routes (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	family INTEGER NOT NULL,
+	network VARCHAR(50) NOT NULL,
+	prefix INTEGER NOT NULL,
+	gateway VARCHAR(50) NOT NULL,
+	metric INTEGER NOT NULL,
+	interface_id INTEGER NOT NULL,
+	PRIMARY KEY (id),
+	CONSTRAINT "u_family@network@prefix@gateway@host" UNIQUE (family, network, prefix, gateway, interface_id),
+	UNIQUE (uuid),
+	FOREIGN KEY(interface_id) REFERENCES interfaces (id) ON DELETE CASCADE
+);
+CREATE TABLE runtime_config (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	forihostid INTEGER,
+	request_id VARCHAR(36),
+	config_uuid VARCHAR(36),
+	classes TEXT,
+	state VARCHAR(255),
+	duration FLOAT,
+	error TEXT,
+	PRIMARY KEY (id),
+	CONSTRAINT "u_forihostid@request_id" UNIQUE (forihostid, request_id),
+	UNIQUE (uuid),
+	FOREIGN KEY(forihostid) REFERENCES i_host (id) ON DELETE CASCADE
+);
+CREATE TABLE sdn_controller (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	ip_address VARCHAR(255),
+	port INTEGER,
+	transport VARCHAR(255),
+	state VARCHAR(255),
+	PRIMARY KEY (id),
+	UNIQUE (uuid)
+);
+CREATE TABLE service_parameter (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	service VARCHAR(8),
+	section VARCHAR(255),
+	name VARCHAR(255),
+	value VARCHAR(255),
+	personality VARCHAR(255),
+	resource VARCHAR(255),
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	CHECK (service IN ('identity')),
+	CONSTRAINT u_service_section_name_personality_resource UNIQUE (service, section, name, personality, resource)
+);
+CREATE TABLE services (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	name VARCHAR(255) NOT NULL,
+	enabled BOOLEAN, region_name TEXT, capabilities TEXT,
+	PRIMARY KEY (id),
+	CHECK (enabled IN (0, 1))
+);
+CREATE TABLE software_upgrade (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	state VARCHAR(128) NOT NULL,
+	from_load INTEGER NOT NULL,
+	to_load INTEGER NOT NULL,
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	FOREIGN KEY(from_load) REFERENCES loads (id) ON DELETE CASCADE,
+	FOREIGN KEY(to_load) REFERENCES loads (id) ON DELETE CASCADE
+);
+CREATE TABLE storage_backend (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	backend VARCHAR(255),
+	state VARCHAR(255),
+	task VARCHAR(255),
+	forisystemid INTEGER, services TEXT, capabilities TEXT, name VARCHAR(255),
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	FOREIGN KEY(forisystemid) REFERENCES i_system (id) ON DELETE CASCADE
+);
+CREATE TABLE storage_ceph (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	cinder_pool_gib INTEGER,
+	glance_pool_gib INTEGER,
+	ephemeral_pool_gib INTEGER,
+	object_pool_gib INTEGER,
+	object_gateway BOOLEAN,
+	tier_id INTEGER, kube_pool_gib INTEGER,
+	PRIMARY KEY (id),
+	CHECK (object_gateway IN (0, 1)),
+	FOREIGN KEY(id) REFERENCES storage_backend (id) ON DELETE CASCADE,
+	UNIQUE (id),
+	CHECK (object_gateway IN (0, 1)),
+	FOREIGN KEY(tier_id) REFERENCES storage_tiers (id)
+);
+CREATE TABLE storage_ceph_external (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	ceph_conf VARCHAR(255),
+	PRIMARY KEY (id),
+	UNIQUE (id),
+	FOREIGN KEY(id) REFERENCES storage_backend (id) ON DELETE CASCADE
+);
+CREATE TABLE storage_external (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	PRIMARY KEY (id),
+	UNIQUE (id),
+	FOREIGN KEY(id) REFERENCES storage_backend (id) ON DELETE CASCADE
+);
+CREATE TABLE storage_file (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	PRIMARY KEY (id),
+	UNIQUE (id),
+	FOREIGN KEY(id) REFERENCES storage_backend (id) ON DELETE CASCADE
+);
+CREATE TABLE storage_lvm (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(id) REFERENCES storage_backend (id) ON DELETE CASCADE,
+	UNIQUE (id)
+);
+CREATE TABLE storage_tiers (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	name VARCHAR(255),
+	type VARCHAR(64),
+	status VARCHAR(64),
+	capabilities TEXT,
+	forbackendid INTEGER,
+	forclusterid INTEGER,
+	PRIMARY KEY (id),
+	FOREIGN KEY(forbackendid) REFERENCES storage_backend (id),
+	FOREIGN KEY(forclusterid) REFERENCES clusters (id)
+);
+CREATE TABLE tpmconfig (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	tpm_path VARCHAR(255),
+	PRIMARY KEY (id),
+	UNIQUE (uuid)
+);
+CREATE TABLE tpmdevice (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	uuid VARCHAR(36),
+	state VARCHAR(255),
+	host_id INTEGER, binary BLOB, tpm_data TEXT, capabilities TEXT,
+	PRIMARY KEY (id),
+	UNIQUE (uuid),
+	FOREIGN KEY(host_id) REFERENCES i_host (id) ON DELETE CASCADE
+);
+CREATE TABLE virtual_interfaces (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	imac VARCHAR(255),
+	imtu INTEGER,
+	PRIMARY KEY (id),
+	FOREIGN KEY(id) REFERENCES interfaces (id) ON DELETE CASCADE
+);
+CREATE TABLE vlan_interfaces (
+	created_at DATETIME,
+	updated_at DATETIME,
+	deleted_at DATETIME,
+	id INTEGER NOT NULL,
+	vlan_id VARCHAR(255),
+	vlan_type VARCHAR(255),
+	imac VARCHAR(255),
+	imtu INTEGER,
+	PRIMARY KEY (id),
+	FOREIGN KEY(id) REFERENCES interfaces (id) ON DELETE CASCADE
+);
+CREATE UNIQUE INDEX ix_i_trap_destination_ip_address ON i_trap_destination (ip_address);
+CREATE UNIQUE INDEX ix_i_community_community ON i_community (community);
+CREATE INDEX ix_i_alarm_history_alarm_id ON i_alarm_history (alarm_id);
+CREATE INDEX ix_i_alarm_history_alarm_type ON i_alarm_history (alarm_type);
+CREATE INDEX ix_i_alarm_history_entity_type_id ON i_alarm_history (entity_type_id);
+CREATE INDEX ix_i_alarm_history_severity ON i_alarm_history (severity);
+CREATE INDEX ix_i_alarm_history_entity_instance_id ON i_alarm_history (entity_instance_id);
+CREATE UNIQUE INDEX ix_i_alarm_history_uuid ON i_alarm_history (uuid);
+CREATE INDEX ix_i_customer_log_log_type ON i_customer_log (log_type);
+CREATE INDEX ix_i_customer_log_entity_instance_id ON i_customer_log (entity_instance_id);
+CREATE INDEX ix_i_customer_log_severity ON i_customer_log (severity);
+CREATE UNIQUE INDEX ix_i_customer_log_uuid ON i_customer_log (uuid);
+CREATE INDEX ix_i_customer_log_log_id ON i_customer_log (log_id);
+CREATE INDEX ix_i_customer_log_entity_type_id ON i_customer_log (entity_type_id);
+CREATE UNIQUE INDEX ix_pci_devices_uuid ON pci_devices (uuid);
+CREATE UNIQUE INDEX ix_clusters_cluster_uuid ON clusters (cluster_uuid);
+CREATE UNIQUE INDEX ix_clusters_uuid ON clusters (uuid);
+CREATE UNIQUE INDEX ix_clusters_name ON clusters (name);
+CREATE UNIQUE INDEX ix_peers_uuid ON peers (uuid);
+CREATE INDEX ix_peers_name ON peers (name);
+CREATE UNIQUE INDEX ix_i_host_hostname ON i_host (hostname);
+CREATE UNIQUE INDEX ix_remotelogging_ip_address ON remotelogging (ip_address);
+CREATE UNIQUE INDEX ix_storage_tiers_uuid ON storage_tiers (uuid);
+CREATE UNIQUE INDEX ix_storage_tiers_name ON storage_tiers (name);
+CREATE UNIQUE INDEX ix_storage_ceph_external_ceph_conf ON storage_ceph_external (ceph_conf);
+CREATE INDEX ix_i_node_forihostid ON i_node (forihostid);
+CREATE INDEX ix_i_icpu_forihostid ON i_icpu (forihostid);
+CREATE INDEX ix_i_icpu_forinodeid ON i_icpu (forinodeid);
+CREATE INDEX ix_i_imemory_forihostid ON i_imemory (forihostid);
+CREATE INDEX ix_i_imemory_forinodeid ON i_imemory (forinodeid);
+CREATE INDEX ix_interfaces_forihostid ON interfaces (forihostid);
+CREATE INDEX ix_ports_host_id ON ports (host_id);
+CREATE INDEX ix_ports_interface_id ON ports (interface_id);
+CREATE INDEX ix_i_idisk_forihostid ON i_idisk (forihostid);
+CREATE INDEX ix_i_idisk_foripvid ON i_idisk (foripvid);
+CREATE INDEX ix_i_istor_forihostid ON i_istor (forihostid);
+CREATE INDEX ix_i_istor_idisk_uuid ON i_istor (idisk_uuid);
+CREATE INDEX ix_i_lvg_forihostid ON i_lvg (forihostid);
+CREATE INDEX ix_i_lvg_vg_state ON i_lvg (vg_state);
+CREATE INDEX ix_i_pv_forihostid ON i_pv (forihostid);
+CREATE INDEX ix_i_pv_forilvgid ON i_pv (forilvgid);
+CREATE INDEX ix_i_pv_pv_state ON i_pv (pv_state);
+CREATE INDEX ix_partition_forihostid ON partition (forihostid);
+CREATE INDEX ix_partition_idisk_uuid ON partition (idisk_uuid);
+CREATE INDEX ix_partition_foripvid ON partition (foripvid);
+CREATE INDEX ix_partition_status ON partition (status);
+CREATE INDEX ix_ceph_mon_forihostid ON ceph_mon (forihostid);
+CREATE INDEX ix_routes_interface_id ON routes (interface_id);
+CREATE INDEX ix_addresses_interface_id ON addresses (interface_id);
+CREATE INDEX ix_address_modes_interface_id ON address_modes (interface_id);
+CREATE INDEX ix_interface_networks_interface_id ON interface_networks (interface_id);
+CREATE INDEX ix_interface_datanetworks_interface_id ON interface_datanetworks (interface_id);
+CREATE INDEX ix_i_sensorgroups_host_id ON i_sensorgroups (host_id);
+CREATE INDEX ix_i_sensors_host_id ON i_sensors (host_id);
+CREATE INDEX ix_pci_devices_host_id ON pci_devices (host_id);
+CREATE INDEX ix_lldp_agents_host_id ON lldp_agents (host_id);
+CREATE INDEX ix_lldp_agents_port_id ON lldp_agents (port_id);
+CREATE INDEX ix_lldp_neighbours_host_id ON lldp_neighbours (host_id);
+CREATE INDEX ix_lldp_neighbours_port_id ON lldp_neighbours (port_id);
+CREATE INDEX ix_label_host_id ON label (host_id);
+CREATE INDEX ix_runtime_config_forihostid ON runtime_config (forihostid);
+COMMIT;
@@ -0,0 +1,62 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from sqlalchemy import Index, MetaData, Table
+
+ENGINE = 'InnoDB'
+CHARSET = 'utf8'
+
+# Columns used by the per host inventory queries (*_get_by_ihost) and by the
+# agent/conductor audits.  PostgreSQL does not index foreign keys on its own,
+# so without these every lookup is a sequential scan.  The index names follow
+# the sqlalchemy convention used for index=True columns in models.py.
+INDEXES = {
+    'i_node': ['forihostid'],
+    'i_icpu': ['forihostid', 'forinodeid'],
+    'i_imemory': ['forihostid', 'forinodeid'],
+    'interfaces': ['forihostid'],
+    'ports': ['host_id', 'interface_id'],
+    'i_idisk': ['forihostid', 'foripvid'],
+    'i_istor': ['forihostid', 'idisk_uuid'],
+    'i_lvg': ['forihostid', 'vg_state'],
+    'i_pv': ['forihostid', 'forilvgid', 'pv_state'],
+    'partition': ['forihostid', 'idisk_uuid', 'foripvid', 'status'],
+    'ceph_mon': ['forihostid'],
+    'routes': ['interface_id'],
+    'addresses': ['interface_id'],
+    'address_modes': ['interface_id'],
+    'interface_networks': ['interface_id'],
+    'interface_datanetworks': ['interface_id'],
+    'i_sensorgroups': ['host_id'],
+    'i_sensors': ['host_id'],
+    'pci_devices': ['host_id'],
+    'lldp_agents': ['host_id', 'port_id'],
+    'lldp_neighbours': ['host_id', 'port_id'],
+    'label': ['host_id'],
+}
+
+
+def _index_name(table_name, column_name):
+    return 'ix_%s_%s' % (table_name, column_name)
+
+
+def upgrade(migrate_engine):
+    meta = MetaData()
+    meta.bind = migrate_engine
+
+    for table_name, columns in INDEXES.items():
+        table = Table(table_name, meta, autoload=True)
+        for column_name in columns:
+            index = Index(_index_name(table_name, column_name),
+                          table.c[column_name])
+            index.create(migrate_engine)
+
+
+def downgrade(migrate_engine):
+    # As per other openstack components, downgrade is
+    # unsupported in this release.
+    raise NotImplementedError('SysInv database downgrade is unsupported.')
@@ -0,0 +1,61 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from sqlalchemy import Column, MetaData, Table
+from sqlalchemy import DateTime, Float, Integer, String, Text
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
+from sysinv.openstack.common import log
+
+ENGINE = 'InnoDB'
+CHARSET = 'utf8'
+LOG = log.getLogger(__name__)
+
+
+def upgrade(migrate_engine):
+    """Perform sysinv database upgrade for runtime manifest apply records
+    """
+
+    meta = MetaData()
+    meta.bind = migrate_engine
+
+    Table('i_host', meta, autoload=True)
+
+    runtime_config = Table(
+        'runtime_config',
+        meta,
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime),
+        Column('deleted_at', DateTime),
+
+        Column('id', Integer, primary_key=True, nullable=False),
+        Column('uuid', String(36), unique=True),
+
+        Column('forihostid', Integer, ForeignKey('i_host.id',
+                                                 ondelete='CASCADE')),
+
+        Column('request_id', String(36)),
+        Column('config_uuid', String(36)),
+        Column('classes', Text),
+        Column('state', String(255)),
+        Column('duration', Float),
+        Column('error', Text),
+        UniqueConstraint('forihostid', 'request_id',
+                         name='u_forihostid@request_id'),
+
+        mysql_engine=ENGINE,
+        mysql_charset=CHARSET,
+    )
+    runtime_config.create()
+
+    Index('ix_runtime_config_forihostid',
+          runtime_config.c.forihostid).create()
+
+
+def downgrade(migrate_engine):
+    # As per other openstack components, downgrade is
+    # unsupported in this release.
+    raise NotImplementedError('SysInv database downgrade is unsupported.')
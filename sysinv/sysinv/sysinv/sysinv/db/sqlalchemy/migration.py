@@ -18,6 +18,7 @@
 
 import distutils.version as dist_version
 import os
+import re
 
 import migrate
 from migrate.versioning import util as migrate_util
@@ -56,9 +57,13 @@ if (not hasattr(migrate, '__version__') or
 from migrate import exceptions as versioning_exceptions
 from migrate.versioning import api as versioning_api
 from migrate.versioning.repository import Repository
+from migrate.versioning.schema import ControlledSchema
 
 _REPOSITORY = None
 
+# First line of a baseline, the version of the schema it creates
+BASELINE_HEADER = '-- sysinv baseline schema version %d\n'
+
 get_engine = enginefacade.get_legacy_facade().get_engine
 
 
@@ -71,6 +76,8 @@ def db_sync(version=None):
 
     current_version = db_version()
     repository = _find_migrate_repo()
+    if version is None and current_version == migration.INIT_VERSION:
+        current_version = _load_baseline(repository)
     if version is None or version > current_version:
         return versioning_api.upgrade(get_engine(), repository, version)
     else:
@@ -103,6 +110,64 @@ def db_version_control(version=None):
     return version
 
 
+def get_baseline_path(dialect):
+    """Get the path of the baseline schema of a database dialect."""
+    return os.path.join(os.path.abspath(os.path.dirname(__file__)),
+                        'migrate_repo', 'baseline', dialect + '.sql')
+
+
+def _read_baseline(dialect):
+    """Returns the version and the SQL of the baseline of a dialect."""
+    path = get_baseline_path(dialect)
+    if not os.path.exists(path):
+        return None, None
+    with open(path) as f:
+        header = f.readline()
+        sql = f.read()
+    match = re.match(BASELINE_HEADER.replace('%d', r'(\d+)'), header)
+    if not match:
+        raise exception.SysinvException(
+            _("Invalid baseline schema %s") % path)
+    return int(match.group(1)), sql
+
+
+def _load_baseline(repository):
+    """Create the schema of an empty database from the baseline.
+
+    A fresh install creates the schema in one step instead of walking all
+    the migrations, the migrations after the baseline still run.  Returns
+    the version of the database.
+    """
+    engine = get_engine()
+    version, sql = _read_baseline(engine.name)
+    if sql is None or version > int(repository.latest):
+        return migration.INIT_VERSION
+
+    meta = sqlalchemy.MetaData()
+    meta.reflect(bind=engine)
+    if set(meta.tables) - set([repository.version_table]):
+        return migration.INIT_VERSION
+
+    connection = engine.raw_connection()
+    try:
+        if engine.name == 'sqlite':
+            connection.executescript(sql)
+        else:
+            cursor = connection.cursor()
+            cursor.execute(sql)
+            cursor.close()
+            connection.commit()
+    finally:
+        connection.close()
+    if engine.name != 'sqlite':
+        # The baseline may change the settings of its connection
+        engine.dispose()
+
+    ControlledSchema(engine, repository).update_repository_table(
+        migration.INIT_VERSION, version)
+    return version
+
+
 def _find_migrate_repo():
     """Get the path for the migrate repository."""
     global _REPOSITORY
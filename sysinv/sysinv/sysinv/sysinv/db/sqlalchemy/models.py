@@ -250,7 +250,8 @@ class inode(Base):
     numa_node = Column(Integer)
     capabilities = Column(JSONEncodedDict)
 
-    forihostid = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'))
+    forihostid = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'),
+                        index=True)
 
     host = relationship("ihost", backref="nodes", lazy="joined", join_depth=1)
 
@@ -274,8 +275,10 @@ class icpu(Base):
     # coprocessors = Column(JSONEncodedDict)
     # JSONEncodedDict e.g. {'Crypto':'CaveCreek'}
     capabilities = Column(JSONEncodedDict)
-    forihostid = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'))
-    forinodeid = Column(Integer, ForeignKey('i_node.id', ondelete='CASCADE'))
+    forihostid = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'),
+                        index=True)
+    forinodeid = Column(Integer, ForeignKey('i_node.id', ondelete='CASCADE'),
+                        index=True)
 
     host = relationship("ihost", backref="cpus", lazy="joined", join_depth=1)
     node = relationship("inode", backref="cpus", lazy="joined", join_depth=1)
@@ -314,8 +317,9 @@ class imemory(Base):
     vm_hugepages_possible_1G = Column(Integer)
     capabilities = Column(JSONEncodedDict)
 
-    forihostid = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'))
-    forinodeid = Column(Integer, ForeignKey('i_node.id'))
+    forihostid = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'),
+                        index=True)
+    forinodeid = Column(Integer, ForeignKey('i_node.id'), index=True)
 
     host = relationship("ihost", backref="memory", lazy="joined", join_depth=1)
     node = relationship("inode", backref="memory", lazy="joined", join_depth=1)
@@ -334,7 +338,8 @@ class Interfaces(Base):
 
     id = Column(Integer, primary_key=True, nullable=False)
     uuid = Column(String(36))
-    forihostid = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'))
+    forihostid = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'),
+                        index=True)
     iftype = Column(String(255))
 
     ifname = Column(String(255))
@@ -431,10 +436,12 @@ class Ports(Base):
 
     id = Column(Integer, primary_key=True, nullable=False)
     uuid = Column(String(36))
-    host_id = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'))
+    host_id = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'),
+                     index=True)
     node_id = Column(Integer, ForeignKey('i_node.id'))
     # might need to be changed to relationship/backref with interface table
-    interface_id = Column(Integer, ForeignKey('interfaces.id', ondelete='SET NULL'))
+    interface_id = Column(Integer, ForeignKey('interfaces.id', ondelete='SET NULL'),
+                          index=True)
     type = Column(String(255))
 
     name = Column(String(255))
@@ -527,7 +534,7 @@ class ilvg(Base):
 
     id = Column(Integer, primary_key=True, nullable=False)
     uuid = Column(String(36), unique=True)
-    vg_state = Column(vgStateEnum, default="unprovisioned")
+    vg_state = Column(vgStateEnum, default="unprovisioned", index=True)
 
     # VG Data from vgdisplay/vgs
     lvm_vg_name = Column(String(64))
@@ -545,7 +552,7 @@ class ilvg(Base):
     capabilities = Column(JSONEncodedDict)
 
     forihostid = Column(Integer, ForeignKey('i_host.id',
-                                            ondelete='CASCADE'))
+                                            ondelete='CASCADE'), index=True)
 
     host = relationship("ihost", backref="lvgs", lazy="joined", join_depth=1)
 
@@ -563,7 +570,7 @@ class ipv(Base):
 
     id = Column(Integer, primary_key=True, nullable=False)
     uuid = Column(String(36), unique=True)
-    pv_state = Column(String(32), default="unprovisioned")
+    pv_state = Column(String(32), default="unprovisioned", index=True)
 
     # Physical volume is a full disk or disk partition
     pv_type = Column(pvTypeEnum, default="disk")
@@ -585,10 +592,10 @@ class ipv(Base):
     capabilities = Column(JSONEncodedDict)
 
     forihostid = Column(Integer, ForeignKey('i_host.id',
-                                            ondelete='CASCADE'))
+                                            ondelete='CASCADE'), index=True)
 
     forilvgid = Column(Integer, ForeignKey('i_lvg.id',
-                                            ondelete='CASCADE'))
+                                            ondelete='CASCADE'), index=True)
 
     host = relationship("ihost", backref="pvs", lazy="joined", join_depth=1)
     lvg = relationship("ilvg", backref="pv", lazy="joined", join_depth=1)
@@ -603,13 +610,14 @@ class istor(Base):
     uuid = Column(String(36))
 
     osdid = Column(Integer)
-    idisk_uuid = Column(String(255))
+    idisk_uuid = Column(String(255), index=True)
     state = Column(String(255))
     function = Column(String(255))
 
     capabilities = Column(JSONEncodedDict)
 
-    forihostid = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'))
+    forihostid = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'),
+                        index=True)
     host = relationship("ihost", backref="stors", lazy="joined", join_depth=1)
 
     fortierid = Column(Integer, ForeignKey('storage_tiers.id'))
@@ -642,9 +650,10 @@ class idisk(Base):
 
     capabilities = Column(JSONEncodedDict)
 
-    forihostid = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'))
+    forihostid = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'),
+                        index=True)
     foristorid = Column(Integer, ForeignKey('i_istor.id', ondelete='CASCADE'))
-    foripvid = Column(Integer, ForeignKey('i_pv.id'))
+    foripvid = Column(Integer, ForeignKey('i_pv.id'), index=True)
 
     host = relationship("ihost", backref="disks", lazy="joined", join_depth=1)
     stor = relationship("istor", lazy="joined", join_depth=1)
@@ -668,14 +677,14 @@ class partition(Base):
     type_name = Column(String(255))
 
     idisk_id = Column(Integer, ForeignKey('i_idisk.id', ondelete='CASCADE'))
-    idisk_uuid = Column(String(36))
+    idisk_uuid = Column(String(36), index=True)
 
     # capabilities not used yet: JSON{'':"", '':''}
     capabilities = Column(JSONEncodedDict)
 
-    foripvid = Column(Integer, ForeignKey('i_pv.id'))
-    forihostid = Column(Integer, ForeignKey('i_host.id'))
-    status = Column(Integer)
+    foripvid = Column(Integer, ForeignKey('i_pv.id'), index=True)
+    forihostid = Column(Integer, ForeignKey('i_host.id'), index=True)
+    status = Column(Integer, index=True)
 
     disk = relationship("idisk", lazy="joined", join_depth=1)
     pv = relationship("ipv", lazy="joined", join_depth=1)
@@ -929,7 +938,8 @@ class CephMon(Base):
     ceph_mon_gib = Column(Integer)
     state = Column(String(255))
     task = Column(String(255))
-    forihostid = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'))
+    forihostid = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'),
+                        index=True)
 
     host = relationship("ihost", lazy="joined", join_depth=1)
 
@@ -1012,7 +1022,8 @@ class Routes(Base):
     metric = Column(Integer, default=1, nullable=False)
 
     interface_id = Column(Integer,
-                          ForeignKey('interfaces.id', ondelete='CASCADE'))
+                          ForeignKey('interfaces.id', ondelete='CASCADE'),
+                          index=True)
 
     UniqueConstraint('family', 'network', 'prefix', 'gateway',
                      'interface_id',
@@ -1088,7 +1099,7 @@ class Addresses(Base):
 
     interface_id = Column(Integer,
                           ForeignKey('interfaces.id', ondelete='CASCADE'),
-                          nullable=True)
+                          nullable=True, index=True)
 
     address_pool_id = Column(Integer,
                              ForeignKey('address_pools.id',
@@ -1111,7 +1122,8 @@ class AddressModes(Base):
     mode = Column(String(32), nullable=False)
 
     interface_id = Column(Integer,
-                          ForeignKey('interfaces.id', ondelete='CASCADE'))
+                          ForeignKey('interfaces.id', ondelete='CASCADE'),
+                          index=True)
 
     address_pool_id = Column(Integer,
                              ForeignKey('address_pools.id',
@@ -1146,7 +1158,8 @@ class InterfaceNetworks(Base):
     id = Column(Integer, primary_key=True, nullable=False)
     uuid = Column(String(36), unique=True)
 
-    interface_id = Column(Integer, ForeignKey('interfaces.id', ondelete='CASCADE'))
+    interface_id = Column(Integer, ForeignKey('interfaces.id', ondelete='CASCADE'),
+                          index=True)
     network_id = Column(Integer, ForeignKey('networks.id', ondelete='CASCADE'))
 
     interface = relationship("Interfaces", lazy="joined", backref="interface_networks")
@@ -1221,7 +1234,7 @@ class InterfaceDataNetworks(Base):
     uuid = Column(String(36), unique=True)
 
     interface_id = Column(
-        Integer, ForeignKey('interfaces.id', ondelete='CASCADE'))
+        Integer, ForeignKey('interfaces.id', ondelete='CASCADE'), index=True)
     datanetwork_id = Column(
         Integer, ForeignKey('datanetworks.id', ondelete='CASCADE'))
 
@@ -1238,7 +1251,8 @@ class SensorGroups(Base):
 
     id = Column(Integer, primary_key=True, nullable=False)
     uuid = Column(String(36))
-    host_id = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'))
+    host_id = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'),
+                     index=True)
 
     sensortype = Column(String(255))
     datatype = Column(String(255))  # polymorphic
@@ -1324,7 +1338,8 @@ class Sensors(Base):
 
     id = Column(Integer, primary_key=True, nullable=False)
     uuid = Column(String(36))
-    host_id = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'))
+    host_id = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'),
+                     index=True)
 
     # might need to be changed to relationship/backref with sensorgroup table
     # a sensorgroup could have many sensors
@@ -1421,7 +1436,8 @@ class PciDevice(Base):
 
     id = Column(Integer, primary_key=True, nullable=False)
     uuid = Column(String(36))
-    host_id = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'))
+    host_id = Column(Integer, ForeignKey('i_host.id', ondelete='CASCADE'),
+                     index=True)
     name = Column(String(255))
     pciaddr = Column(String(255))
     pclass_id = Column(String(6))
@@ -1553,9 +1569,11 @@ class LldpAgents(Base):
     id = Column('id', Integer, primary_key=True, nullable=False)
     uuid = Column('uuid', String(36))
     host_id = Column('host_id', Integer, ForeignKey('i_host.id',
-                                                    ondelete='CASCADE'))
+                                                    ondelete='CASCADE'),
+                     index=True)
     port_id = Column('port_id', Integer, ForeignKey('ports.id',
-                                                    ondelete='CASCADE'))
+                                                    ondelete='CASCADE'),
+                     index=True)
     status = Column('status', String(255))
 
     lldp_tlvs = relationship("LldpTlvs",
@@ -1572,9 +1590,11 @@ class LldpNeighbours(Base):
     id = Column('id', Integer, primary_key=True, nullable=False)
     uuid = Column('uuid', String(36))
     host_id = Column('host_id', Integer, ForeignKey('i_host.id',
-                                                    ondelete='CASCADE'))
+                                                    ondelete='CASCADE'),
+                     index=True)
     port_id = Column('port_id', Integer, ForeignKey('ports.id',
-                                                    ondelete='CASCADE'))
+                                                    ondelete='CASCADE'),
+                     index=True)
     msap = Column('msap', String(511))
 
     lldp_tlvs = relationship(
@@ -1684,13 +1704,31 @@ class Label(Base):
     id = Column(Integer, primary_key=True)
     uuid = Column(String(36))
     host_id = Column(Integer, ForeignKey('i_host.id',
-                                         ondelete='CASCADE'))
+                                         ondelete='CASCADE'), index=True)
     host = relationship("ihost", lazy="joined", join_depth=1)
     label_key = Column(String(384))
     label_value = Column(String(128))
     UniqueConstraint('host_id', 'label_key', name='u_host_id@label_key')
 
 
+class RuntimeConfig(Base):
+    __tablename__ = 'runtime_config'
+
+    id = Column(Integer, primary_key=True)
+    uuid = Column(String(36))
+    forihostid = Column(Integer, ForeignKey('i_host.id',
+                                            ondelete='CASCADE'), index=True)
+    host = relationship("ihost", lazy="joined", join_depth=1)
+    request_id = Column(String(36))
+    config_uuid = Column(String(36))
+    classes = Column(Text)
+    state = Column(String(255))
+    duration = Column(Float)
+    error = Column(Text)
+    UniqueConstraint('forihostid', 'request_id',
+                     name='u_forihostid@request_id')
+
+
 class KubeApp(Base):
     __tablename__ = 'kube_app'
 
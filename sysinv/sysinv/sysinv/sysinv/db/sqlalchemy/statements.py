@@ -0,0 +1,107 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+"""Counters of the statements executed through the sqlalchemy engines.
+
+A counter records the statements the current greenthread executes while
+it is active, whichever engine executes them.  Counters may be nested,
+each active counter records the statement.  Observers are called with the
+latency of every statement of the process, e.g. for the dbstats.
+"""
+
+import time
+
+import eventlet
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_listening = False
+_observers = []
+
+
+def is_select(statement):
+    return statement.lstrip().upper().startswith('SELECT')
+
+
+def _get_counters(create=False):
+    """Return the active counters of the current greenthread."""
+    thread_context = eventlet.greenthread.getcurrent()
+    counters = getattr(thread_context, '_statement_counters', None)
+    if counters is None and create:
+        counters = []
+        setattr(thread_context, '_statement_counters', counters)
+    return counters
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context,
+                           executemany):
+    for counter in _get_counters() or []:
+        counter.add(statement, parameters)
+    conn.info.setdefault('statement_start', []).append(time.time())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context,
+                          executemany):
+    starts = conn.info.get('statement_start')
+    if not starts:
+        return
+    elapsed = time.time() - starts.pop()
+    for observer in _observers:
+        observer(statement, elapsed)
+
+
+def listen():
+    """Listen to the statements of every engine."""
+    global _listening
+    if not _listening:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        _listening = True
+
+
+def observe(observer):
+    """Call observer(statement, elapsed) after each executed statement."""
+    listen()
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def unobserve(observer):
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+class StatementCounter(object):
+    """Count the statements executed by the current greenthread.
+
+    Used as a context manager around the code to count.  With select_only
+    only the queries are counted, with keep the (statement, parameters) of
+    each counted statement are kept in statements.
+    """
+
+    def __init__(self, select_only=False, keep=False):
+        self.select_only = select_only
+        self.keep = keep
+        self.count = 0
+        self.statements = []
+
+    def add(self, statement, parameters):
+        if self.select_only and not is_select(statement):
+            return
+        self.count += 1
+        if self.keep:
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        listen()
+        _get_counters(create=True).append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _get_counters().remove(self)
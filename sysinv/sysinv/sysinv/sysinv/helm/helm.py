@@ -18,6 +18,7 @@ from six import iteritems
 from stevedore import extension
 from sysinv.common import constants
 from sysinv.common import exception
+from sysinv.common import plugin_profiler
 from sysinv.openstack.common import log as logging
 from sysinv.helm import common
 
@@ -58,6 +59,7 @@ class HelmOperator(object):
         self.dbapi = dbapi
         self.path = path
         self.docker_repo_source = docker_repository
+        self.profiler = plugin_profiler.PluginProfiler('helm')
 
         # register chart operators for lookup
         self.chart_operators = {}
@@ -97,6 +99,7 @@ class HelmOperator(object):
         return namespaces
 
     @helm_context
+    @plugin_profiler.profile_run
     def get_helm_chart_overrides(self, chart_name, cnamespace=None):
         return self._get_helm_chart_overrides(chart_name, cnamespace)
 
@@ -140,9 +143,10 @@ class HelmOperator(object):
         overrides = {}
         if chart_name in self.implemented_charts:
             try:
-                overrides.update(
-                    self.chart_operators[chart_name].get_overrides(
-                        cnamespace))
+                overrides.update(self.profiler.profile(
+                    chart_name, 'get_overrides',
+                    self.chart_operators[chart_name].get_overrides,
+                    cnamespace))
             except exception.InvalidHelmNamespace:
                 raise
         return overrides
@@ -172,6 +176,7 @@ class HelmOperator(object):
         return app_namespaces
 
     @helm_context
+    @plugin_profiler.profile_run
     def get_helm_application_overrides(self, app_name, cnamespace=None):
         return self._get_helm_application_overrides(app_name, cnamespace)
 
@@ -331,6 +336,7 @@ class HelmOperator(object):
         return values
 
     @helm_context
+    @plugin_profiler.profile_run
     def generate_helm_chart_overrides(self, chart_name, cnamespace=None):
         """Generate system helm chart overrides
 
@@ -365,18 +371,21 @@ class HelmOperator(object):
             LOG.exception("chart name is required")
 
     @helm_context
+    @plugin_profiler.profile_run
     def generate_meta_overrides(self, chart_name, chart_namespace):
         overrides = {}
         if chart_name in self.implemented_charts:
             try:
-                overrides.update(
-                    self.chart_operators[chart_name].get_meta_overrides(
-                        chart_namespace))
+                overrides.update(self.profiler.profile(
+                    chart_name, 'get_meta_overrides',
+                    self.chart_operators[chart_name].get_meta_overrides,
+                    chart_namespace))
             except exception.InvalidHelmNamespace:
                 raise
         return overrides
 
     @helm_context
+    @plugin_profiler.profile_run
     def generate_helm_application_overrides(self, app_name, cnamespace=None,
                                             armada_format=False,
                                             combined=False):
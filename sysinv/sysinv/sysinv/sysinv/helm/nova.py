@@ -359,15 +359,16 @@ class NovaHelm(openstack.OpenstackBaseHelm):
         to generate one-line-per-entry pretty formatting.
         """
         # obtain interface information specific to this host
+        topology = self.dbapi.interface_topology_get(host.id)
         iface_context = {
             'ports': interface._get_port_interface_id_index(
-                self.dbapi, host),
+                self.dbapi, host, topology),
             'interfaces': interface._get_interface_name_index(
-                self.dbapi, host),
+                self.dbapi, host, topology),
             'interfaces_datanets': interface._get_interface_name_datanets(
-                self.dbapi, host),
+                self.dbapi, host, topology),
             'addresses': interface._get_address_interface_name_index(
-                self.dbapi, host),
+                self.dbapi, host, topology),
         }
 
         # This host's list of PCI passthrough and SR-IOV device dictionaries
@@ -66,6 +66,7 @@ from sysinv.objects import ptp
 from sysinv.objects import pv
 from sysinv.objects import remote_logging
 from sysinv.objects import route
+from sysinv.objects import runtime_config
 from sysinv.objects import sdn_controller
 from sysinv.objects import sensor
 from sysinv.objects import sensor_analog
@@ -187,6 +188,7 @@ helm_overrides = helm_overrides.HelmOverrides
 label = label.Label
 kube_app = kube_app.KubeApp
 datanetwork = datanetwork.DataNetwork
+runtime_config = runtime_config.RuntimeConfig
 
 __all__ = (system,
            cluster,
@@ -257,6 +259,7 @@ __all__ = (system,
            kube_app,
            datanetwork,
            interface_network,
+           runtime_config,
            # alias objects for RPC compatibility
            ihost,
            ilvg,
@@ -0,0 +1,40 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+# coding=utf-8
+#
+
+from sysinv.db import api as db_api
+from sysinv.objects import base
+from sysinv.objects import utils
+
+
+class RuntimeConfig(base.SysinvObject):
+
+    dbapi = db_api.get_instance()
+
+    fields = {
+        'id': int,
+        'uuid': utils.str_or_none,
+        'forihostid': utils.int_or_none,
+        'host_uuid': utils.str_or_none,
+        'request_id': utils.str_or_none,
+        'config_uuid': utils.str_or_none,
+        'classes': utils.str_or_none,
+        'state': utils.str_or_none,
+        'duration': utils.float_or_none,
+        'error': utils.str_or_none,
+    }
+
+    _foreign_fields = {'host_uuid': 'host:uuid'}
+
+    @base.remotable_classmethod
+    def get_by_uuid(cls, context, uuid):
+        return cls.dbapi.runtime_config_get(uuid)
+
+    def save_changes(self, context, updates):
+        self.dbapi.runtime_config_update(self.uuid, updates)
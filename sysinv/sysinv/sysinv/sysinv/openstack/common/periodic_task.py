@@ -14,8 +14,12 @@
 #    under the License.
 
 import datetime
+import random
 import time
 
+import eventlet
+from eventlet import greenthread
+from eventlet import semaphore
 from oslo_config import cfg
 import six
 
@@ -29,6 +33,30 @@ periodic_opts = [
                 default=True,
                 help=('Some periodic tasks can be run in a separate process. '
                       'Should we run them here?')),
+    cfg.BoolOpt('periodic_tasks_concurrent',
+                default=None,
+                help=('Run each periodic task in its own greenthread so that '
+                      'a slow task does not delay the others. When disabled '
+                      'all tasks run serially from a single timer. When '
+                      'unset each service uses its own default: the '
+                      'conductor runs its tasks concurrently, the agent '
+                      'serially.')),
+    cfg.IntOpt('periodic_task_max_concurrent',
+               default=0,
+               help=('Maximum number of concurrently scheduled periodic '
+                     'tasks that may run at the same time. A task due while '
+                     'the limit is reached waits for a running one to '
+                     'finish. Zero means no limit.')),
+    cfg.IntOpt('periodic_task_timeout',
+               default=0,
+               help=('Default number of seconds a concurrently scheduled '
+                     'periodic task may run before it is cancelled. '
+                     'Zero disables the timeout.')),
+    cfg.IntOpt('periodic_task_max_jitter',
+               default=10,
+               help=('Maximum number of seconds by which the first run of '
+                     'each concurrently scheduled periodic task is randomly '
+                     'delayed, so that tasks do not all fire together.')),
 ]
 
 CONF = cfg.CONF
@@ -52,7 +80,8 @@ def periodic_task(*args, **kwargs):
            of the periodic scheduler.
 
         2. With arguments:
-           @periodic_task(spacing=N [, run_immediately=[True|False]])
+           @periodic_task(spacing=N [, run_immediately=[True|False]]
+                          [, timeout=T] [, jitter=J])
            this will be run on approximately every N seconds. If this number is
            negative the periodic task will be disabled. If the run_immediately
            argument is provided and has a value of 'True', the first run of the
@@ -60,6 +89,12 @@ def periodic_task(*args, **kwargs):
            run_immediately is omitted or set to 'False', the first time the
            task runs will be approximately N seconds after the task scheduler
            starts.
+
+    The timeout and jitter arguments only apply when tasks are scheduled
+    concurrently (see start_periodic_task_threads). A run exceeding T seconds
+    is cancelled, and the first run is delayed by a random 0..J seconds.
+    When omitted the periodic_task_timeout and periodic_task_max_jitter
+    configuration options are used.
     """
     def decorator(f):
         # Test for old style invocation
@@ -81,6 +116,10 @@ def periodic_task(*args, **kwargs):
             f._periodic_last_run = None
         else:
             f._periodic_last_run = timeutils.utcnow()
+
+        # Control concurrent scheduling
+        f._periodic_timeout = kwargs.pop('timeout', None)
+        f._periodic_jitter = kwargs.pop('jitter', None)
         return f
 
     # NOTE(sirp): The `if` is necessary to allow the decorator to be used with
@@ -125,6 +164,16 @@ class _PeriodicTasksMeta(type):
         except AttributeError:
             cls._periodic_spacing = {}
 
+        try:
+            cls._periodic_timeout = cls._periodic_timeout.copy()
+        except AttributeError:
+            cls._periodic_timeout = {}
+
+        try:
+            cls._periodic_jitter = cls._periodic_jitter.copy()
+        except AttributeError:
+            cls._periodic_jitter = {}
+
         for value in cls.__dict__.values():
             if getattr(value, '_periodic_task', False):
                 task = value
@@ -149,6 +198,10 @@ class _PeriodicTasksMeta(type):
                 cls._periodic_tasks.append((name, task))
                 cls._periodic_spacing[name] = task._periodic_spacing
                 cls._periodic_last_run[name] = task._periodic_last_run
+                cls._periodic_timeout[name] = getattr(
+                    task, '_periodic_timeout', None)
+                cls._periodic_jitter[name] = getattr(
+                    task, '_periodic_jitter', None)
 
 
 @six.add_metaclass(_PeriodicTasksMeta)
@@ -188,3 +241,133 @@ class PeriodicTasks(object):
             time.sleep(0)
 
         return idle_for
+
+    def start_periodic_task_threads(self, context, thread_group,
+                                    default_spacing=DEFAULT_INTERVAL):
+        """Schedule every periodic task in its own greenthread.
+
+        Unlike run_periodic_tasks, a slow task only delays itself. A run
+        that is still in progress when its next run falls due causes that
+        run to be skipped and counted as an overrun. At most
+        periodic_task_max_concurrent tasks run at the same time.
+        """
+        if CONF.periodic_task_max_concurrent > 0:
+            self._periodic_semaphore = semaphore.Semaphore(
+                CONF.periodic_task_max_concurrent)
+        else:
+            self._periodic_semaphore = None
+        for task_name, task in self._periodic_tasks:
+            thread_group.add_thread(self._periodic_task_loop, context,
+                                    task_name, task, default_spacing)
+
+    def get_periodic_task_stats(self):
+        """Return a copy of the run statistics of each periodic task."""
+        stats = {}
+        for task_name, task_stats in self._periodic_task_stats().items():
+            stats[task_name] = dict(task_stats)
+        return stats
+
+    def _periodic_task_stats(self):
+        try:
+            return self._periodic_stats
+        except AttributeError:
+            self._periodic_stats = {}
+            return self._periodic_stats
+
+    def _periodic_task_stats_entry(self, task_name):
+        return self._periodic_task_stats().setdefault(task_name, {
+            'spacing': None,
+            'timeout': None,
+            'running': False,
+            'runs': 0,
+            'failures': 0,
+            'timeouts': 0,
+            'overruns': 0,
+            'skipped': 0,
+            'last_run': None,
+            'last_duration': None,
+            'max_duration': None,
+            'last_error': None,
+        })
+
+    def _periodic_task_loop(self, context, task_name, task, default_spacing):
+        spacing = self._periodic_spacing[task_name] or default_spacing
+        timeout = self._periodic_timeout.get(task_name)
+        if timeout is None:
+            timeout = CONF.periodic_task_timeout or None
+        jitter = self._periodic_jitter.get(task_name)
+        if jitter is None:
+            jitter = CONF.periodic_task_max_jitter
+
+        stats = self._periodic_task_stats_entry(task_name)
+        stats['spacing'] = spacing
+        stats['timeout'] = timeout
+
+        if self._periodic_last_run[task_name] is None:
+            initial_delay = 0
+        else:
+            initial_delay = spacing
+        initial_delay += random.uniform(0, min(jitter, spacing))
+        greenthread.sleep(initial_delay)
+
+        while True:
+            start = time.time()
+            self._run_periodic_task_once(context, task_name, task, timeout,
+                                         stats)
+            elapsed = time.time() - start
+
+            if elapsed > spacing:
+                skipped = int(elapsed // spacing)
+                stats['overruns'] += 1
+                stats['skipped'] += skipped
+                LOG.warning(_("Periodic task %(task)s took %(elapsed).1f "
+                              "seconds, longer than its %(spacing)s second "
+                              "interval; skipping %(skipped)d run(s)"),
+                            {'task': task_name, 'elapsed': elapsed,
+                             'spacing': spacing, 'skipped': skipped})
+            greenthread.sleep(spacing - (elapsed % spacing))
+
+    def _run_periodic_task_once(self, context, task_name, task, timeout,
+                                stats):
+        limit = getattr(self, '_periodic_semaphore', None)
+        if limit is None:
+            return self._run_periodic_task(context, task_name, task, timeout,
+                                           stats)
+        with limit:
+            return self._run_periodic_task(context, task_name, task, timeout,
+                                           stats)
+
+    def _run_periodic_task(self, context, task_name, task, timeout, stats):
+        full_task_name = '.'.join([self.__class__.__name__, task_name])
+        LOG.debug(_("Running periodic task %(full_task_name)s"),
+                  {"full_task_name": full_task_name})
+
+        self._periodic_last_run[task_name] = timeutils.utcnow()
+        stats['last_run'] = timeutils.strtime(
+            self._periodic_last_run[task_name])
+        stats['running'] = True
+        start = time.time()
+        timer = eventlet.Timeout(timeout)
+        try:
+            task(self, context)
+            stats['last_error'] = None
+        except eventlet.Timeout as t:
+            if t is not timer:
+                raise
+            stats['timeouts'] += 1
+            stats['last_error'] = 'timed out after %s seconds' % timeout
+            LOG.error(_("Periodic task %(full_task_name)s timed out after "
+                        "%(timeout)s seconds"),
+                      {"full_task_name": full_task_name, "timeout": timeout})
+        except Exception as e:
+            stats['failures'] += 1
+            stats['last_error'] = six.text_type(e)
+            LOG.exception(_("Error during %(full_task_name)s: %(e)s"),
+                          {"full_task_name": full_task_name, "e": e})
+        finally:
+            timer.cancel()
+            duration = round(time.time() - start, 3)
+            stats['running'] = False
+            stats['runs'] += 1
+            stats['last_duration'] = duration
+            stats['max_duration'] = max(stats['max_duration'] or 0, duration)
@@ -48,16 +48,10 @@ class Service(service.Service):
         LOG.debug(_("Creating Consumer connection for Service %s") %
                   self.topic)
 
-        dispatcher = rpc_dispatcher.RpcDispatcher([self.manager],
-                                                  self.serializer)
+        dispatcher = self.create_rpc_dispatcher()
 
         # Share this same connection for these Consumers
-        self.conn.create_consumer(self.topic, dispatcher, fanout=False)
-
-        node_topic = '%s.%s' % (self.topic, self.host)
-        self.conn.create_consumer(node_topic, dispatcher, fanout=False)
-
-        self.conn.create_consumer(self.topic, dispatcher, fanout=True)
+        self.create_rpc_consumers(dispatcher)
 
         # Hook to allow the manager to do other initializations after
         # the rpc connection is created.
@@ -67,6 +61,17 @@ class Service(service.Service):
         # Consume from all consumers in a thread
         self.conn.consume_in_thread()
 
+    def create_rpc_dispatcher(self):
+        return rpc_dispatcher.RpcDispatcher([self.manager], self.serializer)
+
+    def create_rpc_consumers(self, dispatcher):
+        self.conn.create_consumer(self.topic, dispatcher, fanout=False)
+
+        node_topic = '%s.%s' % (self.topic, self.host)
+        self.conn.create_consumer(node_topic, dispatcher, fanout=False)
+
+        self.conn.create_consumer(self.topic, dispatcher, fanout=True)
+
     def stop(self):
         # Try to shut the connection down, but if we get any sort of
         # errors, go ahead and ignore them.. as we're shutting down anyway
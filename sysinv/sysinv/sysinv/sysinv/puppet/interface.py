@@ -118,18 +118,21 @@ class InterfacePuppet(base.BasePuppet):
         return config
 
     def _create_interface_context(self, host):
+        topology = self.dbapi.interface_topology_get(host.id)
         context = {
             'hostname': host.hostname,
             'personality': host.personality,
             'subfunctions': host.subfunctions,
             'system_uuid': host.isystem_uuid,
             'system_mode': self._get_system().system_mode,
-            'ports': self._get_port_interface_id_index(host),
-            'interfaces': self._get_interface_name_index(host),
-            'interfaces_datanets': self._get_interface_name_datanets(host),
-            'devices': self._get_port_pciaddr_index(host),
-            'addresses': self._get_address_interface_name_index(host),
-            'routes': self._get_routes_interface_name_index(host),
+            'ports': self._get_port_interface_id_index(host, topology),
+            'interfaces': self._get_interface_name_index(host, topology),
+            'interfaces_datanets': self._get_interface_name_datanets(
+                host, topology),
+            'devices': self._get_port_pciaddr_index(host, topology),
+            'addresses': self._get_address_interface_name_index(
+                host, topology),
+            'routes': self._get_routes_interface_name_index(host, topology),
             'networks': self._get_network_type_index(),
             'gateways': self._get_gateway_index(),
             'floatingips': self._get_floating_ip_index(),
@@ -142,52 +145,59 @@ class InterfacePuppet(base.BasePuppet):
         Search the host interface list looking for an interface with a given
         primary network type.
         """
-        for iface in self.dbapi.iinterface_get_by_ihost(host.id):
-            for ni in self.dbapi.interface_network_get_by_interface(
-                    iface['id']):
-                network = self.dbapi.network_get(ni.id)
+        topology = self.dbapi.interface_topology_get(host.id)
+        for iface in topology['interfaces']:
+            for network in topology['networks'].get(iface.id, []):
                 if network.type == networktype:
                     return iface
 
-    def _get_port_interface_id_index(self, host):
+    def _get_port_interface_id_index(self, host, topology=None):
         """
         Builds a dictionary of ports indexed by interface id.
         """
-        return interface._get_port_interface_id_index(self.dbapi, host)
+        return interface._get_port_interface_id_index(
+            self.dbapi, host, topology)
 
-    def _get_interface_name_index(self, host):
+    def _get_interface_name_index(self, host, topology=None):
         """
         Builds a dictionary of interfaces indexed by interface name.
         """
-        return interface._get_interface_name_index(self.dbapi, host)
+        return interface._get_interface_name_index(
+            self.dbapi, host, topology)
 
-    def _get_interface_name_datanets(self, host):
+    def _get_interface_name_datanets(self, host, topology=None):
         """
         Builds a dictionary of datanets indexed by interface name.
         """
-        return interface._get_interface_name_datanets(self.dbapi, host)
+        return interface._get_interface_name_datanets(
+            self.dbapi, host, topology)
 
-    def _get_port_pciaddr_index(self, host):
+    def _get_port_pciaddr_index(self, host, topology=None):
         """
         Builds a dictionary of port lists indexed by PCI address.
         """
+        topology = interface._get_interface_topology(
+            self.dbapi, host, topology)
         devices = collections.defaultdict(list)
-        for port in self.dbapi.ethernet_port_get_by_host(host.id):
+        for port in topology['ports']:
             devices[port.pciaddr].append(port)
         return devices
 
-    def _get_address_interface_name_index(self, host):
+    def _get_address_interface_name_index(self, host, topology=None):
         """
         Builds a dictionary of address lists indexed by interface name.
         """
-        return interface._get_address_interface_name_index(self.dbapi, host)
+        return interface._get_address_interface_name_index(
+            self.dbapi, host, topology)
 
-    def _get_routes_interface_name_index(self, host):
+    def _get_routes_interface_name_index(self, host, topology=None):
         """
         Builds a dictionary of route lists indexed by interface name.
         """
+        topology = interface._get_interface_topology(
+            self.dbapi, host, topology)
         routes = collections.defaultdict(list)
-        for route in self.dbapi.routes_get_by_host(host.id):
+        for route in topology['routes']:
             routes[route.ifname].append(route)
 
         results = collections.defaultdict(list)
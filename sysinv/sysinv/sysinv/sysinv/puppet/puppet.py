@@ -15,6 +15,7 @@ import yaml
 
 from stevedore import extension
 
+from sysinv.common import plugin_profiler
 from sysinv.openstack.common import log as logging
 from sysinv.puppet import common
 
@@ -40,6 +41,7 @@ class PuppetOperator(object):
 
         self.dbapi = dbapi
         self.path = path
+        self.profiler = plugin_profiler.PluginProfiler('puppet')
 
         puppet_plugins = extension.ExtensionManager(
             namespace='systemconfig.puppet_plugins',
@@ -61,6 +63,7 @@ class PuppetOperator(object):
         return self.context.get('config', {})
 
     @puppet_context
+    @plugin_profiler.profile_run
     def create_static_config(self):
         """
         Create the initial static configuration that sets up one-time
@@ -75,7 +78,8 @@ class PuppetOperator(object):
         try:
             self.context['config'] = config = {}
             for puppet_plugin in self.puppet_plugins:
-                config.update(puppet_plugin.obj.get_static_config())
+                config.update(self._get_plugin_config(
+                    puppet_plugin, 'get_static_config'))
 
             filename = 'static.yaml'
             self._write_config(filename, config)
@@ -84,6 +88,7 @@ class PuppetOperator(object):
             raise
 
     @puppet_context
+    @plugin_profiler.profile_run
     def create_secure_config(self):
         """
         Create the secure config, for storing passwords.
@@ -97,7 +102,8 @@ class PuppetOperator(object):
         try:
             self.context['config'] = config = {}
             for puppet_plugin in self.puppet_plugins:
-                config.update(puppet_plugin.obj.get_secure_static_config())
+                config.update(self._get_plugin_config(
+                    puppet_plugin, 'get_secure_static_config'))
 
             filename = 'secure_static.yaml'
             self._write_config(filename, config)
@@ -106,13 +112,15 @@ class PuppetOperator(object):
             raise
 
     @puppet_context
+    @plugin_profiler.profile_run
     def update_system_config(self):
         """Update the configuration for the system"""
         try:
             # NOTE: order is important due to cached context data
             self.context['config'] = config = {}
             for puppet_plugin in self.puppet_plugins:
-                config.update(puppet_plugin.obj.get_system_config())
+                config.update(self._get_plugin_config(
+                    puppet_plugin, 'get_system_config'))
 
             filename = 'system.yaml'
             self._write_config(filename, config)
@@ -121,13 +129,15 @@ class PuppetOperator(object):
             raise
 
     @puppet_context
+    @plugin_profiler.profile_run
     def update_secure_system_config(self):
         """Update the secure configuration for the system"""
         try:
             # NOTE: order is important due to cached context data
             self.context['config'] = config = {}
             for puppet_plugin in self.puppet_plugins:
-                config.update(puppet_plugin.obj.get_secure_system_config())
+                config.update(self._get_plugin_config(
+                    puppet_plugin, 'get_secure_system_config'))
 
             filename = 'secure_system.yaml'
             self._write_config(filename, config)
@@ -136,16 +146,23 @@ class PuppetOperator(object):
             raise
 
     @puppet_context
+    @plugin_profiler.profile_run
     def update_host_config(self, host, config_uuid=None):
         """Update the host hiera configuration files for the supplied host"""
 
         self.config_uuid = config_uuid
         self.context['config'] = config = {}
         for puppet_plugin in self.puppet_plugins:
-            config.update(puppet_plugin.obj.get_host_config(host))
+            config.update(self._get_plugin_config(
+                puppet_plugin, 'get_host_config', host))
 
         self._write_host_config(host, config)
 
+    def _get_plugin_config(self, puppet_plugin, method, *args):
+        return self.profiler.profile(puppet_plugin.name, method,
+                                     getattr(puppet_plugin.obj, method),
+                                     *args)
+
     def remove_host_config(self, host):
         """Remove the configuration for the supplied host"""
         try:
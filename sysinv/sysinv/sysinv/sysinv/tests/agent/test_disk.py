@@ -0,0 +1,171 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Test class for the Sysinv agent disk inventory."""
+
+import mock
+
+from sysinv.agent import disk
+from sysinv.common import constants
+from sysinv.common import utils
+from sysinv.tests import base
+
+PVS_OUTPUT = "  /dev/sda5 \n  /dev/sdb  \n  /dev/nvme0n1p2\n"
+
+
+class FakeDevice(dict):
+
+    def __init__(self, device_node, device_number, **properties):
+        super(FakeDevice, self).__init__(properties)
+        self.device_node = device_node
+        self.device_number = device_number
+        self.device_type = 'disk'
+        self.setdefault('DEVNAME', device_node)
+        self.setdefault('MAJOR', '8')
+        self.setdefault('ID_PATH', 'pci-0000:00:0d.0-ata-1.0')
+        self.setdefault('ID_SERIAL_SHORT', 'serial-%s' % device_number)
+
+
+class DiskOperatorTestCase(base.TestCase):
+
+    def setUp(self):
+        super(DiskOperatorTestCase, self).setUp()
+        self.events = []
+        self.monitor = mock.MagicMock()
+        self.monitor.poll.side_effect = self._poll
+        with mock.patch.object(disk.pyudev.Monitor, 'from_netlink',
+                               return_value=self.monitor):
+            self.operator = disk.DiskOperator()
+
+        self.sda = FakeDevice('/dev/sda', 2048, ID_PART_TABLE_TYPE='gpt')
+        self.sdb = FakeDevice('/dev/sdb', 2064, ID_PART_TABLE_TYPE='dos')
+
+        self.lookups = []
+        for p in (mock.patch.object(utils, 'get_disk_capacity_mib',
+                                    side_effect=self._get_capacity),
+                  mock.patch.object(disk.DiskOperator, 'get_disk_model',
+                                    return_value='QEMU HARDDISK'),
+                  mock.patch.object(disk.DiskOperator, 'get_sector_size',
+                                    return_value=512),
+                  mock.patch.object(disk.DiskOperator, 'is_rotational',
+                                    return_value='1'),
+                  mock.patch.object(disk.DiskOperator, 'get_device_id_wwn',
+                                    return_value=('id', 'wwn'))):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _poll(self, timeout=None):
+        if self.events:
+            return self.events.pop(0)
+        return None
+
+    def _get_capacity(self, device_node):
+        self.lookups.append(device_node)
+        return 10240
+
+    def test_static_attributes_cached(self):
+        attrs = self.operator.get_disk_static_attributes(self.sda)
+        self.assertEqual(10240, attrs['size_mib'])
+        self.assertEqual('QEMU HARDDISK', attrs['model_num'])
+        self.assertEqual('serial-2048', attrs['serial_id'])
+        self.assertEqual(512, attrs['sector_size_bytes'])
+
+        self.operator._process_udev_events()
+        self.assertEqual(attrs,
+                         self.operator.get_disk_static_attributes(self.sda))
+        self.assertEqual(['/dev/sda'], self.lookups)
+
+    def test_cache_invalidated_by_udev_event(self):
+        self.operator.get_disk_static_attributes(self.sda)
+        self.operator.get_disk_static_attributes(self.sdb)
+
+        self.events.append(FakeDevice('/dev/sda', 2048, ACTION='change'))
+        self.operator._process_udev_events()
+        self.operator.get_disk_static_attributes(self.sda)
+        self.operator.get_disk_static_attributes(self.sdb)
+        self.assertEqual(['/dev/sda', '/dev/sdb', '/dev/sda'], self.lookups)
+
+    def test_cache_invalidated_by_device_number(self):
+        self.operator.get_disk_static_attributes(self.sda)
+        replaced = FakeDevice('/dev/sda', 2049)
+        attrs = self.operator.get_disk_static_attributes(replaced)
+        self.assertEqual('serial-2049', attrs['serial_id'])
+        self.assertEqual(['/dev/sda', '/dev/sda'], self.lookups)
+
+    def test_failed_lookup_not_cached(self):
+        utils.get_disk_capacity_mib.side_effect = ValueError('no size')
+        attrs = self.operator.get_disk_static_attributes(self.sda)
+        self.assertEqual(0, attrs['size_mib'])
+        self.assertNotIn('/dev/sda', self.operator._disk_cache)
+
+    def test_cache_cleared_without_monitor(self):
+        self.operator._monitor = None
+        self.operator.get_disk_static_attributes(self.sda)
+        self.operator._process_udev_events()
+        self.operator.get_disk_static_attributes(self.sda)
+        self.assertEqual(['/dev/sda', '/dev/sda'], self.lookups)
+
+    def test_cache_cleared_on_monitor_error(self):
+        self.operator.get_disk_static_attributes(self.sda)
+        self.monitor.poll.side_effect = IOError('netlink error')
+        self.operator._process_udev_events()
+        self.assertEqual({}, self.operator._disk_cache)
+
+    @mock.patch.object(disk.subprocess, 'Popen')
+    def test_get_pv_names(self, mock_popen):
+        mock_popen.return_value.communicate.return_value = (PVS_OUTPUT, '')
+        self.assertEqual({'/dev/sda5', '/dev/sdb', '/dev/nvme0n1p2'},
+                         self.operator.get_pv_names())
+        mock_popen.assert_called_once_with(
+            ['pvs', '--noheadings', '-o', 'pv_name'],
+            stdout=disk.subprocess.PIPE)
+
+    @mock.patch.object(disk.subprocess, 'Popen')
+    def test_disk_used_by_pv(self, mock_popen):
+        pv_names = {'/dev/sda5', '/dev/sdb'}
+        self.assertEqual(0, self.operator.get_disk_available_mib(
+            '/dev/sdb', is_gpt=True, pv_names=pv_names))
+        self.assertEqual(0, self.operator.get_disk_available_mib(
+            '/dev/sda', is_gpt=False, pv_names=pv_names))
+        self.assertFalse(mock_popen.called)
+
+    @mock.patch.object(disk.pyudev, 'Context')
+    @mock.patch.object(utils, 'is_system_usable_block_device',
+                       return_value=True)
+    @mock.patch.object(utils, 'disk_is_gpt')
+    @mock.patch.object(disk.DiskOperator, 'get_rootfs_node',
+                       return_value='/dev/sda')
+    @mock.patch.object(disk.DiskOperator, 'get_pv_names',
+                       return_value={'/dev/sda5'})
+    @mock.patch.object(disk.DiskOperator, 'get_disk_available_mib',
+                       return_value=1024)
+    def test_idisk_get(self, mock_available, mock_pv_names, mock_rootfs,
+                       mock_is_gpt, mock_usable, mock_context):
+        sdc = FakeDevice('/dev/sdc', 2080, ID_PART_TABLE_TYPE='gpt')
+        mock_context.return_value.list_devices.return_value = [
+            self.sda, self.sdb, sdc]
+
+        idisks = self.operator.idisk_get()
+        self.assertEqual(['/dev/sda', '/dev/sdb', '/dev/sdc'],
+                         [d['device_node'] for d in idisks])
+        self.assertEqual({'model_num': 'QEMU HARDDISK',
+                          'stor_function': 'rootfs'},
+                         idisks[0]['capabilities'])
+        self.assertEqual(constants.DEVICE_TYPE_HDD, idisks[0]['device_type'])
+
+        # udev supplied the partition table types and the PVs are listed
+        # once for all the GPT disks
+        self.assertFalse(mock_is_gpt.called)
+        self.assertEqual(1, mock_pv_names.call_count)
+        self.assertEqual(
+            [(True, {'/dev/sda5'}, 512), (False, {'/dev/sda5'}, 512),
+             (True, {'/dev/sda5'}, 512)],
+            [(c[1]['is_gpt'], c[1]['pv_names'], c[1]['sector_size_bytes'])
+             for c in mock_available.call_args_list])
+
+        # a second audit reuses the cached attributes
+        self.operator.idisk_get()
+        self.assertEqual(['/dev/sda', '/dev/sdb', '/dev/sdc'], self.lookups)
@@ -0,0 +1,91 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Test class for the Sysinv agent platform PSS collection."""
+
+import io
+import mock
+
+from sysinv.agent import node
+from sysinv.tests import base
+
+SMAPS = u"""Rss:                 812 kB
+Pss:                 %d kB
+Shared_Clean:        120 kB
+"""
+
+
+class PssTestCase(base.TestCase):
+
+    def setUp(self):
+        super(PssTestCase, self).setUp()
+        # pid -> PSS in KB, None for a process that exited
+        self.processes = {'1': 100, '2': None, '3': 300}
+        self.now = 0.0
+
+        for p in (mock.patch.object(node, 'listdir',
+                                    side_effect=self._listdir),
+                  mock.patch.object(node, 'open', create=True,
+                                    side_effect=self._open),
+                  mock.patch.object(node.os.path, 'exists',
+                                    return_value=True),
+                  mock.patch.object(node.time, 'time',
+                                    side_effect=self._time),
+                  mock.patch.object(node, 'PSS_TIME_BUDGET', 100)):
+            p.start()
+            self.addCleanup(p.stop)
+
+        patcher = mock.patch.object(node.greenthread, 'sleep')
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _listdir(self, path):
+        return ['self', 'meminfo'] + sorted(self.processes, key=int)
+
+    def _open(self, path, mode='r'):
+        pid, smaps = path.split('/')[2:]
+        self.assertEqual('smaps_rollup', smaps)
+        # each read takes a second
+        self.now += 1
+        if self.processes[pid] is None:
+            raise IOError('No such file or directory')
+        return io.StringIO(SMAPS % self.processes[pid])
+
+    def _time(self):
+        return self.now
+
+    def test_total(self):
+        self.assertEqual((400, True), node.get_total_pss_kb())
+        self.assertFalse(self.sleep.called)
+
+    def test_time_budget(self):
+        self.assertEqual((100, False), node.get_total_pss_kb(time_budget=1.5))
+
+    def test_yields(self):
+        self.processes = dict((str(pid), 10) for pid in range(1, 46))
+        self.assertEqual((450, True), node.get_total_pss_kb())
+        self.assertEqual(45 // node.PSS_YIELD_INTERVAL,
+                         self.sleep.call_count)
+        self.sleep.assert_called_with(0)
+
+    def test_partial_reuses_complete_measurement(self):
+        operator = node.NodeOperator()
+        self.processes = {'1': 2048, '2': 4096}
+        self.assertEqual(6, operator._get_platform_pss_mb())
+
+        # the budget runs out after the first process
+        self.processes = dict((str(pid), 1024) for pid in range(1, 10))
+        with mock.patch.object(node, 'PSS_TIME_BUDGET', 0.5):
+            self.assertEqual(6, operator._get_platform_pss_mb())
+
+        self.assertEqual(9, operator._get_platform_pss_mb())
+
+    def test_partial_without_complete_measurement(self):
+        operator = node.NodeOperator()
+        with mock.patch.object(node, 'PSS_TIME_BUDGET', 0.5):
+            # only the first process is counted
+            self.processes = {'1': 2048, '3': 4096}
+            self.assertEqual(2, operator._get_platform_pss_mb())
@@ -0,0 +1,94 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""
+Unit Tests for :py:class:`sysinv.agent.rpcapi.AgentAPI`.
+"""
+
+import mock
+
+from sysinv.agent import rpcapi as agent_rpcapi
+from sysinv.openstack.common import context
+from sysinv.openstack.common import rpc
+from sysinv.tests import base
+
+HOST_UUIDS = ['1be26c0b-03f2-4d2e-ae87-c02d7f33c123',
+              '1be26c0b-03f2-4d2e-ae87-c02d7f33c124']
+
+
+class AgentRPCAPITestCase(base.TestCase):
+
+    def setUp(self):
+        super(AgentRPCAPITestCase, self).setUp()
+        self.context = context.get_admin_context()
+        self.rpcapi = agent_rpcapi.AgentAPI(topic='fake-topic')
+
+        self.casts = []
+        self.fanout_casts = []
+        self.stubs.Set(rpc, 'cast', self._fake_cast)
+        self.stubs.Set(rpc, 'fanout_cast', self._fake_fanout_cast)
+
+        patcher = mock.patch.object(agent_rpcapi, '_message_stats',
+                                    agent_rpcapi.collections.defaultdict(
+                                        lambda: {'unicast': 0, 'fanout': 0}))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _fake_cast(self, ctxt, topic, msg):
+        self.casts.append((topic, msg['method']))
+
+    def _fake_fanout_cast(self, ctxt, topic, msg):
+        self.fanout_casts.append((topic, msg['method']))
+
+    def test_unicast_to_host(self):
+        self.config(host_topics=True, group='agent')
+        self.rpcapi.agent_update(self.context, HOST_UUIDS[0], ['ilvg'])
+        self.assertEqual(
+            [('fake-topic.%s' % HOST_UUIDS[0], 'agent_audit')], self.casts)
+        self.assertEqual([], self.fanout_casts)
+        self.assertEqual({'agent_audit': {'unicast': 1, 'fanout': 0}},
+                         agent_rpcapi.get_message_stats())
+
+    def test_unicast_to_each_host(self):
+        self.config(host_topics=True, group='agent')
+        self.rpcapi.config_apply_runtime_manifest(
+            self.context, 'config-uuid',
+            {'personalities': ['worker'], 'host_uuids': HOST_UUIDS})
+        self.assertEqual(
+            [('fake-topic.%s' % uuid, 'config_apply_runtime_manifest')
+             for uuid in HOST_UUIDS], self.casts)
+        self.assertEqual([], self.fanout_casts)
+        self.assertEqual(
+            {'config_apply_runtime_manifest': {'unicast': 2, 'fanout': 0}},
+            agent_rpcapi.get_message_stats())
+
+    def test_fanout_without_hosts(self):
+        self.config(host_topics=True, group='agent')
+        self.rpcapi.config_apply_runtime_manifest(
+            self.context, 'config-uuid', {'personalities': ['worker']})
+        self.assertEqual([], self.casts)
+        self.assertEqual(
+            [('fake-topic', 'config_apply_runtime_manifest')],
+            self.fanout_casts)
+
+    def test_fanout_by_default(self):
+        self.rpcapi.execute_command(self.context, HOST_UUIDS[0], 'true')
+        self.assertEqual([], self.casts)
+        self.assertEqual([('fake-topic', 'execute_command')],
+                         self.fanout_casts)
+        self.assertEqual({'execute_command': {'unicast': 0, 'fanout': 1}},
+                         agent_rpcapi.get_message_stats())
+
+    def test_broadcast(self):
+        self.config(host_topics=True, group='agent')
+        self.rpcapi.configure_isystemname(self.context, 'system')
+        self.rpcapi.agent_update(self.context, HOST_UUIDS[1], ['ilvg'])
+        self.assertEqual([('fake-topic', 'configure_isystemname')],
+                         self.fanout_casts)
+        self.assertEqual(
+            {'configure_isystemname': {'unicast': 0, 'fanout': 1},
+             'agent_audit': {'unicast': 1, 'fanout': 0}},
+            agent_rpcapi.get_message_stats())
@@ -16,6 +16,7 @@
 import mock
 from six.moves import http_client
 
+from sysinv.api.controllers.v1 import profile
 from sysinv.common import constants
 from sysinv.common import utils as cutils
 from sysinv.db import api as dbapi
@@ -377,3 +378,72 @@ class ProfileApplyTestCase(ProfileTestCase):
             '%s/ilvgs' % self._get_path(profile_uuid))
         self.assertEqual(hostlvg_r['ilvgs'][0]['lvm_vg_name'],
                          profile_r['ilvgs'][0]['lvm_vg_name'])
+
+    @mock.patch.object(cutils, 'is_virtual')
+    def test_apply_memory_multiple_hosts(self, mock_is_virtual):
+        mock_is_virtual.return_value = True
+        self.profile["profiletype"] = constants.PROFILE_TYPE_MEMORY
+        self.profile["ihost_uuid"] = self.worker.uuid
+        response = self.post_json('%s' % self._get_path(), self.profile)
+        self.assertEqual(http_client.OK, response.status_int)
+
+        list_data = self.get_json('%s' % self._get_path())
+        profile_uuid = list_data['iprofiles'][0]['uuid']
+        self.dbapi.ihost_update(self.controller.uuid,
+                                {'administrative': constants.ADMIN_UNLOCKED})
+        result = self.post_json('%s' % self._get_path('apply'),
+                                {'profile_uuid': profile_uuid,
+                                 'host_uuids': [self.worker.uuid,
+                                                self.controller.uuid]},
+                                headers=HEADER)
+        self.assertEqual(http_client.OK, result.status_int)
+
+        results = dict((r['host_uuid'], r) for r in result.json)
+        self.assertTrue(results[self.worker.uuid]['success'])
+        self.assertFalse(results[self.controller.uuid]['success'])
+        self.assertIn('unlocked', results[self.controller.uuid]['reason'])
+
+        hostmem_r = self.get_json(
+            '/ihosts/%s/imemorys' % self.worker.uuid)
+        profile_r = self.get_json(
+            '%s/imemorys' % self._get_path(profile_uuid))
+        self.assertEqual(hostmem_r['imemorys'][0]['vm_hugepages_nr_1G_pending'],
+                         profile_r['imemorys'][0]['vm_hugepages_nr_1G_pending'])
+
+    @mock.patch.object(cutils, 'is_virtual')
+    def test_apply_memory_multiple_hosts_rollback(self, mock_is_virtual):
+        mock_is_virtual.return_value = True
+        self.profile["profiletype"] = constants.PROFILE_TYPE_MEMORY
+        self.profile["ihost_uuid"] = self.worker.uuid
+        response = self.post_json('%s' % self._get_path(), self.profile)
+        self.assertEqual(http_client.OK, response.status_int)
+
+        list_data = self.get_json('%s' % self._get_path())
+        profile_uuid = list_data['iprofiles'][0]['uuid']
+        profile_r = self.get_json(
+            '%s/imemorys' % self._get_path(profile_uuid))
+        pages = profile_r['imemorys'][0]['vm_hugepages_nr_2M_pending'] or 0
+        self.dbapi.imemory_update(self.compmemory.uuid,
+                                  {'vm_hugepages_nr_2M_pending': pages + 1})
+
+        update = profile.memory_api._update
+        updated = []
+
+        def update_then_fail(mem_uuid, values):
+            update(mem_uuid, values)
+            updated.append(self.dbapi.imemory_get(mem_uuid))
+            raise ValueError('update failed')
+
+        with mock.patch.object(profile.memory_api, '_update',
+                               side_effect=update_then_fail):
+            result = self.post_json('%s' % self._get_path('apply'),
+                                    {'profile_uuid': profile_uuid,
+                                     'host_uuids': [self.worker.uuid]},
+                                    headers=HEADER)
+        self.assertEqual(http_client.OK, result.status_int)
+        self.assertFalse(result.json[0]['success'])
+
+        # the memory updated before the failure is rolled back
+        self.assertEqual(pages, updated[0].vm_hugepages_nr_2M_pending)
+        hostmem = self.dbapi.imemory_get(self.compmemory.uuid)
+        self.assertEqual(pages + 1, hostmem.vm_hugepages_nr_2M_pending)
@@ -0,0 +1,57 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+# -*- encoding: utf-8 -*-
+#
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from sysinv.common import constants
+from sysinv.db import api as dbapi
+from sysinv.tests.api import base
+from sysinv.tests.db import utils as dbutils
+
+
+class RuntimeConfigTestCase(base.FunctionalTest):
+
+    def setUp(self):
+        super(RuntimeConfigTestCase, self).setUp()
+        self.dbapi = dbapi.get_instance()
+        self.system = dbutils.create_test_isystem()
+        self.load = dbutils.create_test_load()
+        self.host = dbutils.create_test_ihost(
+            forisystemid=self.system.id,
+            hostname='controller-0',
+            personality=constants.CONTROLLER,
+            subfunctions=constants.CONTROLLER,
+            invprovision=constants.PROVISIONED)
+
+    def _create_runtime_config(self, request_id, state, **kwargs):
+        values = {'request_id': request_id,
+                  'config_uuid': '1f6d1a42-1cb4-4b37-bd8c-b2f0f3c5a6c1',
+                  'classes': 'platform::network::runtime',
+                  'state': state}
+        values.update(kwargs)
+        return self.dbapi.runtime_config_create(self.host.id, values)
+
+    def test_get_all(self):
+        self._create_runtime_config(
+            'e1b7fb64-6f9b-4f8e-a3c4-96bcb0a7bde0',
+            constants.RUNTIME_CONFIG_STATE_SUCCESS, duration=3.5)
+        self._create_runtime_config(
+            '4d0a0bd6-8b1f-4f55-bdc2-1c8b6f38f3c4',
+            constants.RUNTIME_CONFIG_STATE_FAILED, error='puppet failed')
+
+        result = self.get_json('/ihosts/%s/runtime_configs' % self.host.uuid)
+        records = result['runtime_configs']
+        self.assertEqual(2, len(records))
+        # the most recent apply is listed first
+        self.assertEqual(constants.RUNTIME_CONFIG_STATE_FAILED,
+                         records[0]['state'])
+        self.assertEqual('puppet failed', records[0]['error'])
+        self.assertEqual(constants.RUNTIME_CONFIG_STATE_SUCCESS,
+                         records[1]['state'])
+        self.assertEqual(3.5, records[1]['duration'])
+        self.assertEqual(self.host.uuid, records[1]['host_uuid'])
+        self.assertNotIn('forihostid', records[1])
@@ -36,9 +36,12 @@ from oslo_config import cfg
 from oslo_db.sqlalchemy import enginefacade
 import copy
 import fixtures
+import glob
+import hashlib
 import mock
 import os
 import shutil
+import sqlite3
 import sys
 import testtools
 import eventlet
@@ -48,12 +51,36 @@ eventlet.monkey_patch(os=False)
 CONF = cfg.CONF
 _DB_CACHE = None
 
+MIGRATE_REPO = os.path.join(os.path.dirname(__file__), '..', 'db',
+                            'sqlalchemy', 'migrate_repo')
+TEMPLATE_PREFIX = 'template-'
+
 logging.setup('sysinv')
 
 sys.modules['fm_core'] = mock.Mock()
 
 
+def _get_template_path():
+    """Path of the migrated database template of the current schema."""
+    digest = hashlib.sha1()
+    for directory, dirs, files in os.walk(MIGRATE_REPO):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(('.py', '.sql', '.cfg')):
+                path = os.path.join(directory, name)
+                digest.update(os.path.relpath(path, MIGRATE_REPO).encode())
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+    return paths.state_path_rel(
+        '%s%s.sqlite' % (TEMPLATE_PREFIX, digest.hexdigest()))
+
+
 class Database(fixtures.Fixture):
+    """A migrated database restored for each test.
+
+    The migrated database is cached in a template shared by the test
+    processes until the migrations change.
+    """
 
     def __init__(self, engine, db_migrate, sql_connection,
                  sqlite_db, sqlite_clean_db):
@@ -71,15 +98,36 @@ class Database(fixtures.Fixture):
             testdb = paths.state_path_rel(sqlite_db)
             if os.path.exists(testdb):
                 return
+        cleandb = paths.state_path_rel(sqlite_clean_db)
+        template = _get_template_path()
+        if os.path.exists(template):
+            if sql_connection == "sqlite://":
+                conn = sqlite3.connect(template)
+                try:
+                    self._DB = "".join(line for line in conn.iterdump())
+                finally:
+                    conn.close()
+                self.engine.dispose()
+            else:
+                shutil.copyfile(template, cleandb)
+            return
+
         db_migrate.db_sync()
         self.post_migrations()
+        tmp = '%s.%d' % (template, os.getpid())
         if sql_connection == "sqlite://":
             conn = self.engine.connect()
             self._DB = "".join(line for line in conn.connection.iterdump())
             self.engine.dispose()
+            conn = sqlite3.connect(tmp)
+            try:
+                conn.executescript(self._DB)
+            finally:
+                conn.close()
         else:
-            cleandb = paths.state_path_rel(sqlite_clean_db)
             shutil.copyfile(testdb, cleandb)
+            shutil.copyfile(testdb, tmp)
+        self._save_template(tmp, template)
 
     def setUp(self):
         super(Database, self).setUp()
@@ -95,6 +143,18 @@ class Database(fixtures.Fixture):
     def post_migrations(self):
         """Any addition steps that are needed outside of the migrations."""
 
+    def _save_template(self, tmp, template):
+        # Templates of previous schemas are not used anymore
+        pattern = paths.state_path_rel(TEMPLATE_PREFIX + '*.sqlite')
+        for path in glob.glob(pattern):
+            if path != template:
+                try:
+                    os.remove(path)
+                except OSError:
+                    # Removed by another test process
+                    pass
+        os.rename(tmp, template)
+
 
 class ReplaceModule(fixtures.Fixture):
     """Replace a module with a fake module."""
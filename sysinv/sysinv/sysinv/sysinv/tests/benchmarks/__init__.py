@@ -0,0 +1,26 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""The sysinv benchmarks, only run by the bench tox environment."""
+
+import fnmatch
+import os
+import pkgutil
+
+
+def load_tests(loader, tests, pattern):
+    """Skip the benchmarks unless SYSINV_BENCH is set.
+
+    The benchmarks are discovered with the unit tests, they only run when
+    SYSINV_BENCH is set in the environment, as done by tox -e bench.
+    """
+    if not os.environ.get('SYSINV_BENCH'):
+        return loader.suiteClass()
+    for _, name, _ in pkgutil.iter_modules(__path__):
+        if fnmatch.fnmatch(name + '.py', pattern or 'test*.py'):
+            tests.addTests(loader.loadTestsFromName(
+                '%s.%s' % (__name__, name)))
+    return tests
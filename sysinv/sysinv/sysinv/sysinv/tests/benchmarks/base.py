@@ -0,0 +1,110 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Base classes for the sysinv benchmarks.
+
+Each measured operation runs SYSINV_BENCH_ITERATIONS times (default 1).
+Its timings and the number of statements it executed are attached to the
+details of the test and, when SYSINV_BENCH_OUTPUT names a file, appended
+to it as one JSON document per line.
+"""
+
+import keyring
+import mock
+import os
+import time
+
+from testtools import content
+
+from sysinv.common import utils as cutils
+from sysinv.conductor import manager
+from sysinv.db import api as dbapi
+from sysinv.db.sqlalchemy import statements
+from sysinv.openstack.common import context
+from sysinv.openstack.common import jsonutils
+from sysinv.tests.benchmarks import system
+from sysinv.tests.db import base
+
+DEFAULT_ITERATIONS = 1
+
+
+class BenchmarkMixin(object):
+    """Measure operations on a synthetic system and publish the results."""
+
+    def setUp(self):
+        super(BenchmarkMixin, self).setUp()
+        self.dbapi = dbapi.get_instance()
+        self.iterations = int(os.environ.get('SYSINV_BENCH_ITERATIONS',
+                                             DEFAULT_ITERATIONS))
+        self.results = []
+        self.addCleanup(self._publish)
+
+        # The conductor runs on the first controller of physical hosts and
+        # does not reach any agent
+        self.conductor = manager.ConductorManager('test-host', 'test-topic')
+        self.conductor.dbapi = self.dbapi
+        self.admin_context = context.get_admin_context()
+        for p in (mock.patch.object(manager.socket, 'gethostname',
+                                    return_value='controller-0'),
+                  mock.patch.object(manager.ConductorManager, 'my_host_id',
+                                    None),
+                  mock.patch.object(manager.agent_rpcapi, 'AgentAPI'),
+                  mock.patch.object(cutils, 'is_virtual',
+                                    return_value=False),
+                  # the passwords of the services are in the keyring of
+                  # the controllers
+                  mock.patch.object(keyring, 'get_password',
+                                    return_value=u'synthetic'),
+                  mock.patch.object(keyring, 'set_password')):
+            p.start()
+            self.addCleanup(p.stop)
+
+        self.system = system.SyntheticSystem(self.dbapi, self.conductor,
+                                             self.admin_context)
+        self.system.create()
+
+    def count_statements(self, func, *args, **kwargs):
+        """Run func and return its result and the statements it executed."""
+        with statements.StatementCounter() as counter:
+            result = func(*args, **kwargs)
+        return result, counter.count
+
+    def measure(self, name, func, *args, **kwargs):
+        """Measure func and return the result of its last run."""
+        timings = []
+        queries = 0
+        for i in range(self.iterations):
+            start = time.time()
+            result, queries = self.count_statements(func, *args, **kwargs)
+            timings.append(time.time() - start)
+        self.record(name, timings, queries)
+        return result
+
+    def record(self, name, timings, queries):
+        self.results.append({'test': self.id(),
+                             'name': name,
+                             'size': self.system.size,
+                             'iterations': len(timings),
+                             'min': min(timings),
+                             'mean': sum(timings) / len(timings),
+                             'max': max(timings),
+                             'queries': queries})
+
+    def _publish(self):
+        self.addDetail('benchmarks', content.text_content('\n'.join(
+            '%s: %s queries, min %.6f mean %.6f max %.6f' % (
+                r['name'], r['queries'], r['min'], r['mean'], r['max'])
+            for r in self.results)))
+        output = os.environ.get('SYSINV_BENCH_OUTPUT')
+        if output and self.results:
+            with open(output, 'a') as f:
+                for result in self.results:
+                    f.write(jsonutils.dumps(result) + '\n')
+
+
+class BenchmarkTestCase(BenchmarkMixin, base.DbTestCase):
+    pass
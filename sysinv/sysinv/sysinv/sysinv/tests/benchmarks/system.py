@@ -0,0 +1,484 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Synthetic systems for the sysinv benchmarks.
+
+The inventory of each host is generated as the reports of its agent and
+created through the conductor, the way a real system is inventoried.  The
+size of the system is read from the environment, the defaults keep a
+local run of tox -e bench short:
+
+    SYSINV_BENCH_CONTROLLERS    number of controllers (default 2)
+    SYSINV_BENCH_WORKERS        number of workers (default 2)
+    SYSINV_BENCH_STORAGES       number of storage hosts (default 0)
+"""
+
+import os
+import uuid
+
+from sysinv.common import constants
+from sysinv.common import utils as cutils
+from sysinv.tests.db import utils
+
+DEFAULT_CONTROLLERS = 2
+DEFAULT_WORKERS = 2
+DEFAULT_STORAGES = 0
+
+# Inventory of each host
+NUMA_NODES = 2
+CORES_PER_NODE = 12
+THREADS_PER_CORE = 2
+DISKS = 4
+PARTITIONS_PER_DISK = 3
+PORTS = 6
+SENSORS_PER_GROUP = 8
+
+DISK_SIZE_MIB = 476940
+PARTITION_SIZE_MIB = 20480
+MEMORY_PER_NODE_MIB = 65536
+
+SENSOR_GROUPS = [
+    ('temperature', 'degrees C'),
+    ('fan', 'RPM'),
+    ('voltage', 'Volts'),
+]
+
+# GPT type of the partitions which are not physical volumes
+LINUX_FILESYSTEM_PARTITION = '0fc63daf-8483-4772-8e79-3d69d8477de4'
+
+MGMT_NETWORK = '192.168.0.0'
+MGMT_PREFIX = 16
+
+OAM_NETWORK = '10.10.10.0'
+OAM_PREFIX = 24
+
+CLUSTER_HOST_NETWORK = '192.168.206.0'
+CLUSTER_HOST_PREFIX = 24
+
+REGION_NAME = 'RegionOne'
+
+# management addresses of the system, the hosts are allocated the next ones
+MGMT_SYSTEM_ADDRESSES = [
+    constants.CONTROLLER_HOSTNAME,
+    constants.CONTROLLER_PLATFORM_NFS,
+    constants.CONTROLLER_CGCS_NFS,
+]
+
+
+def get_size(name, default):
+    return int(os.environ.get('SYSINV_BENCH_%s' % name, default))
+
+
+def _get_uuid(*names):
+    """Return a uuid which is the same for every run."""
+    return str(uuid.uuid5(uuid.NAMESPACE_DNS, str('.'.join(names))))
+
+
+class SyntheticSystem(object):
+    """A system of hosts inventoried through the conductor.
+
+    The reports are generated again for every call, the conductor updates
+    the dictionaries it is given.
+    """
+
+    def __init__(self, dbapi, conductor, context, controllers=None,
+                 workers=None, storages=None):
+        self.dbapi = dbapi
+        self.conductor = conductor
+        self.context = context
+        self.controllers = (get_size('CONTROLLERS', DEFAULT_CONTROLLERS)
+                            if controllers is None else controllers)
+        self.workers = (get_size('WORKERS', DEFAULT_WORKERS)
+                        if workers is None else workers)
+        self.storages = (get_size('STORAGES', DEFAULT_STORAGES)
+                         if storages is None else storages)
+        self.hosts = []
+        self._index = {}
+        # the last allocated management address, .1 is the gateway
+        self._addresses = 1
+
+    @property
+    def size(self):
+        return {'controllers': self.controllers,
+                'workers': self.workers,
+                'storages': self.storages}
+
+    def create(self):
+        """Create the system and the inventory of all its hosts."""
+        self.system = utils.create_test_isystem()
+        self.load = utils.create_test_load()
+        self._create_system_config()
+        address_pool = utils.create_test_address_pool(
+            network=MGMT_NETWORK,
+            name='management',
+            ranges=[['192.168.0.2', '192.168.255.254']],
+            prefix=MGMT_PREFIX)
+        self.mgmt_network = utils.create_test_network(
+            type=constants.NETWORK_TYPE_MGMT,
+            address_pool_id=address_pool.id)
+        for name in MGMT_SYSTEM_ADDRESSES:
+            self._create_mgmt_address(name, address_pool)
+        self._create_controller_network(constants.NETWORK_TYPE_OAM,
+                                        OAM_NETWORK, OAM_PREFIX)
+        self._create_controller_network(constants.NETWORK_TYPE_CLUSTER_HOST,
+                                        CLUSTER_HOST_NETWORK,
+                                        CLUSTER_HOST_PREFIX)
+
+        hosts = (
+            [(constants.CONTROLLER, i) for i in range(self.controllers)] +
+            [(constants.WORKER, i) for i in range(self.workers)] +
+            [(constants.STORAGE, i) for i in range(self.storages)])
+        for personality, i in hosts:
+            host = self._create_host(personality, i, address_pool)
+            self.report_inventory(host)
+            self._create_sensors(host)
+        # the host records as updated by the reports
+        self.hosts = self.dbapi.ihost_get_list()
+        self._create_ceph_mons()
+
+    def _create_system_config(self):
+        """Create the system configuration of the bootstrap."""
+        system_id = self.system.id
+        self.system = self.dbapi.isystem_update(
+            self.system.uuid, {'region_name': REGION_NAME})
+        self.dbapi.idns_create({'forisystemid': system_id,
+                                'nameservers': '8.8.8.8,8.8.4.4'})
+        self.dbapi.intp_create({'forisystemid': system_id,
+                                'ntpservers': '0.pool.ntp.org,1.pool.ntp.org'})
+        self.dbapi.ptp_create({'system_id': system_id})
+        self.dbapi.drbdconfig_create({'forisystemid': system_id,
+                                      'link_util': 40,
+                                      'num_parallel': 1,
+                                      'rtt_ms': 0.2})
+        self.dbapi.iuser_create({'forisystemid': system_id,
+                                 'root_sig': 'synthetic',
+                                 'passwd_expiry_days': 90})
+        self.dbapi.remotelogging_create({'system_id': system_id})
+
+        backend = utils.get_test_ceph_storage_backend(
+            forisystemid=system_id,
+            state=constants.SB_STATE_CONFIGURED,
+            services=','.join([constants.SB_SVC_CINDER,
+                               constants.SB_SVC_GLANCE,
+                               constants.SB_SVC_NOVA]),
+            capabilities={constants.CEPH_BACKEND_REPLICATION_CAP: '2',
+                          constants.CEPH_BACKEND_MIN_REPLICATION_CAP: '1'})
+        del backend['id']
+        backend = self.dbapi.storage_ceph_create(backend)
+        cluster = utils.create_test_cluster(
+            system_id=system_id, name=constants.CLUSTER_CEPH_DEFAULT_NAME)
+        utils.create_test_storage_tier(
+            forclusterid=cluster.id,
+            forbackendid=backend.id,
+            status=constants.SB_TIER_STATUS_IN_USE)
+
+    def _create_ceph_mons(self):
+        """Create the monitors of the controllers and of the first worker."""
+        hosts = ([h for h in self.hosts
+                  if h.personality == constants.CONTROLLER][:2] +
+                 [h for h in self.hosts
+                  if h.personality == constants.WORKER][:1])
+        for host in hosts:
+            self.dbapi.ceph_mon_create({
+                'forihostid': host.id,
+                'device_path': '/dev/sda',
+                'ceph_mon_gib': constants.SB_CEPH_MON_GIB,
+                'state': constants.SB_STATE_CONFIGURED})
+
+    def _create_controller_network(self, networktype, network, prefix):
+        """Create a network with addresses for the controllers only."""
+        subnet = network.rsplit('.', 1)[0]
+        address_pool = utils.create_test_address_pool(
+            network=network,
+            name=networktype,
+            ranges=[['%s.1' % subnet, '%s.254' % subnet]],
+            prefix=prefix)
+        utils.create_test_network(
+            type=networktype,
+            address_pool_id=address_pool.id)
+        names = [constants.CONTROLLER_HOSTNAME,
+                 constants.CONTROLLER_0_HOSTNAME,
+                 constants.CONTROLLER_1_HOSTNAME]
+        for i, name in enumerate(names):
+            utils.create_test_address(
+                name=cutils.format_address_name(name, networktype),
+                family=constants.IPV4_FAMILY,
+                address='%s.%d' % (subnet, i + 2),
+                prefix=prefix,
+                address_pool_id=address_pool.id)
+
+    def _create_mgmt_address(self, name, address_pool):
+        self._addresses += 1
+        address = utils.create_test_address(
+            name=cutils.format_address_name(
+                name, constants.NETWORK_TYPE_MGMT),
+            family=constants.IPV4_FAMILY,
+            address='192.168.%d.%d' % (self._addresses // 256,
+                                       self._addresses % 256),
+            prefix=MGMT_PREFIX,
+            address_pool_id=address_pool.id)
+        return address.address
+
+    def _create_host(self, personality, i, address_pool):
+        index = len(self._index)
+        hostname = '%s-%d' % (personality, i)
+        self._index[hostname] = index
+        mgmt_ip = self._create_mgmt_address(hostname, address_pool)
+        host = utils.create_test_ihost(
+            forisystemid=self.system.id,
+            hostname=hostname,
+            personality=personality,
+            subfunctions=personality,
+            mgmt_mac=self.get_mac(hostname, 0),
+            mgmt_ip=mgmt_ip,
+            serialid='SN%08d' % index,
+            invprovision=constants.PROVISIONED,
+            administrative=constants.ADMIN_UNLOCKED,
+            operational=constants.OPERATIONAL_ENABLED,
+            availability=constants.AVAILABILITY_AVAILABLE)
+        self.hosts.append(host)
+        return host
+
+    def report_inventory(self, host):
+        """Report the inventory of a host as its agent does."""
+        conductor = self.conductor
+        conductor.iport_update_by_ihost(
+            self.context, host.uuid, self.get_port_report(host))
+        conductor.inumas_update_by_ihost(
+            self.context, host.uuid, self.get_numa_report(host))
+        conductor.icpus_update_by_ihost(
+            self.context, host.uuid, self.get_cpu_report(host))
+        conductor.imemory_update_by_ihost(
+            self.context, host.uuid, self.get_memory_report(host), True)
+        conductor.idisk_update_by_ihost(
+            self.context, host.uuid, self.get_disk_report(host))
+        conductor.ipartition_update_by_ihost(
+            self.context, host.uuid, self.get_partition_report(host))
+        conductor.ilvg_update_by_ihost(
+            self.context, host.uuid, self.get_lvg_report(host))
+        conductor.ipv_update_by_ihost(
+            self.context, host.uuid, self.get_pv_report(host))
+        conductor.lldp_agent_update_by_host(
+            self.context, host.uuid, self.get_lldp_agent_report(host))
+        conductor.lldp_neighbour_update_by_host(
+            self.context, host.uuid, self.get_lldp_neighbour_report(host))
+
+    def _create_sensors(self, host):
+        for sensortype, unit in SENSOR_GROUPS:
+            group = self.dbapi.isensorgroup_analog_create(host.id, {
+                'sensortype': sensortype,
+                'datatype': 'analog',
+                'sensorgroupname': 'Server %s' % sensortype,
+                'path': '/',
+                'state': 'enabled',
+                'unit_base_group': unit})
+            for i in range(SENSORS_PER_GROUP):
+                self.dbapi.isensor_analog_create(host.id, {
+                    'sensorgroup_id': group.id,
+                    'sensortype': sensortype,
+                    'datatype': 'analog',
+                    'sensorname': '%s %d' % (sensortype, i),
+                    'path': '/',
+                    'status': 'ok',
+                    'state': 'enabled',
+                    'unit_base': unit})
+
+    def get_mac(self, hostname, port):
+        index = self._index[hostname]
+        return '08:00:%02x:%02x:%02x:%02x' % (
+            (index >> 16) & 0xff, (index >> 8) & 0xff, index & 0xff, port)
+
+    def _get_lvgs(self, host):
+        if host.personality == constants.WORKER:
+            return [constants.LVG_CGTS_VG, constants.LVG_NOVA_LOCAL]
+        return [constants.LVG_CGTS_VG]
+
+    def get_port_report(self, host):
+        return [{'pciaddr': '0000:%02x:00.%d' % (p // 2 + 1, p % 2),
+                 'pclass': 'Ethernet controller',
+                 'pvendor': 'Intel Corporation',
+                 'pdevice': 'Ethernet Controller X710 for 10GbE SFP+',
+                 'prevision': '-r01',
+                 'psvendor': 'Intel Corporation',
+                 'psdevice': 'Ethernet Converged Network Adapter X710-2',
+                 'pname': 'enp%ds0f%d' % (p // 2 + 1, p % 2),
+                 'numa_node': p % NUMA_NODES,
+                 'sriov_totalvfs': 64,
+                 'sriov_numvfs': 0,
+                 'sriov_vfs_pci_address': '',
+                 'driver': 'i40e',
+                 'mac': self.get_mac(host.hostname, p),
+                 'mtu': constants.DEFAULT_MTU,
+                 'speed': 10000,
+                 'link_mode': '0',
+                 'dev_id': 0,
+                 'dpdksupport': True}
+                for p in range(PORTS)]
+
+    def get_numa_report(self, host):
+        return [{'numa_node': n, 'capabilities': {}}
+                for n in range(NUMA_NODES)]
+
+    def get_cpu_report(self, host):
+        cpus = []
+        threads = NUMA_NODES * CORES_PER_NODE
+        for thread in range(THREADS_PER_CORE):
+            for node in range(NUMA_NODES):
+                for core in range(CORES_PER_NODE):
+                    cpus.append({
+                        'cpu': thread * threads + node * CORES_PER_NODE + core,
+                        'numa_node': node,
+                        'core': core,
+                        'thread': thread,
+                        'cpu_family': '6',
+                        'cpu_model': 'Intel(R) Xeon(R) CPU E5-2680 v4',
+                        'capabilities': {}})
+        return cpus
+
+    def get_memory_report(self, host):
+        return [{'numa_node': n,
+                 'memtotal_mib': MEMORY_PER_NODE_MIB,
+                 'memavail_mib': MEMORY_PER_NODE_MIB // 2,
+                 'node_memtotal_mib': MEMORY_PER_NODE_MIB * 2,
+                 'hugepages_configured': True,
+                 'vswitch_hugepages_size_mib': 1024,
+                 'vswitch_hugepages_nr': 1,
+                 'vswitch_hugepages_avail': 0,
+                 'vm_hugepages_nr_2M': 1024,
+                 'vm_hugepages_avail_2M': 1024,
+                 'vm_hugepages_nr_1G': 16,
+                 'vm_hugepages_avail_1G': 16,
+                 'vm_hugepages_use_1G': True,
+                 'vm_hugepages_possible_2M': 28000,
+                 'vm_hugepages_possible_1G': 54,
+                 'capabilities': {}}
+                for n in range(NUMA_NODES)]
+
+    def _get_disk_path(self, d):
+        return '/dev/disk/by-path/pci-0000:00:1f.2-ata-%d.0' % (d + 1)
+
+    def _get_disk_node(self, d):
+        return '/dev/sd%s' % chr(ord('a') + d)
+
+    def get_disk_report(self, host):
+        disks = []
+        for d in range(DISKS):
+            capabilities = {'model_num': 'SYNTHETIC DISK'}
+            if d == 0:
+                capabilities['stor_function'] = 'rootfs'
+            disks.append({
+                'device_node': self._get_disk_node(d),
+                'device_num': 2048 + 16 * d,
+                'device_type': (constants.DEVICE_TYPE_SSD if d < 2 else
+                                constants.DEVICE_TYPE_HDD),
+                'device_path': self._get_disk_path(d),
+                'device_id': 'ata-SYNTHETIC_%s_%d' % (host.hostname, d),
+                'device_wwn': '0x5000c500%08x' % (
+                    self._index[host.hostname] * DISKS + d),
+                'size_mib': DISK_SIZE_MIB,
+                'available_mib': (DISK_SIZE_MIB -
+                                  PARTITIONS_PER_DISK * PARTITION_SIZE_MIB),
+                'serial_id': 'SN%s%d' % (host.hostname, d),
+                'capabilities': capabilities,
+                'rpm': 'Undetermined' if d < 2 else '7200'})
+        return disks
+
+    def get_partition_report(self, host):
+        partitions = []
+        for d in range(DISKS):
+            for p in range(PARTITIONS_PER_DISK):
+                device_path = '%s-part%d' % (self._get_disk_path(d), p + 1)
+                start_mib = 1 + p * PARTITION_SIZE_MIB
+                # the last partition of each disk is an LVM physical volume
+                if p == PARTITIONS_PER_DISK - 1:
+                    type_guid = constants.USER_PARTITION_PHYSICAL_VOLUME
+                    type_name = constants.PARTITION_NAME_PV
+                else:
+                    type_guid = LINUX_FILESYSTEM_PARTITION
+                    type_name = 'Linux filesystem'
+                partitions.append({
+                    'device_node': '%s%d' % (self._get_disk_node(d), p + 1),
+                    'device_path': device_path,
+                    'start_mib': start_mib,
+                    'end_mib': start_mib + PARTITION_SIZE_MIB,
+                    'size_mib': PARTITION_SIZE_MIB,
+                    'type_guid': type_guid,
+                    'type_name': type_name,
+                    'uuid': _get_uuid(host.hostname, device_path)})
+        return partitions
+
+    def get_lvg_report(self, host):
+        pe_total = PARTITION_SIZE_MIB // 4
+        return [{'lvm_vg_name': name,
+                 'lvm_vg_uuid': _get_uuid(host.hostname, name),
+                 'lvm_vg_access': 'wz--n-',
+                 'lvm_max_lv': 0,
+                 'lvm_cur_lv': 8,
+                 'lvm_max_pv': 0,
+                 'lvm_cur_pv': 1,
+                 'lvm_vg_size': pe_total * 4 * 1024 * 1024,
+                 'lvm_vg_total_pe': pe_total,
+                 'lvm_vg_free_pe': pe_total // 2}
+                for name in self._get_lvgs(host)]
+
+    def get_pv_report(self, host):
+        pvs = []
+        pe_total = PARTITION_SIZE_MIB // 4
+        for d, name in enumerate(self._get_lvgs(host)):
+            pv_name = '%s%d' % (self._get_disk_node(d), PARTITIONS_PER_DISK)
+            pvs.append({'lvm_pv_name': pv_name,
+                        'lvm_vg_name': name,
+                        'lvm_pv_uuid': _get_uuid(host.hostname, pv_name),
+                        'lvm_pv_size': pe_total * 4 * 1024 * 1024,
+                        'lvm_pe_total': pe_total,
+                        'lvm_pe_alloced': pe_total // 2})
+        return pvs
+
+    def _get_lldp_tlvs(self, host, p):
+        port_name = 'enp%ds0f%d' % (p // 2 + 1, p % 2)
+        return {
+            'name_or_uuid': port_name,
+            'state': None,
+            constants.LLDP_TLV_TYPE_CHASSIS_ID: self.get_mac(host.hostname, 0),
+            constants.LLDP_TLV_TYPE_PORT_ID: self.get_mac(host.hostname, p),
+            constants.LLDP_TLV_TYPE_TTL: '120',
+            constants.LLDP_TLV_TYPE_SYSTEM_NAME: host.hostname,
+            constants.LLDP_TLV_TYPE_SYSTEM_DESC: 'synthetic host',
+            constants.LLDP_TLV_TYPE_SYSTEM_CAP: 'station',
+            constants.LLDP_TLV_TYPE_MGMT_ADDR: host.mgmt_ip,
+            constants.LLDP_TLV_TYPE_PORT_DESC: port_name,
+            constants.LLDP_TLV_TYPE_DOT1_LAG: 'capable=y,enabled=n',
+            constants.LLDP_TLV_TYPE_DOT1_VLAN_NAMES: None,
+            constants.LLDP_TLV_TYPE_DOT3_MAX_FRAME: '9216',
+        }
+
+    def get_lldp_agent_report(self, host):
+        agents = []
+        for p in range(PORTS):
+            agent = self._get_lldp_tlvs(host, p)
+            agent['status'] = 'rx=enabled,tx=enabled'
+            agents.append(agent)
+        return agents
+
+    def get_lldp_neighbour_report(self, host):
+        neighbours = []
+        for p in range(PORTS):
+            # each port is connected to a port of a top of rack switch
+            switch = 'tor-%d' % (p % 2)
+            neighbour = self._get_lldp_tlvs(host, p)
+            neighbour.update({
+                'msap': '%s,%s' % (self.get_mac(host.hostname, p), switch),
+                constants.LLDP_TLV_TYPE_SYSTEM_NAME: switch,
+                constants.LLDP_TLV_TYPE_SYSTEM_DESC: 'top of rack switch',
+                constants.LLDP_TLV_TYPE_SYSTEM_CAP: 'bridge,router',
+                constants.LLDP_TLV_TYPE_PORT_DESC: 'Ethernet%d/%d' % (
+                    p, self._index[host.hostname]),
+                constants.LLDP_TLV_TYPE_DOT1_PORT_VID: '1',
+                constants.LLDP_TLV_TYPE_DOT3_MAC_STATUS:
+                    'auto-negotiation-capable=y'})
+            neighbours.append(neighbour)
+        return neighbours
@@ -0,0 +1,23 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Benchmarks of the host listing of the API."""
+
+from sysinv.tests.api import base as api_base
+from sysinv.tests.benchmarks import base
+
+
+class HostListBenchmark(base.BenchmarkMixin, api_base.FunctionalTest):
+
+    def test_ihost_get_list(self):
+        hosts = self.measure('ihost_get_list', self.dbapi.ihost_get_list)
+        self.assertEqual(len(self.system.hosts), len(hosts))
+
+    def test_get_ihosts(self):
+        # the hosts of the database and their conversion to the collection
+        data = self.measure('GET /ihosts', self.get_json, '/ihosts')
+        self.assertEqual(len(self.system.hosts), len(data['ihosts']))
@@ -0,0 +1,47 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Benchmarks of the conductor handlers of the agent reports and audits.
+
+The reports are the ones of a host whose inventory did not change, which
+is what the conductor handles in the steady state of a system.
+"""
+
+from sysinv.tests.benchmarks import base
+
+# handler, report builder and extra arguments of each agent report
+REPORTS = [
+    ('iport_update_by_ihost', 'get_port_report', ()),
+    ('inumas_update_by_ihost', 'get_numa_report', ()),
+    ('icpus_update_by_ihost', 'get_cpu_report', ()),
+    ('imemory_update_by_ihost', 'get_memory_report', (True,)),
+    ('idisk_update_by_ihost', 'get_disk_report', ()),
+    ('ipartition_update_by_ihost', 'get_partition_report', ()),
+    ('ilvg_update_by_ihost', 'get_lvg_report', ()),
+    ('ipv_update_by_ihost', 'get_pv_report', ()),
+    ('lldp_agent_update_by_host', 'get_lldp_agent_report', ()),
+    ('lldp_neighbour_update_by_host', 'get_lldp_neighbour_report', ()),
+]
+
+
+class ConductorBenchmark(base.BenchmarkTestCase):
+
+    def _measure_report(self, handler, builder, args):
+        for host in self.system.hosts:
+            self.measure('%s(%s)' % (handler, host.hostname),
+                         lambda: getattr(self.conductor, handler)(
+                             self.admin_context, host.uuid,
+                             getattr(self.system, builder)(host), *args))
+
+    def test_agent_reports(self):
+        for handler, builder, args in REPORTS:
+            self._measure_report(handler, builder, args)
+
+    def test_agent_update_request(self):
+        self.measure('_agent_update_request',
+                     self.conductor._agent_update_request,
+                     self.admin_context)
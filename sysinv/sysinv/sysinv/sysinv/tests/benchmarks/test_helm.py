@@ -0,0 +1,25 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Benchmarks of the generation of the helm chart overrides."""
+
+from sysinv.helm import helm
+from sysinv.tests.benchmarks import base
+
+
+class HelmBenchmark(base.BenchmarkTestCase):
+
+    def setUp(self):
+        super(HelmBenchmark, self).setUp()
+        self.operator = helm.HelmOperator(self.dbapi)
+
+    def test_get_helm_chart_overrides(self):
+        for chart in self.operator.implemented_charts:
+            name = 'get_helm_chart_overrides(%s)' % chart
+            overrides = self.measure(
+                name, self.operator.get_helm_chart_overrides, chart)
+            self.assertTrue(overrides, chart)
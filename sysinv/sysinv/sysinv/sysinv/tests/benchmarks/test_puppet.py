@@ -0,0 +1,56 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Benchmarks of the generation of the host hiera configuration."""
+
+import fixtures
+import os
+import time
+
+from sysinv.puppet import puppet
+from sysinv.tests.benchmarks import base
+
+
+class PuppetBenchmark(base.BenchmarkTestCase):
+
+    def setUp(self):
+        super(PuppetBenchmark, self).setUp()
+        self.path = self.useFixture(fixtures.TempDir()).path
+        self.operator = puppet.PuppetOperator(self.dbapi, self.path)
+        self.timings = {}
+        self.queries = {}
+        for plugin in self.operator.puppet_plugins:
+            self._wrap_plugin(plugin)
+
+    def _wrap_plugin(self, plugin):
+        """Time the host configuration of a plugin."""
+        get_host_config = plugin.obj.get_host_config
+
+        def timed_get_host_config(host):
+            start = time.time()
+            result, queries = self.count_statements(get_host_config, host)
+            self.timings.setdefault(plugin.name, []).append(
+                time.time() - start)
+            self.queries[plugin.name] = queries
+            return result
+
+        plugin.obj.get_host_config = timed_get_host_config
+
+    def test_update_host_config(self):
+        for host in self.system.hosts:
+            self.timings = {}
+            self.queries = {}
+            self.measure('update_host_config(%s)' % host.hostname,
+                         self.operator.update_host_config, host)
+            self.assertEqual(
+                set(p.name for p in self.operator.puppet_plugins),
+                set(self.timings))
+            self.assertTrue(os.path.exists(
+                os.path.join(self.path, '%s.yaml' % host.mgmt_ip)))
+            for name, timings in sorted(self.timings.items()):
+                self.record('%s.get_host_config(%s)' % (name, host.hostname),
+                            timings, self.queries[name])
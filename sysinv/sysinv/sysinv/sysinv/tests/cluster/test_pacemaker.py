@@ -0,0 +1,193 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Test class for the Sysinv pacemaker CIB parsing and caching."""
+
+import io
+import mock
+
+from sysinv.cluster import pacemaker
+from sysinv.tests import base
+
+CIB = b"""<cib epoch="10" num_updates="2">
+  <configuration>
+    <nodes>
+      <node id="controller-0" uname="controller-0">
+        <instance_attributes id="nodes-controller-0">
+          <nvpair id="nodes-controller-0-standby" name="standby"
+                  value="off"/>
+        </instance_attributes>
+      </node>
+      <node id="controller-1" uname="controller-1">
+        <instance_attributes id="nodes-controller-1">
+          <nvpair id="nodes-controller-1-standby" name="standby"
+                  value="on"/>
+        </instance_attributes>
+      </node>
+    </nodes>
+    <resources>
+      <primitive id="management_ip" class="ocf" type="IPaddr2">
+        <instance_attributes id="management_ip-attrs">
+          <nvpair id="management_ip-standby" name="standby" value="on"/>
+        </instance_attributes>
+      </primitive>
+    </resources>
+  </configuration>
+  <status>
+    <node_state id="controller-0" in_ccm="true" crmd="online">
+      <lrm id="controller-0">
+        <lrm_resources>
+          <lrm_resource id="management_ip">
+            <lrm_rsc_op id="management_ip_last_0" operation="start"
+                        rc-code="0"/>
+            <lrm_rsc_op id="management_ip_monitor" operation="monitor"
+                        rc-code="1"/>
+          </lrm_resource>
+          <lrm_resource id="drbd-pg">
+            <lrm_rsc_op id="drbd-pg_last_0" operation="monitor"
+                        rc-code="7"/>
+          </lrm_resource>
+          <lrm_resource id="pg-fs">
+            <lrm_rsc_op id="pg-fs_last_0" operation="stop" rc-code="1"/>
+          </lrm_resource>
+        </lrm_resources>
+      </lrm>
+    </node_state>
+    <node_state id="controller-1" in_ccm="true" crmd="offline">
+      <lrm id="controller-1">
+        <lrm_resources>
+          <lrm_resource id="management_ip">
+            <lrm_rsc_op id="management_ip_last_0" operation="stop"
+                        rc-code="0"/>
+          </lrm_resource>
+        </lrm_resources>
+      </lrm>
+    </node_state>
+    <node_state id="storage-0" in_ccm="false" crmd="online"/>
+  </status>
+</cib>
+"""
+
+
+class PaceMakerCibTestCase(base.TestCase):
+
+    def setUp(self):
+        super(PaceMakerCibTestCase, self).setUp()
+        self.cib = pacemaker.PaceMakerCib.parse(io.BytesIO(CIB))
+
+    def test_parse(self):
+        # only the node standby attributes are indexed
+        self.assertEqual({'controller-0': ('standby', 'off'),
+                          'controller-1': ('standby', 'on')},
+                         self.cib.standby)
+        self.assertEqual({'controller-0': ('true', 'online'),
+                          'controller-1': ('true', 'offline'),
+                          'storage-0': ('false', 'online')},
+                         self.cib.node_states)
+        # the first operation of each resource is kept
+        self.assertEqual(
+            {('controller-0', 'management_ip'): ('start', '0'),
+             ('controller-0', 'drbd-pg'): ('monitor', '7'),
+             ('controller-0', 'pg-fs'): ('stop', '1'),
+             ('controller-1', 'management_ip'): ('stop', '0')},
+            self.cib.resource_ops)
+
+    def test_parse_empty(self):
+        self.assertIsNone(pacemaker.PaceMakerCib.parse(io.BytesIO(b'<cib/>')))
+
+    def test_node_and_resource_state(self):
+        pm = pacemaker.Pacemaker()
+        pm._cib = self.cib
+
+        self.assertEqual(pacemaker.NODE_STATE_ONLINE,
+                         pm.get_node('controller-0').state)
+        # standby wins over the running state
+        self.assertEqual(pacemaker.NODE_STATE_OFFLINE,
+                         pm.get_node('controller-1').state)
+        self.assertEqual(pacemaker.NODE_STATE_OFFLINE,
+                         pm.get_node('storage-0').state)
+        self.assertIsNone(pm.get_node('storage-1'))
+
+        self.assertEqual(pacemaker.RESOURCE_STATE_ENABLED,
+                         pm.get_resource('controller-0',
+                                         'management_ip').state)
+        self.assertEqual(pacemaker.RESOURCE_STATE_DISABLED,
+                         pm.get_resource('controller-0', 'drbd-pg').state)
+        self.assertEqual(pacemaker.RESOURCE_STATE_FAILED,
+                         pm.get_resource('controller-0', 'pg-fs').state)
+        self.assertEqual(pacemaker.RESOURCE_STATE_DISABLED,
+                         pm.get_resource('controller-1',
+                                         'management_ip').state)
+        self.assertIsNone(pm.get_resource('controller-1', 'drbd-pg'))
+
+
+class PacemakerLoadTestCase(base.TestCase):
+
+    def setUp(self):
+        super(PacemakerLoadTestCase, self).setUp()
+        pacemaker.Pacemaker.invalidate()
+        self.addCleanup(pacemaker.Pacemaker.invalidate)
+
+        self.now = 1000.0
+        for p in (mock.patch.object(pacemaker.os.path, 'exists',
+                                    return_value=True),
+                  mock.patch.object(pacemaker.os, 'system'),
+                  mock.patch.object(pacemaker.time, 'time',
+                                    side_effect=lambda: self.now)):
+            p.start()
+            self.addCleanup(p.stop)
+
+        patcher = mock.patch.object(pacemaker.subprocess, 'Popen',
+                                    side_effect=self._popen)
+        self.popen = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _popen(self, *args, **kwargs):
+        return mock.MagicMock(stdout=io.BytesIO(CIB), returncode=0)
+
+    def _load(self):
+        pm = pacemaker.Pacemaker()
+        pm.load()
+        return pm
+
+    def test_cache_hit(self):
+        pm = self._load()
+        self.assertEqual(pacemaker.NODE_STATE_ONLINE,
+                         pm.get_node('controller-0').state)
+
+        self.now += pacemaker.CIB_CACHE_TTL - 1
+        other = self._load()
+        self.assertEqual(1, self.popen.call_count)
+        self.assertIs(pm._cib, other._cib)
+
+    def test_cache_expiry(self):
+        self._load()
+        self.now += pacemaker.CIB_CACHE_TTL
+        self._load()
+        self.assertEqual(2, self.popen.call_count)
+
+    def test_invalidated_by_write(self):
+        pm = self._load()
+        self.assertTrue(pm.set_node_state('controller-1',
+                                          pacemaker.NODE_STATE_ONLINE))
+        self._load()
+        self.assertEqual(2, self.popen.call_count)
+
+        self.assertTrue(pm.migrate_resource_to_node('management_ip',
+                                                    'controller-1', 60))
+        self._load()
+        self.assertEqual(3, self.popen.call_count)
+
+    def test_failed_read_not_cached(self):
+        self.popen.side_effect = lambda *args, **kwargs: mock.MagicMock(
+            stdout=io.BytesIO(CIB), returncode=1)
+        pm = self._load()
+        self.assertIsNone(pm.get_node('controller-0'))
+
+        self.popen.side_effect = self._popen
+        pm = self._load()
+        self.assertEqual(2, self.popen.call_count)
+        self.assertIsNotNone(pm.get_node('controller-0'))
@@ -12,6 +12,7 @@ import mock
 from cephclient import wrapper as ceph
 
 from sysinv.common import constants
+from sysinv.common import exception
 from sysinv.conductor import manager
 from sysinv.conductor import ceph as iceph
 from sysinv.db import api as dbapi
@@ -443,3 +444,239 @@ class UpdateCephCluster(base.DbTestCase):
             set([(p.name, tuple(sorted(p.hosts))) for p in peers]),
             {('group-0', ('storage-0', 'storage-1')),
              ('group-1', ('storage-2', 'storage-3'))})
+
+
+class CephSnapshotTestCase(base.DbTestCase):
+
+    def setUp(self):
+        super(CephSnapshotTestCase, self).setUp()
+        self.dbapi = dbapi.get_instance()
+        with mock.patch.object(ceph.CephWrapper, 'fsid') as mock_fsid:
+            mock_fsid.return_value = (mock.MagicMock(ok=False), None)
+            self.operator = iceph.CephOperator(self.dbapi)
+
+        self.ok = mock.MagicMock(ok=True)
+        self.views = {
+            'status': {'output': {'health': {
+                'overall_status': constants.CEPH_HEALTH_OK}}},
+            'df': {'output': {'stats': {'total_bytes': 100},
+                              'pools': [{'name': 'kube-rbd'}]}},
+            'osd_stat': {'output': {'num_osds': 2, 'num_up_osds': 2,
+                                    'num_in_osds': 2}},
+            'osd_dump': {'output': {'pools': [
+                {'pool_name': 'kube-rbd', 'pg_num': 64, 'pg_placement_num': 64,
+                 'quota_max_bytes': 1024, 'quota_max_objects': 0}]}},
+        }
+        self.mocks = {}
+        for view, body in self.views.items():
+            patcher = mock.patch.object(ceph.CephWrapper, view)
+            self.mocks[view] = patcher.start()
+            self.mocks[view].return_value = (self.ok, body)
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(iceph.rpc, 'call')
+        self.mock_tiers = patcher.start()
+        self.mock_tiers.return_value = {'storage-tier': 100}
+        self.addCleanup(patcher.stop)
+
+    def test_views_served_from_single_refresh(self):
+        self.assertTrue(self.operator.ceph_status_ok())
+        self.assertEqual(self.operator.get_cluster_df_stats(),
+                         {'total_bytes': 100})
+        self.assertEqual(self.operator.get_pools_df_stats(),
+                         [{'name': 'kube-rbd'}])
+        self.assertEqual(self.operator.get_osd_stats()['num_osds'], 2)
+        self.assertEqual(self.operator.get_osd_pool_quota('kube-rbd'),
+                         {'max_bytes': 1024, 'max_objects': 0})
+        self.assertEqual(self.operator.get_ceph_tiers_size(),
+                         {'storage-tier': 100})
+        for view in self.views:
+            self.assertEqual(self.mocks[view].call_count, 1)
+        self.assertEqual(self.mock_tiers.call_count, 1)
+
+    def test_force_refresh_and_invalidate(self):
+        self.operator.get_pools_df_stats()
+        self.operator.get_pools_df_stats(force_refresh=True)
+        self.assertEqual(self.mocks['df'].call_count, 2)
+
+        self.operator.invalidate_ceph_snapshot()
+        self.operator.get_pools_df_stats()
+        self.assertEqual(self.mocks['df'].call_count, 3)
+
+    def test_views_fetched_on_demand(self):
+        self.assertTrue(self.operator.ceph_status_ok())
+        self.assertEqual(self.mocks['status'].call_count, 1)
+        for view in ('df', 'osd_stat', 'osd_dump'):
+            self.assertFalse(self.mocks[view].called)
+        self.assertFalse(self.mock_tiers.called)
+
+    def test_failed_view_not_cached(self):
+        self.mocks['status'].return_value = (
+            mock.MagicMock(ok=False, reason='timeout'), None)
+        self.assertFalse(self.operator.ceph_status_ok())
+        self.assertFalse(self.operator.ceph_status_ok())
+        self.assertEqual(self.mocks['status'].call_count, 2)
+
+        self.mocks['status'].return_value = (self.ok, self.views['status'])
+        self.assertTrue(self.operator.ceph_status_ok())
+        self.assertTrue(self.operator.ceph_status_ok())
+        self.assertEqual(self.mocks['status'].call_count, 3)
+
+    def test_failed_view_raises(self):
+        self.mocks['df'].return_value = (
+            mock.MagicMock(ok=False, reason='timeout'), None)
+        self.assertRaises(exception.CephGetPoolsUsageFailure,
+                          self.operator.get_pools_df_stats)
+        self.assertTrue(self.operator.ceph_status_ok())
+
+    def test_failed_osd_dump_raises(self):
+        self.mocks['osd_dump'].return_value = (
+            mock.MagicMock(ok=False, reason='timeout'), None)
+        e = self.assertRaises(exception.CephPoolGetQuotaFailure,
+                              self.operator.get_osd_pool_quota, 'kube-rbd')
+        self.assertIn('timeout', str(e))
+        e = self.assertRaises(exception.CephPoolGetFailure,
+                              self.operator.osd_get_pool_quota, 'kube-rbd')
+        self.assertIn('timeout', str(e))
+
+    def test_missing_pool_raises(self):
+        e = self.assertRaises(exception.CephPoolGetQuotaFailure,
+                              self.operator.get_osd_pool_quota, 'unknown')
+        self.assertIn('pool does not exist', str(e))
+        self.assertRaises(exception.CephPoolGetFailure,
+                          self.operator.osd_get_pool_quota, 'unknown')
+
+    def _get_tier_pool(self, pg_num, pgp_num):
+        tier = mock.MagicMock(uuid=uuidutils.generate_uuid())
+        tier.name = 'gold'
+        pool = {'pool_name': constants.CEPH_POOL_KUBE_NAME + '-gold',
+                'pg_num': pg_num, 'pg_placement_num': pgp_num}
+        return tier, pool
+
+    def test_audit_osd_pool_in_sync(self):
+        tier, pool = self._get_tier_pool(0, 0)
+        target = self.operator._calculate_target_pg_num_for_tier_pool(
+            tier, pool['pool_name'], 8, 2)
+        tier, pool = self._get_tier_pool(target, target)
+        self.assertEqual(
+            self.operator.audit_osd_pool_on_tier(tier, pool, 8, 8, 2, True),
+            [])
+
+    def test_audit_osd_pool_updates(self):
+        tier, pool = self._get_tier_pool(64, 32)
+        target = self.operator._calculate_target_pg_num_for_tier_pool(
+            tier, pool['pool_name'], 8, 2)
+        self.assertEqual(
+            self.operator.audit_osd_pool_on_tier(tier, pool, 8, 8, 2, True),
+            [('pgp_num', 64), ('pg_num', target)])
+        self.assertEqual(
+            self.operator.audit_osd_pool_on_tier(tier, pool, 8, 8, 2, False),
+            [('pgp_num', 64)])
+
+    def _setup_pool_audit(self, storage_hosts=3):
+        tier = mock.MagicMock(type=constants.SB_TIER_TYPE_CEPH)
+        tier.name = 'storage'
+        db_api = mock.MagicMock()
+        db_api.storage_tier_get_by_cluster.return_value = [tier]
+        db_api.ihost_get_by_personality.return_value = \
+            [mock.MagicMock()] * storage_hosts
+        db_api.istor_get_all.return_value = []
+        for p in (mock.patch.object(self.operator, '_db_api', db_api),
+                  mock.patch.object(self.operator, 'audit_osd_quotas_for_tier',
+                                    return_value={'kube-rbd': 2048}),
+                  mock.patch.object(self.operator, '_calculate_tier_osds',
+                                    return_value=(8, 8)),
+                  mock.patch.object(self.operator, '_get_tier_pool_names',
+                                    return_value=['kube-rbd']),
+                  mock.patch.object(self.operator, 'audit_osd_pool_on_tier',
+                                    return_value=[('pg_num', 128)]),
+                  mock.patch.object(
+                      iceph.StorageBackendConfig,
+                      'get_ceph_pool_replication', return_value=(2, 1)),
+                  mock.patch.dict(
+                      self.operator.executed_default_quota_check_by_tier,
+                      clear=True)):
+            p.start()
+            self.addCleanup(p.stop)
+
+        self.updates = []
+
+        def set_pool_quota(pool, param, value, body=None):
+            self.updates.append((pool, param, value))
+            return self.ok, None
+
+        def set_pool_param(pool, param, value, force=None, body=None):
+            self.updates.append((pool, param, value))
+            return self.ok, None
+
+        for method, side_effect in (('osd_set_pool_quota', set_pool_quota),
+                                    ('osd_set_pool_param', set_pool_param)):
+            patcher = mock.patch.object(ceph.CephWrapper, method,
+                                        side_effect=side_effect)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _audit_osd_pools(self):
+        with mock.patch.object(iceph.LOG, 'info') as info:
+            with mock.patch.object(self.operator, 'invalidate_ceph_snapshot',
+                                   wraps=self.operator.invalidate_ceph_snapshot
+                                   ) as invalidate:
+                self.operator.audit_osd_pools_by_tier()
+        summaries = [c[0][0] for c in info.call_args_list
+                     if c[0][0].startswith('OSD pool audit:')]
+        self.assertEqual(1, len(summaries))
+        return invalidate.call_count, summaries[0]
+
+    def test_audit_osd_pools_single_pass(self):
+        self._setup_pool_audit()
+        self.operator.ceph_status_ok()
+
+        invalidated, summary = self._audit_osd_pools()
+        self.assertEqual([('kube-rbd', 'max_bytes', 2048),
+                          ('kube-rbd', 'pg_num', 128)], self.updates)
+        self.assertEqual(1, invalidated)
+        self.assertIn('2 updates sent', summary)
+        # the whole pass was computed from the cached views
+        self.assertEqual(1, self.mocks['osd_dump'].call_count)
+        self.assertEqual(1, self.mocks['status'].call_count)
+
+    def test_audit_osd_pools_quotas_only(self):
+        self._setup_pool_audit(storage_hosts=2)
+        invalidated, summary = self._audit_osd_pools()
+        self.assertEqual([('kube-rbd', 'max_bytes', 2048)], self.updates)
+        self.assertEqual(1, invalidated)
+        self.assertIn('1 updates sent', summary)
+
+    def test_audit_osd_pools_in_sync(self):
+        self._setup_pool_audit()
+        self.operator.audit_osd_quotas_for_tier.return_value = {
+            'kube-rbd': 1024}
+        self.operator.audit_osd_pool_on_tier.return_value = []
+        invalidated, summary = self._audit_osd_pools()
+        self.assertEqual([], self.updates)
+        self.assertEqual(0, invalidated)
+
+    def test_audit_osd_pools_osd_dump_failure(self):
+        self._setup_pool_audit()
+        self.mocks['osd_dump'].return_value = (
+            mock.MagicMock(ok=False, reason='timeout'), None)
+        invalidated, summary = self._audit_osd_pools()
+        self.assertEqual([], self.updates)
+        self.assertIn('0 updates sent', summary)
+
+    def test_audit_osd_pools_failed_quota_checked_again(self):
+        self._setup_pool_audit(storage_hosts=2)
+        ceph.CephWrapper.osd_set_pool_quota.side_effect = None
+        ceph.CephWrapper.osd_set_pool_quota.return_value = (
+            mock.MagicMock(ok=False, reason='error'), None)
+
+        def audit_osd_quotas_for_tier(tier):
+            self.operator.executed_default_quota_check_by_tier[
+                tier.name] = True
+            return {'kube-rbd': 2048}
+
+        self.operator.audit_osd_quotas_for_tier.side_effect = \
+            audit_osd_quotas_for_tier
+        invalidated, summary = self._audit_osd_pools()
+        self.assertIn('1 pools failed', summary)
+        self.assertFalse(
+            self.operator.executed_default_quota_check_by_tier['storage'])
@@ -0,0 +1,102 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Test class for the Sysinv conductor RPC lane dispatcher."""
+
+import eventlet
+from eventlet import event
+
+from sysinv.common import exception
+from sysinv.conductor import dispatcher
+from sysinv.openstack.common import context
+from sysinv.tests import base
+
+
+class FakeManager(object):
+
+    RPC_API_VERSION = '1.1'
+
+    def __init__(self):
+        self.reports = []
+        self.release = event.Event()
+
+    def idisk_update_by_ihost(self, context, ihost_uuid, idisk_dict_array):
+        self.reports.append((ihost_uuid, idisk_dict_array))
+        self.release.wait()
+        if idisk_dict_array == ['fail']:
+            raise exception.SysinvException('report failed')
+        return idisk_dict_array
+
+    def update_ihost(self, context, ihost_obj):
+        return ihost_obj
+
+
+class MeteredDispatcherTestCase(base.TestCase):
+
+    def setUp(self):
+        super(MeteredDispatcherTestCase, self).setUp()
+        self.context = context.get_admin_context()
+        self.manager = FakeManager()
+        self.dispatcher = dispatcher.MeteredDispatcher(
+            [self.manager], lane='reports', concurrency=1,
+            coalesce=['idisk_update_by_ihost'])
+
+    def _report(self, ihost_uuid, disks):
+        return eventlet.spawn(self.dispatcher.dispatch, self.context, '1.0',
+                              'idisk_update_by_ihost', None,
+                              ihost_uuid=ihost_uuid, idisk_dict_array=disks)
+
+    def test_dispatch_stats(self):
+        self.assertEqual(
+            'host', self.dispatcher.dispatch(self.context, '1.0',
+                                             'update_ihost', None,
+                                             ihost_obj='host'))
+        stats = self.dispatcher.get_stats()
+        self.assertEqual(0, stats['in_flight'])
+        self.assertEqual(1, stats['max_in_flight'])
+        self.assertEqual(1, stats['methods']['update_ihost']['calls'])
+        self.assertEqual(0, stats['methods']['update_ihost']['failures'])
+
+    def test_queued_report_coalesced(self):
+        threads = [self._report('host-1', ['first'])]
+        eventlet.sleep(0)
+        threads.append(self._report('host-1', ['second']))
+        threads.append(self._report('host-2', ['other']))
+        threads.append(self._report('host-1', ['third']))
+        eventlet.sleep(0)
+        self.assertEqual(1, self.dispatcher.in_flight)
+        self.assertEqual(3, self.dispatcher.queued)
+
+        self.manager.release.send()
+        # the superseded report gets the result of the newer report
+        self.assertEqual([['first'], ['third'], ['other'], ['third']],
+                         [thread.wait() for thread in threads])
+
+        self.assertEqual([('host-1', ['first']),
+                          ('host-2', ['other']),
+                          ('host-1', ['third'])], self.manager.reports)
+        stats = self.dispatcher.get_stats()
+        self.assertEqual(1, stats['coalesced'])
+        self.assertEqual(3, stats['max_queued'])
+        self.assertEqual(0, stats['queued'])
+        self.assertEqual(3,
+                         stats['methods']['idisk_update_by_ihost']['calls'])
+
+    def test_superseding_report_failure(self):
+        threads = [self._report('host-1', ['first'])]
+        eventlet.sleep(0)
+        threads.append(self._report('host-1', ['second']))
+        threads.append(self._report('host-1', ['fail']))
+        eventlet.sleep(0)
+
+        self.manager.release.send()
+        self.assertEqual(['first'], threads[0].wait())
+        for thread in threads[1:]:
+            self.assertRaises(exception.SysinvException, thread.wait)
+        stats = self.dispatcher.get_stats()
+        self.assertEqual(1, stats['coalesced'])
+        self.assertEqual(1,
+                         stats['methods']['idisk_update_by_ihost']['failures'])
@@ -22,6 +22,9 @@
 
 """Test class for Sysinv ManagerService."""
 
+import mock
+
+from sysinv.common import constants
 from sysinv.common import exception
 from sysinv.conductor import manager
 from sysinv.db import api as dbapi
@@ -256,3 +259,238 @@ class ManagerTestCase(base.DbTestCase):
                           self.service.configure_ihost,
                           self.context,
                           ihost)
+
+    def _mock_config_apply(self, delay=2):
+        self.config(config_update_delay=delay, group='conductor')
+        self.service.tg = mock.Mock()
+        update_hosts = mock.patch.object(self.service, '_config_update_hosts',
+                                         return_value='config-uuid').start()
+        apply_manifest = mock.patch.object(
+            self.service, '_config_apply_runtime_manifest').start()
+        self.addCleanup(mock.patch.stopall)
+        return update_hosts, apply_manifest
+
+    def test_config_queue_runtime_manifest_merged(self):
+        update_hosts, apply_manifest = self._mock_config_apply()
+        personalities = [constants.CONTROLLER]
+        for classes in (['platform::haproxy::runtime'],
+                        ['openstack::horizon::runtime'],
+                        ['platform::haproxy::runtime']):
+            self.service._config_queue_runtime_manifest(
+                self.context, {'personalities': personalities,
+                               'classes': classes})
+        self.service._config_queue_runtime_manifest(
+            self.context, {'personalities': [constants.WORKER],
+                           'classes': 'platform::network::runtime'})
+
+        self.assertEqual(1, self.service.tg.add_thread.call_count)
+        self.assertFalse(apply_manifest.called)
+
+        self.service._config_queue_flush()
+
+        update_hosts.assert_has_calls([
+            mock.call(self.context, personalities, host_uuids=None),
+            mock.call(self.context, [constants.WORKER], host_uuids=None)])
+        apply_manifest.assert_has_calls([
+            mock.call(self.context, 'config-uuid',
+                      {'personalities': personalities,
+                       'classes': ['platform::haproxy::runtime',
+                                   'openstack::horizon::runtime']},
+                      host_uuids=None, force=False),
+            mock.call(self.context, 'config-uuid',
+                      {'personalities': [constants.WORKER],
+                       'classes': ['platform::network::runtime']},
+                      host_uuids=None, force=False)])
+
+    def test_config_queue_call_deduplicated(self):
+        self._mock_config_apply()
+        with mock.patch.object(self.service, '_update_ntp_config') as ntp:
+            ntp.__name__ = '_update_ntp_config'
+            self.service.update_ntp_config(self.context)
+            self.service.update_ntp_config(self.context)
+            self.service.update_ntp_config(self.context, service_change=True)
+            self.service._config_queue_flush()
+        ntp.assert_has_calls([mock.call(self.context, False),
+                              mock.call(self.context, True)])
+        self.assertEqual(2, ntp.call_count)
+
+    def test_update_service_config_single_config_target(self):
+        update_hosts, apply_manifest = self._mock_config_apply()
+        self.service.update_service_config(
+            self.context, service=constants.SERVICE_TYPE_HORIZON,
+            do_apply=True)
+        self.assertFalse(update_hosts.called)
+
+        self.service._config_queue_flush()
+        update_hosts.assert_called_once_with(self.context,
+                                             [constants.CONTROLLER])
+        apply_manifest.assert_called_once_with(
+            self.context, 'config-uuid',
+            {'personalities': [constants.CONTROLLER],
+             'classes': ['openstack::horizon::runtime']},
+            host_uuids=None, force=False)
+        self.assertEqual({}, self.service._config_queue)
+
+    def test_config_queue_runtime_manifest_config_uuid(self):
+        update_hosts, apply_manifest = self._mock_config_apply()
+        self.service._config_queue_runtime_manifest(
+            self.context, {'personalities': [constants.CONTROLLER],
+                           'classes': ['platform::mtce::runtime']},
+            config_uuid='other-config-uuid')
+        self.service._config_queue_flush()
+        self.assertFalse(update_hosts.called)
+        self.assertEqual('other-config-uuid', apply_manifest.call_args[0][1])
+
+    def test_config_queue_failure(self):
+        update_hosts, apply_manifest = self._mock_config_apply()
+        apply_manifest.side_effect = [RuntimeError('apply failed'), None]
+        for personality in (constants.CONTROLLER, constants.WORKER):
+            self.service._config_queue_runtime_manifest(
+                self.context, {'personalities': [personality],
+                               'classes': ['platform::mtce::runtime']})
+
+        # the following updates still run
+        self.assertRaises(RuntimeError, self.service._config_queue_flush)
+        self.assertEqual(2, apply_manifest.call_count)
+        self.assertEqual(1, self.service._config_queue_failures)
+        self.assertEqual(1, self.service._get_worker_stats()[
+            'config_update_failures'])
+
+    def test_config_queue_failure_no_delay(self):
+        update_hosts, apply_manifest = self._mock_config_apply(delay=0)
+        update_hosts.side_effect = RuntimeError('update failed')
+        self.assertRaises(RuntimeError,
+                          self.service.update_route_config, self.context)
+        self.assertFalse(apply_manifest.called)
+
+    def _create_rpc_consumers(self):
+        self.service.conn = mock.MagicMock()
+        with mock.patch.object(manager.rpc, 'create_connection') as conn:
+            dispatcher = self.service.create_rpc_dispatcher()
+            self.service.create_rpc_consumers(dispatcher)
+        reports = self.service._dispatchers['reports']
+        topics = [(c[0][0], c[0][1] is reports)
+                  for c in self.service.conn.create_consumer.call_args_list]
+        lane_topics = [c[0][0] for c in
+                       conn.return_value.create_consumer.call_args_list]
+        return topics, lane_topics
+
+    def test_reports_lane_consumers(self):
+        topics, lane_topics = self._create_rpc_consumers()
+        self.assertEqual([('test-topic', False),
+                          ('test-topic.test-host', False),
+                          ('test-topic', False)], topics)
+        self.assertEqual(['test-topic.reports'], lane_topics)
+        self.assertEqual({'workers': 1, 'reports_lane': True},
+                         self.service.get_conductor_topology(self.context))
+
+    def test_reports_lane_disabled(self):
+        self.config(reports_lane=False, group='conductor')
+        topics, lane_topics = self._create_rpc_consumers()
+        self.assertEqual(3, len(topics))
+        self.assertEqual([], lane_topics)
+        self.assertIsNone(self.service._reports_conn)
+        self.assertEqual({'workers': 1, 'reports_lane': False},
+                         self.service.get_conductor_topology(self.context))
+
+    def test_reports_lane_disabled_sharded(self):
+        self.config(reports_lane=False, workers=2, group='conductor')
+        topics, lane_topics = self._create_rpc_consumers()
+        self.assertEqual(('test-topic.shard0', True), topics[-1])
+        self.assertEqual([], lane_topics)
+
+    def test_config_queue_no_delay(self):
+        update_hosts, apply_manifest = self._mock_config_apply(delay=0)
+        self.service.update_route_config(self.context)
+        self.assertFalse(self.service.tg.add_thread.called)
+        self.assertEqual(1, update_hosts.call_count)
+        self.assertEqual(1, apply_manifest.call_count)
+
+    def test_report_runtime_config_status(self):
+        ihost = self._create_test_ihost()
+        runtime_config = {'request_id': 'a6c7bd5d-5a5e-4a52-9f0e-f4b8d5fd8b59',
+                          'config_uuid': 'c7a1bd66-5a9d-4f77-8f5d-3e33e8f7a1b2',
+                          'classes': 'platform::network::runtime',
+                          'state': constants.RUNTIME_CONFIG_STATE_QUEUED}
+        for state in (constants.RUNTIME_CONFIG_STATE_QUEUED,
+                      constants.RUNTIME_CONFIG_STATE_SUCCESS,
+                      constants.RUNTIME_CONFIG_STATE_RUNNING):
+            runtime_config.update({'state': state})
+            if state == constants.RUNTIME_CONFIG_STATE_SUCCESS:
+                runtime_config.update({'duration': 12.5})
+            self.service.report_runtime_config_status(
+                self.context, ihost['uuid'], runtime_config)
+
+        records = self.dbapi.runtime_config_get_by_host(ihost['uuid'])
+        self.assertEqual(1, len(records))
+        # the late running report must not override the completed apply
+        self.assertEqual(constants.RUNTIME_CONFIG_STATE_SUCCESS,
+                         records[0].state)
+        self.assertEqual(12.5, records[0].duration)
+        self.assertEqual('platform::network::runtime', records[0].classes)
+
+    def test_report_runtime_config_status_pruned(self):
+        ihost = self._create_test_ihost()
+        with mock.patch.object(manager, 'RUNTIME_CONFIG_HISTORY', 2):
+            for i in range(3):
+                self.service.report_runtime_config_status(
+                    self.context, ihost['uuid'],
+                    {'request_id': 'request-%d' % i,
+                     'config_uuid': 'config-%d' % i,
+                     'classes': 'platform::network::runtime',
+                     'state': constants.RUNTIME_CONFIG_STATE_QUEUED})
+
+        records = self.dbapi.runtime_config_get_by_host(ihost['uuid'])
+        self.assertEqual(['request-1', 'request-2'],
+                         sorted(r.request_id for r in records))
+
+    def test_check_leader_lock_held(self):
+        self.service._leader_lock = lock = mock.sentinel.lock
+        with mock.patch.object(self.dbapi, 'advisory_lock_held',
+                               return_value=True), \
+                mock.patch.object(self.dbapi,
+                                  'advisory_lock_acquire') as acquire:
+            self.service._check_leader_lock()
+        self.assertFalse(acquire.called)
+        self.assertEqual(lock, self.service._leader_lock)
+
+    def test_check_leader_lock_lost(self):
+        self.service._leader_lock = mock.sentinel.lock
+        task = mock.Mock()
+        with mock.patch.object(self.dbapi, 'advisory_lock_held',
+                               return_value=False), \
+                mock.patch.object(self.dbapi,
+                                  'advisory_lock_release') as release, \
+                mock.patch.object(self.dbapi, 'advisory_lock_acquire',
+                                  return_value=None):
+            self.service._check_leader_lock()
+        release.assert_called_once_with(mock.sentinel.lock)
+        self.assertIsNone(self.service._leader_lock)
+
+        # the periodic tasks are suspended until the lock is taken again
+        self.service._run_periodic_task_once(
+            self.context, 'task', task, 0, None)
+        self.assertFalse(task.called)
+        self.assertIsNone(self.service.periodic_tasks(self.context))
+
+        with mock.patch.object(self.dbapi, 'advisory_lock_acquire',
+                               return_value=mock.sentinel.new_lock):
+            self.service._check_leader_lock()
+        self.assertEqual(mock.sentinel.new_lock, self.service._leader_lock)
+
+    def test_leader_lock_held_after_start(self):
+        self.service.start()
+        self.addCleanup(self.service._release_leader_lock)
+        self.assertIsNotNone(self.service._leader_lock)
+        self.assertTrue(
+            self.dbapi.advisory_lock_held(self.service._leader_lock))
+
+    def test_config_update_error_returned_by_default(self):
+        self.service.tg = mock.Mock()
+        with mock.patch.object(self.service, '_update_ntp_config',
+                               side_effect=RuntimeError('ntp failed')) as ntp:
+            ntp.__name__ = '_update_ntp_config'
+            self.assertRaises(RuntimeError,
+                              self.service.update_ntp_config, self.context)
+        self.assertFalse(self.service.tg.add_thread.called)
+        self.assertEqual({}, self.service._config_queue)
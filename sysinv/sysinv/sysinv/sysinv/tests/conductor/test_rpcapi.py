@@ -23,6 +23,9 @@
 Unit Tests for :py:class:`sysinv.conductor.rpcapi.ConductorAPI`.
 """
 
+import mock
+import time
+
 from oslo_config import cfg
 
 from sysinv.conductor import rpcapi as conductor_rpcapi
@@ -30,6 +33,7 @@ from sysinv.db import api as dbapi
 from sysinv.openstack.common import context
 from sysinv.openstack.common import jsonutils as json
 from sysinv.openstack.common import rpc
+from sysinv.openstack.common.rpc import common as rpc_common
 from sysinv.tests.db import base
 from sysinv.tests.db import utils as dbutils
 
@@ -44,6 +48,17 @@ class RPCAPITestCase(base.DbTestCase):
         self.dbapi = dbapi.get_instance()
         self.fake_ihost = json.to_primitive(dbutils.get_test_ihost())
 
+        patcher = mock.patch.object(conductor_rpcapi, '_topology',
+                                    {'topology': None, 'updated_at': 0})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self._set_topology(workers=1)
+
+    def _set_topology(self, workers, reports_lane=True):
+        conductor_rpcapi._topology.update(
+            topology={'workers': workers, 'reports_lane': reports_lane},
+            updated_at=time.time())
+
     def test_serialized_instance_has_uuid(self):
         self.assertTrue('uuid' in self.fake_ihost)
 
@@ -54,12 +69,11 @@ class RPCAPITestCase(base.DbTestCase):
         default_rpc_api_version = '1.0'
         expected_retval = 'hello world' if method == 'call' else None
         expected_version = kwargs.pop('version', default_rpc_api_version)
+        expected_topic = kwargs.pop('expected_topic', 'fake-topic')
         expected_msg = rpcapi.make_msg(method, **kwargs)
 
         expected_msg['version'] = expected_version
 
-        expected_topic = 'fake-topic'
-
         self.fake_args = None
         self.fake_kwargs = None
 
@@ -95,3 +109,136 @@ class RPCAPITestCase(base.DbTestCase):
                           'call',
                           host=self.fake_ihost,
                           do_worker_apply=False)
+
+    def test_get_periodic_task_stats(self):
+        self._test_rpcapi('get_periodic_task_stats',
+                          'call')
+
+    def test_get_conductor_worker_stats(self):
+        self._test_rpcapi('get_conductor_worker_stats',
+                          'call')
+
+    def test_idisk_update_by_ihost(self):
+        self._test_rpcapi('idisk_update_by_ihost',
+                          'call',
+                          ihost_uuid=self.fake_ihost['uuid'],
+                          idisk_dict_array=[],
+                          expected_topic='fake-topic.reports')
+
+    def test_get_conductor_topology(self):
+        self._test_rpcapi('get_conductor_topology',
+                          'call')
+
+    def test_idisk_update_by_ihost_sharded(self):
+        # the clients shard with the conductor topology, not their own
+        # configuration
+        self._set_topology(workers=4)
+        shard = conductor_rpcapi.get_shard(self.fake_ihost['uuid'], 4)
+        self.assertEqual(shard,
+                         conductor_rpcapi.get_shard(self.fake_ihost['uuid'],
+                                                    4))
+        self.assertTrue(0 <= shard < 4)
+        self._test_rpcapi('idisk_update_by_ihost',
+                          'call',
+                          ihost_uuid=self.fake_ihost['uuid'],
+                          idisk_dict_array=[],
+                          expected_topic='fake-topic.shard%d' % shard)
+
+    def test_idisk_update_by_ihost_without_reports_lane(self):
+        self._set_topology(workers=1, reports_lane=False)
+        self._test_rpcapi('idisk_update_by_ihost',
+                          'call',
+                          ihost_uuid=self.fake_ihost['uuid'],
+                          idisk_dict_array=[])
+
+    def test_ipartition_update_by_ihost(self):
+        self._test_rpcapi('ipartition_update_by_ihost',
+                          'call',
+                          ihost_uuid=self.fake_ihost['uuid'],
+                          ipart_dict_array=[],
+                          expected_topic='fake-topic.reports')
+
+    def test_ipv_ipartition_update_by_ihost_sharded(self):
+        # the pv and partition reports of a host are handled in order with
+        # its disk reports
+        self._set_topology(workers=4)
+        shard = conductor_rpcapi.get_shard(self.fake_ihost['uuid'], 4)
+        self._test_rpcapi('ipv_update_by_ihost',
+                          'call',
+                          ihost_uuid=self.fake_ihost['uuid'],
+                          ipv_dict_array=[],
+                          version='1.1',
+                          expected_topic='fake-topic.shard%d' % shard)
+        self._test_rpcapi('ipartition_update_by_ihost',
+                          'call',
+                          ihost_uuid=self.fake_ihost['uuid'],
+                          ipart_dict_array=[],
+                          expected_topic='fake-topic.shard%d' % shard)
+
+    def test_report_runtime_config_status(self):
+        self._test_rpcapi('report_runtime_config_status',
+                          'cast',
+                          host_uuid=self.fake_ihost['uuid'],
+                          runtime_config={'state': 'queued'},
+                          expected_topic='fake-topic.reports')
+
+    def test_report_runtime_config_status_without_reports_lane(self):
+        self._set_topology(workers=4, reports_lane=False)
+        self._test_rpcapi('report_runtime_config_status',
+                          'cast',
+                          host_uuid=self.fake_ihost['uuid'],
+                          runtime_config={'state': 'queued'})
+
+    def _fake_topology_call(self, ctxt, topic, msg, timeout=None):
+        self.topology_calls.append(topic)
+        if msg['method'] != 'get_conductor_topology':
+            return None
+        if isinstance(self.topology, Exception):
+            raise self.topology
+        return self.topology
+
+    def _test_topology(self, topology, expected_topic):
+        self.topology_calls = []
+        self.topology = topology
+        self.stubs.Set(rpc, 'call', self._fake_topology_call)
+        rpcapi = conductor_rpcapi.ConductorAPI(topic='fake-topic')
+        rpcapi.idisk_update_by_ihost(self.context, self.fake_ihost['uuid'], [])
+        self.assertEqual(['fake-topic', expected_topic],
+                         self.topology_calls)
+
+    def test_topology_from_conductor(self):
+        conductor_rpcapi._topology['topology'] = None
+        shard = conductor_rpcapi.get_shard(self.fake_ihost['uuid'], 4)
+        self._test_topology({'workers': 4, 'reports_lane': True},
+                            'fake-topic.shard%d' % shard)
+
+    def test_topology_cached(self):
+        self._set_topology(workers=4)
+        self.topology_calls = []
+        self.stubs.Set(rpc, 'call', self._fake_topology_call)
+        rpcapi = conductor_rpcapi.ConductorAPI(topic='fake-topic')
+        rpcapi.idisk_update_by_ihost(self.context, self.fake_ihost['uuid'], [])
+        self.assertEqual(1, len(self.topology_calls))
+
+    def test_topology_expired(self):
+        conductor_rpcapi._topology['updated_at'] -= (
+            conductor_rpcapi.TOPOLOGY_CACHE_TTL)
+        self._test_topology({'workers': 1, 'reports_lane': True},
+                            'fake-topic.reports')
+
+    def test_topology_unsupported(self):
+        conductor_rpcapi._topology['topology'] = None
+        # the conductor predates the workers and lanes
+        self._test_topology(rpc_common.RemoteError('AttributeError'),
+                            'fake-topic')
+
+    def test_topology_failure(self):
+        conductor_rpcapi._topology['topology'] = None
+        self.topology_calls = []
+        self.topology = rpc_common.Timeout()
+        self.stubs.Set(rpc, 'call', self._fake_topology_call)
+        rpcapi = conductor_rpcapi.ConductorAPI(topic='fake-topic')
+        self.assertRaises(rpc_common.Timeout,
+                          rpcapi.idisk_update_by_ihost,
+                          self.context, self.fake_ihost['uuid'], [])
+        self.assertIsNone(conductor_rpcapi._topology['topology'])
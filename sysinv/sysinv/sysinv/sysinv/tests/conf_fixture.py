@@ -24,6 +24,7 @@ from sysinv.common import config
 CONF = cfg.CONF
 CONF.import_opt('use_ipv6', 'sysinv.netconf')
 CONF.import_opt('host', 'sysinv.common.service')
+CONF.import_opt('enabled', 'sysinv.db.sqlalchemy.dbstats', group='dbstats')
 
 
 class ConfFixture(fixtures.Fixture):
@@ -44,5 +45,6 @@ class ConfFixture(fixtures.Fixture):
         self.conf.set_default('sqlite_synchronous', False)
         self.conf.set_default('use_ipv6', True)
         self.conf.set_default('verbose', True)
+        self.conf.set_default('enabled', False, group='dbstats')
         config.parse_args([], default_config_files=[])
         self.addCleanup(self.conf.reset)
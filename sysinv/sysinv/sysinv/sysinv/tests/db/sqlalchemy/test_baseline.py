@@ -0,0 +1,133 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Tests for the baseline schema loaded by sysinv-dbsync."""
+
+import fixtures
+import mock
+import os
+import sqlalchemy
+
+from migrate.versioning import api as versioning_api
+
+from sysinv.db import migration as db_migration
+from sysinv.tests import base
+from sysinv.tests.db.sqlalchemy import test_migrations
+
+
+def _get_schema(engine, version_table):
+    inspector = sqlalchemy.inspect(engine)
+    schema = {}
+    for table in inspector.get_table_names():
+        if table == version_table:
+            continue
+        schema[table] = {
+            'columns': [(c['name'], str(c['type']), c['nullable'])
+                        for c in inspector.get_columns(table)],
+            'primary_key': inspector.get_pk_constraint(table),
+            'foreign_keys': sorted(
+                (f['constrained_columns'], f['referred_table'],
+                 f['referred_columns'])
+                for f in inspector.get_foreign_keys(table)),
+            'indexes': sorted(
+                (i['name'], i['column_names'], i['unique'])
+                for i in inspector.get_indexes(table)),
+            'unique_constraints': sorted(
+                u['column_names']
+                for u in inspector.get_unique_constraints(table)),
+        }
+    return schema
+
+
+def _reset_postgresql(engine):
+    """Drop the tables and types of the opportunistic test database."""
+    with engine.begin() as connection:
+        for table in sqlalchemy.inspect(connection).get_table_names():
+            connection.execute('DROP TABLE IF EXISTS "%s" CASCADE' % table)
+        types = connection.execute(
+            "SELECT t.typname FROM pg_type t "
+            "JOIN pg_namespace n ON n.oid = t.typnamespace "
+            "WHERE n.nspname = 'public' AND t.typtype = 'e'")
+        for name, in types.fetchall():
+            connection.execute('DROP TYPE "%s"' % name)
+
+
+class TestBaseline(base.TestCase):
+
+    def setUp(self):
+        super(TestBaseline, self).setUp()
+        # Imported once the database connection is configured
+        from sysinv.db.sqlalchemy import migration
+        self.migration = migration
+        self.repository = migration._find_migrate_repo()
+        self.tempdir = self.useFixture(fixtures.TempDir()).path
+
+    def _create_engine(self, name):
+        engine = sqlalchemy.create_engine(
+            'sqlite:///%s' % os.path.join(self.tempdir, name))
+        self.addCleanup(engine.dispose)
+        return engine
+
+    def _db_sync(self, engine):
+        with mock.patch.object(self.migration, 'get_engine',
+                               return_value=engine):
+            self.migration.db_sync()
+            return self.migration.db_version()
+
+    def _migrate(self, engine):
+        versioning_api.version_control(engine, self.repository,
+                                       db_migration.INIT_VERSION)
+        versioning_api.upgrade(engine, self.repository)
+        return _get_schema(engine, self.repository.version_table)
+
+    def _load(self, engine):
+        version, _ = self.migration._read_baseline(engine.name)
+        self.assertIsNotNone(version)
+        self.assertLessEqual(version, int(self.repository.latest))
+
+        with mock.patch.object(self.migration, 'get_engine',
+                               return_value=engine):
+            # An empty database is put under version control at INIT_VERSION
+            self.assertEqual(db_migration.INIT_VERSION,
+                             self.migration.db_version())
+            self.assertEqual(version,
+                             self.migration._load_baseline(self.repository))
+        self.assertEqual(int(self.repository.latest),
+                         self._db_sync(engine))
+        return _get_schema(engine, self.repository.version_table)
+
+    def test_baseline_matches_migrations(self):
+        migrated = self._migrate(self._create_engine('migrated.sqlite'))
+        baseline = self._load(self._create_engine('baseline.sqlite'))
+        self.assertEqual(migrated, baseline)
+
+    def test_postgresql_baseline_matches_migrations(self):
+        user = test_migrations.TestMigrations.USER
+        passwd = test_migrations.TestMigrations.PASSWD
+        database = test_migrations.TestMigrations.DATABASE
+        if not test_migrations._have_postgresql(user, passwd, database):
+            self.skipTest("postgresql not available")
+        engine = sqlalchemy.create_engine(test_migrations._get_connect_string(
+            "postgres", user, passwd, database))
+        self.addCleanup(engine.dispose)
+        self.addCleanup(_reset_postgresql, engine)
+
+        _reset_postgresql(engine)
+        migrated = self._migrate(engine)
+        _reset_postgresql(engine)
+        baseline = self._load(engine)
+        self.assertEqual(migrated, baseline)
+
+    def test_existing_database_walks_migrations(self):
+        engine = self._create_engine('existing.sqlite')
+        versioning_api.version_control(engine, self.repository,
+                                       db_migration.INIT_VERSION)
+        versioning_api.upgrade(engine, self.repository, 1)
+
+        with mock.patch.object(self.migration, '_load_baseline') as load:
+            self.assertEqual(int(self.repository.latest),
+                             self._db_sync(engine))
+            self.assertFalse(load.called)
@@ -550,6 +550,11 @@ class TestMigrations(BaseMigrationTestCase, WalkVersionsMixin):
         self.assertFalse(self.column_exists(engine, table_name, column),
                         'Column %s.%s should not exist' % (table_name, column))
 
+    def assertIndexExists(self, engine, table_name, index):
+        indexes = sqlalchemy.inspect(engine).get_indexes(table_name)
+        self.assertIn(index, [i['name'] for i in indexes],
+                      'Index %s on %s does not exist' % (index, table_name))
+
     def assertTableNotExists(self, engine, table):
         self.assertRaises(sqlalchemy.exc.NoSuchTableError,
                             db_utils.get_table, engine, table)
@@ -1896,3 +1901,44 @@ class TestMigrations(BaseMigrationTestCase, WalkVersionsMixin):
         for col, coltype in ptp_cols.items():
             self.assertTrue(isinstance(ptp.c[col].type,
                                        getattr(sqlalchemy.types, coltype)))
+
+    def _check_085(self, engine, data):
+        # Assert the inventory lookup indexes were created
+        indexes = {
+            'i_icpu': ['forihostid', 'forinodeid'],
+            'i_imemory': ['forihostid', 'forinodeid'],
+            'interfaces': ['forihostid'],
+            'ports': ['host_id', 'interface_id'],
+            'i_idisk': ['forihostid', 'foripvid'],
+            'i_istor': ['forihostid', 'idisk_uuid'],
+            'i_lvg': ['forihostid', 'vg_state'],
+            'i_pv': ['forihostid', 'forilvgid', 'pv_state'],
+            'partition': ['forihostid', 'idisk_uuid', 'foripvid', 'status'],
+        }
+        for table, columns in indexes.items():
+            for column in columns:
+                self.assertIndexExists(engine, table,
+                                       'ix_%s_%s' % (table, column))
+
+    def _check_086(self, engine, data):
+        # Assert data types for all columns in new table "runtime_config"
+        runtime_config = db_utils.get_table(engine, 'runtime_config')
+        runtime_config_cols = {
+            'created_at': 'DateTime',
+            'updated_at': 'DateTime',
+            'deleted_at': 'DateTime',
+            'id': 'Integer',
+            'uuid': 'String',
+            'forihostid': 'Integer',
+            'request_id': 'String',
+            'config_uuid': 'String',
+            'classes': 'Text',
+            'state': 'String',
+            'duration': 'Float',
+            'error': 'Text',
+        }
+        for col, coltype in runtime_config_cols.items():
+            self.assertTrue(isinstance(runtime_config.c[col].type,
+                                       getattr(sqlalchemy.types, coltype)))
+        self.assertIndexExists(engine, 'runtime_config',
+                               'ix_runtime_config_forihostid')
@@ -0,0 +1,141 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Tests for the sysinv database statement statistics."""
+
+import mock
+
+from oslo_config import cfg
+from oslo_db.sqlalchemy import enginefacade
+
+from sysinv.db import api as dbapi
+from sysinv.db.sqlalchemy import api as db_api
+from sysinv.db.sqlalchemy import dbstats
+from sysinv.db.sqlalchemy import statements
+from sysinv.tests import base as test_base
+from sysinv.tests.db import base
+from sysinv.tests.db import utils
+
+CONF = cfg.CONF
+
+
+class DbStatsTestCase(base.DbTestCase):
+
+    def setUp(self):
+        super(DbStatsTestCase, self).setUp()
+        self.dbapi = dbapi.get_instance()
+        self.system = utils.create_test_isystem()
+
+        self.stats = dbstats.EngineStats('test')
+        self._install_stats()
+
+    def _install_stats(self):
+        original = dbstats._stats
+        dbstats._stats = self.stats
+        statements.observe(dbstats._record_statement)
+
+        def cleanup():
+            statements.unobserve(dbstats._record_statement)
+            dbstats._stats = original
+        self.addCleanup(cleanup)
+
+    def _get_count(self, method):
+        # the connection liveness pings of oslo_db are counted as well
+        return dbstats.get_stats()['statements'][method]['count']
+
+    def test_statements_by_type(self):
+        self.dbapi.isystem_get_one()
+        count = self._get_count('SELECT')
+        self.dbapi.isystem_get_one()
+
+        stats = dbstats.get_stats()
+        self.assertEqual(['SELECT'], list(stats['statements']))
+        self.assertEqual(2 * count, self._get_count('SELECT'))
+
+    def test_statements_by_method(self):
+        self.config(caller_stats=True, group='dbstats')
+        self.dbapi.isystem_get_one()
+        count = self._get_count('isystem_get_one')
+        self.dbapi.isystem_get_one()
+
+        stats = dbstats.get_stats()
+        self.assertEqual('test', stats['service'])
+        method = stats['statements']['isystem_get_one']
+        self.assertEqual(2 * count, method['count'])
+        self.assertEqual(2 * count, sum(method['histogram']))
+        self.assertEqual(0, stats['slow_queries'])
+
+    def test_slow_query(self):
+        self.config(slow_query_threshold=0.000001, group='dbstats')
+        self.dbapi.isystem_get_one()
+
+        stats = dbstats.get_stats()
+        count = self._get_count('SELECT')
+        self.assertEqual(count, stats['statements']['SELECT']['slow'])
+        self.assertEqual(count, stats['slow_queries'])
+
+    def test_histogram_buckets(self):
+        self.assertEqual(0, dbstats._get_bucket(0.0005))
+        self.assertEqual(3, dbstats._get_bucket(0.02))
+        self.assertEqual(len(dbstats.LATENCY_BUCKETS),
+                         dbstats._get_bucket(60))
+
+
+class DbStatsSetupTestCase(test_base.TestCase):
+
+    def setUp(self):
+        super(DbStatsSetupTestCase, self).setUp()
+        # stand-ins for the global oslo_db facade and the db api facade
+        self.global_facade = enginefacade.transaction_context()
+        self.api_facade = enginefacade.transaction_context()
+        self.global_writer = self.global_facade.writer
+        for facade in (self.global_facade, self.api_facade):
+            facade.configure(connection='sqlite://')
+
+        for p in (mock.patch.object(dbstats.enginefacade, 'writer',
+                                    self.global_writer),
+                  mock.patch.object(db_api, 'context_manager',
+                                    self.api_facade),
+                  mock.patch.object(dbstats, '_stats', None),
+                  mock.patch.object(dbstats, '_timer', None)):
+            p.start()
+            self.addCleanup(p.stop)
+        self.config(enabled=True, report_interval=0, group='dbstats')
+        self.addCleanup(statements.unobserve, dbstats._record_statement)
+        CONF.register_opts(dbstats.pool_opts,
+                           group=dbstats.get_pool_group('test'))
+
+    def _execute(self):
+        with self.global_writer.using(self) as session:
+            session.execute('VALUES (1)')
+        engine = self.api_facade.get_legacy_facade().get_engine()
+        engine.execute('PRAGMA user_version')
+
+    def test_hooks_installed_on_both_facades(self):
+        dbstats.setup('test')
+        self._execute()
+
+        stats = dbstats.get_stats()
+        self.assertEqual('test', stats['service'])
+        self.assertEqual(1, stats['statements']['VALUES']['count'])
+        self.assertEqual(1, stats['statements']['PRAGMA']['count'])
+        self.assertTrue(stats['pool']['checkouts'] >= 2)
+
+    def test_pool_settings_applied_to_both_facades(self):
+        self.config(max_pool_size=20, pool_timeout=5,
+                    group=dbstats.get_pool_group('test'))
+        with mock.patch.object(self.global_writer, 'configure') as g, \
+                mock.patch.object(self.api_facade, 'configure') as a:
+            dbstats.setup('test')
+        g.assert_called_once_with(max_pool_size=20, pool_timeout=5)
+        a.assert_called_once_with(max_pool_size=20, pool_timeout=5)
+
+    def test_disabled(self):
+        self.config(enabled=False, group='dbstats')
+        dbstats.setup('test')
+        self._execute()
+        self.assertIsNone(dbstats.get_stats())
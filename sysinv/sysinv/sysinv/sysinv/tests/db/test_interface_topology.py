@@ -0,0 +1,111 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Tests for the eager loading of the host interface topology."""
+
+from sysinv.common import constants
+from sysinv.db import api as dbapi
+from sysinv.db.sqlalchemy import statements
+from sysinv.openstack.common import uuidutils
+from sysinv.tests.db import base
+from sysinv.tests.db import utils
+
+
+class InterfaceTopologyTestCase(base.DbTestCase):
+
+    def setUp(self):
+        super(InterfaceTopologyTestCase, self).setUp()
+        self.dbapi = dbapi.get_instance()
+        self.system = utils.create_test_isystem()
+        self.load = utils.create_test_load()
+        self.host = utils.create_test_ihost(forisystemid=self.system.id)
+        address_pool = utils.create_test_address_pool(
+            network='192.168.204.0',
+            name='management',
+            ranges=[['192.168.204.2', '192.168.204.254']],
+            prefix=24)
+        self.network = utils.create_test_network(
+            name='mgmt',
+            type=constants.NETWORK_TYPE_MGMT,
+            address_pool_id=address_pool.id)
+        self.datanetworks = [
+            utils.create_test_datanetwork(
+                name='physnet0', uuid=uuidutils.generate_uuid(),
+                network_type=constants.DATANETWORK_TYPE_VLAN),
+            utils.create_test_datanetwork(
+                name='physnet1', uuid=uuidutils.generate_uuid(),
+                network_type=constants.DATANETWORK_TYPE_VXLAN)]
+        self.interfaces = []
+
+    def _create_interfaces(self, count):
+        for i in range(len(self.interfaces),
+                       len(self.interfaces) + count):
+            mac = '02:01:00:00:00:%02x' % i
+            interface = utils.create_test_interface(
+                forihostid=self.host.id, ifname='eth%d' % i, imac=mac,
+                datanetworks=','.join(dn.uuid for dn in self.datanetworks))
+            utils.create_test_ethernet_port(
+                name='eth%d' % i, host_id=self.host.id,
+                interface_id=interface.id, pciaddr='0000:00:%02x.0' % i,
+                mac=mac)
+            utils.create_test_interface_network(
+                interface_id=interface.id, network_id=self.network.id)
+            utils.create_test_address(
+                interface_id=interface.id, family=constants.IPV4_FAMILY,
+                address='192.168.204.%d' % (i + 10), prefix=24)
+            utils.create_test_route(
+                interface_id=interface.id, family=constants.IPV4_FAMILY,
+                network='10.10.%d.0' % i, prefix=24,
+                gateway='192.168.204.1')
+            self.interfaces.append(interface)
+
+    def _count_queries(self, func, *args, **kwargs):
+        with statements.StatementCounter(select_only=True) as counter:
+            result = func(*args, **kwargs)
+        return result, counter.count
+
+    def test_interface_topology_get(self):
+        self._create_interfaces(2)
+        topology, expected = self._count_queries(
+            self.dbapi.interface_topology_get, self.host.id)
+        self._create_interfaces(6)
+        topology, queries = self._count_queries(
+            self.dbapi.interface_topology_get, self.host.uuid)
+
+        self.assertEqual(expected, queries)
+        self.assertEqual([i.ifname for i in self.interfaces],
+                         [i.ifname for i in topology['interfaces']])
+        self.assertEqual(8, len(topology['ports']))
+        self.assertEqual(8, len(topology['addresses']))
+        self.assertEqual(8, len(topology['routes']))
+        for interface in topology['interfaces']:
+            self.assertEqual(
+                [self.network.type],
+                [n.type for n in topology['networks'][interface.id]])
+            datanetworks = topology['datanetworks'][interface.id]
+            self.assertEqual(sorted(dn.name for dn in self.datanetworks),
+                             sorted(dn.name for dn in datanetworks))
+            vxlan = [dn for dn in datanetworks if dn.network_type ==
+                     constants.DATANETWORK_TYPE_VXLAN]
+            self.assertEqual(self.datanetworks[1].port_num,
+                             vxlan[0].port_num)
+
+    def test_iinterface_get_by_ihost_eager(self):
+        self._create_interfaces(2)
+        interfaces, expected = self._count_queries(
+            self.dbapi.iinterface_get_by_ihost_eager, self.host.id)
+        self._create_interfaces(6)
+        interfaces, queries = self._count_queries(
+            self.dbapi.iinterface_get_by_ihost_eager, self.host.id)
+
+        self.assertEqual(expected, queries)
+        self.assertEqual(8, len(interfaces))
+        for interface in interfaces:
+            self.assertEqual([str(self.network.id)], interface.networks)
+            self.assertEqual(
+                sorted(str(dn.id) for dn in self.datanetworks),
+                sorted(interface.datanetworks))
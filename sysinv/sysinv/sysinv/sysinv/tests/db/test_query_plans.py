@@ -0,0 +1,173 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Query plan regression tests for the per host inventory queries.
+
+The dataset size defaults to a handful of hosts so the tests stay fast; set
+SYSINV_QUERY_PLAN_HOSTS (e.g. 500) to seed a large system.  Per query timings
+are attached to each test's details.
+"""
+
+import os
+import time
+
+from oslo_db.sqlalchemy import enginefacade
+from testtools import content
+
+from sysinv.common import constants
+from sysinv.db import api as dbapi
+from sysinv.db.sqlalchemy import statements
+from sysinv.tests.db import base
+from sysinv.tests.db import utils
+
+DEFAULT_HOSTS = 5
+
+
+class QueryPlanTestCase(base.DbTestCase):
+
+    def setUp(self):
+        super(QueryPlanTestCase, self).setUp()
+        self.dbapi = dbapi.get_instance()
+        self.engine = enginefacade.get_legacy_facade().get_engine()
+        self.system = utils.create_test_isystem()
+        self.load = utils.create_test_load()
+        self.timings = []
+        self.hosts = self._create_hosts(
+            int(os.environ.get('SYSINV_QUERY_PLAN_HOSTS', DEFAULT_HOSTS)))
+        self.addCleanup(self._add_timings)
+
+    def _create_hosts(self, count):
+        hosts = []
+        for i in range(count):
+            host = utils.create_test_ihost(
+                forisystemid=self.system.id,
+                hostname='worker-%d' % i,
+                personality=constants.WORKER,
+                mgmt_mac='02:00:00:%02x:%02x:%02x' % (
+                    (i >> 16) & 0xff, (i >> 8) & 0xff, i & 0xff),
+                mgmt_ip='10.%d.%d.%d' % (
+                    (i >> 16) & 0xff, (i >> 8) & 0xff, i & 0xff))
+            self._create_inventory(host)
+            hosts.append(host)
+        return hosts
+
+    def _create_inventory(self, host):
+        for numa_node in range(2):
+            node = self.dbapi.inode_create(host.id, {'numa_node': numa_node})
+            for cpu in range(4):
+                self.dbapi.icpu_create(host.id, {
+                    'cpu': numa_node * 4 + cpu, 'core': cpu, 'thread': 0,
+                    'forinodeid': node.id})
+            self.dbapi.imemory_create(host.id, {'forinodeid': node.id})
+
+        lvg = self.dbapi.ilvg_create(host.id, {
+            'lvm_vg_name': constants.LVG_NOVA_LOCAL,
+            'vg_state': constants.PROVISIONED})
+        for d in range(2):
+            disk = self.dbapi.idisk_create(host.id, {
+                'device_node': '/dev/sd%s' % chr(ord('a') + d),
+                'device_path': '/dev/disk/by-path/%s-%d' % (host.hostname, d),
+                'device_type': constants.DEVICE_TYPE_HDD})
+            partition = self.dbapi.partition_create(host.id, {
+                'idisk_id': disk.id,
+                'idisk_uuid': disk.uuid,
+                'device_path': '%s-part1' % disk.device_path,
+                'status': constants.PARTITION_READY_STATUS})
+            self.dbapi.ipv_create(host.id, {
+                'lvm_vg_name': constants.LVG_NOVA_LOCAL,
+                'disk_or_part_uuid': partition.uuid,
+                'pv_state': constants.PROVISIONED,
+                'forilvgid': lvg.id})
+
+        for p in range(2):
+            interface = utils.create_test_interface(
+                forihostid=host.id, ifname='eth%d' % p,
+                imac='02:01:00:00:%02x:%02x' % (host.id & 0xff, p))
+            utils.create_test_ethernet_port(
+                name='eth%d' % p, host_id=host.id,
+                interface_id=interface.id,
+                mac='02:01:00:00:%02x:%02x' % (host.id & 0xff, p))
+
+    def _add_timings(self):
+        self.addDetail('query_timings', content.text_content('\n'.join(
+            '%s: %.6f' % (name, elapsed) for name, elapsed in self.timings)))
+
+    def _capture(self, name, func, *args, **kwargs):
+        """Run a db api call and return the statements it executed."""
+        with statements.StatementCounter(select_only=True,
+                                         keep=True) as counter:
+            start = time.time()
+            func(*args, **kwargs)
+            self.timings.append((name, time.time() - start))
+        return counter.statements
+
+    def _explain(self, statement, parameters):
+        if self.engine.name == 'sqlite':
+            explain = 'EXPLAIN QUERY PLAN '
+        else:
+            explain = 'EXPLAIN '
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(explain + statement, parameters)
+            return '\n'.join(' '.join(str(c) for c in row)
+                             for row in cursor.fetchall())
+        finally:
+            connection.close()
+
+    def assertUsesIndex(self, index, func, *args, **kwargs):
+        queries = self._capture(func.__name__, func, *args, **kwargs)
+        self.assertTrue(queries)
+        plans = [self._explain(s, p) for s, p in queries]
+        self.assertTrue(any(index in plan for plan in plans),
+                        'Index %s not used by %s:\n%s' % (
+                            index, func.__name__, '\n'.join(plans)))
+
+    def test_icpu_get_by_ihost(self):
+        self.assertUsesIndex('ix_i_icpu_forihostid',
+                             self.dbapi.icpu_get_by_ihost, self.hosts[-1].id)
+
+    def test_icpu_get_by_inode(self):
+        node = self.dbapi.inode_get_by_ihost(self.hosts[-1].id)[0]
+        self.assertUsesIndex('ix_i_icpu_forinodeid',
+                             self.dbapi.icpu_get_by_inode, node.id)
+
+    def test_inode_get_by_ihost(self):
+        self.assertUsesIndex('ix_i_node_forihostid',
+                             self.dbapi.inode_get_by_ihost, self.hosts[-1].id)
+
+    def test_imemory_get_by_ihost(self):
+        self.assertUsesIndex('ix_i_imemory_forihostid',
+                             self.dbapi.imemory_get_by_ihost,
+                             self.hosts[-1].id)
+
+    def test_idisk_get_by_ihost(self):
+        self.assertUsesIndex('ix_i_idisk_forihostid',
+                             self.dbapi.idisk_get_by_ihost, self.hosts[-1].id)
+
+    def test_partition_get_by_ihost(self):
+        self.assertUsesIndex('ix_partition_forihostid',
+                             self.dbapi.partition_get_by_ihost,
+                             self.hosts[-1].id)
+
+    def test_ilvg_get_by_ihost(self):
+        self.assertUsesIndex('ix_i_lvg_forihostid',
+                             self.dbapi.ilvg_get_by_ihost, self.hosts[-1].id)
+
+    def test_ipv_get_by_ihost(self):
+        self.assertUsesIndex('ix_i_pv_forihostid',
+                             self.dbapi.ipv_get_by_ihost, self.hosts[-1].id)
+
+    def test_iinterface_get_by_ihost(self):
+        self.assertUsesIndex('ix_interfaces_forihostid',
+                             self.dbapi.iinterface_get_by_ihost,
+                             self.hosts[-1].id)
+
+    def test_ethernet_port_get_by_host(self):
+        self.assertUsesIndex('ix_ports_host_id',
+                             self.dbapi.ethernet_port_get_by_host,
+                             self.hosts[-1].id)
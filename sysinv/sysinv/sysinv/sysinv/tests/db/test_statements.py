@@ -0,0 +1,67 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Tests for the counters of the executed database statements."""
+
+import eventlet
+
+from sysinv.db import api as dbapi
+from sysinv.db.sqlalchemy import statements
+from sysinv.tests.db import base
+from sysinv.tests.db import utils
+
+
+class StatementCounterTestCase(base.DbTestCase):
+
+    def setUp(self):
+        super(StatementCounterTestCase, self).setUp()
+        self.dbapi = dbapi.get_instance()
+
+    def test_count(self):
+        with statements.StatementCounter() as counter:
+            utils.create_test_isystem()
+        self.assertTrue(counter.count)
+        self.assertEqual([], counter.statements)
+
+        with statements.StatementCounter() as idle:
+            pass
+        self.assertEqual(0, idle.count)
+
+    def test_select_only(self):
+        with statements.StatementCounter(select_only=True, keep=True) as reads:
+            with statements.StatementCounter(keep=True) as writes:
+                system = utils.create_test_isystem()
+            self.dbapi.isystem_get(system.uuid)
+
+        self.assertTrue(all(statements.is_select(statement)
+                            for statement, _ in reads.statements))
+        self.assertFalse(all(statements.is_select(statement)
+                             for statement, _ in writes.statements))
+        self.assertEqual(reads.count, len(reads.statements))
+        self.assertTrue(reads.count)
+
+    def test_greenthread(self):
+        with statements.StatementCounter() as counter:
+            eventlet.spawn(utils.create_test_isystem).wait()
+        self.assertEqual(0, counter.count)
+
+    def test_observe(self):
+        observed = []
+
+        def observer(statement, elapsed):
+            observed.append((statement, elapsed))
+
+        statements.observe(observer)
+        self.addCleanup(statements.unobserve, observer)
+        with statements.StatementCounter() as counter:
+            self.dbapi.isystem_get_list()
+        self.assertEqual(counter.count, len(observed))
+        self.assertTrue(all(elapsed >= 0 for _, elapsed in observed))
+
+        statements.unobserve(observer)
+        self.dbapi.isystem_get_list()
+        self.assertEqual(counter.count, len(observed))
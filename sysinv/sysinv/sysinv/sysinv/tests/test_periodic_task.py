@@ -0,0 +1,156 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Tests for the concurrently scheduled periodic tasks."""
+
+import eventlet
+import mock
+
+from sysinv.common import service
+from sysinv.openstack.common import context
+from sysinv.openstack.common import periodic_task
+from sysinv.openstack.common import threadgroup
+from sysinv.tests import base
+
+SPACING = 0.1
+
+
+class FakeManager(periodic_task.PeriodicTasks):
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.runs = {'slow': 0, 'failing': 0, 'quick': 0}
+        self.slow_duration = 0
+        self.quick_duration = 0
+
+    def _run(self, name, duration):
+        self.runs[name] += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            eventlet.sleep(duration)
+        finally:
+            self.running -= 1
+
+    @periodic_task.periodic_task(spacing=SPACING, run_immediately=True,
+                                 jitter=0)
+    def _slow(self, context):
+        self._run('slow', self.slow_duration)
+
+    @periodic_task.periodic_task(spacing=SPACING, run_immediately=True,
+                                 jitter=0)
+    def _failing(self, context):
+        self.runs['failing'] += 1
+        raise ValueError('audit failed')
+
+    @periodic_task.periodic_task(spacing=SPACING, run_immediately=True,
+                                 jitter=0)
+    def _quick(self, context):
+        self._run('quick', self.quick_duration)
+
+
+class PeriodicTaskTestCase(base.TestCase):
+
+    def setUp(self):
+        super(PeriodicTaskTestCase, self).setUp()
+        self.manager = FakeManager()
+        # run every task immediately, whatever the previous tests ran
+        self.manager._periodic_last_run = dict.fromkeys(
+            self.manager._periodic_last_run)
+        self.tg = threadgroup.ThreadGroup()
+        self.addCleanup(self.tg.stop)
+        self.context = context.get_admin_context()
+
+    def _run_for(self, seconds):
+        self.manager.start_periodic_task_threads(self.context, self.tg)
+        eventlet.sleep(seconds)
+        self.tg.stop()
+
+    def test_exception_isolation(self):
+        self._run_for(SPACING * 3.5)
+        stats = self.manager.get_periodic_task_stats()
+
+        # the failing task keeps being scheduled and does not stop the others
+        self.assertGreaterEqual(self.manager.runs['failing'], 3)
+        self.assertEqual(self.manager.runs['failing'],
+                         stats['_failing']['failures'])
+        self.assertEqual('audit failed', stats['_failing']['last_error'])
+        self.assertGreaterEqual(self.manager.runs['quick'], 3)
+        self.assertEqual(0, stats['_quick']['failures'])
+        self.assertIsNone(stats['_quick']['last_error'])
+
+    def test_overlap_skipped(self):
+        self.manager.slow_duration = SPACING * 2.5
+        self._run_for(SPACING * 3.5)
+        stats = self.manager.get_periodic_task_stats()['_slow']
+
+        # the overrun skips the runs that fell due while it was running
+        # instead of starting them concurrently
+        self.assertEqual(2, self.manager.runs['slow'])
+        self.assertEqual(1, stats['overruns'])
+        self.assertEqual(2, stats['skipped'])
+        # the slow task does not delay the quick one
+        self.assertGreaterEqual(self.manager.runs['quick'], 3)
+
+    def test_concurrency_limit(self):
+        self.manager.slow_duration = SPACING / 2
+        self.manager.quick_duration = SPACING / 2
+
+        self._run_for(SPACING * 2.5)
+        self.assertEqual(2, self.manager.max_running)
+
+        self.config(periodic_task_max_concurrent=1)
+        self.manager.max_running = 0
+        self.manager._periodic_last_run = dict.fromkeys(
+            self.manager._periodic_last_run)
+        self.tg = threadgroup.ThreadGroup()
+        self._run_for(SPACING * 2.5)
+        self.assertEqual(1, self.manager.max_running)
+
+    def test_timeout(self):
+        self.manager.slow_duration = 10
+        self.manager._periodic_timeout = dict(
+            self.manager._periodic_timeout, _slow=SPACING / 2)
+        self._run_for(SPACING * 1.8)
+
+        stats = self.manager.get_periodic_task_stats()['_slow']
+        self.assertEqual(2, stats['timeouts'])
+        self.assertFalse(stats['running'])
+        self.assertGreaterEqual(self.manager.runs['quick'], 2)
+
+
+class FakeService(service.PeriodicService):
+
+    def periodic_tasks(self, context, raise_on_error=False):
+        pass
+
+
+class SerialFakeService(FakeService):
+    periodic_tasks_concurrent = False
+
+
+class PeriodicServiceTestCase(base.TestCase):
+
+    def _start(self, manager_class):
+        manager = manager_class('test-host', 'test-topic')
+        with mock.patch.object(service.rpc_service.Service, 'start'), \
+                mock.patch.object(manager, 'start_periodic_task_threads') \
+                as threads, \
+                mock.patch.object(manager, 'tg') as tg:
+            manager.start()
+        return threads.called, tg.add_timer.called
+
+    def test_service_default(self):
+        self.assertEqual((True, False), self._start(FakeService))
+        self.assertEqual((False, True), self._start(SerialFakeService))
+
+    def test_option_overrides_service_default(self):
+        self.config(periodic_tasks_concurrent=True)
+        self.assertEqual((True, False), self._start(SerialFakeService))
+        self.config(periodic_tasks_concurrent=False)
+        self.assertEqual((False, True), self._start(FakeService))
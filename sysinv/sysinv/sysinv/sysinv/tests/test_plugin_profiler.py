@@ -0,0 +1,128 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Tests for the puppet and helm plugin profiler."""
+
+import mock
+
+from sysinv.common import plugin_profiler
+from sysinv.db import api as dbapi
+from sysinv.tests.db import base
+from sysinv.tests.db import utils
+
+
+class FakeOperator(object):
+
+    def __init__(self, plugins):
+        self.profiler = plugin_profiler.PluginProfiler('fake')
+        self.plugins = plugins
+
+    @plugin_profiler.profile_run
+    def get_config(self, host):
+        config = {}
+        for name, plugin in self.plugins:
+            config.update(self.profiler.profile(name, 'get_config', plugin,
+                                                host))
+        return config
+
+    @plugin_profiler.profile_run
+    def get_all_config(self, host):
+        """Return the configuration of all the plugins."""
+        # runs of the methods it calls are part of its run
+        return self.get_config(host)
+
+
+class PluginProfilerTestCase(base.DbTestCase):
+
+    def setUp(self):
+        super(PluginProfilerTestCase, self).setUp()
+        self.dbapi = dbapi.get_instance()
+        self.system = utils.create_test_isystem()
+        self.host = utils.create_test_ihost(forisystemid=self.system.id,
+                                            hostname='controller-0')
+
+    def _get_system_config(self, host):
+        system = self.dbapi.isystem_get_one()
+        return {'platform::params::system_name': system.name}
+
+    def _get_host_config(self, host):
+        host = self.dbapi.ihost_get(host.uuid)
+        self.dbapi.ihost_get(host.uuid)
+        return {'platform::params::hostname': host.hostname}
+
+    def _get_operator(self, plugins=None):
+        if plugins is None:
+            plugins = [('001_system', self._get_system_config),
+                       ('002_host', self._get_host_config)]
+        operator = FakeOperator(plugins)
+        operator.profiler.enable(keep_runs=True)
+        return operator
+
+    def test_disabled(self):
+        operator = FakeOperator([('001_system', self._get_system_config)])
+        self.assertEqual(
+            {'platform::params::system_name': self.system.name},
+            operator.get_config(self.host))
+        self.assertIsNone(operator.profiler.runs)
+
+    def test_run(self):
+        operator = self._get_operator()
+        config = operator.get_config(self.host)
+        self.assertEqual('controller-0',
+                         config['platform::params::hostname'])
+
+        self.assertEqual(1, len(operator.profiler.runs))
+        run = operator.profiler.runs[0]
+        self.assertEqual('get_config(controller-0)', run['name'])
+        self.assertEqual('fake', run['operator'])
+        self.assertEqual(['001_system', '002_host'],
+                         [p['plugin'] for p in run['plugins']])
+        system, host = run['plugins']
+        self.assertGreater(system['queries'], 0)
+        self.assertGreater(host['queries'], system['queries'])
+        self.assertEqual(system['queries'] + host['queries'],
+                         run['queries'])
+        self.assertGreater(host['size'], 0)
+        self.assertIsNone(host['error'])
+        self.assertGreaterEqual(run['elapsed'],
+                                system['elapsed'] + host['elapsed'])
+
+    def test_nested_run(self):
+        operator = self._get_operator()
+        operator.get_all_config(self.host)
+        self.assertEqual(['get_all_config(controller-0)'],
+                         [r['name'] for r in operator.profiler.runs])
+        self.assertEqual(2, len(operator.profiler.runs[0]['plugins']))
+
+    def test_profile_run_wraps(self):
+        self.assertEqual('get_all_config',
+                         FakeOperator.get_all_config.__name__)
+        self.assertEqual('Return the configuration of all the plugins.',
+                         FakeOperator.get_all_config.__doc__)
+
+    def test_plugin_error(self):
+        def get_config(host):
+            raise ValueError('bad config')
+
+        operator = self._get_operator([('001_bad', get_config)])
+        self.assertRaises(ValueError, operator.get_config, self.host)
+        plugin = operator.profiler.runs[0]['plugins'][0]
+        self.assertEqual('ValueError: bad config', plugin['error'])
+        self.assertIsNone(plugin['size'])
+        self.assertIn('ValueError: bad config',
+                      plugin_profiler.format_run(operator.profiler.runs[0]))
+
+    def test_log_threshold(self):
+        operator = self._get_operator()
+        with mock.patch.object(plugin_profiler.LOG, 'warn') as warn:
+            operator.get_config(self.host)
+            self.assertFalse(warn.called)
+
+            self.config(log_threshold=0, group='plugin_profiler')
+            operator.get_config(self.host)
+            self.assertTrue(warn.called)
+            self.assertIn('002_host', warn.call_args[0][0])
@@ -0,0 +1,53 @@
+#
+# Copyright (c) 2019 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""
+Compare the sysinv-agent PSS collector with the shell pipeline it replaced.
+
+Run on a target host as root:
+    python bench_pss.py [iterations]
+"""
+
+import subprocess
+import sys
+import time
+
+from sysinv.agent import node
+
+SHELL_CMD = ('cat /proc/*/smaps 2>/dev/null | awk \'/^Pss:/ '
+             '{a += $2;} END {printf "%d\\n", a/1024.0;}\'')
+
+
+def shell_pss_mb():
+    proc = subprocess.Popen(SHELL_CMD, stdout=subprocess.PIPE, shell=True)
+    return int(proc.communicate()[0].strip())
+
+
+def native_pss_mb():
+    pss_kb, _ = node.get_total_pss_kb()
+    return int(pss_kb / 1024.0)
+
+
+def bench(func, iterations):
+    timings = []
+    result = None
+    for _ in range(iterations):
+        start = time.time()
+        result = func()
+        timings.append(time.time() - start)
+    return result, min(timings), sum(timings) / len(timings)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for name, func in (('shell', shell_pss_mb), ('native', native_pss_mb)):
+        pss_mb, best, mean = bench(func, iterations)
+        print("%-8s pss=%dMB best=%.3fs mean=%.3fs" % (name, pss_mb,
+                                                       best, mean))
+
+
+if __name__ == '__main__':
+    main()